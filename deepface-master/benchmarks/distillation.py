@@ -0,0 +1,55 @@
+"""
+Report how closely the distilled demography model agrees with the original
+    age, gender and race models and how much faster it is.
+
+Usage:
+    python benchmarks/distillation.py --train_path <faces> --test_path <faces>
+"""
+
+# built-in dependencies
+import argparse
+import os
+
+# project dependencies
+from deepface.modules import distillation
+from deepface.models.demography import Distilled
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--train_path", required=True)
+    parser.add_argument("--test_path", required=True)
+    parser.add_argument("--detector_backend", default="opencv")
+    parser.add_argument("--epochs", type=int, default=10)
+    args = parser.parse_args()
+
+    if not os.path.isfile(Distilled.get_weights_path()):
+        distillation.distill(
+            img_path=args.train_path,
+            detector_backend=args.detector_backend,
+            epochs=args.epochs,
+        )
+
+    report = distillation.agreement_report(
+        img_path=args.test_path, detector_backend=args.detector_backend
+    )
+
+    logger.info(f"{report['faces']} faces compared")
+    logger.info(
+        f"age: mean absolute difference {report['age_mean_absolute_difference']:.2f}, "
+        f"max absolute difference {report['age_max_absolute_difference']:.2f}"
+    )
+    logger.info(f"gender agreement: {100 * report['gender_agreement']:.1f}%")
+    logger.info(f"race agreement: {100 * report['race_agreement']:.1f}%")
+    logger.info(
+        f"original models: {report['original_duration']:.2f} seconds, "
+        f"distilled model: {report['distilled_duration']:.2f} seconds, "
+        f"speedup: {report['original_duration'] / report['distilled_duration']:.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
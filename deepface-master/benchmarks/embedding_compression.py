@@ -0,0 +1,134 @@
+"""
+Measure storage, scan speed and recall of compressed embeddings against full precision
+    exact search on synthetic clustered embeddings.
+
+Usage:
+    python benchmarks/embedding_compression.py --dimension 4096 --num_records 20000
+"""
+
+# built-in dependencies
+import time
+import argparse
+from typing import Any, Dict
+
+# 3rd party dependencies
+import numpy as np
+
+# project dependencies
+from deepface.modules.database import compression
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+METRICS = ["cosine", "euclidean"]
+
+
+def generate_embeddings(
+    num_records: int, dimension: int, num_identities: int, seed: int = 0
+) -> np.ndarray:
+    """
+    Generate embeddings grouped around identities, similar to faces of the same person
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((num_identities, dimension))
+    return (
+        centers[rng.integers(0, num_identities, num_records)]
+        + 0.3 * rng.standard_normal((num_records, dimension))
+    ).astype(np.float32)
+
+
+def find_exact_distances(queries: np.ndarray, vectors: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Find full precision distances of queries against all vectors
+    """
+    if metric == "cosine":
+        return 1 - (queries @ vectors.T) / np.outer(
+            np.linalg.norm(queries, axis=1), np.linalg.norm(vectors, axis=1)
+        )
+    return np.sqrt(
+        np.maximum(
+            np.sum(queries**2, axis=1)[:, None]
+            + np.sum(vectors**2, axis=1)[None, :]
+            - 2 * queries @ vectors.T,
+            0,
+        )
+    )
+
+
+def recall(expected: np.ndarray, found: np.ndarray) -> float:
+    """
+    Ratio of expected neighbours that are found, averaged over queries
+    """
+    return float(
+        np.mean([len(set(e) & set(f)) / len(e) for e, f in zip(expected, found)])
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dimension", type=int, default=512)
+    parser.add_argument("--num_records", type=int, default=20000)
+    parser.add_argument("--num_queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    vectors = generate_embeddings(args.num_records, args.dimension, args.num_records // 10)
+    queries = vectors[0 : args.num_queries] + 0.05 * np.random.default_rng(1).standard_normal(
+        (args.num_queries, args.dimension)
+    ).astype(np.float32)
+
+    tic = time.time()
+    for metric in METRICS:
+        find_exact_distances(queries, vectors.astype(np.float64), metric)
+    logger.info(
+        f"float64: {8 * args.dimension} bytes per vector, exact scan "
+        f"{1000 * (time.time() - tic) / len(METRICS) / args.num_queries:.2f}ms/query"
+    )
+
+    for embedding_compression in compression.COMPRESSIONS:
+        codebook = None
+        if embedding_compression == "pq":
+            tic = time.time()
+            codebook = compression.train_codebook(vectors)
+            logger.info(f"pq codebook trained in {time.time() - tic:.2f}s")
+
+        codes = compression.encode(vectors, embedding_compression, codebook)
+        results: Dict[str, Any] = {
+            "bytes": codes.shape[1],
+            "ratio": 8 * args.dimension / codes.shape[1],
+        }
+
+        for metric in METRICS:
+            exact = find_exact_distances(queries, vectors, metric)
+            expected = np.argsort(exact, axis=1)[:, 0 : args.k]
+
+            tic = time.time()
+            approximate = compression.find_approximate_distances(
+                queries, codes, embedding_compression, metric, codebook
+            )
+            duration = time.time() - tic
+
+            # candidates are re-ranked with exact distances in search
+            candidates = np.argsort(approximate, axis=1)[:, 0 : compression.RERANK_CANDIDATES]
+            reranked = np.take_along_axis(
+                candidates,
+                np.argsort(np.take_along_axis(exact, candidates, axis=1), axis=1),
+                axis=1,
+            )[:, 0 : args.k]
+
+            found = np.argsort(approximate, axis=1)[:, 0 : args.k]
+            results[metric] = (
+                f"recall@{args.k} {recall(expected, found):.3f}"
+                f" re-ranked {recall(expected, reranked):.3f}"
+                f" scan {1000 * duration / args.num_queries:.2f}ms/query"
+            )
+
+        logger.info(
+            f"{embedding_compression}: {results['bytes']} bytes per vector "
+            f"({results['ratio']:.1f}x smaller than float64), "
+            + ", ".join(f"{metric} {results[metric]}" for metric in METRICS)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Measure bulk registration throughput of PostgresClient with synthetic faces and embeddings.
+    Rows are inserted with a dedicated model name and removed when the benchmark ends.
+
+Usage:
+    python benchmarks/postgres_ingestion.py --connection_details postgresql://... \
+        --num_records 100000 --checkpoint_size 10000
+"""
+
+# built-in dependencies
+import os
+import json
+import time
+import struct
+import hashlib
+import argparse
+from typing import Any, Dict, List
+
+# 3rd party dependencies
+import numpy as np
+
+# project dependencies
+from deepface.modules.database.postgres import PostgresClient
+from deepface.modules.database.hashing import find_face_hash, find_embedding_hash
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+BENCHMARK_MODEL_NAME = "ingestion-benchmark"
+
+
+def generate_records(
+    num_records: int, face_size: int, dimension: int, seed: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Generate unique synthetic embedding records shaped like the ones register produces
+    """
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "id": None,
+            "img_name": f"synthetic_{i}.jpg",
+            "face": rng.random((face_size, face_size, 3), dtype=np.float32),
+            "model_name": BENCHMARK_MODEL_NAME,
+            "detector_backend": "skip",
+            "embedding": rng.standard_normal(dimension).tolist(),
+            "aligned": True,
+            "l2_normalized": False,
+        }
+        for i in range(num_records)
+    ]
+
+
+def measure_hashing(records: List[Dict[str, Any]]) -> None:
+    """
+    Compare hashing on json serialized faces and packed embeddings against raw bytes
+    """
+    tic = time.time()
+    for record in records:
+        hashlib.sha256(json.dumps(record["face"].tolist()).encode()).hexdigest()
+        hashlib.sha256(
+            struct.pack(f'{len(record["embedding"])}d', *record["embedding"])
+        ).hexdigest()
+    serialized_duration = time.time() - tic
+
+    tic = time.time()
+    for record in records:
+        find_face_hash(record["face"])
+        find_embedding_hash(record["embedding"])
+    raw_duration = time.time() - tic
+
+    logger.info(
+        f"hashing {len(records)} records: serialized {serialized_duration:.2f}s, "
+        f"raw bytes {raw_duration:.2f}s ({serialized_duration / raw_duration:.1f}x)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connection_details", default=os.getenv("DEEPFACE_POSTGRES_URI"))
+    parser.add_argument("--num_records", type=int, default=10000)
+    parser.add_argument("--face_size", type=int, default=160)
+    parser.add_argument("--dimension", type=int, default=512)
+    parser.add_argument("--checkpoint_size", type=int, default=0)
+    args = parser.parse_args()
+
+    records = generate_records(args.num_records, args.face_size, args.dimension)
+    payload_mb = sum(r["face"].nbytes + 8 * len(r["embedding"]) for r in records) / 1024**2
+
+    # serialized hashing is slow, a small sample is enough to compare
+    measure_hashing(records[0 : min(100, len(records))])
+
+    client = PostgresClient(connection_details=args.connection_details)
+    try:
+        tic = time.time()
+        inserted = client.insert_embeddings(records, batch_size=args.checkpoint_size)
+        duration = time.time() - tic
+
+        logger.info(
+            f"inserted {inserted} records ({payload_mb:.1f} MB) in {duration:.2f}s: "
+            f"{inserted / duration:.0f} rows/s, {payload_mb / duration:.1f} MB/s"
+        )
+    finally:
+        with client.conn.cursor() as cur:
+            cur.execute("DELETE FROM embeddings WHERE model_name = %s", (BENCHMARK_MODEL_NAME,))
+        client.conn.commit()
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
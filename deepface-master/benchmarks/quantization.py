@@ -0,0 +1,138 @@
+"""
+Measure the speedup and accuracy drift of quantized facial recognition models
+    against their full precision versions on the labeled pairs in tests/unit/dataset.
+
+Usage:
+    python benchmarks/quantization.py --model_name VGG-Face --precision int8
+"""
+
+# built-in dependencies
+import os
+import time
+import argparse
+from typing import Any, Dict, List, Tuple
+
+# 3rd party dependencies
+import numpy as np
+import pandas as pd
+
+# project dependencies
+from deepface import DeepFace
+from deepface.modules import modeling, verification, preprocessing
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+DATASET = os.path.join(os.path.dirname(__file__), "..", "tests", "unit", "dataset")
+METRICS = ["cosine", "euclidean", "euclidean_l2", "angular"]
+
+
+def embed(model_name: str, faces: np.ndarray, batch_size: int) -> Tuple[np.ndarray, float]:
+    """
+    Find embeddings of pre-processed faces and measure the forward pass duration
+    """
+    model = modeling.build_model(task="facial_recognition", model_name=model_name)
+
+    # warm up to exclude graph tracing and tensor allocation from measurements
+    model.forward(faces[0:batch_size])
+
+    embeddings: List[Any] = []
+    tic = time.time()
+    for i in range(0, faces.shape[0], batch_size):
+        batch = model.forward(faces[i : i + batch_size])
+        embeddings += batch if isinstance(batch[0], list) else [batch]
+    toc = time.time()
+
+    return np.array(embeddings, dtype=np.float32), toc - tic
+
+
+def evaluate(
+    pairs: pd.DataFrame, embeddings: Dict[str, np.ndarray], model_name: str, metric: str
+) -> Tuple[np.ndarray, float, float]:
+    """
+    Find distances of labeled pairs, accuracy with pre-tuned threshold and best threshold
+    """
+    distances = np.array(
+        [
+            verification.find_distance(embeddings[x], embeddings[y], metric)
+            for x, y in zip(pairs["file_x"], pairs["file_y"])
+        ]
+    )
+    labels = (pairs["Decision"] == "Yes").to_numpy()
+
+    threshold = verification.find_threshold(model_name, metric)
+    accuracy = float(np.mean((distances <= threshold) == labels))
+
+    candidates = np.unique(distances)
+    scores = [np.mean((distances <= candidate) == labels) for candidate in candidates]
+    best_threshold = float(candidates[int(np.argmax(scores))])
+
+    return distances, accuracy, best_threshold
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model_name", default="VGG-Face")
+    parser.add_argument("--precision", default="int8")
+    parser.add_argument("--detector_backend", default="opencv")
+    parser.add_argument("--calibration_path", default=DATASET)
+    parser.add_argument("--batch_size", type=int, default=16)
+    args = parser.parse_args()
+
+    variant = f"{args.model_name}-{args.precision}"
+
+    DeepFace.quantize(
+        model_name=args.model_name,
+        precision=args.precision,
+        calibration_path=args.calibration_path,
+        detector_backend=args.detector_backend,
+    )
+
+    pairs = pd.read_csv(os.path.join(DATASET, "master.csv"))
+    files = sorted(set(pairs["file_x"]).union(set(pairs["file_y"])))
+
+    base_model = modeling.build_model(task="facial_recognition", model_name=args.model_name)
+
+    target_size = base_model.input_shape
+    faces = []
+    for file in files:
+        face_objs = DeepFace.extract_faces(
+            img_path=os.path.join(DATASET, file),
+            detector_backend=args.detector_backend,
+            enforce_detection=False,
+        )
+        # rgb to bgr
+        img = face_objs[0]["face"][:, :, ::-1]
+        img = preprocessing.resize_image(img=img, target_size=(target_size[1], target_size[0]))
+        faces.append(preprocessing.normalize_input(img=img, normalization="base")[0])
+    faces_np = np.array(faces)
+
+    base_embeddings, base_duration = embed(args.model_name, faces_np, args.batch_size)
+    quantized_embeddings, quantized_duration = embed(variant, faces_np, args.batch_size)
+
+    logger.info(f"{len(files)} faces represented")
+    logger.info(f"{args.model_name}: {base_duration:.2f} seconds")
+    logger.info(f"{variant}: {quantized_duration:.2f} seconds")
+    logger.info(f"speedup: {base_duration / quantized_duration:.2f}x")
+
+    base_lookup = dict(zip(files, base_embeddings))
+    quantized_lookup = dict(zip(files, quantized_embeddings))
+
+    suggested: Dict[str, float] = {}
+    for metric in METRICS:
+        base_distances, base_accuracy, _ = evaluate(pairs, base_lookup, args.model_name, metric)
+        distances, accuracy, best_threshold = evaluate(pairs, quantized_lookup, variant, metric)
+        threshold = verification.find_threshold(variant, metric)
+        flips = int(np.sum((base_distances <= threshold) != (distances <= threshold)))
+        logger.info(
+            f"{metric}: accuracy {100 * base_accuracy:.1f}% -> {100 * accuracy:.1f}%, "
+            f"mean distance drift {np.mean(np.abs(distances - base_distances)):.5f}, "
+            f"{flips}/{len(pairs)} decisions flipped"
+        )
+        suggested[metric] = round(best_threshold, 4)
+
+    logger.info(f"tuned thresholds for quantized_thresholds table: '{variant}': {suggested}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 import os
 import warnings
 import logging
-from typing import Any, Dict, IO, List, Union, Optional, Sequence, Tuple, cast
+from typing import Any, Callable, Dict, IO, List, Union, Optional, Sequence, Tuple, cast
 
 # this has to be set before importing tensorflow
 os.environ["TF_USE_LEGACY_KERAS"] = "1"
@@ -26,8 +26,10 @@ from deepface.modules import (
     demography,
     detection,
     streaming,
+    multistream,
     preprocessing,
     datastore,
+    quantization,
 )
 from deepface import __version__
 
@@ -174,6 +176,84 @@ def verify(
     )
 
 
+def verify_many(
+    probe: Union[str, NDArray[Any], IO[bytes], List[float]],
+    candidates: Sequence[Union[str, NDArray[Any], IO[bytes], List[float]]],
+    model_name: str = "VGG-Face",
+    detector_backend: str = "opencv",
+    distance_metric: str = "cosine",
+    enforce_detection: bool = True,
+    align: bool = True,
+    expand_percentage: int = 0,
+    normalization: str = "base",
+    silent: bool = False,
+    threshold: Optional[Union[float, Sequence[float]]] = None,
+    anti_spoofing: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Verify a probe image against many candidate images. The probe is represented once,
+        faces of all images are represented in a single forward pass and distances of all
+        face pairs are found with a single distance matrix, so it is much faster than
+        calling verify for each candidate.
+    Args:
+        probe (str or np.ndarray or IO[bytes] or List[float]): image to verify. Accepts exact
+            image path as a string, numpy array (BGR), a file object that supports at least
+            `.read` and is opened in binary mode, base64 encoded images
+            or pre-calculated embeddings.
+
+        candidates (list): images to verify the probe against, each in any of the formats
+            accepted for the probe. Pre-calculated embeddings of candidates are not
+            represented again.
+
+        model_name (str): Model for face recognition. Options: VGG-Face, Facenet, Facenet512,
+            OpenFace, DeepFace, DeepID, Dlib, ArcFace, SFace and GhostFaceNet (default is VGG-Face).
+
+        detector_backend (string): face detector backend. Options: 'opencv', 'retinaface',
+            'mtcnn', 'ssd', 'dlib', 'mediapipe', 'yolov8n', 'yolov8m', 'yolov8l', 'yolov11n',
+            'yolov11s', 'yolov11m', 'yolov11l', 'yolov12n', 'yolov12s', 'yolov12m', 'yolov12l',
+            'centerface' or 'skip' (default is opencv).
+
+        distance_metric (string): Metric for measuring similarity. Options: 'cosine',
+            'euclidean', 'euclidean_l2', 'angular' (default is cosine).
+
+        enforce_detection (boolean): If no face is detected in an image, raise an exception.
+            Set to False to avoid the exception for low-resolution images (default is True).
+
+        align (bool): Flag to enable face alignment (default is True).
+
+        expand_percentage (int): expand detected facial area with a percentage (default is 0).
+
+        normalization (string): Normalize the input image before feeding it to the model.
+            Options: base, raw, Facenet, Facenet2018, VGGFace, VGGFace2, ArcFace (default is base)
+
+        silent (boolean): Suppress or allow some log messages for a quieter analysis process
+            (default is False).
+
+        threshold (float or list): Threshold of all pairs, or a threshold for each candidate.
+            If left unset, default pre-tuned threshold values will be applied based on the
+            specified model name and distance metric (default is None).
+
+        anti_spoofing (boolean): Flag to enable anti spoofing (default is False).
+
+    Returns:
+        results (List[Dict[str, Any]]): A verification result for each candidate with the
+            same keys of verify. 'img1' of 'facial_areas' is the probe's face.
+    """
+    return verification.verify_many(
+        probe=probe,
+        candidates=candidates,
+        model_name=model_name,
+        detector_backend=detector_backend,
+        distance_metric=distance_metric,
+        enforce_detection=enforce_detection,
+        align=align,
+        expand_percentage=expand_percentage,
+        normalization=normalization,
+        silent=silent,
+        threshold=threshold,
+        anti_spoofing=anti_spoofing,
+    )
+
 def analyze(
     img_path: Union[str, NDArray[Any], IO[bytes], List[str], List[NDArray[Any]], List[IO[bytes]]],
     actions: Union[Tuple[str, ...], List[str]] = ("emotion", "age", "gender", "race"),
@@ -183,6 +263,7 @@ def analyze(
     expand_percentage: int = 0,
     silent: bool = False,
     anti_spoofing: bool = False,
+    distilled: bool = False,
 ) -> Union[List[Dict[str, Any]], List[List[Dict[str, Any]]]]:
     """
     Analyze facial attributes such as age, gender, emotion, and race in the provided image.
@@ -214,6 +295,9 @@ def analyze(
 
         anti_spoofing (boolean): Flag to enable anti spoofing (default is False).
 
+        distilled (boolean): Use the distilled demography model sharing a single trunk for
+            age, gender and race instead of three separate models (default is False).
+
     Returns:
         (List[List[Dict[str, Any]]]): A list of analysis results if received batched image,
                                       explained below.
@@ -274,6 +358,7 @@ def analyze(
         expand_percentage=expand_percentage,
         silent=silent,
         anti_spoofing=anti_spoofing,
+        distilled=distilled,
     )
 
 
@@ -515,6 +600,8 @@ def stream(
     anti_spoofing: bool = False,
     output_path: Optional[str] = None,
     debug: bool = False,
+    tracker: str = "iou",
+    detection_interval: Optional[int] = None,
 ) -> None:
     """
     Run real time face recognition and facial attribute analysis
@@ -549,6 +636,13 @@ def stream(
 
         debug (bool): set this to True to save frame outcomes
 
+        tracker (str): tracker following faces between detections. Options: 'iou', 'mil',
+            'kcf' or 'csrt' (default is iou). kcf and csrt require opencv-contrib-python.
+
+        detection_interval (int): run the face detector every n-th frame, and earlier
+            if the tracker loses a face. Set 1 to detect on every frame (default is
+            DEEPFACE_DETECTION_INTERVAL environment variable or 5).
+
     Returns:
         None
     """
@@ -568,6 +662,83 @@ def stream(
         anti_spoofing=anti_spoofing,
         output_path=output_path,
         debug=debug,
+        tracker=tracker,
+        detection_interval=detection_interval,
+    )
+
+
+def analyze_streams(
+    sources: Union[List[Any], Dict[str, Any]],
+    db_path: Optional[str] = None,
+    model_name: str = "VGG-Face",
+    detector_backend: str = "opencv",
+    distance_metric: str = "cosine",
+    enable_face_analysis: bool = True,
+    anti_spoofing: bool = False,
+    tracker: str = "iou",
+    detection_interval: Optional[int] = None,
+    event_sink: Optional[Union[str, Callable[[Dict[str, Any]], None]]] = None,
+    output_dir: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run face recognition and facial attribute analysis on several video sources headlessly,
+        e.g. on servers without any display. Frames of all sources share batched detection
+        and recognition calls, and events are emitted whenever a tracked face appears or
+        disappears.
+
+    Args:
+        sources (list or dict): video files, camera indexes or rtsp / http urls. Stream ids
+            are the keys if a dict is given, or stream_{i} for a list.
+
+        db_path (string): Path to the folder containing image files to identify faces.
+            Faces are not identified if not given (default is None).
+
+        model_name (str): Model for face recognition. Options: VGG-Face, Facenet, Facenet512,
+            OpenFace, DeepFace, DeepID, Dlib, ArcFace, SFace and GhostFaceNet (default is VGG-Face).
+
+        detector_backend (string): face detector backend. Options: 'opencv', 'retinaface',
+            'mtcnn', 'ssd', 'dlib', 'mediapipe', 'yolov8', 'yolov11n', 'yolov11s', 'yolov11m',
+            'centerface' or 'skip' (default is opencv).
+
+        distance_metric (string): Metric for measuring similarity. Options: 'cosine',
+            'euclidean', 'euclidean_l2', 'angular' (default is cosine).
+
+        enable_face_analysis (bool): Flag to enable age, gender and emotion analysis
+            (default is True).
+
+        anti_spoofing (boolean): Flag to enable anti spoofing (default is False).
+
+        tracker (str): tracker following faces between detections. Options: 'iou', 'mil',
+            'kcf' or 'csrt' (default is iou). kcf and csrt require opencv-contrib-python.
+
+        detection_interval (int): run the face detector every n-th frame of each stream,
+            and earlier if the tracker loses a face (default is DEEPFACE_DETECTION_INTERVAL
+            environment variable or 5).
+
+        event_sink (str or callable): path of a json lines file to append events to, or a
+            callable receiving each event as a dict. Events are logged if not given.
+
+        output_dir (str): directory to write annotated videos as {stream_id}.mp4
+            (default is None, no video is written).
+
+    Returns:
+        stats (dict): processed frames, skipped frames and tracks per stream id.
+            Events are track_started with stream_id, track_id, timestamp, position_ms,
+            frame_index, facial_area, identity, confidence and demography, and track_ended
+            with stream_id, track_id, first_seen, last_seen and identity.
+    """
+    return multistream.analyze_streams(
+        sources=sources,
+        db_path=db_path,
+        model_name=model_name,
+        detector_backend=detector_backend,
+        distance_metric=distance_metric,
+        enable_face_analysis=enable_face_analysis,
+        anti_spoofing=anti_spoofing,
+        tracker=tracker,
+        detection_interval=detection_interval,
+        event_sink=event_sink,
+        output_dir=output_dir,
     )
 
 
@@ -718,6 +889,7 @@ def register(
     database_type: str = "postgres",
     connection_details: Optional[Union[Dict[str, Any], str]] = None,
     connection: Any = None,
+    embedding_compression: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Register identities to database for face recognition
@@ -743,10 +915,16 @@ def register(
             Options: base, raw, Facenet, Facenet2018, VGGFace, VGGFace2, ArcFace (default is base).
         anti_spoofing (boolean): Flag to enable anti spoofing (default is False).
         database_type (str): Type of database to register identities. Options: 'postgres', 'mongo',
-            'weaviate' (default is 'postgres').
+            'weaviate', 'local' (default is 'postgres').
         connection_details (dict or str): Connection details for the database.
         connection (Any): Existing database connection object. If provided, this connection
             will be used instead of creating a new one.
+        embedding_compression (str): Also store a compressed code of each embedding for
+            faster exact search. Options: 'float16', 'int8', 'pq' (default is None).
+            The full embedding is still stored to re-rank candidates, so each row grows by
+            its code; only the data scanned by search shrinks. Codebook of 'pq' is trained
+            once 256 embeddings of a model are registered, embeddings registered before
+            that are stored uncompressed.
     Returns:
         result (dict): A dictionary containing registration results with following keys.
             - inserted (int): Number of embeddings successfully registered to the database.
@@ -765,6 +943,7 @@ def register(
         database_type=database_type,
         connection_details=connection_details,
         connection=connection,
+        embedding_compression=embedding_compression,
     )
 
 
@@ -785,7 +964,9 @@ def search(
     connection_details: Optional[Union[Dict[str, Any], str]] = None,
     connection: Any = None,
     search_method: str = "exact",
-) -> List[pd.DataFrame]:
+    columnar: bool = False,
+    embedding_compression: Optional[str] = None,
+) -> Union[List[pd.DataFrame], Dict[str, NDArray[Any]]]:
     """
     Search for identities in database for face recognition. This is a stateless facial
         recognition function. Use find function to do it in a stateful way.
@@ -816,14 +997,19 @@ def search(
         k (int): Number of top similar faces to retrieve from the database for each detected face.
             If not specified, all faces within the threshold will be returned (default is None).
         database_type (str): Type of database to search identities. Options: 'postgres', 'mongo',
-            'weaviate' (default is 'postgres').
+            'weaviate', 'local' (default is 'postgres').
         connection_details (dict or str): Connection details for the database.
         connection (Any): Existing database connection object. If provided, this connection
             will be used instead of creating a new one.
         search_method (str): Method to use for searching identities. Options: 'exact', 'ann'.
             To use ann search, you must run build_index function first to create the index.
+        columnar (bool): If True, matches of all faces are returned together as numpy arrays
+            instead of a dataframe per face (default is False).
+        embedding_compression (str): If set, exact search scans compressed codes of embeddings
+            registered with the same compression, and re-ranks the nearest candidates with
+            full embeddings. Options: 'float16', 'int8', 'pq' (default is None).
     Returns:
-        results (List[pd.DataFrame]):
+        results (List[pd.DataFrame] or dict):
             A list of pandas dataframes or a list of dicts. Each dataframe or dict corresponds
                 to the identity information for an individual detected in the source image.
 
@@ -839,6 +1025,9 @@ def search(
                 is True, euclidean if l2_normalize is False.
             - distance: Similarity score between the faces based on the specified model
                 and distance metric
+
+            If columnar is True, a dict of arrays with query (index of the detected face),
+                id, distance and img_name (if available) keys is returned instead.
     """
     return datastore.search(
         img=img,
@@ -857,6 +1046,8 @@ def search(
         connection_details=connection_details,
         connection=connection,
         search_method=search_method,
+        columnar=columnar,
+        embedding_compression=embedding_compression,
     )
 
 
@@ -872,7 +1063,8 @@ def build_index(
 ) -> None:
     """
     Build index for faster search in the database. You should set search_method to 'ann'
-        in the search function to use the built index.
+        in the search function to use the built index. For postgres with pgvector mode
+        enabled (DEEPFACE_POSTGRES_PGVECTOR=true), a pgvector index is created instead.
 
     - Use this function after registering all identities to the database.
     - This function is resumable, run again whenever new identities are added to the db.
@@ -889,7 +1081,7 @@ def build_index(
         align (bool): Flag to enable face alignment (default is True).
         l2_normalize (bool): Flag to enable L2 normalization (unit vector normalization)
         database_type (str): Type of database to build index. Options: 'postgres', 'mongo',
-            'weaviate' (default is 'postgres').
+            'weaviate', 'local' (default is 'postgres').
         connection (Any): Existing database connection object. If provided, this connection
             will be used instead of creating a new one.
         connection_details (dict or str): Connection details for the database.
@@ -906,3 +1098,47 @@ def build_index(
         connection_details=connection_details,
         max_neighbors_per_node=max_neighbors_per_node,
     )
+
+
+def quantize(
+    model_name: str = "VGG-Face",
+    precision: str = "int8",
+    calibration_path: Optional[str] = None,
+    detector_backend: str = "opencv",
+    align: bool = True,
+    normalization: str = "base",
+    max_samples: int = 200,
+) -> str:
+    """
+    Create a post-training quantized variant of a facial recognition model. Then, pass
+        the variant name (e.g. VGG-Face-int8 or Facenet512-float16) as model_name to
+        represent, verify, find, register or search functions.
+
+    - float16 halves the model size and keeps accuracy virtually same.
+    - int8 quantizes weights and activations. It requires a folder of faces to calibrate
+        activation ranges. Check benchmarks/quantization.py to measure its speedup and
+        accuracy drift on your hardware.
+
+    Args:
+        model_name (str): Model for face recognition. Options: VGG-Face, Facenet, Facenet512,
+            ArcFace and GhostFaceNet (default is VGG-Face).
+        precision (str): Options: float16 or int8 (default is int8).
+        calibration_path (str): Folder of facial images to calibrate int8 quantization.
+        detector_backend (string): face detector backend used for calibration images
+            (default is opencv).
+        align (bool): Flag to enable face alignment for calibration images (default is True).
+        normalization (string): Normalize the calibration images before feeding them to the model.
+            It should be same as the one used while representing (default is base).
+        max_samples (int): Maximum number of faces used for calibration (default is 200).
+    Returns:
+        target_file (str): exact path of the quantized tflite model
+    """
+    return quantization.quantize(
+        model_name=model_name,
+        precision=precision,
+        calibration_path=calibration_path,
+        detector_backend=detector_backend,
+        align=align,
+        normalization=normalization,
+        max_samples=max_samples,
+    )
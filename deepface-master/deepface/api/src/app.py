@@ -1,3 +1,6 @@
+# built-in dependencies
+import time
+
 # 3rd parth dependencies
 from flask import Flask
 from flask_cors import CORS
@@ -12,7 +15,8 @@ load_dotenv()
 from deepface import __version__
 from deepface.api.src.modules.core.routes import blueprint
 from deepface.api.src.dependencies.variables import Variables
-from deepface import DeepFace
+from deepface.api.src.dependencies.executor import InferenceExecutor
+from deepface.api.src.dependencies.preload import parse_preload_spec, preload_models
 from deepface.commons.logger import Logger
 
 logger = Logger()
@@ -25,6 +29,11 @@ def create_app() -> Flask:
     # inject variables
     variables = Variables()
     blueprint.variables = variables  # type: ignore[attr-defined]
+    blueprint.executor = InferenceExecutor(  # type: ignore[attr-defined]
+        max_workers=variables.inference_workers,
+        max_queue_size=variables.max_queue_size,
+        timeout=variables.request_timeout,
+    )
 
     load_models_on_startup(variables)
 
@@ -35,13 +44,18 @@ def create_app() -> Flask:
 
 def load_models_on_startup(variables: Variables) -> None:
     """Load models on startup to reduce latency on first request."""
-    face_recognition_models = variables.face_recognition_models
-    if face_recognition_models is not None:
-        for model in face_recognition_models.split(","):
-            DeepFace.build_model(task="facial_recognition", model_name=model.strip())
-            logger.info(f"Facial Recognition Model {model} loaded on startup.")
-    face_detection_models = variables.face_detection_models
-    if face_detection_models is not None:
-        for model in face_detection_models.split(","):
-            DeepFace.build_model(task="face_detector", model_name=model.strip())
-            logger.info(f"Face Detector Model {model} loaded on startup.")
+    spec = parse_preload_spec(
+        preload_models=variables.preload_models,
+        face_recognition_models=variables.face_recognition_models,
+        face_detection_models=variables.face_detection_models,
+    )
+    tic = time.time()
+    statuses = preload_models(
+        spec, max_workers=variables.preload_workers, warmup=variables.preload_warmup
+    )
+    blueprint.model_statuses = statuses  # type: ignore[attr-defined]
+    if statuses:
+        logger.info(
+            f"{sum(status.loaded for status in statuses)}/{len(statuses)} models "
+            f"loaded on startup in {time.time() - tic:.2f}s"
+        )
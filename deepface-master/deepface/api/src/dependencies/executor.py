@@ -0,0 +1,104 @@
+# built-in dependencies
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+
+# project dependencies
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+class ServerOverloadedError(Exception):
+    """Raised when the inference queue is full and a request is not admitted."""
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a request is not served before its deadline."""
+
+
+class InferenceExecutor:
+    """
+    Run model inference of all requests of the process on a fixed number of threads.
+        Web server threads only parse requests and wait for results, so a single process
+        serves many connections while models are loaded once and shared by inference
+        threads. Requests are rejected once max_queue_size requests are already waiting,
+        and dropped without running if their deadline passes while they wait.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int, timeout: float) -> None:
+        """
+        Args:
+            max_workers (int): number of threads running inference concurrently
+            max_queue_size (int): number of requests allowed to wait for a free thread
+            timeout (float): default deadline of a request in seconds
+        """
+        self.max_workers = max(max_workers, 1)
+        self.max_queue_size = max(max_queue_size, 0)
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="deepface-inference"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of requests running or waiting for a free thread."""
+        return self._pending
+
+    def run(
+        self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any
+    ) -> Any:
+        """
+        Run a function on an inference thread and wait for its result
+        Args:
+            func (callable): function to run
+            timeout (float): seconds to wait for the result, executor's timeout if not given
+        Returns:
+            result (Any): result of the function
+        Raises:
+            ServerOverloadedError: if too many requests are already waiting
+            DeadlineExceededError: if the result is not ready before the deadline
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue_size:
+                raise ServerOverloadedError(
+                    f"Server is busy with {self._pending} requests, please retry later."
+                )
+            self._pending += 1
+
+        try:
+            future = self._pool.submit(self._run_before_deadline, deadline, func, args, kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError as err:
+            # a request still waiting for a thread is dropped, a running one cannot be stopped
+            future.cancel()
+            raise DeadlineExceededError(
+                f"Request could not be served in {timeout} seconds."
+            ) from err
+
+    def shutdown(self) -> None:
+        """Wait for running requests and stop inference threads."""
+        self._pool.shutdown(wait=True)
+
+    def _run_before_deadline(
+        self, deadline: float, func: Callable[..., Any], args: Any, kwargs: Any
+    ) -> Any:
+        if time.monotonic() > deadline:
+            raise DeadlineExceededError("Request deadline passed while waiting in the queue.")
+        return func(*args, **kwargs)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
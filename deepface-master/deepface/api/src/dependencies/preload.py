@@ -0,0 +1,196 @@
+# built-in dependencies
+import os
+import json
+import time
+import traceback
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# 3rd party dependencies
+import numpy as np
+
+# project dependencies
+from deepface.modules import modeling
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class ModelStatus:
+    """
+    Loading details of a model preloaded on startup
+    """
+
+    task: str
+    model_name: str
+    loaded: bool = False
+    # seconds spent to build the model and to run its first inference
+    load_time: Optional[float] = None
+    warmup_time: Optional[float] = None
+    # memory held by weights of the model, None if the framework does not expose them
+    weights_bytes: Optional[int] = None
+    error: Optional[str] = None
+
+
+def parse_preload_spec(
+    preload_models: Optional[str],
+    face_recognition_models: Optional[str] = None,
+    face_detection_models: Optional[str] = None,
+) -> Dict[str, List[str]]:
+    """
+    Parse the models to preload on startup
+    Args:
+        preload_models (str): json mapping tasks to model names, or path of a json file
+            e.g. {"facial_recognition": ["Facenet"], "face_detector": ["retinaface"],
+            "facial_attribute": ["Age", "Gender"], "spoofing": ["Fasnet"]}
+        face_recognition_models (str): comma separated facial recognition models
+        face_detection_models (str): comma separated face detectors
+    Returns:
+        spec (dict): model names of each task
+    """
+    spec: Dict[str, List[str]] = {}
+    if preload_models:
+        if os.path.isfile(preload_models):
+            with open(preload_models, "r", encoding="utf-8") as f:
+                preload_models = f.read()
+        spec = {task: list(model_names) for task, model_names in json.loads(preload_models).items()}
+
+    for task, model_names in [
+        ("facial_recognition", face_recognition_models),
+        ("face_detector", face_detection_models),
+    ]:
+        if model_names:
+            spec.setdefault(task, []).extend(name.strip() for name in model_names.split(","))
+
+    for task, model_names in spec.items():
+        available_models = modeling.AVAILABLE_MODELS.get(task)  # type: ignore[misc]
+        if available_models is None:
+            raise ValueError(
+                f"Unsupported task in preload spec: {task}. "
+                f"Options: {list(modeling.AVAILABLE_MODELS.keys())}"
+            )
+        unavailable_models = [name for name in model_names if name not in available_models]
+        if unavailable_models:
+            raise ValueError(f"Unsupported {task} models in preload spec: {unavailable_models}")
+
+    # opencv finds eyes of faces if a detector does not, so it is loaded with any detector
+    if spec.get("face_detector") and "opencv" not in spec["face_detector"]:
+        spec["face_detector"].append("opencv")
+
+    # a model may be listed both in the spec and in the legacy variables
+    return {task: list(dict.fromkeys(model_names)) for task, model_names in spec.items()}
+
+
+def preload_models(
+    spec: Dict[str, List[str]], max_workers: int, warmup: bool = True
+) -> List[ModelStatus]:
+    """
+    Build models in parallel and run a warm-up inference on each, so that the first
+        request does not pay for loading weights or initializing kernels
+    Args:
+        spec (dict): model names of each task
+        max_workers (int): number of models loaded concurrently
+        warmup (bool): run an inference with a blank input after building each model
+    Returns:
+        statuses (list): loading details of each model, failures do not stop others
+    """
+    statuses = [
+        ModelStatus(task=task, model_name=model_name)
+        for task, model_names in spec.items()
+        for model_name in model_names
+    ]
+    if not statuses:
+        return statuses
+
+    with ThreadPoolExecutor(
+        max_workers=max(max_workers, 1), thread_name_prefix="deepface-preload"
+    ) as pool:
+        list(pool.map(lambda status: __load(status, warmup), statuses))
+    return statuses
+
+
+def find_resident_memory() -> Optional[int]:
+    """
+    Find resident memory of the process in bytes, None if the platform does not expose it
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def __load(status: ModelStatus, warmup: bool) -> None:
+    try:
+        tic = time.time()
+        model = modeling.build_model(task=status.task, model_name=status.model_name)
+        status.load_time = round(time.time() - tic, 3)
+        status.weights_bytes = __find_weights_bytes(model)
+
+        if warmup:
+            tic = time.time()
+            __warm_up(status.task, model)
+            status.warmup_time = round(time.time() - tic, 3)
+
+        status.loaded = True
+        warmup_message = f", warmed up in {status.warmup_time}s" if warmup else ""
+        logger.info(
+            f"{status.task} model {status.model_name} loaded on startup "
+            f"in {status.load_time}s{warmup_message}"
+        )
+    except Exception as err:  # pylint: disable=broad-except
+        status.loaded = status.load_time is not None
+        status.error = str(err)
+        logger.error(f"Failed to preload {status.task} model {status.model_name}: {err}")
+        logger.debug(traceback.format_exc())
+
+
+def __warm_up(task: str, model: Any) -> None:
+    """
+    Run an inference with a blank input on the model of the task
+    """
+    if task == "facial_recognition":
+        height, width = model.input_shape[1], model.input_shape[0]
+        model.forward(np.zeros((1, height, width, 3), dtype=np.float32))
+    elif task == "facial_attribute":
+        model.predict(np.zeros((1, 224, 224, 3), dtype=np.float32))
+    elif task == "face_detector":
+        model.detect_faces(np.zeros((224, 224, 3), dtype=np.uint8))
+    elif task == "spoofing":
+        model.analyze(img=np.zeros((224, 224, 3), dtype=np.uint8), facial_area=(0, 0, 224, 224))
+
+
+def __find_weights_bytes(model: Any) -> Optional[int]:
+    """
+    Find memory held by weights of keras and torch models wrapped by the given client
+    """
+    total, found = 0, False
+    candidates = list(vars(model).values())
+    for candidate in candidates:
+        if isinstance(candidate, dict):
+            candidates.extend(candidate.values())
+        elif hasattr(candidate, "count_params") and hasattr(candidate, "weights"):
+            # keras model
+            total += sum(
+                int(np.prod(weight.shape)) * np.dtype(__dtype_name(weight)).itemsize
+                for weight in candidate.weights
+            )
+            found = True
+        elif hasattr(candidate, "parameters") and hasattr(candidate, "buffers"):
+            # torch module
+            total += sum(
+                tensor.numel() * tensor.element_size()
+                for tensors in (candidate.parameters(), candidate.buffers())
+                for tensor in tensors
+            )
+            found = True
+    return total if found else None
+
+
+def __dtype_name(weight: Any) -> str:
+    """Dtype of a keras 2 or keras 3 variable as a numpy compatible name."""
+    dtype = weight.dtype
+    return dtype if isinstance(dtype, str) else getattr(dtype, "name", "float32")
@@ -9,3 +9,18 @@ class Variables:
         self.conection_details = os.getenv("DEEPFACE_CONNECTION_DETAILS")
         self.face_recognition_models = os.getenv("DEEPFACE_FACE_RECOGNITION_MODELS")
         self.face_detection_models = os.getenv("DEEPFACE_FACE_DETECTION_MODELS")
+        # json mapping tasks to models to preload on startup, or path of a json file
+        self.preload_models = os.getenv("DEEPFACE_PRELOAD_MODELS")
+        # models loaded in parallel on startup, each is warmed up with a blank inference
+        self.preload_workers = int(os.getenv("DEEPFACE_PRELOAD_WORKERS", "4"))
+        self.preload_warmup = os.getenv("DEEPFACE_PRELOAD_WARMUP", "true").lower() == "true"
+        # inference threads shared by all requests, models are loaded once per process
+        self.inference_workers = int(
+            os.getenv("DEEPFACE_INFERENCE_WORKERS", str(os.cpu_count() or 1))
+        )
+        # requests waiting for a free inference thread, more are rejected with 503
+        self.max_queue_size = int(os.getenv("DEEPFACE_MAX_QUEUE_SIZE", "64"))
+        # seconds a request may wait and run before it is answered with 504
+        self.request_timeout = float(os.getenv("DEEPFACE_REQUEST_TIMEOUT", "60"))
+        # images of batch endpoints processed with a single forward pass
+        self.batch_size = int(os.getenv("DEEPFACE_API_BATCH_SIZE", "32"))
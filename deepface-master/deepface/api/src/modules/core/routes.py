@@ -1,14 +1,23 @@
 # built-in dependencies
-from typing import Union, cast, Any, Tuple, Dict
+import json
+from dataclasses import asdict
+from typing import Union, cast, Any, Tuple, Dict, Callable, Optional, List, Iterator
 
 # 3rd party dependencies
-from flask import Blueprint, request
+from flask import Blueprint, Response, current_app, request, stream_with_context
 from numpy.typing import NDArray
 
 # project dependencies
 from deepface import __version__
-from deepface.api.src.modules.core import service
+from deepface.api.src.modules.core import service, serialization
 from deepface.api.src.dependencies.variables import Variables
+from deepface.api.src.dependencies.preload import ModelStatus, find_resident_memory
+from deepface.modules import modeling
+from deepface.api.src.dependencies.executor import (
+    InferenceExecutor,
+    ServerOverloadedError,
+    DeadlineExceededError,
+)
 from deepface.commons import image_utils
 from deepface.commons.logger import Logger
 
@@ -16,6 +25,9 @@ logger = Logger()
 
 blueprint = Blueprint("routes", __name__)
 
+# content types of newline delimited json requests and responses of batch endpoints
+NDJSON_MIMETYPES = ["application/x-ndjson", "application/jsonl", "application/jsonlines"]
+
 # pylint: disable=no-else-return, broad-except
 
 
@@ -24,6 +36,30 @@ def home() -> str:
     return f"<h1>Welcome to DeepFace API v{__version__}!</h1>"
 
 
+@blueprint.route("/health/models")
+def health_models() -> Tuple[Dict[str, Any], int]:
+    """
+    Report models preloaded on startup with their load times and memory, and the models
+        loaded lazily by requests since then. Responds 503 if a preloaded model failed.
+    """
+    statuses: List[ModelStatus] = getattr(blueprint, "model_statuses", [])
+    preloaded = {(status.task, status.model_name) for status in statuses}
+    cached_models: Dict[str, Dict[str, Any]] = getattr(modeling, "cached_models", {})
+
+    healthy = all(status.loaded and status.error is None for status in statuses)
+    return {
+        "healthy": healthy,
+        "resident_memory_bytes": find_resident_memory(),
+        "models": [asdict(status) for status in statuses],
+        "lazily_loaded_models": [
+            {"task": task, "model_name": model_name}
+            for task, task_models in cached_models.items()
+            for model_name in task_models
+            if (task, model_name) not in preloaded
+        ],
+    }, (200 if healthy else 503)
+
+
 def extract_image_from_request(img_key: str) -> Union[str, NDArray[Any]]:
     """
     Extracts an image from the request either from json or a multipart/form-data file.
@@ -71,12 +107,216 @@ def extract_image_from_request(img_key: str) -> Union[str, NDArray[Any]]:
     raise ValueError(f"'{img_key}' not found in request in either json or form data")
 
 
+def run_inference(
+    func: Callable[..., Tuple[Dict[str, Any], int]], **kwargs: Any
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Run a service function on the shared inference executor of the app.
+
+    Args:
+        func (callable): service function returning a response and its status code
+        kwargs: arguments of the service function
+
+    Returns:
+        response (dict): response of the service function, or the error if the request
+            is rejected (503) or not served before its deadline (504).
+        status_code (int): status code of the response
+    """
+    try:
+        return cast(Tuple[Dict[str, Any], int], execute(func, **kwargs))
+    except ServerOverloadedError as err:
+        logger.warn(str(err))
+        return {"error": str(err)}, 503
+    except DeadlineExceededError as err:
+        logger.warn(str(err))
+        return {"error": str(err)}, 504
+    except ValueError as err:
+        return {"exception": str(err)}, 400
+
+
+def execute(func: Callable[..., Any], **kwargs: Any) -> Any:
+    """
+    Run a function on the shared inference executor of the app, directly if there is none.
+        Clients may ask for a shorter deadline than the server's one with the
+        X-Request-Timeout header.
+
+    Raises:
+        ServerOverloadedError: if too many requests are already waiting
+        DeadlineExceededError: if the result is not ready before the deadline
+        ValueError: if the X-Request-Timeout header is not a number
+    """
+    executor: Optional[InferenceExecutor] = getattr(blueprint, "executor", None)
+    if executor is None:
+        return func(**kwargs)
+
+    timeout = executor.timeout
+    requested_timeout = request.headers.get("X-Request-Timeout")
+    if requested_timeout is not None:
+        try:
+            timeout = min(float(requested_timeout), timeout)
+        except ValueError as err:
+            raise ValueError(f"Invalid X-Request-Timeout header: {requested_timeout}") from err
+
+    return executor.run(func, timeout=timeout, **kwargs)
+
+
+def extract_batch_from_request(
+    img_keys: List[str],
+) -> Tuple[List[Any], List[Any], Dict[str, Any]]:
+    """
+    Extracts many images from a multipart/form-data or NDJSON request.
+
+    Multipart requests carry several files under each image key, pairs are matched by
+        their order, and options as form fields. NDJSON requests carry an object with the
+        image keys and an optional id on each line, and options as query parameters.
+
+    Args:
+        img_keys (list): keys of the images of an item, e.g. ['img'] or ['img1', 'img2']
+
+    Returns:
+        items (list): image of each item, or a tuple of its images for several keys
+        ids (list): id of each item, file name for multipart requests
+        input_args (dict): options of the request
+    """
+    if request.files:
+        files = [request.files.getlist(img_key) for img_key in img_keys]
+        if any(len(key_files) == 0 for key_files in files):
+            raise ValueError(f"Request form data must have files for {img_keys}")
+        if any(len(key_files) != len(files[0]) for key_files in files):
+            raise ValueError(f"Request form data must have the same number of {img_keys}")
+
+        # files are decoded in the batch they are processed, not all at once
+        items: List[Any] = files[0] if len(img_keys) == 1 else list(zip(*files))
+        ids: List[Any] = [
+            item_files[0].filename if len(img_keys) == 1 else None for item_files in zip(*files)
+        ]
+        return items, ids, request.form.to_dict()
+
+    if request.mimetype in NDJSON_MIMETYPES:
+        items, ids = [], []
+        for line_number, line in enumerate(request.get_data(as_text=True).splitlines()):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if any(not item.get(img_key) for img_key in img_keys):
+                raise ValueError(f"Line {line_number + 1} doesn't have all of {img_keys}")
+            images = tuple(item[img_key] for img_key in img_keys)
+            items.append(images[0] if len(img_keys) == 1 else images)
+            ids.append(item.get("id"))
+
+        if not items:
+            raise ValueError("empty input set passed")
+        return items, ids, request.args.to_dict()
+
+    raise ValueError(
+        "Batch requests must be either multipart/form-data or "
+        f"newline delimited json ({NDJSON_MIMETYPES[0]})"
+    )
+
+
+def stream_batch(
+    func: Callable[..., List[Dict[str, Any]]],
+    batch_arg: str,
+    items: List[Any],
+    ids: List[Any],
+    **kwargs: Any,
+) -> Response:
+    """
+    Run a batch service function on chunks of items and stream a json line for each item
+        as soon as its chunk is processed.
+
+    Args:
+        func (callable): batch service function returning the response of each item
+        batch_arg (str): argument of the function that items are passed with
+        items (list): items of the request
+        ids (list): id of each item, included in its response line if available
+        kwargs: other arguments of the service function
+
+    Returns:
+        response (Response): newline delimited json response with the index of each item
+    """
+    variables: Variables = blueprint.variables  # type: ignore[attr-defined]
+    batch_size = max(variables.batch_size, 1)
+
+    def generate() -> Iterator[str]:
+        for start in range(0, len(items), batch_size):
+            chunk = items[start : start + batch_size]
+            try:
+                results = execute(func, **{batch_arg: chunk}, **kwargs)
+            except (ServerOverloadedError, DeadlineExceededError, ValueError) as err:
+                results = [{"error": str(err)}] * len(chunk)
+
+            for offset, result in enumerate(results):
+                line = {"index": start + offset, **result}
+                if ids[start + offset] is not None:
+                    line["id"] = ids[start + offset]
+                yield current_app.json.dumps(line) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPES[0])
+
+
+def parse_actions(actions: Union[str, List[str]]) -> List[str]:
+    """
+    Parse actions of an analysis request.
+
+    Args:
+        actions (str or list): actions list, or its text if the request is form data
+
+    Returns:
+        actions (list): actions to analyze
+    """
+    # actions is the only argument instance of list or tuple
+    # if request is form data, input args can either be text or file
+    if isinstance(actions, str):
+        actions = (
+            actions.replace("[", "")
+            .replace("]", "")
+            .replace("(", "")
+            .replace(")", "")
+            .replace('"', "")
+            .replace("'", "")
+            .replace(" ", "")
+            .split(",")
+        )
+    return actions
+
+
+def parse_flag(input_args: Dict[str, Any], key: str, default: bool) -> bool:
+    """
+    Parse a boolean option of a batch request.
+
+    Args:
+        input_args (dict): options of the request, text for query parameters and form fields
+        key (str): name of the option
+        default (bool): value if the option is not given
+
+    Returns:
+        flag (bool): True only for true or 1, case insensitive
+    """
+    value = input_args.get(key)
+    if value is None:
+        return default
+    return str(value).lower() in ("true", "1")
+
+
 @blueprint.route("/represent", methods=["POST"])
-def represent() -> Tuple[Dict[str, Any], int]:
+def represent() -> Union[Response, Tuple[Dict[str, Any], int]]:
     input_args = (request.is_json and request.get_json()) or (
         request.form and request.form.to_dict()
     )
 
+    # embeddings are responded in json unless a binary format is accepted
+    available_mimetypes = serialization.find_available_mimetypes()
+    mimetype = (
+        request.accept_mimetypes.best_match(available_mimetypes)
+        if request.accept_mimetypes
+        else serialization.JSON_MIMETYPE
+    )
+    if mimetype is None:
+        return {
+            "exception": f"Response type is not acceptable. Options: {available_mimetypes}"
+        }, 406
+
     try:
         img = extract_image_from_request("img")
     except Exception as err:
@@ -84,7 +324,8 @@ def represent() -> Tuple[Dict[str, Any], int]:
 
     max_faces = input_args.get("max_faces")
 
-    obj, status_code = service.represent(
+    obj, status_code = run_inference(
+        service.represent,
         img_path=img,
         model_name=input_args.get("model_name", "VGG-Face"),
         detector_backend=input_args.get("detector_backend", "opencv"),
@@ -96,7 +337,12 @@ def represent() -> Tuple[Dict[str, Any], int]:
 
     logger.debug(obj)
 
-    return obj, status_code
+    if status_code != 200 or mimetype == serialization.JSON_MIMETYPE:
+        return obj, status_code
+
+    return Response(
+        serialization.serialize_embeddings(obj["results"], mimetype), mimetype=mimetype
+    )
 
 
 @blueprint.route("/verify", methods=["POST"])
@@ -115,7 +361,8 @@ def verify() -> Tuple[Dict[str, Any], int]:
     except Exception as err:
         return {"exception": str(err)}, 400
 
-    verification, status_code = service.verify(
+    verification, status_code = run_inference(
+        service.verify,
         img1_path=img1,
         img2_path=img2,
         model_name=input_args.get("model_name", "VGG-Face"),
@@ -142,22 +389,10 @@ def analyze() -> Tuple[Dict[str, Any], int]:
     except Exception as err:
         return {"exception": str(err)}, 400
 
-    actions = input_args.get("actions", ["age", "gender", "emotion", "race"])
-    # actions is the only argument instance of list or tuple
-    # if request is form data, input args can either be text or file
-    if isinstance(actions, str):
-        actions = (
-            actions.replace("[", "")
-            .replace("]", "")
-            .replace("(", "")
-            .replace(")", "")
-            .replace('"', "")
-            .replace("'", "")
-            .replace(" ", "")
-            .split(",")
-        )
+    actions = parse_actions(input_args.get("actions", ["age", "gender", "emotion", "race"]))
 
-    demographies, status_code = service.analyze(
+    demographies, status_code = run_inference(
+        service.analyze,
         img_path=img,
         actions=actions,
         detector_backend=input_args.get("detector_backend", "opencv"),
@@ -171,6 +406,70 @@ def analyze() -> Tuple[Dict[str, Any], int]:
     return demographies, status_code
 
 
+@blueprint.route("/represent/batch", methods=["POST"])
+def represent_batch() -> Union[Response, Tuple[Dict[str, Any], int]]:
+    try:
+        items, ids, input_args = extract_batch_from_request(["img"])
+    except Exception as err:
+        return {"exception": str(err)}, 400
+
+    max_faces = input_args.get("max_faces")
+
+    return stream_batch(
+        service.represent_batch,
+        "img_paths",
+        items,
+        ids,
+        model_name=input_args.get("model_name", "VGG-Face"),
+        detector_backend=input_args.get("detector_backend", "opencv"),
+        enforce_detection=parse_flag(input_args, "enforce_detection", True),
+        align=parse_flag(input_args, "align", True),
+        anti_spoofing=parse_flag(input_args, "anti_spoofing", False),
+        max_faces=int(max_faces) if max_faces is not None else None,
+    )
+
+
+@blueprint.route("/verify/batch", methods=["POST"])
+def verify_batch() -> Union[Response, Tuple[Dict[str, Any], int]]:
+    try:
+        items, ids, input_args = extract_batch_from_request(["img1", "img2"])
+    except Exception as err:
+        return {"exception": str(err)}, 400
+
+    return stream_batch(
+        service.verify_batch,
+        "pairs",
+        items,
+        ids,
+        model_name=input_args.get("model_name", "VGG-Face"),
+        detector_backend=input_args.get("detector_backend", "opencv"),
+        distance_metric=input_args.get("distance_metric", "cosine"),
+        align=parse_flag(input_args, "align", True),
+        enforce_detection=parse_flag(input_args, "enforce_detection", True),
+        anti_spoofing=parse_flag(input_args, "anti_spoofing", False),
+    )
+
+
+@blueprint.route("/analyze/batch", methods=["POST"])
+def analyze_batch() -> Union[Response, Tuple[Dict[str, Any], int]]:
+    try:
+        items, ids, input_args = extract_batch_from_request(["img"])
+    except Exception as err:
+        return {"exception": str(err)}, 400
+
+    return stream_batch(
+        service.analyze_batch,
+        "img_paths",
+        items,
+        ids,
+        actions=parse_actions(input_args.get("actions", ["age", "gender", "emotion", "race"])),
+        detector_backend=input_args.get("detector_backend", "opencv"),
+        enforce_detection=parse_flag(input_args, "enforce_detection", True),
+        align=parse_flag(input_args, "align", True),
+        anti_spoofing=parse_flag(input_args, "anti_spoofing", False),
+    )
+
+
 @blueprint.route("/register", methods=["POST"])
 def register() -> Tuple[Dict[str, Any], int]:
     # load injected variables
@@ -191,7 +490,8 @@ def register() -> Tuple[Dict[str, Any], int]:
     except Exception as err:
         return {"exception": str(err)}, 400
 
-    result, status_code = service.register(
+    result, status_code = run_inference(
+        service.register,
         img=img,
         img_name=input_args.get("img_name"),
         model_name=input_args.get("model_name", "VGG-Face"),
@@ -234,7 +534,8 @@ def search() -> Tuple[Dict[str, Any], int]:
     except Exception as err:
         return {"exception": str(err)}, 400
 
-    return service.search(
+    return run_inference(
+        service.search,
         img=img,
         model_name=input_args.get("model_name", "VGG-Face"),
         detector_backend=input_args.get("detector_backend", "opencv"),
@@ -268,7 +569,8 @@ def build_index() -> Tuple[Dict[str, Any], int]:
         request.form and request.form.to_dict()
     )
 
-    return service.build_index(
+    return run_inference(
+        service.build_index,
         model_name=input_args.get("model_name", "VGG-Face"),
         detector_backend=input_args.get("detector_backend", "opencv"),
         align=bool(input_args.get("align", True)),
@@ -0,0 +1,152 @@
+# built-in dependencies
+import io
+from functools import lru_cache
+from typing import Any, Dict, List
+
+# 3rd party dependencies
+import numpy as np
+from numpy.typing import NDArray
+
+# project dependencies
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+JSON_MIMETYPE = "application/json"
+NPY_MIMETYPES = ["application/x-npy", "application/octet-stream"]
+MSGPACK_MIMETYPES = ["application/msgpack", "application/x-msgpack"]
+ARROW_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+
+@lru_cache(maxsize=None)
+def find_available_mimetypes() -> List[str]:
+    """
+    Find response types of embeddings, formats of uninstalled optional dependencies
+        are not offered to clients
+    Returns:
+        mimetypes (list): json first as default, then binary formats
+    """
+    mimetypes = [JSON_MIMETYPE] + NPY_MIMETYPES
+    try:
+        import msgpack  # pylint: disable=import-outside-toplevel, unused-import
+
+        mimetypes += MSGPACK_MIMETYPES
+    except ModuleNotFoundError:
+        pass
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel, unused-import
+
+        mimetypes.append(ARROW_MIMETYPE)
+    except ModuleNotFoundError:
+        pass
+    return mimetypes
+
+
+def serialize_embeddings(embedding_objs: List[Dict[str, Any]], mimetype: str) -> bytes:
+    """
+    Serialize results of represent into a binary format with float32 embeddings
+    Args:
+        embedding_objs (list): results of represent with embedding, facial_area
+            and face_confidence of each face
+        mimetype (str): one of binary formats
+            - application/x-npy or application/octet-stream: a numpy structured array with
+                embedding, x, y, w, h, left_eye, right_eye and face_confidence fields,
+                eyes are (-1, -1) if not available. Read with np.load(allow_pickle=False).
+            - application/msgpack: results as in json, embeddings are little endian
+                float32 bytes. Read embeddings with np.frombuffer(embedding, "<f4").
+            - application/vnd.apache.arrow.stream: arrow ipc stream of a table with the same
+                columns of numpy format, eyes are null if not available.
+    Returns:
+        body (bytes): serialized results
+    """
+    embeddings = np.asarray(
+        [embedding_obj["embedding"] for embedding_obj in embedding_objs], dtype="<f4"
+    ).reshape(len(embedding_objs), -1)
+
+    if mimetype in NPY_MIMETYPES:
+        return __serialize_npy(embedding_objs, embeddings)
+    if mimetype in MSGPACK_MIMETYPES:
+        return __serialize_msgpack(embedding_objs, embeddings)
+    if mimetype == ARROW_MIMETYPE:
+        return __serialize_arrow(embedding_objs, embeddings)
+    raise ValueError(f"Unsupported response type: {mimetype}")
+
+
+def __serialize_npy(embedding_objs: List[Dict[str, Any]], embeddings: NDArray[Any]) -> bytes:
+    records = np.zeros(
+        len(embedding_objs),
+        dtype=[
+            ("embedding", "<f4", (embeddings.shape[1],)),
+            ("x", "<i4"),
+            ("y", "<i4"),
+            ("w", "<i4"),
+            ("h", "<i4"),
+            ("left_eye", "<i4", (2,)),
+            ("right_eye", "<i4", (2,)),
+            ("face_confidence", "<f4"),
+        ],
+    )
+    records["embedding"] = embeddings
+    for idx, embedding_obj in enumerate(embedding_objs):
+        facial_area = embedding_obj["facial_area"]
+        for key in ["x", "y", "w", "h"]:
+            records[key][idx] = facial_area.get(key) or 0
+        for key in ["left_eye", "right_eye"]:
+            records[key][idx] = facial_area.get(key) or (-1, -1)
+        records["face_confidence"][idx] = embedding_obj.get("face_confidence") or 0
+
+    buffer = io.BytesIO()
+    np.save(buffer, records, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def __serialize_msgpack(embedding_objs: List[Dict[str, Any]], embeddings: NDArray[Any]) -> bytes:
+    try:
+        import msgpack  # pylint: disable=import-outside-toplevel
+    except ModuleNotFoundError as e:
+        raise ImportError(
+            "msgpack is an optional dependency. Please install it as `pip install msgpack`"
+        ) from e
+
+    results = [
+        {**embedding_obj, "embedding": embedding.tobytes()}
+        for embedding_obj, embedding in zip(embedding_objs, embeddings)
+    ]
+    return msgpack.packb({"results": results, "dtype": "<f4"}, use_bin_type=True)
+
+
+def __serialize_arrow(embedding_objs: List[Dict[str, Any]], embeddings: NDArray[Any]) -> bytes:
+    try:
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+    except ModuleNotFoundError as e:
+        raise ImportError(
+            "pyarrow is an optional dependency. Please install it as `pip install pyarrow`"
+        ) from e
+
+    facial_areas = [embedding_obj["facial_area"] for embedding_obj in embedding_objs]
+    columns = {
+        "embedding": pa.FixedSizeListArray.from_arrays(
+            pa.array(embeddings.ravel(), type=pa.float32()), embeddings.shape[1]
+        ),
+        **{
+            key: pa.array([facial_area.get(key) for facial_area in facial_areas], pa.int32())
+            for key in ["x", "y", "w", "h"]
+        },
+        **{
+            key: pa.array(
+                [facial_area.get(key) for facial_area in facial_areas],
+                pa.list_(pa.int32(), 2),
+            )
+            for key in ["left_eye", "right_eye"]
+        },
+        "face_confidence": pa.array(
+            [embedding_obj.get("face_confidence") for embedding_obj in embedding_objs],
+            pa.float32(),
+        ),
+    }
+    table = pa.table(columns)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -1,12 +1,14 @@
 # built-in dependencies
+import time
 import traceback
-from typing import Optional, Union, Dict, Any, Tuple, List
+from typing import Optional, Union, Dict, Any, Tuple, List, Callable
 
 # 3rd party dependencies
 from numpy.typing import NDArray
 
 # project dependencies
 from deepface import DeepFace
+from deepface.modules import verification
 from deepface.commons.logger import Logger
 
 logger = Logger()
@@ -210,3 +212,141 @@ def build_index(
         logger.error(str(err))
         logger.error(tb_str)
         return {"error": f"Exception while building index: {str(err)} - {tb_str}"}, 400
+
+
+def represent_batch(
+    img_paths: List[Any],
+    model_name: str,
+    detector_backend: str,
+    enforce_detection: bool,
+    align: bool,
+    anti_spoofing: bool,
+    max_faces: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Represent many images with a single forward pass of the model
+    Returns:
+        results (list): response of each image, either its results or an error
+    """
+
+    def represent_images(images: List[Any]) -> List[Any]:
+        embedding_objs = DeepFace.represent(
+            img_path=images,
+            model_name=model_name,
+            detector_backend=detector_backend,
+            enforce_detection=enforce_detection,
+            align=align,
+            anti_spoofing=anti_spoofing,
+            max_faces=max_faces,
+        )
+        # a single image is not responded as a batch
+        return [embedding_objs] if len(images) == 1 else embedding_objs
+
+    return [
+        {"results": result}
+        if error is None
+        else {"error": f"Exception while representing: {error}"}
+        for result, error in __run_batch(img_paths, represent_images)
+    ]
+
+
+def verify_batch(
+    pairs: List[Tuple[Any, Any]],
+    model_name: str,
+    detector_backend: str,
+    distance_metric: str,
+    enforce_detection: bool,
+    align: bool,
+    anti_spoofing: bool,
+) -> List[Dict[str, Any]]:
+    """
+    Verify many image pairs, images of all pairs are represented with a single forward pass
+    Returns:
+        results (list): response of each pair, either its verification result or an error
+    """
+
+    def represent_images(images: List[Any]) -> List[Any]:
+        embedding_objs = DeepFace.represent(
+            img_path=images,
+            model_name=model_name,
+            detector_backend=detector_backend,
+            enforce_detection=enforce_detection,
+            align=align,
+            anti_spoofing=anti_spoofing,
+        )
+        return [embedding_objs] if len(images) == 1 else embedding_objs
+
+    tic = time.time()
+    represented = __run_batch([img for pair in pairs for img in pair], represent_images)
+
+    results = []
+    for idx in range(len(pairs)):
+        (img1_objs, img1_error), (img2_objs, img2_error) = represented[2 * idx : 2 * idx + 2]
+        if img1_error is not None or img2_error is not None:
+            results.append({"error": f"Exception while verifying: {img1_error or img2_error}"})
+            continue
+
+        results.extend(
+            verification.verify_faces(
+                probe_faces=img1_objs,
+                candidates_faces=[img2_objs],
+                model_name=model_name,
+                detector_backend=detector_backend,
+                distance_metric=distance_metric,
+                tic=tic,
+            )
+        )
+    return results
+
+
+def analyze_batch(
+    img_paths: List[Any],
+    actions: List[str],
+    detector_backend: str,
+    enforce_detection: bool,
+    align: bool,
+    anti_spoofing: bool,
+) -> List[Dict[str, Any]]:
+    """
+    Analyze many images with batched forward passes of demography models
+    Returns:
+        results (list): response of each image, either its results or an error
+    """
+
+    def analyze_images(images: List[Any]) -> List[Any]:
+        return DeepFace.analyze(
+            img_path=images,
+            actions=actions,
+            detector_backend=detector_backend,
+            enforce_detection=enforce_detection,
+            align=align,
+            silent=True,
+            anti_spoofing=anti_spoofing,
+        )
+
+    return [
+        {"results": result}
+        if error is None
+        else {"error": f"Exception while analyzing: {error}"}
+        for result, error in __run_batch(img_paths, analyze_images)
+    ]
+
+
+def __run_batch(
+    items: List[Any], func: Callable[[List[Any]], List[Any]]
+) -> List[Tuple[Any, Optional[str]]]:
+    """
+    Run a batched function on items. If the batch fails, e.g. no face is detected in one of
+        the images, halves of it are run separately so that failures affect their own items.
+    Returns:
+        results (list): result and error message of each item
+    """
+    try:
+        return [(result, None) for result in func(items)]
+    except Exception as err:
+        if len(items) == 1:
+            logger.error(str(err))
+            logger.debug(traceback.format_exc())
+            return [(None, str(err))]
+    middle = len(items) // 2
+    return __run_batch(items[0:middle], func) + __run_batch(items[middle:], func)
@@ -1,3 +1,5 @@
+from typing import Dict
+
 thresholds = {
     "VGG-Face": {"cosine": 0.68, "euclidean": 1.17, "euclidean_l2": 1.17, "angular": 0.39},
     "Facenet": {"cosine": 0.40, "euclidean": 10, "euclidean_l2": 0.80, "angular": 0.33},
@@ -11,3 +13,8 @@ thresholds = {
     "GhostFaceNet": {"cosine": 0.65, "euclidean": 35.71, "euclidean_l2": 1.10, "angular": 0.38},
     "Buffalo_L": {"cosine": 0.55, "euclidean": 0.6, "euclidean_l2": 1.1, "angular": 0.45},
 }
+
+# quantized variants drift slightly from their full precision models. Tune them with
+# benchmarks/quantization.py on your own calibration data and register the values here.
+# Variants missing in this table use the thresholds of their base model.
+quantized_thresholds: Dict[str, Dict[str, float]] = {}
@@ -0,0 +1,132 @@
+# stdlib dependencies
+import os
+from typing import List, Union, Any, Tuple
+
+# 3rd party dependencies
+import numpy as np
+from numpy.typing import NDArray
+
+# project dependencies
+from deepface.models.facial_recognition import VGGFace
+from deepface.commons import package_utils, weight_utils, folder_utils
+from deepface.models.Demography import Demography
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+# dependency configurations
+tf_version = package_utils.get_tf_major_version()
+
+if tf_version == 1:
+    from keras.models import Model
+    from keras.layers import Convolution2D, Flatten, Activation, Concatenate
+else:
+    from tensorflow.keras.models import Model
+    from tensorflow.keras.layers import Convolution2D, Flatten, Activation, Concatenate
+
+# distilled weights are produced offline with deepface.modules.distillation.distill
+WEIGHTS_FILE = "distilled_demography_weights.h5"
+
+# number of classes of each head in the order they are concatenated in the output
+AGE_CLASSES = 101
+GENDER_CLASSES = 2
+RACE_CLASSES = 6
+HEADS = {"age": AGE_CLASSES, "gender": GENDER_CLASSES, "race": RACE_CLASSES}
+
+
+# pylint: disable=too-few-public-methods
+class DistilledDemographyClient(Demography):
+    """
+    Distilled demography model class. A single VGG-Face trunk is shared by the age,
+        gender and race heads, so one forward pass replaces three separate models.
+    """
+
+    def __init__(self) -> None:
+        self.model = load_model()
+        self.model_name = "Distilled"
+
+    def predict(self, img: Union[NDArray[Any], List[NDArray[Any]]]) -> NDArray[Any]:
+        """
+        Predict age, gender and race probabilities for single or multiple faces
+        Args:
+            img: Single image as np.ndarray (224, 224, 3) or
+                List of images as List[np.ndarray] or
+                Batch of images as np.ndarray (n, 224, 224, 3)
+        Returns:
+            np.ndarray (109,) if single image, np.ndarray (n, 109) if batched images.
+            Age, gender and race probabilities are concatenated in this order.
+            Use split_predictions to retrieve each head.
+        """
+        # Preprocessing input image or image list.
+        imgs = self._preprocess_batch_or_single_input(img)
+
+        # Prediction from 3 channels image
+        predictions = self._predict_internal(imgs)
+
+        return predictions
+
+
+def split_predictions(
+    predictions: NDArray[Any],
+) -> Tuple[NDArray[Any], NDArray[Any], NDArray[Any]]:
+    """
+    Split concatenated outputs of the distilled model into its heads
+    Args:
+        predictions (np.ndarray): (109,) or (n, 109) shaped outputs of the distilled model
+    Returns:
+        age_predictions (np.ndarray): (n, 101) shaped age class probabilities
+        gender_predictions (np.ndarray): (n, 2) shaped gender probabilities
+        race_predictions (np.ndarray): (n, 6) shaped race probabilities
+    """
+    predictions = np.reshape(predictions, (-1, AGE_CLASSES + GENDER_CLASSES + RACE_CLASSES))
+    age_predictions = predictions[:, :AGE_CLASSES]
+    gender_predictions = predictions[:, AGE_CLASSES : AGE_CLASSES + GENDER_CLASSES]
+    race_predictions = predictions[:, AGE_CLASSES + GENDER_CLASSES :]
+    return age_predictions, gender_predictions, race_predictions
+
+
+def build_model() -> Model:
+    """
+    Construct the shared trunk model with age, gender and race heads
+    Returns:
+        model (Model)
+    """
+    model = VGGFace.base_model()
+    trunk_output = model.layers[-4].output
+
+    outputs = []
+    for head, classes in HEADS.items():
+        head_output = Convolution2D(classes, (1, 1), name=f"{head}_predictions")(trunk_output)
+        head_output = Flatten(name=f"{head}_flatten")(head_output)
+        head_output = Activation("softmax", name=f"{head}_softmax")(head_output)
+        outputs.append(head_output)
+
+    return Model(inputs=model.inputs, outputs=Concatenate(axis=-1)(outputs))
+
+
+def get_weights_path() -> str:
+    """
+    Find the exact path of distilled model weights in the weights folder
+    Returns:
+        target_file (str): exact path of the weights
+    """
+    home = folder_utils.get_deepface_home()
+    return os.path.normpath(os.path.join(home, ".deepface/weights", WEIGHTS_FILE))
+
+
+def load_model() -> Model:
+    """
+    Construct distilled demography model and load its weights
+    Returns:
+        model (Model)
+    """
+    weight_file = get_weights_path()
+
+    if not os.path.isfile(weight_file):
+        raise ValueError(
+            f"Distilled demography weights are not available at {weight_file}. "
+            "Train them first from the original age, gender and race models with "
+            "deepface.modules.distillation.distill(img_path=<folder of facial images>)"
+        )
+
+    return weight_utils.load_model_weights(model=build_model(), weight_file=weight_file)
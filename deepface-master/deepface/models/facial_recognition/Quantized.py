@@ -0,0 +1,178 @@
+# built-in dependencies
+import os
+import threading
+from typing import Any, List, Optional, Tuple, Union, cast
+
+# 3rd party dependencies
+import numpy as np
+from numpy.typing import NDArray
+import tensorflow as tf
+
+# project dependencies
+from deepface.commons import folder_utils
+from deepface.models.FacialRecognition import FacialRecognition
+from deepface.modules.exceptions import InvalidEmbeddingsShapeError
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+# post-training quantization precisions supported for keras based recognition models
+QUANTIZED_PRECISIONS = ["float16", "int8"]
+
+# keras based models that can be converted into tflite
+QUANTIZABLE_MODELS = ["VGG-Face", "Facenet", "Facenet512", "ArcFace", "GhostFaceNet"]
+
+# models whose original client l2 normalizes the raw output in its forward method
+L2_NORMALIZED_MODELS = ["VGG-Face"]
+
+
+def parse_model_name(model_name: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a model name into its base model and quantization precision
+    Args:
+        model_name (str): model name such as VGG-Face or VGG-Face-int8
+    Returns:
+        base_model_name (str): model name without precision suffix e.g. VGG-Face
+        precision (str): float16, int8 or None if it is not a quantized variant
+    """
+    for precision in QUANTIZED_PRECISIONS:
+        suffix = f"-{precision}"
+        if model_name.endswith(suffix) and model_name[: -len(suffix)] in QUANTIZABLE_MODELS:
+            return model_name[: -len(suffix)], precision
+    return model_name, None
+
+
+def get_quantized_model_path(model_name: str, precision: str) -> str:
+    """
+    Find the exact path of a quantized tflite model in the weights folder
+    Args:
+        model_name (str): base model name e.g. VGG-Face
+        precision (str): float16 or int8
+    Returns:
+        target_file (str): exact path of the tflite file
+    """
+    home = folder_utils.get_deepface_home()
+    file_name = f"{model_name.lower().replace('-', '_')}_{precision}.tflite"
+    return os.path.normpath(os.path.join(home, ".deepface/weights", file_name))
+
+
+# pylint: disable=too-few-public-methods
+class QuantizedClient(FacialRecognition):
+    """
+    Post-training quantized facial recognition model served with the tflite interpreter
+    """
+
+    base_model_name: str
+    precision: str
+
+    def __init__(self) -> None:
+        model_path = get_quantized_model_path(self.base_model_name, self.precision)
+        if not os.path.isfile(model_path):
+            raise ValueError(
+                f"Quantized model {self.base_model_name}-{self.precision} is not available "
+                f"at {model_path}. Create it first with DeepFace.quantize(model_name="
+                f"'{self.base_model_name}', precision='{self.precision}')"
+            )
+
+        self.model = tf.lite.Interpreter(
+            model_path=model_path, num_threads=os.cpu_count() or 1
+        )
+        self.model_name = f"{self.base_model_name}-{self.precision}"
+
+        input_details = self.model.get_input_details()[0]
+        output_details = self.model.get_output_details()[0]
+        # tflite shapes are (batch, height, width, channels)
+        self.input_shape = (int(input_details["shape"][2]), int(input_details["shape"][1]))
+        self.output_shape = int(output_details["shape"][-1])
+
+        self._input_index = input_details["index"]
+        self._output_index = output_details["index"]
+        self._batch_size = int(input_details["shape"][0])
+        # tflite interpreters are not thread safe
+        self._lock = threading.Lock()
+
+        self.model.allocate_tensors()
+
+    def forward(self, img: NDArray[Any]) -> Union[List[float], List[List[float]]]:
+        """
+        Generates embeddings with the quantized model
+        Args:
+            img (np.ndarray): pre-processed image(s) in (X, X, 3) or (N, X, X, 3) shape
+        Returns
+            embeddings (list): multi-dimensional vector or list of vectors for batch input
+        """
+        if img.ndim == 3:
+            img = np.expand_dims(img, axis=0)
+
+        if img.ndim != 4:
+            raise InvalidEmbeddingsShapeError(
+                f"Input image must be (N, X, X, 3) shaped but it is {img.shape}"
+            )
+
+        with self._lock:
+            if img.shape[0] != self._batch_size:
+                self.model.resize_tensor_input(self._input_index, list(img.shape))
+                self.model.allocate_tensors()
+                self._batch_size = img.shape[0]
+
+            self.model.set_tensor(self._input_index, img.astype(np.float32))
+            self.model.invoke()
+            embeddings = self.model.get_tensor(self._output_index).copy()
+
+        if self.base_model_name in L2_NORMALIZED_MODELS:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / (norms + 1e-10)
+
+        if embeddings.shape[0] == 1:
+            return cast(List[float], embeddings[0].tolist())
+        return cast(List[List[float]], embeddings.tolist())
+
+
+class VggFaceFloat16Client(QuantizedClient):
+    base_model_name = "VGG-Face"
+    precision = "float16"
+
+
+class VggFaceInt8Client(QuantizedClient):
+    base_model_name = "VGG-Face"
+    precision = "int8"
+
+
+class FaceNet128dFloat16Client(QuantizedClient):
+    base_model_name = "Facenet"
+    precision = "float16"
+
+
+class FaceNet128dInt8Client(QuantizedClient):
+    base_model_name = "Facenet"
+    precision = "int8"
+
+
+class FaceNet512dFloat16Client(QuantizedClient):
+    base_model_name = "Facenet512"
+    precision = "float16"
+
+
+class FaceNet512dInt8Client(QuantizedClient):
+    base_model_name = "Facenet512"
+    precision = "int8"
+
+
+class ArcFaceFloat16Client(QuantizedClient):
+    base_model_name = "ArcFace"
+    precision = "float16"
+
+
+class ArcFaceInt8Client(QuantizedClient):
+    base_model_name = "ArcFace"
+    precision = "int8"
+
+
+class GhostFaceNetFloat16Client(QuantizedClient):
+    base_model_name = "GhostFaceNet"
+    precision = "float16"
+
+
+class GhostFaceNetInt8Client(QuantizedClient):
+    base_model_name = "GhostFaceNet"
+    precision = "int8"
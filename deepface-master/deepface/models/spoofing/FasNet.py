@@ -1,5 +1,6 @@
 # built-in dependencies
-from typing import Union, Any, Tuple, List
+import os
+from typing import Union, Any, Tuple, List, Sequence
 
 # 3rd party dependencies
 import cv2
@@ -37,6 +38,8 @@ class Fasnet:
         device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
         self.device = device
 
+        configure_torch_threads()
+
         # download pre-trained models if not installed yet
         first_model_weight_file = weight_utils.download_weights_if_necessary(
             file_name="2.7_80x80_MiniFASNetV2.pth",
@@ -109,83 +112,72 @@ class Fasnet:
         Returns:
             result (tuple): a result tuple consisting of is_real and score
         """
+        return self.analyze_batch(img=img, facial_areas=[facial_area])[0]
+
+    def analyze_batch(
+        self,
+        img: NDArray[Any],
+        facial_areas: Sequence[Union[List[Union[int, float]], Tuple[Union[int, float], ...]]],
+    ) -> List[Tuple[bool, float]]:
+        """
+        Analyze many faces in a given image spoofed or not. Faces are stacked into a single
+            batch, so each model runs once regardless of the number of faces.
+        Args:
+            img (np.ndarray): pre loaded image
+            facial_areas (list): facial rectangle area coordinates with x, y, w, h respectively
+        Returns:
+            results (list): result tuples consisting of is_real and score for each facial area
+        """
         import torch
         import torch.nn.functional as F
 
-        x, y, w, h = facial_area
-        first_img = crop(img, (x, y, w, h), 2.7, 80, 80)
-        second_img = crop(img, (x, y, w, h), 4, 80, 80)
+        if len(facial_areas) == 0:
+            return []
 
-        test_transform = Compose(
-            [
-                ToTensor(),
-            ]
-        )
-
-        first_img = test_transform(first_img)
-        first_img = first_img.unsqueeze(0).to(self.device)
+        # (n, 80, 80, 3) to (n, 3, 80, 80) float tensors
+        first_imgs = np.stack([crop(img, facial_area, 2.7, 80, 80) for facial_area in facial_areas])
+        second_imgs = np.stack([crop(img, facial_area, 4, 80, 80) for facial_area in facial_areas])
 
-        second_img = test_transform(second_img)
-        second_img = second_img.unsqueeze(0).to(self.device)
+        first_batch = torch.from_numpy(first_imgs.transpose((0, 3, 1, 2))).float().to(self.device)
+        second_batch = torch.from_numpy(second_imgs.transpose((0, 3, 1, 2))).float().to(self.device)
 
         with torch.no_grad():
-            first_result = self.first_model.forward(first_img)
-            first_result = F.softmax(first_result).cpu().numpy()
-
-            second_result = self.second_model.forward(second_img)
-            second_result = F.softmax(second_result).cpu().numpy()
+            first_result = F.softmax(self.first_model.forward(first_batch), dim=1).cpu().numpy()
+            second_result = F.softmax(self.second_model.forward(second_batch), dim=1).cpu().numpy()
 
-        prediction = np.zeros((1, 3))
-        prediction += first_result
-        prediction += second_result
+        predictions = first_result + second_result
 
-        label = np.argmax(prediction)
-        is_real = True if label == 1 else False  # pylint: disable=simplifiable-if-expression
-        score = prediction[0][label] / 2
+        results = []
+        for prediction in predictions:
+            label = np.argmax(prediction)
+            is_real = True if label == 1 else False  # pylint: disable=simplifiable-if-expression
+            score = prediction[label] / 2
+            results.append((is_real, score))
 
-        return is_real, score
+        return results
 
 
-# subsdiary classes and functions
-
-
-def to_tensor(pic: NDArray[Any]) -> Any:
-    """Convert a ``numpy.ndarray`` to tensor.
-
-    See ``ToTensor`` for more details.
-
-    Args:
-        pic (PIL Image or numpy.ndarray): Image to be converted to tensor.
-
-    Returns:
-        Tensor: Converted image.
+def configure_torch_threads() -> None:
+    """
+    Set torch intra-op and inter-op thread pools from DEEPFACE_TORCH_THREADS and
+        DEEPFACE_TORCH_INTEROP_THREADS environment variables if they are set.
     """
     import torch
 
-    # handle numpy array
-    # IR image channel=1: modify by lzc --> 20190730
-    if pic.ndim == 2:
-        pic = pic.reshape((pic.shape[0], pic.shape[1], 1))
-
-    img = torch.from_numpy(pic.transpose((2, 0, 1)))
-    # backward compatibility
-    # return img.float().div(255)  modify by zkx
-    return img.float()
-
+    num_threads = os.getenv("DEEPFACE_TORCH_THREADS")
+    if num_threads is not None:
+        torch.set_num_threads(int(num_threads))
 
-class Compose:
-    def __init__(self, transforms: List[Any]) -> None:
-        self.transforms = transforms
-
-    def __call__(self, img: NDArray[Any]) -> NDArray[Any]:
-        for t in self.transforms:
-            img = t(img)
-        return img
+    num_interop_threads = os.getenv("DEEPFACE_TORCH_INTEROP_THREADS")
+    if num_interop_threads is not None:
+        try:
+            torch.set_num_interop_threads(int(num_interop_threads))
+        except RuntimeError as err:
+            # it can be set once and before any inter-op parallel work started
+            logger.warn(f"torch inter-op threads could not be set: {err}")
 
 
-class ToTensor:
-    def __call__(self, pic: Any) -> Any:
-        return to_tensor(pic)
+# subsdiary classes and functions
 
 
 def _get_new_box(
@@ -0,0 +1,245 @@
+# built-in dependencies
+import io
+import os
+from typing import Any, Optional
+
+# 3rd party dependencies
+import numpy as np
+from numpy.typing import NDArray
+
+# project dependencies
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+COMPRESSIONS = ["float16", "int8", "pq"]
+
+# dimensions of each sub vector encoded into a byte by product quantization
+PQ_SUBVECTOR_SIZE = int(os.getenv("DEEPFACE_PQ_SUBVECTOR_SIZE", "4"))
+PQ_NUM_CENTROIDS = 256
+PQ_TRAINING_SAMPLES = int(os.getenv("DEEPFACE_PQ_TRAINING_SAMPLES", "8192"))
+PQ_TRAINING_ITERATIONS = 10
+
+# nearest candidates of approximate distances that are re-ranked with full embeddings
+RERANK_CANDIDATES = int(os.getenv("DEEPFACE_RERANK_CANDIDATES", "100"))
+
+# memory budget of distance matrices while training product quantization codebooks
+_KMEANS_MAX_ELEMENTS = 32 * 1024 * 1024
+
+
+def validate_compression(compression: str) -> None:
+    """
+    Ensure the compression is supported
+    Args:
+        compression (str): float16, int8 or pq
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Unsupported embedding compression: {compression}. Options: {COMPRESSIONS}"
+        )
+
+
+def train_codebook(vectors: NDArray[Any]) -> NDArray[Any]:
+    """
+    Train a product quantization codebook with k-means on each sub space
+    Args:
+        vectors (np.ndarray): (n, dimension) shaped training embeddings
+    Returns:
+        codebook (np.ndarray): (num_subvectors, num_centroids, subvector_size) shaped centroids
+    """
+    vectors = __split(np.asarray(vectors, dtype=np.float32))  # (M, n, s)
+    num_subvectors, num_samples, _ = vectors.shape
+
+    rng = np.random.default_rng(0)
+    if num_samples > PQ_TRAINING_SAMPLES:
+        vectors = vectors[:, rng.choice(num_samples, PQ_TRAINING_SAMPLES, replace=False)]
+        num_samples = PQ_TRAINING_SAMPLES
+
+    num_centroids = min(PQ_NUM_CENTROIDS, num_samples)
+    if num_centroids < PQ_NUM_CENTROIDS:
+        logger.warn(
+            f"Product quantization codebook is trained on {num_samples} embeddings only, "
+            f"so it has {num_centroids} centroids instead of {PQ_NUM_CENTROIDS}. "
+            "Register a larger batch first for a more accurate codebook."
+        )
+
+    centroids = vectors[:, rng.choice(num_samples, num_centroids, replace=False)].copy()
+    group_size = max(1, _KMEANS_MAX_ELEMENTS // (num_samples * num_centroids))
+
+    for _ in range(PQ_TRAINING_ITERATIONS):
+        for start in range(0, num_subvectors, group_size):
+            group = slice(start, start + group_size)
+            group_vectors = vectors[group]
+            num_groups = group_vectors.shape[0]
+
+            # centroids of all sub spaces in the group are updated with a single bincount
+            assignments = __nearest_centroids(group_vectors, centroids[group]).astype(np.int64)
+            flat = (assignments + np.arange(num_groups)[:, None] * num_centroids).ravel()
+            counts = np.bincount(flat, minlength=num_groups * num_centroids)
+            sums = np.stack(
+                [
+                    np.bincount(
+                        flat,
+                        weights=group_vectors[:, :, i].ravel(),
+                        minlength=num_groups * num_centroids,
+                    )
+                    for i in range(PQ_SUBVECTOR_SIZE)
+                ],
+                axis=1,
+            )
+
+            # empty clusters keep their previous centroid
+            filled = counts > 0
+            group_centroids = centroids[group].reshape(-1, PQ_SUBVECTOR_SIZE)
+            group_centroids[filled] = sums[filled] / counts[filled, None]
+            centroids[group] = group_centroids.reshape(num_groups, num_centroids, -1)
+
+    return centroids
+
+
+def serialize_codebook(codebook: NDArray[Any]) -> bytes:
+    """
+    Serialize a product quantization codebook to store it in the database
+    """
+    buffer = io.BytesIO()
+    np.save(buffer, np.asarray(codebook, dtype=np.float32), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def deserialize_codebook(codebook_bytes: bytes) -> NDArray[Any]:
+    """
+    Deserialize a product quantization codebook stored in the database
+    """
+    return np.load(io.BytesIO(codebook_bytes), allow_pickle=False)
+
+
+def encode(
+    vectors: NDArray[Any], compression: str, codebook: Optional[NDArray[Any]] = None
+) -> NDArray[Any]:
+    """
+    Encode embeddings into compressed codes
+    Args:
+        vectors (np.ndarray): (n, dimension) shaped embeddings
+        compression (str): float16 (2 bytes per dimension), int8 (1 byte per dimension and
+            a float32 scale per vector) or pq (1 byte per sub vector)
+        codebook (np.ndarray): product quantization codebook, required for pq
+    Returns:
+        codes (np.ndarray): (n, code_size) shaped uint8 codes
+    """
+    validate_compression(compression)
+    vectors = np.asarray(vectors, dtype=np.float32)
+
+    if compression == "float16":
+        return vectors.astype("<f2").view(np.uint8)
+
+    if compression == "int8":
+        scales = np.abs(vectors).max(axis=1, keepdims=True) / 127
+        scales[scales == 0] = 1
+        quantized = np.clip(np.rint(vectors / scales), -127, 127).astype(np.int8)
+        return np.concatenate(
+            [scales.astype("<f4").view(np.uint8), quantized.view(np.uint8)], axis=1
+        )
+
+    if codebook is None:
+        raise ValueError("Product quantization requires a codebook.")
+    splitted = __split(vectors)
+    codes = np.empty((splitted.shape[1], splitted.shape[0]), dtype=np.uint8)
+    group_size = max(1, _KMEANS_MAX_ELEMENTS // max(1, splitted.shape[1] * codebook.shape[1]))
+    for start in range(0, splitted.shape[0], group_size):
+        group = slice(start, start + group_size)
+        codes[:, group] = __nearest_centroids(splitted[group], codebook[group]).T
+    return codes
+
+
+def find_approximate_distances(
+    query_vectors: NDArray[Any],
+    codes: NDArray[Any],
+    compression: str,
+    distance_metric: str,
+    codebook: Optional[NDArray[Any]] = None,
+) -> NDArray[Any]:
+    """
+    Find distances between query faces and compressed embeddings without decoding them.
+        Dot products and norms are computed on codes directly: scaled int8 products for
+        int8 and lookup tables of the query against the centroids for pq.
+    Args:
+        query_vectors (np.ndarray): (m, dimension) shaped embeddings of the query faces
+        codes (np.ndarray): (n, code_size) shaped uint8 codes
+        compression (str): float16, int8 or pq
+        distance_metric (str): cosine, euclidean, euclidean_l2 or angular
+        codebook (np.ndarray): product quantization codebook, required for pq
+    Returns:
+        distances (np.ndarray): (m, n) shaped approximate distances
+    """
+    query_vectors = np.asarray(query_vectors, dtype=np.float32)
+    codes = np.ascontiguousarray(codes, dtype=np.uint8)
+
+    if compression == "float16":
+        halves = codes.view("<f2")
+        dot_products = query_vectors @ halves.T
+        square_norms = np.einsum("nd,nd->n", halves, halves, dtype=np.float32)
+    elif compression == "int8":
+        scales = codes[:, 0:4].copy().view("<f4")[:, 0]
+        quantized = codes[:, 4:].view(np.int8).astype(np.float32)
+        dot_products = (query_vectors @ quantized.T) * scales
+        square_norms = np.einsum("nd,nd->n", quantized, quantized) * scales**2
+    elif compression == "pq":
+        if codebook is None:
+            raise ValueError("Product quantization requires a codebook.")
+        # (m, M, k) shaped dot products of each query sub vector with each centroid
+        tables = np.einsum("qms,mks->qmk", __split(query_vectors).transpose(1, 0, 2), codebook)
+        # positions of codes in flattened (M, k) tables are shared by all queries
+        flat_codes = codes + (np.arange(codes.shape[1]) * codebook.shape[1]).astype(np.int64)
+        dot_products = np.stack(
+            [np.take(table.ravel(), flat_codes).sum(axis=1) for table in tables]
+        )
+        centroid_norms = np.einsum("mks,mks->mk", codebook, codebook)
+        square_norms = np.take(centroid_norms.ravel(), flat_codes).sum(axis=1)
+    else:
+        validate_compression(compression)
+
+    query_square_norms = np.einsum("qd,qd->q", query_vectors, query_vectors)[:, None]
+    if distance_metric == "euclidean":
+        return np.sqrt(np.maximum(query_square_norms + square_norms - 2 * dot_products, 0))
+
+    similarities = dot_products / (np.sqrt(query_square_norms * square_norms) + 1e-10)
+    if distance_metric == "cosine":
+        return 1 - similarities
+    if distance_metric == "euclidean_l2":
+        return np.sqrt(np.maximum(2 - 2 * similarities, 0))
+    if distance_metric == "angular":
+        return np.arccos(np.clip(similarities, -1, 1)) / np.pi
+    raise ValueError(f"Unsupported distance metric: {distance_metric}")
+
+
+def __split(vectors: NDArray[Any]) -> NDArray[Any]:
+    """
+    Split (n, dimension) shaped vectors into (num_subvectors, n, subvector_size) shaped
+        sub vectors, zero padded if the dimension is not a multiple of the sub vector size
+    """
+    num_vectors, dimension = vectors.shape
+    padding = -dimension % PQ_SUBVECTOR_SIZE
+    if padding:
+        vectors = np.pad(vectors, ((0, 0), (0, padding)))
+    return vectors.reshape(num_vectors, -1, PQ_SUBVECTOR_SIZE).transpose(1, 0, 2)
+
+
+def __nearest_centroids(vectors: NDArray[Any], centroids: NDArray[Any]) -> NDArray[Any]:
+    """
+    Find the nearest centroid of each sub vector
+    Args:
+        vectors (np.ndarray): (g, n, s) shaped sub vectors
+        centroids (np.ndarray): (g, k, s) shaped centroids
+    Returns:
+        assignments (np.ndarray): (g, n) shaped centroid indexes
+    """
+    # nearest centroid minimizes |c|^2 - 2 x.c since |x|^2 is the same for all centroids,
+    # so it is the maximum of [x, 1].[c, -|c|^2 / 2] found with a single matmul
+    augmented_vectors = np.concatenate(
+        [vectors, np.ones(vectors.shape[:2] + (1,), dtype=np.float32)], axis=2
+    )
+    augmented_centroids = np.concatenate(
+        [centroids, -0.5 * np.einsum("gks,gks->gk", centroids, centroids)[:, :, None]], axis=2
+    )
+    scores = np.matmul(augmented_vectors, augmented_centroids.transpose(0, 2, 1))
+    return scores.argmax(axis=2).astype(np.uint8)
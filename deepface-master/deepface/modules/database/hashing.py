@@ -0,0 +1,70 @@
+# built-in dependencies
+import json
+import hashlib
+from typing import Any, List, Sequence, Set, Tuple, Union
+
+# 3rd party dependencies
+import numpy as np
+from numpy.typing import NDArray
+
+
+def find_face_hash(face: NDArray[Any]) -> str:
+    """
+    Find the hash of a face on its raw bytes, without any text serialization
+    Args:
+        face (np.ndarray): extracted face
+    Returns:
+        face_hash (str): sha256 of the face's pixels
+    """
+    return hashlib.sha256(np.ascontiguousarray(face).tobytes()).hexdigest()
+
+
+def find_legacy_face_hash(face: NDArray[Any]) -> str:
+    """
+    Find the hash of a face on its json serialization, as faces were hashed before
+    Args:
+        face (np.ndarray): extracted face
+    Returns:
+        face_hash (str): sha256 of the face's pixels as a json list
+    """
+    return hashlib.sha256(json.dumps(np.asarray(face).tolist()).encode()).hexdigest()
+
+
+def find_legacy_duplicates(
+    faces: Sequence[NDArray[Any]],
+    embedding_hashes: Sequence[str],
+    stored_hashes: Set[Tuple[str, str]],
+) -> List[int]:
+    """
+    Find faces stored before with json based face hashes. Their raw hashes differ from the
+        stored ones, so unique constraints of face and embedding hashes do not catch them.
+    Args:
+        faces (list): extracted faces to insert
+        embedding_hashes (list): embedding hash of each face
+        stored_hashes (set): stored face and embedding hash pairs of the embedding hashes
+    Returns:
+        positions (list): positions of faces that are already stored
+    """
+    stored_embedding_hashes = {embedding_hash for _, embedding_hash in stored_hashes}
+    duplicates = []
+    for idx, (face, embedding_hash) in enumerate(zip(faces, embedding_hashes)):
+        # json serialization is slow, so it is only paid for embeddings already stored
+        # whose raw face hash does not match
+        if (
+            embedding_hash in stored_embedding_hashes
+            and (find_face_hash(face), embedding_hash) not in stored_hashes
+            and (find_legacy_face_hash(face), embedding_hash) in stored_hashes
+        ):
+            duplicates.append(idx)
+    return duplicates
+
+
+def find_embedding_hash(embedding: Union[List[float], NDArray[Any]]) -> str:
+    """
+    Find the hash of an embedding on its raw float64 bytes
+    Args:
+        embedding (list or np.ndarray): multi-dimensional vector
+    Returns:
+        embedding_hash (str): sha256 of the embedding, same as hashing packed doubles
+    """
+    return hashlib.sha256(np.asarray(embedding, dtype="<f8").tobytes()).hexdigest()
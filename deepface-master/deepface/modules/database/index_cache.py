@@ -0,0 +1,196 @@
+# built-in dependencies
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, ContextManager, Optional, Tuple
+
+# 3rd party dependencies
+import numpy as np
+
+# project dependencies
+from deepface.modules.database.types import Database
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+# number of deserialized indexes kept in memory, least recently used ones are dropped
+INDEX_CACHE_SIZE = int(os.getenv("DEEPFACE_INDEX_CACHE_SIZE", "8"))
+
+# seconds a cached index is served without asking the database for its version
+INDEX_CACHE_CHECK_INTERVAL = float(os.getenv("DEEPFACE_INDEX_CACHE_CHECK_INTERVAL", "1"))
+
+IndexKey = Tuple[Any, ...]
+
+
+# pylint: disable=too-few-public-methods
+class CachedIndex:
+    """
+    Deserialized index with the version it was loaded from
+    """
+
+    def __init__(self, index: Any, version: str) -> None:
+        self.index = index
+        self.version = version
+        self.checked_at = time.monotonic()
+        self.refreshing = False
+
+
+_CACHE: "OrderedDict[IndexKey, CachedIndex]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+# pylint: disable=too-many-positional-arguments
+def get_index(
+    key: IndexKey,
+    db_client: Database,
+    model_name: str,
+    detector_backend: str,
+    aligned: bool,
+    l2_normalized: bool,
+    background_client: Optional[Callable[[], ContextManager[Database]]] = None,
+) -> Any:
+    """
+    Find the deserialized embeddings index of a model configuration. Cached indexes are
+        served as long as their version in the database is unchanged. When a new version
+        is published, the cached one keeps serving while the new one is loaded in the
+        background if background_client is provided.
+    Args:
+        key (tuple): identity of the database and model configuration
+        db_client (Database): client of the current request
+        model_name (str): Model for face recognition.
+        detector_backend (string): face detector backend.
+        aligned (bool): Flag to enable face alignment.
+        l2_normalized (bool): Flag to enable L2 normalization (unit vector normalization)
+        background_client (callable): opens another client to load new versions in background
+    Returns:
+        embeddings_index (Any): deserialized faiss index
+    """
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is not None:
+            _CACHE.move_to_end(key)
+            if time.monotonic() - entry.checked_at < INDEX_CACHE_CHECK_INTERVAL:
+                return entry.index
+
+    version = db_client.get_embeddings_index_version(
+        model_name=model_name,
+        detector_backend=detector_backend,
+        aligned=aligned,
+        l2_normalized=l2_normalized,
+    )
+
+    if entry is not None and version is not None:
+        if version == entry.version:
+            entry.checked_at = time.monotonic()
+            return entry.index
+
+        if background_client is not None:
+            with _CACHE_LOCK:
+                entry.checked_at = time.monotonic()
+                start_refresh = not entry.refreshing
+                entry.refreshing = True
+            if start_refresh:
+                threading.Thread(
+                    target=__refresh,
+                    args=(key, entry, background_client, model_name, detector_backend),
+                    kwargs={"aligned": aligned, "l2_normalized": l2_normalized},
+                    daemon=True,
+                ).start()
+            return entry.index
+
+    index = load_index(
+        db_client=db_client,
+        model_name=model_name,
+        detector_backend=detector_backend,
+        aligned=aligned,
+        l2_normalized=l2_normalized,
+    )
+    if version is not None:
+        put_index(key, index, version)
+    return index
+
+
+def put_index(key: IndexKey, index: Any, version: str) -> None:
+    """
+    Store a deserialized index in the cache, e.g. right after it is built
+    Args:
+        key (tuple): identity of the database and model configuration
+        index (Any): deserialized faiss index
+        version (str): version of the index in the database
+    """
+    with _CACHE_LOCK:
+        _CACHE[key] = CachedIndex(index=index, version=version)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > INDEX_CACHE_SIZE:
+            _CACHE.popitem(last=False)
+
+
+def clear() -> None:
+    """Drop all cached indexes."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+def load_index(
+    db_client: Database,
+    model_name: str,
+    detector_backend: str,
+    aligned: bool,
+    l2_normalized: bool,
+) -> Any:
+    """
+    Retrieve the embeddings index from the database and deserialize it
+    Returns:
+        embeddings_index (Any): deserialized faiss index
+    """
+    import faiss
+
+    tic = time.time()
+    embeddings_index_bytes = db_client.get_embeddings_index(
+        model_name=model_name,
+        detector_backend=detector_backend,
+        aligned=aligned,
+        l2_normalized=l2_normalized,
+    )
+    embeddings_index = faiss.deserialize_index(
+        np.frombuffer(embeddings_index_bytes, dtype=np.uint8)
+    )
+    logger.info(f"Loaded embeddings index from database in {time.time() - tic:.2f} seconds.")
+    return embeddings_index
+
+
+def __refresh(
+    key: IndexKey,
+    entry: CachedIndex,
+    background_client: Callable[[], ContextManager[Database]],
+    model_name: str,
+    detector_backend: str,
+    aligned: bool,
+    l2_normalized: bool,
+) -> None:
+    """
+    Load the new version of an index while the cached one keeps serving
+    """
+    try:
+        with background_client() as db_client:
+            # version is read first, so a newer index is never labeled with an older version
+            version = db_client.get_embeddings_index_version(
+                model_name=model_name,
+                detector_backend=detector_backend,
+                aligned=aligned,
+                l2_normalized=l2_normalized,
+            )
+            index = load_index(
+                db_client=db_client,
+                model_name=model_name,
+                detector_backend=detector_backend,
+                aligned=aligned,
+                l2_normalized=l2_normalized,
+            )
+        if version is not None:
+            put_index(key, index, version)
+    except Exception as err:  # pylint: disable=broad-except
+        logger.warn(f"Refreshing embeddings index in background failed: {err}")
+    finally:
+        entry.refreshing = False
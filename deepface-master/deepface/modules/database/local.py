@@ -0,0 +1,771 @@
+# built-in dependencies
+import os
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# 3rd party dependencies
+import numpy as np
+from numpy.typing import NDArray
+
+# project dependencies
+from deepface.commons import folder_utils
+from deepface.modules.database.types import Database
+from deepface.modules.database.hashing import find_face_hash, find_embedding_hash
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+_SCHEMA_CHECKED: Dict[str, bool] = {}
+
+# number of vectors stored in a segment file before a new one is started
+SEGMENT_SIZE = int(os.getenv("DEEPFACE_LOCAL_SEGMENT_SIZE", "100000"))
+
+METADATA_FILE = "metadata.sqlite"
+
+CREATE_COLLECTIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS collections (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        model_name TEXT NOT NULL,
+        detector_backend TEXT NOT NULL,
+        aligned INTEGER NOT NULL,
+        l2_normalized INTEGER NOT NULL,
+        dimension INTEGER NOT NULL,
+        segment INTEGER NOT NULL DEFAULT 0,
+        next_row INTEGER NOT NULL DEFAULT 0,
+        UNIQUE (model_name, detector_backend, aligned, l2_normalized)
+    );
+"""
+
+CREATE_EMBEDDINGS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS embeddings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        collection_id INTEGER NOT NULL REFERENCES collections (id),
+        img_name TEXT NOT NULL,
+        face BLOB NOT NULL,
+        face_shape TEXT NOT NULL,
+        segment INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        face_hash TEXT NOT NULL,
+        embedding_hash TEXT NOT NULL,
+        embedding_code BLOB,
+        embedding_compression TEXT,
+        UNIQUE (face_hash, embedding_hash)
+    );
+"""
+
+# product quantization codebooks are kept per model configuration
+CREATE_CODEBOOKS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS codebooks (
+        model_name TEXT NOT NULL,
+        detector_backend TEXT NOT NULL,
+        aligned INTEGER NOT NULL,
+        l2_normalized INTEGER NOT NULL,
+        codebook BLOB NOT NULL,
+        PRIMARY KEY (model_name, detector_backend, aligned, l2_normalized)
+    );
+"""
+
+CREATE_EMBEDDINGS_COLLECTION_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS embeddings_collection_id ON embeddings (collection_id, id);
+"""
+
+
+# pylint: disable=too-many-positional-arguments
+class LocalClient(Database):
+    """
+    Embedded, file backed store for DeepFace embeddings that needs no external server.
+        Metadata lives in an SQLite database in WAL mode, and vectors are appended to
+        float32 segment files next to it. A vector is only visible to readers once its
+        metadata is committed, so any number of readers can work with a single writer.
+    """
+
+    def __init__(
+        self,
+        connection_details: Optional[Union[str, Dict[str, Any]]] = None,
+        connection: Any = None,
+    ) -> None:
+        if connection is not None:
+            self.conn = connection
+            # main database file of an existing sqlite connection
+            self.path = os.path.dirname(connection.execute("PRAGMA database_list").fetchone()[2])
+        else:
+            conn_details = connection_details or os.environ.get("DEEPFACE_LOCAL_DB_PATH")
+            if isinstance(conn_details, dict):
+                conn_details = conn_details.get("path")
+            self.path = conn_details or os.path.join(
+                folder_utils.get_deepface_home(), ".deepface", "local_db"
+            )
+            os.makedirs(self.path, exist_ok=True)
+            self.conn = sqlite3.connect(
+                os.path.join(self.path, METADATA_FILE),
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+
+        self.segments_path = os.path.join(self.path, "segments")
+        self.indexes_path = os.path.join(self.path, "indexes")
+        os.makedirs(self.segments_path, exist_ok=True)
+        os.makedirs(self.indexes_path, exist_ok=True)
+
+        # sqlite connections must not be used by multiple threads at the same time
+        self._lock = threading.Lock()
+
+        self.ensure_embeddings_table()
+
+    def ensure_embeddings_table(self) -> None:
+        """
+        Ensure that the metadata tables exist and WAL mode is enabled.
+        """
+        if _SCHEMA_CHECKED.get(self.path):
+            logger.debug("Local database schema already checked, skipping.")
+            return
+
+        with self._lock:
+            # readers are not blocked by the writer in write-ahead logging mode
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(CREATE_COLLECTIONS_TABLE_SQL)
+            self.conn.execute(CREATE_EMBEDDINGS_TABLE_SQL)
+            self.conn.execute(CREATE_EMBEDDINGS_COLLECTION_INDEX_SQL)
+            self.conn.execute(CREATE_CODEBOOKS_TABLE_SQL)
+
+            # databases created before compressed embeddings were introduced
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(embeddings)")}
+            for column, column_type in [
+                ("embedding_code", "BLOB"),
+                ("embedding_compression", "TEXT"),
+            ]:
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE embeddings ADD COLUMN {column} {column_type}")
+            if self.conn.in_transaction:
+                self.conn.commit()
+        logger.debug(f"Ensured local database tables exist in {self.path}.")
+
+        _SCHEMA_CHECKED[self.path] = True
+
+    def close(self) -> None:
+        """Close the metadata database connection."""
+        self.conn.close()
+
+    def upsert_embeddings_index(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        index_data: bytes,
+    ) -> None:
+        """
+        Store embeddings index as a file. The file is replaced atomically, so readers
+            either see the previous or the new index.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+            index_data (bytes): Serialized index data.
+        """
+        with self._lock:
+            collection = self.__get_collection(
+                model_name, detector_backend, aligned, l2_normalized
+            )
+        if collection is None:
+            raise ValueError(
+                "No embeddings found in the local database for "
+                f"{model_name=}, {detector_backend=}, {aligned=}, {l2_normalized=}."
+            )
+
+        target_file = self.__get_index_path(collection[0])
+        tmp_file = f"{target_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(index_data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, target_file)
+
+    def get_embeddings_index(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+    ) -> bytes:
+        """
+        Get embeddings index from the local database.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+        Returns:
+            bytes: Serialized index data.
+        """
+        with self._lock:
+            collection = self.__get_collection(
+                model_name, detector_backend, aligned, l2_normalized
+            )
+        target_file = self.__get_index_path(collection[0]) if collection is not None else None
+        if target_file is None or not os.path.isfile(target_file):
+            raise ValueError(
+                "No Embeddings index found for the specified parameters "
+                f" {model_name=}, {detector_backend=}, {aligned=}, {l2_normalized=}. "
+                "You must run build_index first."
+            )
+        with open(target_file, "rb") as f:
+            return f.read()
+
+    def get_embeddings_index_version(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+    ) -> Optional[str]:
+        """
+        Get version of embeddings index from the local database.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+        Returns:
+            str: identity of the index file or None if there is no index.
+        """
+        with self._lock:
+            collection = self.__get_collection(
+                model_name, detector_backend, aligned, l2_normalized
+            )
+        if collection is None:
+            return None
+        try:
+            # index file is replaced as a whole, so a new version is a new file
+            stat = os.stat(self.__get_index_path(collection[0]))
+        except FileNotFoundError:
+            return None
+        return f"{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def insert_embeddings(self, embeddings: List[Dict[str, Any]], batch_size: int = 100) -> int:
+        """
+        Insert embeddings into the local database. Vectors of each batch are appended to
+            segment files first, and then their metadata is committed in one transaction.
+        Args:
+            embeddings (List[Dict[str, Any]]): List of embeddings to insert.
+            batch_size (int): Number of embeddings to insert per transaction.
+        Returns:
+            int: Number of embeddings inserted.
+        """
+        if not embeddings:
+            raise ValueError("No embeddings to insert.")
+
+        inserted = 0
+        for i in range(0, len(embeddings), batch_size):
+            try:
+                inserted += self.__insert_batch(embeddings[i : i + batch_size])
+            except sqlite3.IntegrityError as e:
+                raise ValueError(
+                    f"Duplicate detected for extracted face and embedding columns in {i}-th batch"
+                ) from e
+        return inserted
+
+    def fetch_all_embeddings(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        batch_size: int = 1000,
+        after_id: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch all embeddings from the local database based on specified parameters.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+            batch_size (int): Number of records to fetch in each round trip.
+            after_id (int): If provided, only embeddings with a greater id are fetched.
+        Returns:
+            List[Dict[str, Any]]: List of embedding records.
+        """
+        ids, img_names, vectors = self.__load_vectors(
+            model_name, detector_backend, aligned, l2_normalized, after_id
+        )
+        return [
+            {
+                "id": int(ids[i]),
+                "img_name": img_names[i],
+                "embedding": vectors[i].tolist(),
+                "model_name": model_name,
+                "detector_backend": detector_backend,
+                "aligned": aligned,
+                "l2_normalized": l2_normalized,
+            }
+            for i in range(len(ids))
+        ]
+
+    def iter_embeddings(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        batch_size: int = 1000,
+        after_id: Optional[int] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Iterate over embeddings of the local database in batches of batch_size records.
+        """
+        for ids, img_names, vectors in self.iter_embedding_blocks(
+            model_name, detector_backend, aligned, l2_normalized, batch_size, after_id
+        ):
+            yield [
+                {
+                    "id": int(ids[i]),
+                    "img_name": img_names[i],
+                    "embedding": vectors[i].tolist(),
+                    "model_name": model_name,
+                    "detector_backend": detector_backend,
+                    "aligned": aligned,
+                    "l2_normalized": l2_normalized,
+                }
+                for i in range(len(ids))
+            ]
+
+    def iter_embedding_blocks(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        batch_size: int = 1000,
+        after_id: Optional[int] = None,
+    ) -> Iterator[Tuple[NDArray[Any], List[str], NDArray[Any]]]:
+        """
+        Read vectors straight from segment files, one page of batch_size ids at a time.
+        """
+        while True:
+            ids, img_names, vectors = self.__load_vectors(
+                model_name, detector_backend, aligned, l2_normalized, after_id, batch_size
+            )
+            if len(ids) == 0:
+                return
+            yield ids, img_names, vectors
+            after_id = int(ids[-1])
+
+    def iter_uncompressed_embedding_blocks(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        compression: str,
+        batch_size: int = 1000,
+    ) -> Iterator[Tuple[NDArray[Any], List[str], NDArray[Any]]]:
+        """
+        Read vectors of embeddings not registered with the given compression from segment
+            files, one page of batch_size ids at a time.
+        """
+        after_id = 0
+        while True:
+            ids, img_names, vectors = self.__load_vectors(
+                model_name,
+                detector_backend,
+                aligned,
+                l2_normalized,
+                after_id,
+                batch_size,
+                excluded_compression=compression,
+            )
+            if len(ids) == 0:
+                return
+            yield ids, img_names, vectors
+            after_id = int(ids[-1])
+
+    def iter_embedding_codes(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        compression: str,
+        batch_size: int = 1000,
+    ) -> Iterator[Tuple[NDArray[Any], List[str], NDArray[Any]]]:
+        """
+        Read compressed codes of embeddings registered with the given compression,
+            one page of batch_size ids at a time.
+        """
+        with self._lock:
+            collection = self.__get_collection(
+                model_name, detector_backend, aligned, l2_normalized
+            )
+        if collection is None:
+            return
+
+        after_id = 0
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    """
+                    SELECT id, img_name, embedding_code FROM embeddings
+                    WHERE collection_id = ? AND embedding_compression = ? AND id > ?
+                    ORDER BY id ASC
+                    LIMIT ?
+                    """,
+                    (collection[0], compression, after_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            yield (
+                np.array([r[0] for r in rows], dtype=np.int64),
+                [r[1] for r in rows],
+                np.frombuffer(b"".join(r[2] for r in rows), dtype=np.uint8).reshape(
+                    len(rows), -1
+                ),
+            )
+            after_id = rows[-1][0]
+
+    def fetch_embeddings_by_id(self, ids: List[Any]) -> Dict[Any, List[float]]:
+        """
+        Fetch full embeddings of the given ids from segment files.
+        """
+        embeddings: Dict[Any, List[float]] = {}
+        ids = [int(i) for i in ids]
+        # sqlite limits the number of variables in a statement
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            with self._lock:
+                rows = self.conn.execute(
+                    f"""
+                    SELECT e.id, e.collection_id, c.dimension, e.segment, e.position
+                    FROM embeddings e JOIN collections c ON c.id = e.collection_id
+                    WHERE e.id IN ({", ".join("?" * len(chunk))})
+                    """,
+                    chunk,
+                ).fetchall()
+            for collection_id in {r[1] for r in rows}:
+                collection_rows = [r for r in rows if r[1] == collection_id]
+                vectors = self.__read_vectors(
+                    collection_id,
+                    collection_rows[0][2],
+                    [r[3] for r in collection_rows],
+                    [r[4] for r in collection_rows],
+                )
+                for r, vector in zip(collection_rows, vectors):
+                    embeddings[r[0]] = vector.tolist()
+        return embeddings
+
+    def ensure_codebook(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        codebook: Optional[bytes] = None,
+    ) -> Optional[bytes]:
+        """
+        Retrieve the product quantization codebook of a model configuration, storing the
+            given one first if there is none yet.
+        """
+        key = (model_name, detector_backend, int(aligned), int(l2_normalized))
+        with self._lock:
+            if codebook is not None:
+                self.conn.execute(
+                    """
+                    INSERT OR IGNORE INTO codebooks (
+                        model_name, detector_backend, aligned, l2_normalized, codebook
+                    )
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    key + (codebook,),
+                )
+            row = self.conn.execute(
+                """
+                SELECT codebook FROM codebooks
+                WHERE model_name = ? AND detector_backend = ? AND aligned = ?
+                    AND l2_normalized = ?
+                """,
+                key,
+            ).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def search_by_vector(
+        self,
+        vector: List[float],
+        model_name: str = "VGG-Face",
+        detector_backend: str = "opencv",
+        aligned: bool = True,
+        l2_normalized: bool = False,
+        limit: int = 10,
+        threshold: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Exact nearest neighbour search over the stored vectors. Distance is cosine distance
+            for l2 normalized embeddings and squared euclidean distance otherwise, same as
+            the vector databases do. Neighbours farther than threshold are not returned.
+            Vectors are streamed in blocks, so only a block and the nearest limit neighbours
+            are held in memory at a time.
+        """
+        target = np.asarray(vector, dtype=np.float32)
+        nearest_ids = np.empty((0,), dtype=np.int64)
+        nearest_img_names: List[str] = []
+        nearest_vectors = np.empty((0, len(target)), dtype=np.float32)
+        nearest_distances = np.empty((0,), dtype=np.float32)
+
+        for ids, img_names, vectors in self.iter_embedding_blocks(
+            model_name, detector_backend, aligned, l2_normalized
+        ):
+            if l2_normalized:
+                distances = 1 - (vectors @ target) / (
+                    np.linalg.norm(vectors, axis=1) * np.linalg.norm(target) + 1e-10
+                )
+            else:
+                distances = np.sum(np.square(vectors - target), axis=1)
+
+            mask = np.ones(len(ids), dtype=bool) if threshold is None else distances <= threshold
+            nearest_ids = np.concatenate([nearest_ids, ids[mask]])
+            nearest_img_names += [name for name, keep in zip(img_names, mask) if keep]
+            nearest_vectors = np.concatenate([nearest_vectors, vectors[mask]])
+            nearest_distances = np.concatenate([nearest_distances, distances[mask]])
+
+            if 0 < limit < len(nearest_ids):
+                kept = np.argpartition(nearest_distances, limit - 1)[:limit]
+                nearest_ids, nearest_vectors = nearest_ids[kept], nearest_vectors[kept]
+                nearest_distances = nearest_distances[kept]
+                nearest_img_names = [nearest_img_names[i] for i in kept]
+
+        return [
+            {
+                "id": int(nearest_ids[i]),
+                "img_name": nearest_img_names[i],
+                "embedding": nearest_vectors[i].tolist(),
+                "distance": float(nearest_distances[i]),
+            }
+            for i in np.argsort(nearest_distances, kind="stable")[0:max(limit, 0)]
+        ]
+
+    def __insert_batch(self, embeddings: List[Dict[str, Any]]) -> int:
+        """
+        Append vectors of a batch to segment files and commit their metadata
+        """
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock of the database file,
+            # so there is a single writer across threads and processes.
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                # collection id to its write cursor and the vectors to append
+                cursors: Dict[int, Tuple[int, int, int]] = {}
+                pending: Dict[Tuple[int, int], List[Tuple[int, NDArray[Any]]]] = {}
+                values = []
+
+                for e in embeddings:
+                    vector = np.asarray(e["embedding"], dtype=np.float32)
+                    collection_id = self.__get_or_create_collection(
+                        e["model_name"],
+                        e["detector_backend"],
+                        e["aligned"],
+                        e["l2_normalized"],
+                        vector.shape[0],
+                        cursors,
+                    )
+                    dimension, segment, rows = cursors[collection_id]
+
+                    if vector.shape[0] != dimension:
+                        raise ValueError(
+                            f"Embedding has {vector.shape[0]} dimensions but the stored ones "
+                            f"of {e['model_name']} have {dimension}."
+                        )
+
+                    if rows >= SEGMENT_SIZE:
+                        segment, rows = segment + 1, 0
+
+                    pending.setdefault((collection_id, segment), []).append((rows, vector))
+                    cursors[collection_id] = (dimension, segment, rows + 1)
+
+                    face = np.ascontiguousarray(e["face"], dtype=np.float32)
+                    values.append(
+                        (
+                            collection_id,
+                            e["img_name"],
+                            face.tobytes(),
+                            json.dumps(list(face.shape)),
+                            segment,
+                            rows,
+                            # uniqueness is guaranteed by face hash and embedding hash
+                            find_face_hash(e["face"]),
+                            find_embedding_hash(e["embedding"]),
+                            e.get("embedding_code"),
+                            e.get("embedding_compression"),
+                        )
+                    )
+
+                for (collection_id, segment), items in pending.items():
+                    self.__write_vectors(collection_id, segment, items)
+
+                self.conn.executemany(
+                    """
+                    INSERT INTO embeddings (
+                        collection_id, img_name, face, face_shape, segment, position,
+                        face_hash, embedding_hash, embedding_code, embedding_compression
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    values,
+                )
+                self.conn.executemany(
+                    "UPDATE collections SET segment = ?, next_row = ? WHERE id = ?",
+                    [
+                        (segment, rows, collection_id)
+                        for collection_id, (_, segment, rows) in cursors.items()
+                    ],
+                )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                # vectors written beyond the committed cursor are overwritten by the next writer
+                self.conn.execute("ROLLBACK")
+                raise
+
+        return len(values)
+
+    def __get_or_create_collection(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        dimension: int,
+        cursors: Dict[int, Tuple[int, int, int]],
+    ) -> int:
+        """
+        Find the collection of a model configuration, create it if it does not exist,
+            and store its dimension and write cursor in cursors
+        """
+        collection = self.__get_collection(model_name, detector_backend, aligned, l2_normalized)
+        if collection is None:
+            cur = self.conn.execute(
+                """
+                INSERT INTO collections (
+                    model_name, detector_backend, aligned, l2_normalized, dimension
+                )
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (model_name, detector_backend, int(aligned), int(l2_normalized), dimension),
+            )
+            collection = (int(cur.lastrowid or 0), dimension, 0, 0)
+
+        collection_id, stored_dimension, segment, rows = collection
+        if collection_id not in cursors:
+            cursors[collection_id] = (stored_dimension, segment, rows)
+        return collection_id
+
+    def __get_collection(
+        self, model_name: str, detector_backend: str, aligned: bool, l2_normalized: bool
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Find id, dimension and write cursor of a model configuration's collection
+        """
+        row = self.conn.execute(
+            """
+            SELECT id, dimension, segment, next_row FROM collections
+            WHERE model_name = ? AND detector_backend = ? AND aligned = ? AND l2_normalized = ?
+            """,
+            (model_name, detector_backend, int(aligned), int(l2_normalized)),
+        ).fetchone()
+        return None if row is None else (int(row[0]), int(row[1]), int(row[2]), int(row[3]))
+
+    def __write_vectors(
+        self, collection_id: int, segment: int, items: List[Tuple[int, NDArray[Any]]]
+    ) -> None:
+        """
+        Write vectors into their rows of a segment file and flush them to disk
+        """
+        segment_file = self.__get_segment_path(collection_id, segment)
+        first_row = items[0][0]
+        block = np.stack([vector for _, vector in items]).astype(np.float32)
+
+        mode = "r+b" if os.path.isfile(segment_file) else "wb"
+        with open(segment_file, mode) as f:
+            f.seek(first_row * block.shape[1] * 4)
+            f.write(block.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def __load_vectors(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        after_id: Optional[int] = None,
+        limit: int = -1,
+        excluded_compression: Optional[str] = None,
+    ) -> Tuple[NDArray[Any], List[str], NDArray[Any]]:
+        """
+        Read ids, image names and vectors of committed embeddings of a model configuration
+            in id order, at most limit rows if it is not negative. Embeddings registered
+            with excluded_compression are skipped if it is given.
+        Returns:
+            ids (np.ndarray): (n,) shaped ids
+            img_names (list): image names
+            vectors (np.ndarray): (n, dimension) shaped float32 vectors
+        """
+        with self._lock:
+            collection = self.__get_collection(
+                model_name, detector_backend, aligned, l2_normalized
+            )
+            if collection is None:
+                return np.empty((0,), dtype=np.int64), [], np.empty((0, 0), dtype=np.float32)
+
+            rows = self.conn.execute(
+                """
+                SELECT id, img_name, segment, position FROM embeddings
+                WHERE collection_id = ? AND id > ? AND (? IS NULL OR embedding_compression IS NOT ?)
+                ORDER BY id ASC
+                LIMIT ?
+                """,
+                (
+                    collection[0],
+                    after_id if after_id is not None else 0,
+                    excluded_compression,
+                    excluded_compression,
+                    limit,
+                ),
+            ).fetchall()
+
+        ids = np.array([r[0] for r in rows], dtype=np.int64)
+        img_names = [r[1] for r in rows]
+        vectors = self.__read_vectors(
+            collection[0], collection[1], [r[2] for r in rows], [r[3] for r in rows]
+        )
+        return ids, img_names, vectors
+
+    def __read_vectors(
+        self, collection_id: int, dimension: int, segments: List[int], positions: List[int]
+    ) -> NDArray[Any]:
+        """
+        Read vectors of a collection from their segment files
+        Returns:
+            vectors (np.ndarray): (n, dimension) shaped float32 vectors
+        """
+        segments_array = np.array(segments, dtype=np.int64)
+        positions_array = np.array(positions, dtype=np.int64)
+
+        vectors = np.empty((len(segments_array), dimension), dtype=np.float32)
+        for segment in np.unique(segments_array):
+            mask = segments_array == segment
+            segment_file = self.__get_segment_path(collection_id, int(segment))
+            num_rows = os.path.getsize(segment_file) // (dimension * 4)
+            data = np.memmap(segment_file, dtype=np.float32, mode="r", shape=(num_rows, dimension))
+            vectors[mask] = data[positions_array[mask]]
+            del data
+
+        return vectors
+
+    def __get_segment_path(self, collection_id: int, segment: int) -> str:
+        return os.path.join(self.segments_path, f"{collection_id}_{segment:06d}.f32")
+
+    def __get_index_path(self, collection_id: int) -> str:
+        return os.path.join(self.indexes_path, f"{collection_id}.faiss")
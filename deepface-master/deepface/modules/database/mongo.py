@@ -1,20 +1,32 @@
 # built-in dependencies
 import os
-import json
-import hashlib
-import struct
+import math
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 # 3rd party dependencies
 import numpy as np
+from numpy.typing import NDArray
 
 # project dependencies
 from deepface.modules.database.types import Database
+from deepface.modules.database.hashing import (
+    find_face_hash,
+    find_embedding_hash,
+    find_legacy_duplicates,
+)
 from deepface.commons.logger import Logger
 
 logger = Logger()
 
+# serialized indexes are stored in chunks since a document cannot exceed 16 MB
+INDEX_CHUNK_SIZE = 8 * 1024 * 1024
+
+# number of insert_many batches sent concurrently while registering
+INSERT_CONCURRENCY = int(os.getenv("DEEPFACE_MONGO_INSERT_CONCURRENCY", "4"))
+
 
 # pylint: disable=too-many-positional-arguments, too-many-instance-attributes
 class MongoDbClient(Database):
@@ -60,6 +72,8 @@ class MongoDbClient(Database):
         self.db = self.client[db_name]
         self.embeddings = self.db.embeddings
         self.embeddings_index = self.db.embeddings_index
+        self.embeddings_index_chunks = self.db.embeddings_index_chunks
+        self.embeddings_codebook = self.db.embeddings_codebook
         self.counters = self.db.counters
         self.ensure_embeddings_table()
 
@@ -67,6 +81,14 @@ class MongoDbClient(Database):
         """Close MongoDB connection."""
         self.client.close()
 
+    def ping(self) -> bool:
+        """Check the server responds."""
+        try:
+            self.client.admin.command("ping")
+            return True
+        except Exception:  # pylint: disable=broad-except
+            return False
+
     def ensure_embeddings_table(self) -> None:
         """
         Ensure required MongoDB indexes exist.
@@ -79,6 +101,9 @@ class MongoDbClient(Database):
             name="uniq_face_embedding",
         )
 
+        # faces registered before raw face hashes are found by their embedding hashes
+        self.embeddings.create_index("embedding_hash", name="embedding_hash")
+
         # Unique constraint for embeddings_index
         self.embeddings_index.create_index(
             [
@@ -91,6 +116,23 @@ class MongoDbClient(Database):
             name="uniq_index_config",
         )
 
+        self.embeddings_index_chunks.create_index(
+            [("generation", self.ASCENDING), ("chunk_no", self.ASCENDING)],
+            unique=True,
+            name="uniq_index_chunk",
+        )
+
+        self.embeddings_codebook.create_index(
+            [
+                ("model_name", self.ASCENDING),
+                ("detector_backend", self.ASCENDING),
+                ("align", self.ASCENDING),
+                ("l2_normalized", self.ASCENDING),
+            ],
+            unique=True,
+            name="uniq_codebook_config",
+        )
+
         # counters collection for auto-incrementing IDs
         if not self.counters.find_one({"_id": "embedding_id"}):
             self.counters.insert_one({"_id": "embedding_id", "seq": 0})
@@ -114,7 +156,21 @@ class MongoDbClient(Database):
             l2_normalized (bool): Whether the embeddings are L2 normalized.
             index_data (bytes): Serialized index data.
         """
-        self.embeddings_index.update_one(
+        # chunks are written under a new generation first, then the index document is
+        # switched to it. so, readers never see a partially written index.
+        generation = str(uuid.uuid4())
+        self.embeddings_index_chunks.insert_many(
+            [
+                {
+                    "generation": generation,
+                    "chunk_no": i // INDEX_CHUNK_SIZE,
+                    "chunk_data": self.Binary(index_data[i : i + INDEX_CHUNK_SIZE]),
+                }
+                for i in range(0, len(index_data), INDEX_CHUNK_SIZE)
+            ]
+        )
+
+        previous = self.embeddings_index.find_one_and_update(
             {
                 "model_name": model_name,
                 "detector_backend": detector_backend,
@@ -123,16 +179,22 @@ class MongoDbClient(Database):
             },
             {
                 "$set": {
-                    "index_data": self.Binary(index_data),
+                    "generation": generation,
+                    "num_chunks": math.ceil(len(index_data) / INDEX_CHUNK_SIZE),
                     "updated_at": datetime.now(timezone.utc),
                 },
+                "$unset": {"index_data": ""},
                 "$setOnInsert": {
                     "created_at": datetime.now(timezone.utc),
                 },
             },
             upsert=True,
+            return_document=False,
         )
 
+        if previous is not None and previous.get("generation") is not None:
+            self.embeddings_index_chunks.delete_many({"generation": previous["generation"]})
+
     def get_embeddings_index(
         self,
         model_name: str,
@@ -150,6 +212,57 @@ class MongoDbClient(Database):
         Returns:
             bytes: Serialized index data.
         """
+        # retry if the index is replaced by another process while its chunks are being read
+        for _ in range(3):
+            doc = self.embeddings_index.find_one(
+                {
+                    "model_name": model_name,
+                    "detector_backend": detector_backend,
+                    "align": aligned,
+                    "l2_normalized": l2_normalized,
+                },
+                {"index_data": 1, "generation": 1, "num_chunks": 1},
+            )
+
+            if not doc:
+                raise ValueError(
+                    "No Embeddings index found for the specified parameters "
+                    f"{model_name=}, {detector_backend=}, "
+                    f"{aligned=}, {l2_normalized=}. "
+                    "You must run build_index first."
+                )
+
+            # indexes stored before chunking was introduced are kept in index_data field
+            if doc.get("generation") is None:
+                return bytes(doc["index_data"])
+
+            chunks = list(
+                self.embeddings_index_chunks.find(
+                    {"generation": doc["generation"]}, {"chunk_data": 1}
+                ).sort("chunk_no", self.ASCENDING)
+            )
+            if len(chunks) == doc["num_chunks"]:
+                return b"".join(bytes(chunk["chunk_data"]) for chunk in chunks)
+
+        raise ValueError("Embeddings index is being replaced concurrently, please try again.")
+
+    def get_embeddings_index_version(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+    ) -> Optional[str]:
+        """
+        Get version of embeddings index from MongoDB.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+        Returns:
+            str: generation of the index or None if there is no index.
+        """
         doc = self.embeddings_index.find_one(
             {
                 "model_name": model_name,
@@ -157,18 +270,12 @@ class MongoDbClient(Database):
                 "align": aligned,
                 "l2_normalized": l2_normalized,
             },
-            {"index_data": 1},
+            {"generation": 1, "updated_at": 1},
         )
-
         if not doc:
-            raise ValueError(
-                "No Embeddings index found for the specified parameters "
-                f"{model_name=}, {detector_backend=}, "
-                f"{aligned=}, {l2_normalized=}. "
-                "You must run build_index first."
-            )
-
-        return bytes(doc["index_data"])
+            return None
+        # indexes stored before chunking was introduced have no generation
+        return str(doc.get("generation") or doc.get("updated_at"))
 
     def insert_embeddings(self, embeddings: List[Dict[str, Any]], batch_size: int = 100) -> int:
         """
@@ -182,47 +289,82 @@ class MongoDbClient(Database):
         if not embeddings:
             raise ValueError("No embeddings to insert.")
 
+        # reserve a block of sequence ids for the whole call in a single round trip
+        last_id = self.counters.find_one_and_update(
+            {"_id": "embedding_id"},
+            {"$inc": {"seq": len(embeddings)}},
+            upsert=True,
+            return_document=True,
+        )["seq"]
+        first_id = last_id - len(embeddings) + 1
+
+        embedding_hashes = [find_embedding_hash(e["embedding"]) for e in embeddings]
+
+        # faces registered before raw face hashes were introduced have json based hashes
+        legacy_duplicates = set(
+            find_legacy_duplicates(
+                faces=[e["face"] for e in embeddings],
+                embedding_hashes=embedding_hashes,
+                stored_hashes={
+                    (doc["face_hash"], doc["embedding_hash"])
+                    for doc in self.embeddings.find(
+                        {"embedding_hash": {"$in": embedding_hashes}},
+                        {"_id": 0, "face_hash": 1, "embedding_hash": 1},
+                    )
+                },
+            )
+        )
+
+        created_at = datetime.now(timezone.utc)
         docs: List[Dict[str, Any]] = []
 
-        for e in embeddings:
+        for offset, e in enumerate(embeddings):
+            if offset in legacy_duplicates:
+                continue
             face = e["face"]
-            face_shape = list(face.shape)
-
-            binary_face_data = self.Binary(face.astype(np.float32).tobytes())
 
-            embedding_bytes = struct.pack(f'{len(e["embedding"])}d', *e["embedding"])
-
-            face_hash = hashlib.sha256(json.dumps(face.tolist()).encode()).hexdigest()
-            embedding_hash = hashlib.sha256(embedding_bytes).hexdigest()
-
-            int_id = self.counters.find_one_and_update(
-                {"_id": "embedding_id"}, {"$inc": {"seq": 1}}, upsert=True, return_document=True
-            )["seq"]
-
-            docs.append(
-                {
-                    "sequence": int_id,
-                    "img_name": e["img_name"],
-                    "face": binary_face_data,
-                    "face_shape": face_shape,
-                    "model_name": e["model_name"],
-                    "detector_backend": e["detector_backend"],
-                    "aligned": e["aligned"],
-                    "l2_normalized": e["l2_normalized"],
-                    "embedding": e["embedding"],
-                    "face_hash": face_hash,
-                    "embedding_hash": embedding_hash,
-                    "created_at": datetime.now(timezone.utc),
-                }
-            )
+            doc = {
+                "sequence": first_id + offset,
+                "img_name": e["img_name"],
+                "face": self.Binary(face.astype(np.float32).tobytes()),
+                "face_shape": list(face.shape),
+                "model_name": e["model_name"],
+                "detector_backend": e["detector_backend"],
+                "aligned": e["aligned"],
+                "l2_normalized": e["l2_normalized"],
+                "embedding": e["embedding"],
+                "face_hash": find_face_hash(face),
+                "embedding_hash": embedding_hashes[offset],
+                "created_at": created_at,
+            }
+            if e.get("embedding_code") is not None:
+                doc["embedding_code"] = self.Binary(e["embedding_code"])
+                doc["embedding_compression"] = e["embedding_compression"]
+            docs.append(doc)
+
+        # batches are pipelined over the client's connection pool instead of waiting for
+        # each acknowledgement before sending the next one
+        batches = [docs[i : i + batch_size] for i in range(0, len(docs), batch_size)]
+        with ThreadPoolExecutor(max_workers=max(1, min(INSERT_CONCURRENCY, len(batches)))) as ex:
+            futures = [
+                ex.submit(self.embeddings.insert_many, batch, ordered=False) for batch in batches
+            ]
 
         inserted = 0
-        try:
-            for i in range(0, len(docs), batch_size):
-                result = self.embeddings.insert_many(docs[i : i + batch_size], ordered=False)
-                inserted += len(result.inserted_ids)
-        except (self.DuplicateKeyError, self.BulkWriteError) as e:
-            raise ValueError("Duplicate detected for extracted face and embedding") from e
+        duplicate: Optional[Exception] = None
+        for future in futures:
+            try:
+                inserted += len(future.result().inserted_ids)
+            except (self.DuplicateKeyError, self.BulkWriteError) as err:
+                # unordered batches still insert their rows that are not duplicates
+                inserted += (getattr(err, "details", None) or {}).get("nInserted", 0)
+                duplicate = duplicate or err
+
+        if duplicate is not None or legacy_duplicates:
+            raise ValueError(
+                "Duplicate detected for extracted face and embedding "
+                f"after {inserted} inserted embeddings"
+            ) from duplicate
 
         return inserted
 
@@ -233,6 +375,7 @@ class MongoDbClient(Database):
         aligned: bool,
         l2_normalized: bool,
         batch_size: int = 1000,
+        after_id: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         Fetch all embeddings from MongoDB based on specified parameters.
@@ -242,42 +385,253 @@ class MongoDbClient(Database):
             aligned (bool): Whether the embeddings are aligned.
             l2_normalized (bool): Whether the embeddings are L2 normalized.
             batch_size (int): Number of records to fetch in each batch.
+            after_id (int): If provided, only embeddings with a greater id are fetched.
         Returns:
             List[Dict[str, Any]]: List of embedding records.
         """
+        return [
+            item
+            for batch in self.iter_embeddings(
+                model_name=model_name,
+                detector_backend=detector_backend,
+                aligned=aligned,
+                l2_normalized=l2_normalized,
+                batch_size=batch_size,
+                after_id=after_id,
+            )
+            for item in batch
+        ]
+
+    def iter_embeddings(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        batch_size: int = 1000,
+        after_id: Optional[int] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream embeddings from MongoDB in batches as the cursor receives them.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+            batch_size (int): Number of records to fetch in each batch.
+            after_id (int): If provided, only embeddings with a greater id are fetched.
+        Returns:
+            Iterator[List[Dict[str, Any]]]: Batches of embedding records.
+        """
+        query: Dict[str, Any] = {
+            "model_name": model_name,
+            "detector_backend": detector_backend,
+            "aligned": aligned,
+            "l2_normalized": l2_normalized,
+        }
+        if after_id is not None:
+            query["sequence"] = {"$gt": after_id}
 
+        cursor = self.embeddings.find(
+            query,
+            {
+                "_id": 1,
+                "sequence": 1,
+                "img_name": 1,
+                "embedding": 1,
+            },
+            batch_size=batch_size,
+        ).sort("sequence", self.ASCENDING)
+
+        batch: List[Dict[str, Any]] = []
+        try:
+            for doc in cursor:
+                batch.append(
+                    {
+                        "id": doc["sequence"],
+                        "img_name": doc["img_name"],
+                        "embedding": doc["embedding"],
+                        "model_name": model_name,
+                        "detector_backend": detector_backend,
+                        "aligned": aligned,
+                        "l2_normalized": l2_normalized,
+                    }
+                )
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+        finally:
+            cursor.close()
+
+        if batch:
+            yield batch
+
+    def iter_embedding_codes(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        compression: str,
+        batch_size: int = 1000,
+    ) -> Iterator[Tuple[NDArray[Any], List[str], NDArray[Any]]]:
+        """
+        Stream compressed codes of embeddings registered with the given compression.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+            compression (str): float16, int8 or pq.
+            batch_size (int): Number of records to fetch in each batch.
+        Returns:
+            Iterator of ids, image names and (n, code_size) shaped uint8 codes.
+        """
         cursor = self.embeddings.find(
             {
                 "model_name": model_name,
                 "detector_backend": detector_backend,
                 "aligned": aligned,
                 "l2_normalized": l2_normalized,
+                "embedding_compression": compression,
             },
+            {"_id": 0, "sequence": 1, "img_name": 1, "embedding_code": 1},
+            batch_size=batch_size,
+        ).sort("sequence", self.ASCENDING)
+
+        def to_block(docs: List[Dict[str, Any]]) -> Tuple[NDArray[Any], List[str], NDArray[Any]]:
+            return (
+                np.array([doc["sequence"] for doc in docs], dtype=np.int64),
+                [doc["img_name"] for doc in docs],
+                np.frombuffer(
+                    b"".join(bytes(doc["embedding_code"]) for doc in docs), dtype=np.uint8
+                ).reshape(len(docs), -1),
+            )
+
+        batch: List[Dict[str, Any]] = []
+        try:
+            for doc in cursor:
+                batch.append(doc)
+                if len(batch) == batch_size:
+                    yield to_block(batch)
+                    batch = []
+        finally:
+            cursor.close()
+
+        if batch:
+            yield to_block(batch)
+
+    def iter_uncompressed_embedding_blocks(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        compression: str,
+        batch_size: int = 1000,
+    ) -> Iterator[Tuple[NDArray[Any], List[str], NDArray[Any]]]:
+        """
+        Stream full embeddings not registered with the given compression.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+            compression (str): float16, int8 or pq.
+            batch_size (int): Number of records to fetch in each batch.
+        Returns:
+            Iterator of ids, image names and (n, dimension) shaped float32 vectors.
+        """
+        cursor = self.embeddings.find(
             {
-                "_id": 1,
-                "sequence": 1,
-                "img_name": 1,
-                "embedding": 1,
+                "model_name": model_name,
+                "detector_backend": detector_backend,
+                "aligned": aligned,
+                "l2_normalized": l2_normalized,
+                # documents without the field are matched as well
+                "embedding_compression": {"$ne": compression},
             },
+            {"_id": 0, "sequence": 1, "img_name": 1, "embedding": 1},
             batch_size=batch_size,
         ).sort("sequence", self.ASCENDING)
 
-        results: List[Dict[str, Any]] = []
-        for doc in cursor:
-            results.append(
-                {
-                    # "_id": str(doc["_id"]),
-                    "id": doc["sequence"],
-                    "img_name": doc["img_name"],
-                    "embedding": doc["embedding"],
-                    "model_name": model_name,
-                    "detector_backend": detector_backend,
-                    "aligned": aligned,
-                    "l2_normalized": l2_normalized,
-                }
+        def to_block(docs: List[Dict[str, Any]]) -> Tuple[NDArray[Any], List[str], NDArray[Any]]:
+            return (
+                np.array([doc["sequence"] for doc in docs], dtype=np.int64),
+                [doc["img_name"] for doc in docs],
+                np.array([doc["embedding"] for doc in docs], dtype=np.float32),
             )
 
-        return results
+        batch: List[Dict[str, Any]] = []
+        try:
+            for doc in cursor:
+                batch.append(doc)
+                if len(batch) == batch_size:
+                    yield to_block(batch)
+                    batch = []
+        finally:
+            cursor.close()
+
+        if batch:
+            yield to_block(batch)
+
+    def fetch_embeddings_by_id(self, ids: List[Any]) -> Dict[Any, List[float]]:
+        """
+        Fetch full embeddings of the given ids from MongoDB.
+        Args:
+            ids (List[int]): ids of the embeddings.
+        Returns:
+            Dict[int, List[float]]: embedding of each id.
+        """
+        cursor = self.embeddings.find(
+            {"sequence": {"$in": [int(i) for i in ids]}},
+            {"_id": 0, "sequence": 1, "embedding": 1},
+        )
+        return {doc["sequence"]: doc["embedding"] for doc in cursor}
+
+    def ensure_codebook(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        codebook: Optional[bytes] = None,
+    ) -> Optional[bytes]:
+        """
+        Retrieve the product quantization codebook of a model configuration from MongoDB,
+            storing the given one first if there is none yet.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+            codebook (bytes): Serialized codebook to store if there is none yet.
+        Returns:
+            bytes: Serialized codebook or None if there is none.
+        """
+        config = {
+            "model_name": model_name,
+            "detector_backend": detector_backend,
+            "align": aligned,
+            "l2_normalized": l2_normalized,
+        }
+        if codebook is not None:
+            # the first stored codebook wins if registrations train one concurrently
+            try:
+                self.embeddings_codebook.update_one(
+                    config,
+                    {
+                        "$setOnInsert": {
+                            "codebook": self.Binary(codebook),
+                            "created_at": datetime.now(timezone.utc),
+                        }
+                    },
+                    upsert=True,
+                )
+            except self.DuplicateKeyError:
+                pass
+        doc = self.embeddings_codebook.find_one(config, {"codebook": 1})
+        return None if doc is None else bytes(doc["codebook"])
 
     def search_by_vector(
         self,
@@ -287,6 +641,7 @@ class MongoDbClient(Database):
         aligned: bool = True,
         l2_normalized: bool = False,
         limit: int = 10,
+        threshold: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
         """
         ANN search using the main vector (embedding).
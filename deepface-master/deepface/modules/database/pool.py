@@ -0,0 +1,289 @@
+# built-in dependencies
+import os
+import json
+import time
+import atexit
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Generator, Optional, Set, Tuple, Union
+
+# project dependencies
+from deepface.modules.database.types import Database
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+# environment variables each backend falls back to when connection details are not given
+CONNECTION_ENV_VARS = {
+    "postgres": "DEEPFACE_POSTGRES_URI",
+    "mongo": "DEEPFACE_MONGO_URI",
+    "weaviate": "DEEPFACE_WEAVIATE_URL",
+    "local": "DEEPFACE_LOCAL_DB_PATH",
+}
+
+# pool configuration, max size of 0 disables pooling
+POOL_MIN_SIZE = int(os.getenv("DEEPFACE_DB_POOL_MIN_SIZE", "0"))
+POOL_MAX_SIZE = int(os.getenv("DEEPFACE_DB_POOL_MAX_SIZE", "10"))
+POOL_TIMEOUT = float(os.getenv("DEEPFACE_DB_POOL_TIMEOUT", "30"))
+POOL_IDLE_TIMEOUT = float(os.getenv("DEEPFACE_DB_POOL_IDLE_TIMEOUT", "300"))
+POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("DEEPFACE_DB_POOL_HEALTH_CHECK_INTERVAL", "30"))
+
+_POOLS: Dict[Tuple[str, str], "ClientPool"] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+# pylint: disable=too-many-instance-attributes, too-many-positional-arguments
+class ClientPool:
+    """
+    Thread safe pool of database clients sharing the same backend and connection details.
+        Idle clients are health checked before they are handed out again, and the ones
+        idle longer than idle_timeout are closed while keeping at least min_size of them.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Database],
+        min_size: int = POOL_MIN_SIZE,
+        max_size: int = POOL_MAX_SIZE,
+        timeout: float = POOL_TIMEOUT,
+        idle_timeout: float = POOL_IDLE_TIMEOUT,
+        health_check_interval: float = POOL_HEALTH_CHECK_INTERVAL,
+    ) -> None:
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(
+                f"Invalid pool sizes min_size={min_size}, max_size={max_size}. "
+                "Expected 0 <= min_size <= max_size and max_size >= 1."
+            )
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+
+        # idle clients with the time they were returned, most recently used at the right
+        self._idle: Deque[Tuple[Database, float]] = deque()
+        self._in_use: Set[int] = set()
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        for _ in range(self.min_size):
+            self._idle.append((self.factory(), time.monotonic()))
+            self._size += 1
+
+    @property
+    def size(self) -> int:
+        """Number of open clients, both idle and in use."""
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        """Number of idle clients ready to be handed out."""
+        return len(self._idle)
+
+    def acquire(self) -> Database:
+        """
+        Hand out an idle healthy client, create a new one if the pool is not full,
+            or wait for a client to be released otherwise.
+        Returns:
+            client (Database): database client for exclusive use until it is released
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            client: Optional[Database] = None
+            last_used = 0.0
+            create = False
+
+            with self._condition:
+                if self._closed:
+                    raise ValueError("Database client pool is already closed.")
+                self._evict_idle()
+
+                if self._idle:
+                    client, last_used = self._idle.pop()
+                elif self._size < self.max_size:
+                    # reserve the slot so the connection is established outside the lock
+                    self._size += 1
+                    create = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"No database client became available in {self.timeout} seconds. "
+                            f"All {self.max_size} clients of the pool are in use. "
+                            "Consider increasing DEEPFACE_DB_POOL_MAX_SIZE."
+                        )
+                    self._condition.wait(remaining)
+                    continue
+
+            if create:
+                try:
+                    client = self.factory()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+            elif client is not None and time.monotonic() - last_used > self.health_check_interval:
+                if not client.ping():
+                    logger.debug("Discarding a pooled database client failing health check.")
+                    self._discard(client)
+                    continue
+
+            with self._condition:
+                self._in_use.add(id(client))
+            return client
+
+    def release(self, client: Database, discard: bool = False) -> None:
+        """
+        Return a client to the pool
+        Args:
+            client (Database): client handed out by acquire
+            discard (bool): close the client instead of reusing it e.g. after a failure
+        """
+        with self._condition:
+            if id(client) not in self._in_use:
+                raise ValueError("Released database client does not belong to this pool.")
+            self._in_use.discard(id(client))
+
+        if not discard and not self._closed:
+            try:
+                client.reset()
+            except Exception as err:  # pylint: disable=broad-except
+                logger.debug(f"Discarding a pooled database client failed to reset: {err}")
+                discard = True
+
+        if discard or self._closed:
+            self._discard(client)
+            return
+
+        with self._condition:
+            self._idle.append((client, time.monotonic()))
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Close all idle clients. Clients in use are closed once they are released."""
+        with self._condition:
+            self._closed = True
+            idle = [client for client, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for client in idle:
+            self._close_client(client)
+
+    def _evict_idle(self) -> None:
+        """Close clients idle longer than idle_timeout. Must be called with the lock held."""
+        now = time.monotonic()
+        # least recently used clients are at the left
+        while (
+            self._idle
+            and self._size > self.min_size
+            and now - self._idle[0][1] > self.idle_timeout
+        ):
+            client, _ = self._idle.popleft()
+            self._size -= 1
+            self._close_client(client)
+
+    def _discard(self, client: Database) -> None:
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+        self._close_client(client)
+
+    @staticmethod
+    def _close_client(client: Database) -> None:
+        try:
+            client.close()
+        except Exception as err:  # pylint: disable=broad-except
+            logger.debug(f"Exception while closing a pooled database client: {err}")
+
+
+def pool_key(
+    database_type: str, connection_details: Optional[Union[Dict[str, Any], str]] = None
+) -> Tuple[str, str]:
+    """
+    Find the key of the pool serving a backend and connection details
+    Args:
+        database_type (str): 'postgres', 'mongo', 'weaviate' or 'local'
+        connection_details (dict or str): connection details, or None to use the
+            environment variable of the backend
+    Returns:
+        key (tuple): database type and canonical connection details
+    """
+    details = connection_details or os.environ.get(CONNECTION_ENV_VARS.get(database_type, ""))
+    if isinstance(details, dict):
+        return database_type, json.dumps(details, sort_keys=True, default=str)
+    return database_type, str(details)
+
+
+def get_pool(
+    database_type: str,
+    connection_details: Optional[Union[Dict[str, Any], str]],
+    factory: Callable[[], Database],
+) -> ClientPool:
+    """
+    Find the pool of a backend and connection details, create it at first use
+    Args:
+        database_type (str): 'postgres', 'mongo', 'weaviate' or 'local'
+        connection_details (dict or str): connection details of the database
+        factory (callable): creates a new client when the pool needs one
+    Returns:
+        pool (ClientPool)
+    """
+    key = pool_key(database_type, connection_details)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = ClientPool(factory=factory)
+            _POOLS[key] = pool
+            logger.debug(f"Created {database_type} client pool with max size {pool.max_size}")
+        return pool
+
+
+@contextmanager
+def pooled_client(
+    database_type: str,
+    connection_details: Optional[Union[Dict[str, Any], str]],
+    factory: Callable[[], Database],
+) -> Generator[Database, None, None]:
+    """
+    Borrow a client from the pool of a backend and connection details. The client is
+        reset and returned to the pool on exit, or closed if it cannot be reset.
+        Pooling is disabled when DEEPFACE_DB_POOL_MAX_SIZE is 0.
+    Args:
+        database_type (str): 'postgres', 'mongo', 'weaviate' or 'local'
+        connection_details (dict or str): connection details of the database
+        factory (callable): creates a new client when the pool needs one
+    Yields:
+        client (Database)
+    """
+    if POOL_MAX_SIZE == 0:
+        client = factory()
+        try:
+            yield client
+        finally:
+            client.close()
+        return
+
+    pool = get_pool(database_type, connection_details, factory)
+    client = pool.acquire()
+    try:
+        yield client
+    finally:
+        pool.release(client)
+
+
+def close_pools() -> None:
+    """Close all client pools, e.g. before forking worker processes or at exit."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_pools)
@@ -1,15 +1,20 @@
 # built-in dependencies
 import os
-import json
+import uuid
 import hashlib
-import struct
-from typing import Any, Dict, Optional, List, Union, cast
+from typing import Any, Dict, Iterator, Optional, List, Tuple, Union, cast
 
 # 3rd party dependencies
 import numpy as np
+from numpy.typing import NDArray
 
 # project dependencies
 from deepface.modules.database.types import Database
+from deepface.modules.database.hashing import (
+    find_face_hash,
+    find_embedding_hash,
+    find_legacy_duplicates,
+)
 from deepface.commons.logger import Logger
 
 logger = Logger()
@@ -31,10 +36,36 @@ CREATE_EMBEDDINGS_TABLE_SQL = """
         created_at TIMESTAMPTZ DEFAULT now(),
         face_hash TEXT NOT NULL,
         embedding_hash TEXT NOT NULL,
+        embedding_code BYTEA,
+        embedding_compression TEXT,
         UNIQUE (face_hash, embedding_hash)
     );
 """
 
+# tables created before compressed embeddings were introduced
+ADD_EMBEDDING_CODE_COLUMNS_SQL = """
+    ALTER TABLE embeddings
+        ADD COLUMN IF NOT EXISTS embedding_code BYTEA,
+        ADD COLUMN IF NOT EXISTS embedding_compression TEXT;
+"""
+
+# faces registered before raw face hashes are found by their embedding hashes
+CREATE_EMBEDDING_HASH_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS embeddings_embedding_hash_idx ON embeddings (embedding_hash);
+"""
+
+CREATE_EMBEDDINGS_CODEBOOK_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS embeddings_codebook (
+        model_name TEXT NOT NULL,
+        detector_backend TEXT NOT NULL,
+        align BOOL NOT NULL,
+        l2_normalized BOOL NOT NULL,
+        codebook BYTEA NOT NULL,
+        created_at TIMESTAMPTZ DEFAULT now(),
+        PRIMARY KEY (model_name, detector_backend, align, l2_normalized)
+    );
+"""
+
 CREATE_EMBEDDINGS_INDEX_TABLE_SQL = """
     CREATE TABLE IF NOT EXISTS embeddings_index (
         id SERIAL PRIMARY KEY,
@@ -49,6 +80,71 @@ CREATE_EMBEDDINGS_INDEX_TABLE_SQL = """
     );
 """
 
+# serialized indexes are stored in chunks to stay far below bytea limits
+CREATE_EMBEDDINGS_INDEX_CHUNKS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS embeddings_index_chunks (
+        index_id INT NOT NULL REFERENCES embeddings_index (id) ON DELETE CASCADE,
+        chunk_no INT NOT NULL,
+        chunk_data BYTEA NOT NULL,
+        PRIMARY KEY (index_id, chunk_no)
+    );
+"""
+
+# rows are inserted in a single transaction by default, checkpoints commit every n rows
+COPY_CHECKPOINT_SIZE = int(os.getenv("DEEPFACE_POSTGRES_CHECKPOINT_SIZE", "0"))
+
+COPY_EMBEDDINGS_SQL = """
+    COPY embeddings (
+        img_name,
+        face,
+        face_shape,
+        model_name,
+        detector_backend,
+        aligned,
+        l2_normalized,
+        embedding,
+        face_hash,
+        embedding_hash,
+        embedding_code,
+        embedding_compression
+    ) FROM STDIN (FORMAT BINARY)
+"""
+
+# binary copy requires the exact postgres type of each column
+COPY_EMBEDDINGS_TYPES = [
+    "text",
+    "bytea",
+    "int4[]",
+    "text",
+    "text",
+    "bool",
+    "bool",
+    "float8[]",
+    "text",
+    "text",
+    "bytea",
+    "text",
+]
+
+INDEX_CHUNK_SIZE = int(os.getenv("DEEPFACE_INDEX_CHUNK_SIZE", str(64 * 1024 * 1024)))
+
+# pgvector mode serves ann search natively instead of faiss indexes stored in the database
+PGVECTOR_ENABLED = os.getenv("DEEPFACE_POSTGRES_PGVECTOR", "false").lower() in ["1", "true"]
+PGVECTOR_INDEX_METHOD = os.getenv("DEEPFACE_PGVECTOR_INDEX_METHOD", "hnsw").lower()
+PGVECTOR_IVFFLAT_PROBES = int(os.getenv("DEEPFACE_PGVECTOR_IVFFLAT_PROBES", "10"))
+
+# pgvector cannot index vectors with more dimensions than this, larger embeddings such as
+# the ones of VGG-Face are indexed as half precision vectors up to their own limit
+PGVECTOR_MAX_INDEXED_DIMENSIONS = 2000
+PGVECTOR_MAX_INDEXED_HALFVEC_DIMENSIONS = 4000
+
+# embeddings of all models share the table, so vector column has no fixed dimension
+# and the indexes are built on its cast to the dimension of each model
+ADD_EMBEDDING_VECTOR_COLUMN_SQL = """
+    ALTER TABLE embeddings ADD COLUMN IF NOT EXISTS embedding_vector vector
+        GENERATED ALWAYS AS (embedding::vector) STORED;
+"""
+
 
 # pylint: disable=too-many-positional-arguments
 class PostgresClient(Database):
@@ -56,10 +152,12 @@ class PostgresClient(Database):
         self,
         connection_details: Optional[Union[Dict[str, Any], str]] = None,
         connection: Any = None,
+        pgvector: Optional[bool] = None,
     ) -> None:
         # Import here to avoid mandatory dependency
         try:
             import psycopg
+            from psycopg import sql
         except ModuleNotFoundError as e:
             raise ImportError(
                 "psycopg is an optional dependency, ensure the library is installed."
@@ -67,6 +165,8 @@ class PostgresClient(Database):
             ) from e
 
         self.psycopg = psycopg
+        self.sql = sql
+        self.pgvector = PGVECTOR_ENABLED if pgvector is None else pgvector
 
         if connection is not None:
             self.conn = connection
@@ -93,6 +193,8 @@ class PostgresClient(Database):
         Ensure that the `embeddings` table exists.
         """
         dsn = self.conn.info.dsn
+        if self.pgvector:
+            dsn = f"{dsn} pgvector"
 
         if _SCHEMA_CHECKED.get(dsn):
             logger.debug("PostgreSQL schema already checked, skipping.")
@@ -107,11 +209,31 @@ class PostgresClient(Database):
                 logger.debug(
                     "Ensured 'embeddings_index' table either exists or was created in Postgres."
                 )
+
+                cur.execute(CREATE_EMBEDDINGS_INDEX_CHUNKS_TABLE_SQL)
+                logger.debug(
+                    "Ensured 'embeddings_index_chunks' table either exists "
+                    "or was created in Postgres."
+                )
+
+                cur.execute(CREATE_EMBEDDING_HASH_INDEX_SQL)
+                cur.execute(ADD_EMBEDDING_CODE_COLUMNS_SQL)
+                cur.execute(CREATE_EMBEDDINGS_CODEBOOK_TABLE_SQL)
+                logger.debug(
+                    "Ensured compressed embedding columns and 'embeddings_codebook' table "
+                    "exist in Postgres."
+                )
+
+                if self.pgvector:
+                    cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+                    cur.execute(ADD_EMBEDDING_VECTOR_COLUMN_SQL)
+                    logger.debug("Ensured 'embedding_vector' column exists in Postgres.")
             except Exception as e:
                 if getattr(e, "sqlstate", None) == "42501":  # permission denied
                     raise ValueError(
                         "The PostgreSQL user does not have permission to create "
-                        "the required tables ('embeddings', 'embeddings_index'). "
+                        "the required tables ('embeddings', 'embeddings_index', "
+                        "'embeddings_index_chunks', 'embeddings_codebook'). "
                         "Please ask your database administrator to grant CREATE privileges "
                         "on the schema."
                     ) from e
@@ -124,6 +246,23 @@ class PostgresClient(Database):
         """Close the database connection."""
         self.conn.close()
 
+    def ping(self) -> bool:
+        """Check the connection is open and the server responds."""
+        if self.conn.closed:
+            return False
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            self.conn.rollback()
+            return True
+        except self.psycopg.Error:
+            return False
+
+    def reset(self) -> None:
+        """Roll back any transaction left open, e.g. by a select or a failed statement."""
+        if self.conn.info.transaction_status != self.psycopg.pq.TransactionStatus.IDLE:
+            self.conn.rollback()
+
     def upsert_embeddings_index(
         self,
         model_name: str,
@@ -143,16 +282,32 @@ class PostgresClient(Database):
         """
         query = """
             INSERT INTO embeddings_index (model_name, detector_backend, align, l2_normalized, index_data)
-            VALUES (%s, %s, %s, %s, %s)
+            VALUES (%s, %s, %s, %s, NULL)
             ON CONFLICT (model_name, detector_backend, align, l2_normalized)
             DO UPDATE SET
-                index_data = EXCLUDED.index_data,
+                index_data = NULL,
                 updated_at = NOW()
+            RETURNING id
         """
+        chunks = [
+            (i // INDEX_CHUNK_SIZE, index_data[i : i + INDEX_CHUNK_SIZE])
+            for i in range(0, len(index_data), INDEX_CHUNK_SIZE)
+        ]
+
+        # chunks are replaced in a single transaction, so readers never see a partial index
         with self.conn.cursor() as cur:
             cur.execute(
                 query,
-                (model_name, detector_backend, aligned, l2_normalized, index_data),
+                (model_name, detector_backend, aligned, l2_normalized),
+            )
+            index_id = cur.fetchone()[0]
+            cur.execute("DELETE FROM embeddings_index_chunks WHERE index_id = %s", (index_id,))
+            cur.executemany(
+                """
+                INSERT INTO embeddings_index_chunks (index_id, chunk_no, chunk_data)
+                VALUES (%s, %s, %s)
+                """,
+                [(index_id, chunk_no, chunk_data) for chunk_no, chunk_data in chunks],
             )
             self.conn.commit()
 
@@ -173,93 +328,139 @@ class PostgresClient(Database):
         Returns:
             bytes: Serialized index data.
         """
+        # indexes stored before chunking was introduced are kept in index_data column
         query = """
-            SELECT index_data
-            FROM embeddings_index
-            WHERE model_name = %s AND detector_backend = %s AND align = %s AND l2_normalized = %s
+            SELECT COALESCE(c.chunk_data, i.index_data)
+            FROM embeddings_index i
+            LEFT JOIN embeddings_index_chunks c ON c.index_id = i.id
+            WHERE i.model_name = %s AND i.detector_backend = %s
+                AND i.align = %s AND i.l2_normalized = %s
+            ORDER BY c.chunk_no ASC
         """
         with self.conn.cursor() as cur:
             cur.execute(
                 query,
                 (model_name, detector_backend, aligned, l2_normalized),
             )
-            result = cur.fetchone()
-            if result:
-                return cast(bytes, result[0])
+            result = cur.fetchall()
+            if result and result[0][0] is not None:
+                return b"".join(cast(bytes, r[0]) for r in result)
             raise ValueError(
                 "No Embeddings index found for the specified parameters "
                 f" {model_name=}, {detector_backend=}, {aligned=}, {l2_normalized=}. "
                 "You must run build_index first."
             )
 
-    def insert_embeddings(self, embeddings: List[Dict[str, Any]], batch_size: int = 100) -> int:
+    def get_embeddings_index_version(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+    ) -> Optional[str]:
+        """
+        Get version of embeddings index from PostgreSQL.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+        Returns:
+            str: last update time of the index or None if there is no index.
+        """
+        query = """
+            SELECT updated_at FROM embeddings_index
+            WHERE model_name = %s AND detector_backend = %s AND align = %s AND l2_normalized = %s
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(query, (model_name, detector_backend, aligned, l2_normalized))
+            result = cur.fetchone()
+        return None if result is None else str(result[0])
+
+    def insert_embeddings(
+        self, embeddings: List[Dict[str, Any]], batch_size: Optional[int] = None
+    ) -> int:
         """
-        Insert multiple embeddings into PostgreSQL.
+        Insert multiple embeddings into PostgreSQL with binary COPY.
         Args:
             embeddings (List[Dict[str, Any]]): List of embeddings to insert.
-            batch_size (int): Number of embeddings to insert per batch.
+            batch_size (int): Number of rows streamed and committed together. All rows are
+                inserted in a single transaction if it is 0 (default is
+                DEEPFACE_POSTGRES_CHECKPOINT_SIZE environment variable or 0).
         Returns:
             int: Number of embeddings inserted.
         """
         if not embeddings:
             raise ValueError("No embeddings to insert.")
 
-        query = """
-            INSERT INTO embeddings (
-                img_name,
-                face,
-                face_shape,
-                model_name,
-                detector_backend,
-                aligned,
-                l2_normalized,
-                embedding,
-                face_hash,
-                embedding_hash
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
-        """
-
-        values = []
-        for e in embeddings:
-            face = e["face"]
-            face_shape = list(face.shape)
-            face_bytes = face.astype(np.float32).tobytes()
-            face_json = json.dumps(face.tolist())
+        if batch_size is None:
+            batch_size = COPY_CHECKPOINT_SIZE
+        if batch_size <= 0:
+            batch_size = len(embeddings)
 
-            embedding_bytes = struct.pack(f'{len(e["embedding"])}d', *e["embedding"])
+        embedding_hashes = [find_embedding_hash(e["embedding"]) for e in embeddings]
 
-            # uniqueness is guaranteed by face hash and embedding hash
-            face_hash = hashlib.sha256(face_json.encode()).hexdigest()
-            embedding_hash = hashlib.sha256(embedding_bytes).hexdigest()
-
-            values.append(
-                (
-                    e["img_name"],
-                    face_bytes,
-                    face_shape,
-                    e["model_name"],
-                    e["detector_backend"],
-                    e["aligned"],
-                    e["l2_normalized"],
-                    e["embedding"],
-                    face_hash,
-                    embedding_hash,
-                )
+        # faces registered before raw face hashes were introduced have json based hashes
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT face_hash, embedding_hash FROM embeddings WHERE embedding_hash = ANY(%s)",
+                (embedding_hashes,),
+            )
+            stored_hashes = set(cur.fetchall())
+        if find_legacy_duplicates(
+            faces=[e["face"] for e in embeddings],
+            embedding_hashes=embedding_hashes,
+            stored_hashes=stored_hashes,
+        ):
+            self.conn.rollback()
+            raise ValueError(
+                "Duplicate detected for extracted face and embedding columns after "
+                "0 committed embeddings"
             )
 
+        inserted = 0
         try:
             with self.conn.cursor() as cur:
-                for i in range(0, len(values), batch_size):
-                    cur.executemany(query, values[i : i + batch_size])
-                    # commit for every batch
+                for i in range(0, len(embeddings), batch_size):
+                    with cur.copy(COPY_EMBEDDINGS_SQL) as copy:
+                        copy.set_types(COPY_EMBEDDINGS_TYPES)
+                        for e, embedding_hash in zip(
+                            embeddings[i : i + batch_size], embedding_hashes[i : i + batch_size]
+                        ):
+                            copy.write_row(self.__to_copy_row(e, embedding_hash))
                     self.conn.commit()
-                return len(values)
+                    inserted = min(i + batch_size, len(embeddings))
+            return inserted
         except self.psycopg.errors.UniqueViolation as e:
+            self.conn.rollback()
             raise ValueError(
-                f"Duplicate detected for extracted face and embedding columns in {i}-th batch"
+                "Duplicate detected for extracted face and embedding columns after "
+                f"{inserted} committed embeddings"
             ) from e
 
+    @staticmethod
+    def __to_copy_row(e: Dict[str, Any], embedding_hash: str) -> Tuple[Any, ...]:
+        """
+        Convert an embedding record into a row of binary COPY
+        """
+        face = np.ascontiguousarray(e["face"], dtype=np.float32)
+        embedding = np.asarray(e["embedding"], dtype=np.float64)
+        return (
+            e["img_name"],
+            face.tobytes(),
+            list(face.shape),
+            e["model_name"],
+            e["detector_backend"],
+            e["aligned"],
+            e["l2_normalized"],
+            embedding.tolist(),
+            # uniqueness is guaranteed by face hash and embedding hash
+            find_face_hash(e["face"]),
+            embedding_hash,
+            e.get("embedding_code"),
+            e.get("embedding_compression"),
+        )
+
     def fetch_all_embeddings(
         self,
         model_name: str,
@@ -267,37 +468,334 @@ class PostgresClient(Database):
         aligned: bool,
         l2_normalized: bool,
         batch_size: int = 1000,
+        after_id: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
+        """
+        Fetch all embeddings from PostgreSQL based on specified parameters.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+            batch_size (int): Number of records to fetch in each round trip.
+            after_id (int): If provided, only embeddings with a greater id are fetched.
+        Returns:
+            List[Dict[str, Any]]: List of embedding records.
+        """
+        return [
+            item
+            for batch in self.iter_embeddings(
+                model_name=model_name,
+                detector_backend=detector_backend,
+                aligned=aligned,
+                l2_normalized=l2_normalized,
+                batch_size=batch_size,
+                after_id=after_id,
+            )
+            for item in batch
+        ]
 
+    def iter_embeddings(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        batch_size: int = 1000,
+        after_id: Optional[int] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream embeddings from PostgreSQL with a server side cursor, one batch per round trip.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+            batch_size (int): Number of records to fetch in each round trip.
+            after_id (int): If provided, only embeddings with a greater id are fetched.
+        Returns:
+            Iterator[List[Dict[str, Any]]]: Batches of embedding records.
+        """
         query = """
             SELECT id, img_name, embedding
             FROM embeddings
             WHERE model_name = %s AND detector_backend = %s AND aligned = %s AND l2_normalized = %s
+                AND id > %s
             ORDER BY id ASC;
         """
 
-        embeddings: List[Dict[str, Any]] = []
+        with self.conn.cursor(name=f"embeddings_cursor_{uuid.uuid4().hex}") as cur:
+            cur.execute(
+                query,
+                (
+                    model_name,
+                    detector_backend,
+                    aligned,
+                    l2_normalized,
+                    after_id if after_id is not None else 0,
+                ),
+            )
+            while True:
+                batch = cur.fetchmany(batch_size)
+                if not batch:
+                    break
 
-        with self.conn.cursor(name="embeddings_cursor") as cur:
-            cur.execute(query, (model_name, detector_backend, aligned, l2_normalized))
+                yield [
+                    {
+                        "id": r[0],
+                        "img_name": r[1],
+                        "embedding": r[2],
+                        "model_name": model_name,
+                        "detector_backend": detector_backend,
+                        "aligned": aligned,
+                        "l2_normalized": l2_normalized,
+                    }
+                    for r in batch
+                ]
+
+    def iter_embedding_codes(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        compression: str,
+        batch_size: int = 1000,
+    ) -> Iterator[Tuple[NDArray[Any], List[str], NDArray[Any]]]:
+        """
+        Stream compressed codes of embeddings registered with the given compression.
+            Full embeddings are not read, so the scan moves only the compressed bytes.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+            compression (str): float16, int8 or pq.
+            batch_size (int): Number of records to fetch in each round trip.
+        Returns:
+            Iterator of ids, image names and (n, code_size) shaped uint8 codes.
+        """
+        query = """
+            SELECT id, img_name, embedding_code
+            FROM embeddings
+            WHERE model_name = %s AND detector_backend = %s AND aligned = %s AND l2_normalized = %s
+                AND embedding_compression = %s
+            ORDER BY id ASC;
+        """
+
+        with self.conn.cursor(name=f"embedding_codes_cursor_{uuid.uuid4().hex}") as cur:
+            cur.execute(
+                query, (model_name, detector_backend, aligned, l2_normalized, compression)
+            )
             while True:
                 batch = cur.fetchmany(batch_size)
                 if not batch:
                     break
 
-                for r in batch:
-                    embeddings.append(
-                        {
-                            "id": r[0],
-                            "img_name": r[1],
-                            "embedding": r[2],
-                            "model_name": model_name,
-                            "detector_backend": detector_backend,
-                            "aligned": aligned,
-                            "l2_normalized": l2_normalized,
-                        }
-                    )
-        return embeddings
+                yield (
+                    np.array([r[0] for r in batch], dtype=np.int64),
+                    [r[1] for r in batch],
+                    np.frombuffer(b"".join(bytes(r[2]) for r in batch), dtype=np.uint8).reshape(
+                        len(batch), -1
+                    ),
+                )
+
+    def iter_uncompressed_embedding_blocks(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        compression: str,
+        batch_size: int = 1000,
+    ) -> Iterator[Tuple[NDArray[Any], List[str], NDArray[Any]]]:
+        """
+        Stream full embeddings not registered with the given compression.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+            compression (str): float16, int8 or pq.
+            batch_size (int): Number of records to fetch in each round trip.
+        Returns:
+            Iterator of ids, image names and (n, dimension) shaped float32 vectors.
+        """
+        query = """
+            SELECT id, img_name, embedding
+            FROM embeddings
+            WHERE model_name = %s AND detector_backend = %s AND aligned = %s AND l2_normalized = %s
+                AND embedding_compression IS DISTINCT FROM %s
+            ORDER BY id ASC;
+        """
+
+        with self.conn.cursor(name=f"uncompressed_cursor_{uuid.uuid4().hex}") as cur:
+            cur.execute(
+                query, (model_name, detector_backend, aligned, l2_normalized, compression)
+            )
+            while True:
+                batch = cur.fetchmany(batch_size)
+                if not batch:
+                    break
+
+                yield (
+                    np.array([r[0] for r in batch], dtype=np.int64),
+                    [r[1] for r in batch],
+                    np.array([r[2] for r in batch], dtype=np.float32),
+                )
+
+    def fetch_embeddings_by_id(self, ids: List[Any]) -> Dict[Any, List[float]]:
+        """
+        Fetch full embeddings of the given ids from PostgreSQL.
+        Args:
+            ids (List[int]): ids of the embeddings.
+        Returns:
+            Dict[int, List[float]]: embedding of each id.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT id, embedding FROM embeddings WHERE id = ANY(%s)",
+                ([int(i) for i in ids],),
+            )
+            return {r[0]: r[1] for r in cur.fetchall()}
+
+    def ensure_codebook(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        codebook: Optional[bytes] = None,
+    ) -> Optional[bytes]:
+        """
+        Retrieve the product quantization codebook of a model configuration from PostgreSQL,
+            storing the given one first if there is none yet.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+            codebook (bytes): Serialized codebook to store if there is none yet.
+        Returns:
+            bytes: Serialized codebook or None if there is none.
+        """
+        with self.conn.cursor() as cur:
+            if codebook is not None:
+                cur.execute(
+                    """
+                    INSERT INTO embeddings_codebook
+                        (model_name, detector_backend, align, l2_normalized, codebook)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (model_name, detector_backend, align, l2_normalized) DO NOTHING
+                    """,
+                    (model_name, detector_backend, aligned, l2_normalized, codebook),
+                )
+            cur.execute(
+                """
+                SELECT codebook FROM embeddings_codebook
+                WHERE model_name = %s AND detector_backend = %s
+                    AND align = %s AND l2_normalized = %s
+                """,
+                (model_name, detector_backend, aligned, l2_normalized),
+            )
+            result = cur.fetchone()
+        self.conn.commit()
+        return None if result is None else bytes(result[0])
+
+    def has_vector_search(self) -> bool:
+        """Whether ann search is served by pgvector."""
+        return self.pgvector
+
+    def create_vector_index(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        max_neighbors_per_node: int = 16,
+    ) -> None:
+        """
+        Create a pgvector index for the embeddings of a model configuration. The index is
+            partial, so each configuration is indexed with its own dimension and metric.
+        Args:
+            model_name (str): Name of the model.
+            detector_backend (str): Name of the detector backend.
+            aligned (bool): Whether the embeddings are aligned.
+            l2_normalized (bool): Whether the embeddings are L2 normalized.
+            max_neighbors_per_node (int): m parameter of hnsw index.
+        """
+        if not self.pgvector:
+            raise ValueError(
+                "pgvector mode is not enabled. Set DEEPFACE_POSTGRES_PGVECTOR=true to use it."
+            )
+
+        if PGVECTOR_INDEX_METHOD not in ["hnsw", "ivfflat"]:
+            raise ValueError(
+                f"Unsupported pgvector index method {PGVECTOR_INDEX_METHOD}. "
+                "Options: hnsw, ivfflat."
+            )
+
+        sql = self.sql
+        condition = self.__vector_condition(model_name, detector_backend, aligned, l2_normalized)
+
+        with self.conn.cursor() as cur:
+            cur.execute(
+                sql.SQL(
+                    "SELECT array_length(embedding, 1), COUNT(*) OVER () FROM embeddings "
+                    "WHERE {condition} LIMIT 1"
+                ).format(condition=condition)
+            )
+            row = cur.fetchone()
+            if row is None:
+                raise ValueError(
+                    "No embeddings found in the database for the criteria "
+                    f"{model_name=}, {detector_backend=}, {aligned=}, {l2_normalized=}."
+                )
+            dimension, num_embeddings = int(row[0]), int(row[1])
+
+            if dimension > PGVECTOR_MAX_INDEXED_HALFVEC_DIMENSIONS:
+                self.conn.rollback()
+                raise ValueError(
+                    f"{model_name} embeddings have {dimension} dimensions but pgvector indexes "
+                    f"support up to {PGVECTOR_MAX_INDEXED_HALFVEC_DIMENSIONS}. "
+                    "Use search_method='exact' for this model."
+                )
+
+            if PGVECTOR_INDEX_METHOD == "hnsw":
+                options = sql.SQL("m = {m}, ef_construction = 64").format(
+                    m=sql.Literal(max_neighbors_per_node)
+                )
+            else:
+                # recommended number of lists for up to 1M rows
+                options = sql.SQL("lists = {lists}").format(
+                    lists=sql.Literal(max(1, num_embeddings // 1000))
+                )
+
+            cur.execute(
+                sql.SQL(
+                    "CREATE INDEX IF NOT EXISTS {name} ON embeddings USING {method} "
+                    "(({expression}) {ops}) WITH ({options}) WHERE {condition}"
+                ).format(
+                    name=sql.Identifier(
+                        self.__vector_index_name(
+                            model_name, detector_backend, aligned, l2_normalized
+                        )
+                    ),
+                    method=sql.SQL(PGVECTOR_INDEX_METHOD),
+                    expression=self.__vector_expression(dimension),
+                    ops=sql.SQL(
+                        f"{self.__vector_type(dimension)}_"
+                        f"{'cosine' if l2_normalized else 'l2'}_ops"
+                    ),
+                    options=options,
+                    condition=condition,
+                )
+            )
+        self.conn.commit()
+        logger.info(
+            f"pgvector {PGVECTOR_INDEX_METHOD} index is ready for {num_embeddings} "
+            f"{model_name} embeddings."
+        )
 
     def search_by_vector(
         self,
@@ -307,8 +805,119 @@ class PostgresClient(Database):
         aligned: bool = True,
         l2_normalized: bool = False,
         limit: int = 10,
+        threshold: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
         """
-        ANN search using the main vector (embedding).
+        ANN search with pgvector. Distance is cosine distance for l2 normalized embeddings
+            and squared euclidean distance otherwise. Only the nearest limit neighbours within
+            the threshold are returned from the server.
+        """
+        if not self.pgvector:
+            raise NotImplementedError(
+                "ANN search is natively supported in Postgres only with pgvector. "
+                "Set DEEPFACE_POSTGRES_PGVECTOR=true to use it."
+            )
+
+        sql = self.sql
+        dimension = len(vector)
+        target = "[" + ",".join(str(float(value)) for value in vector) + "]"
+
+        # literals instead of parameters so that the planner can match the partial index
+        query = sql.SQL(
+            """
+            SELECT id, img_name, distance FROM (
+                SELECT id, img_name, {expression} {operator} {target}::{vector_type}({dimension})
+                    AS distance
+                FROM embeddings
+                WHERE {condition}
+                ORDER BY distance
+                LIMIT {limit}
+            ) neighbours
+            WHERE {threshold} IS NULL OR distance <= {threshold}
+            ORDER BY distance
+            """
+        ).format(
+            expression=self.__vector_expression(dimension),
+            operator=sql.SQL("<=>" if l2_normalized else "<->"),
+            target=sql.Literal(target),
+            vector_type=sql.SQL(self.__vector_type(dimension)),
+            dimension=sql.Literal(dimension),
+            condition=self.__vector_condition(
+                model_name, detector_backend, aligned, l2_normalized
+            ),
+            limit=sql.Literal(limit),
+            # euclidean distances are compared before they are squared
+            threshold=sql.Literal(
+                None
+                if threshold is None
+                else (threshold if l2_normalized else float(threshold) ** 0.5)
+            ),
+        )
+
+        with self.conn.cursor() as cur:
+            if PGVECTOR_INDEX_METHOD == "ivfflat":
+                cur.execute(
+                    sql.SQL("SET LOCAL ivfflat.probes = {probes}").format(
+                        probes=sql.Literal(PGVECTOR_IVFFLAT_PROBES)
+                    )
+                )
+            else:
+                # hnsw returns at most ef_search neighbours
+                cur.execute(
+                    sql.SQL("SET LOCAL hnsw.ef_search = {ef_search}").format(
+                        ef_search=sql.Literal(max(40, limit))
+                    )
+                )
+            cur.execute(query)
+            rows = cur.fetchall()
+
+        return [
+            {
+                "id": r[0],
+                "img_name": r[1],
+                "distance": float(r[2]) if l2_normalized else float(r[2]) ** 2,
+            }
+            for r in rows
+        ]
+
+    def __vector_expression(self, dimension: int) -> Any:
+        """
+        Vector column cast to the dimension of a model, same expression the indexes are built on
+        """
+        sql = self.sql
+        return sql.SQL("(embedding_vector::{vector_type}({dimension}))").format(
+            vector_type=sql.SQL(self.__vector_type(dimension)), dimension=sql.Literal(dimension)
+        )
+
+    @staticmethod
+    def __vector_type(dimension: int) -> str:
+        """
+        pgvector type that embeddings of a dimension are indexed and searched as
+        """
+        return "vector" if dimension <= PGVECTOR_MAX_INDEXED_DIMENSIONS else "halfvec"
+
+    def __vector_condition(
+        self, model_name: str, detector_backend: str, aligned: bool, l2_normalized: bool
+    ) -> Any:
+        """
+        Filter of a model configuration, same predicate the partial indexes are built with
         """
-        raise NotImplementedError("ANN search is not natively supported in Postgres.")
+        sql = self.sql
+        return sql.SQL(
+            "model_name = {model_name} AND detector_backend = {detector_backend} "
+            "AND aligned = {aligned} AND l2_normalized = {l2_normalized}"
+        ).format(
+            model_name=sql.Literal(model_name),
+            detector_backend=sql.Literal(detector_backend),
+            aligned=sql.Literal(aligned),
+            l2_normalized=sql.Literal(l2_normalized),
+        )
+
+    @staticmethod
+    def __vector_index_name(
+        model_name: str, detector_backend: str, aligned: bool, l2_normalized: bool
+    ) -> str:
+        config = ":".join(
+            [model_name, detector_backend, str(aligned), str(l2_normalized), PGVECTOR_INDEX_METHOD]
+        )
+        return f"embeddings_vector_{hashlib.sha1(config.encode()).hexdigest()[:16]}"
@@ -1,7 +1,11 @@
 # built-in dependencies
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from abc import ABC, abstractmethod
 
+# 3rd party dependencies
+import numpy as np
+from numpy.typing import NDArray
+
 
 # pylint: disable=unnecessary-pass, too-many-positional-arguments
 class Database(ABC):
@@ -39,6 +43,19 @@ class Database(ABC):
         """
         pass
 
+    def get_embeddings_index_version(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+    ) -> Optional[str]:
+        """
+        Retrieve a version of the embeddings index that changes whenever it is replaced,
+        or None if the database does not track versions of indexes.
+        """
+        return None
+
     @abstractmethod
     def insert_embeddings(self, embeddings: List[Dict[str, Any]], batch_size: int = 100) -> int:
         """
@@ -54,12 +71,134 @@ class Database(ABC):
         aligned: bool,
         l2_normalized: bool,
         batch_size: int = 1000,
+        after_id: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         Fetch all embeddings from the database in batches.
+        If after_id is provided, only embeddings with a greater id are fetched.
         """
         pass
 
+    def iter_embeddings(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        batch_size: int = 1000,
+        after_id: Optional[int] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Iterate over embeddings in batches of at most batch_size records.
+        Databases that can page through results override this to avoid
+        loading all embeddings at once.
+        """
+        embeddings = self.fetch_all_embeddings(
+            model_name=model_name,
+            detector_backend=detector_backend,
+            aligned=aligned,
+            l2_normalized=l2_normalized,
+            batch_size=batch_size,
+            after_id=after_id,
+        )
+        for i in range(0, len(embeddings), batch_size):
+            yield embeddings[i : i + batch_size]
+
+    def iter_embedding_blocks(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        batch_size: int = 1000,
+    ) -> Iterator[Tuple[NDArray[Any], List[str], NDArray[Any]]]:
+        """
+        Iterate over embeddings as blocks of at most batch_size rows, so that exact search
+            holds a single block of vectors in memory at a time.
+        Returns:
+            ids (np.ndarray): (n,) shaped ids
+            img_names (list): image names
+            vectors (np.ndarray): (n, dimension) shaped float32 vectors
+        """
+        for batch in self.iter_embeddings(
+            model_name=model_name,
+            detector_backend=detector_backend,
+            aligned=aligned,
+            l2_normalized=l2_normalized,
+            batch_size=batch_size,
+        ):
+            yield (
+                np.array([item["id"] for item in batch]),
+                [item["img_name"] for item in batch],
+                np.array([item["embedding"] for item in batch], dtype=np.float32),
+            )
+
+    def iter_embedding_codes(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        compression: str,
+        batch_size: int = 1000,
+    ) -> Iterator[Tuple[NDArray[Any], List[str], NDArray[Any]]]:
+        """
+        Iterate over compressed codes of embeddings registered with the given compression.
+        Returns:
+            ids (np.ndarray): (n,) shaped ids
+            img_names (list): image names
+            codes (np.ndarray): (n, code_size) shaped uint8 codes
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support compressed embeddings."
+        )
+
+    def iter_uncompressed_embedding_blocks(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        compression: str,
+        batch_size: int = 1000,
+    ) -> Iterator[Tuple[NDArray[Any], List[str], NDArray[Any]]]:
+        """
+        Iterate over full embeddings not registered with the given compression, e.g. the ones
+            registered before a codebook was trained, so compressed search scans them exactly.
+        Returns:
+            ids (np.ndarray): (n,) shaped ids
+            img_names (list): image names
+            vectors (np.ndarray): (n, dimension) shaped float32 vectors
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support compressed embeddings."
+        )
+
+    def fetch_embeddings_by_id(self, ids: List[Any]) -> Dict[Any, List[float]]:
+        """
+        Fetch full embeddings of the given ids, e.g. to re-rank compressed search results.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support compressed embeddings."
+        )
+
+    def ensure_codebook(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        codebook: Optional[bytes] = None,
+    ) -> Optional[bytes]:
+        """
+        Retrieve the product quantization codebook of a model configuration. If there is
+            none yet and codebook is provided, it is stored. The stored codebook is returned,
+            so concurrent registrations all encode with the same one.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support compressed embeddings."
+        )
+
     @abstractmethod
     def close(self) -> None:
         """
@@ -67,6 +206,18 @@ class Database(ABC):
         """
         pass
 
+    def ping(self) -> bool:
+        """
+        Check the connection is still usable before a pooled client is handed out again.
+        """
+        return True
+
+    def reset(self) -> None:
+        """
+        Clear any state left by a request before the client is returned to the pool.
+        """
+        pass
+
     @abstractmethod
     def search_by_vector(
         self,
@@ -76,8 +227,17 @@ class Database(ABC):
         aligned: bool = True,
         l2_normalized: bool = False,
         limit: int = 10,
+        threshold: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
         """
         ANN search using the main vector (embedding).
+        Distance is cosine distance for l2 normalized embeddings and squared euclidean
+        distance otherwise. If threshold is provided, farther neighbours are not returned.
         """
         pass
+
+    def has_vector_search(self) -> bool:
+        """
+        Whether search_by_vector is served natively by the database for ann search.
+        """
+        return False
@@ -5,7 +5,7 @@ import hashlib
 import struct
 import base64
 import uuid
-from typing import Any, Dict, Optional, List, Union
+from typing import Any, Dict, Iterator, Optional, List, Union
 
 # project dependencies
 from deepface.modules.database.types import Database
@@ -168,34 +168,66 @@ class WeaviateClient(Database):
         aligned: bool,
         l2_normalized: bool,
         batch_size: int = 1000,
+        after_id: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         Fetch all embeddings with filters.
         """
+        return [
+            item
+            for batch in self.iter_embeddings(
+                model_name=model_name,
+                detector_backend=detector_backend,
+                aligned=aligned,
+                l2_normalized=l2_normalized,
+                batch_size=batch_size,
+                after_id=after_id,
+            )
+            for item in batch
+        ]
+
+    def iter_embeddings(
+        self,
+        model_name: str,
+        detector_backend: str,
+        aligned: bool,
+        l2_normalized: bool,
+        batch_size: int = 1000,
+        after_id: Optional[int] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Page through embeddings with the cursor api. A single Get query is capped by
+            the server (QUERY_MAXIMUM_RESULTS), so large classes are read page by page.
+        """
+        if after_id is not None:
+            raise ValueError("Weaviate uses uuids as ids, so after_id filter is not supported.")
+
         class_name = "EmbeddingsNorm" if l2_normalized else "EmbeddingsRaw"
-        filters = {
-            "operator": "And",
-            "operands": [
-                {"path": ["model_name"], "operator": "Equal", "valueText": model_name},
-                {"path": ["detector_backend"], "operator": "Equal", "valueText": detector_backend},
-                {"path": ["aligned"], "operator": "Equal", "valueBoolean": aligned},
-                {"path": ["l2_normalized"], "operator": "Equal", "valueBoolean": l2_normalized},
-            ],
-        }
-
-        results = (
-            self.client.query.get(class_name, ["img_name", "embedding"])
-            .with_where(filters)
-            .with_additional(["id"])
-            .do()
-        )
-        data = results.get("data", {}).get("Get", {}).get(class_name, [])
+        properties = ["img_name", "embedding", "model_name", "detector_backend", "aligned"]
+
+        cursor: Optional[str] = None
+        while True:
+            # cursor cannot be combined with where filters, so pages are filtered here
+            query = (
+                self.client.query.get(class_name, properties)
+                .with_additional(["id"])
+                .with_limit(batch_size)
+            )
+            if cursor is not None:
+                query = query.with_after(cursor)
+            results = query.do()
+
+            if results.get("errors"):
+                raise ValueError(f"Fetching embeddings from Weaviate failed: {results['errors']}")
+
+            data = results.get("data", {}).get("Get", {}).get(class_name) or []
+            if not data:
+                return
+            cursor = data[-1]["_additional"]["id"]
 
-        embeddings = []
-        for r in data:
-            embeddings.append(
+            batch = [
                 {
-                    "id": r.get("_additional", {}).get("id"),
+                    "id": r["_additional"]["id"],
                     "img_name": r["img_name"],
                     "embedding": r["embedding"],
                     "model_name": model_name,
@@ -203,8 +235,17 @@ class WeaviateClient(Database):
                     "aligned": aligned,
                     "l2_normalized": l2_normalized,
                 }
-            )
-        return embeddings
+                for r in data
+                if r["model_name"] == model_name
+                and r["detector_backend"] == detector_backend
+                and r["aligned"] == aligned
+            ]
+            if batch:
+                yield batch
+
+            # a short page is the last one, so the cursor is not asked for an empty page
+            if len(data) < batch_size:
+                return
 
     def search_by_vector(
         self,
@@ -214,6 +255,7 @@ class WeaviateClient(Database):
         aligned: bool = True,
         l2_normalized: bool = False,
         limit: int = 10,
+        threshold: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
         """
         ANN search using the main vector (embedding).
@@ -230,7 +272,11 @@ class WeaviateClient(Database):
         query = self.client.query.get(class_name, ["img_name", "embedding"])
         query = query.with_where({"operator": "And", "operands": where_filters})
         query = (
-            query.with_near_vector({"vector": vector})
+            query.with_near_vector(
+                {"vector": vector}
+                if threshold is None
+                else {"vector": vector, "distance": threshold}
+            )
             .with_limit(limit)
             .with_additional(["id", "distance"])
         )
@@ -248,12 +294,27 @@ class WeaviateClient(Database):
             for r in data
         ]
 
+    def has_vector_search(self) -> bool:
+        """
+        Weaviate serves ann search natively.
+        """
+        return True
+
     def close(self) -> None:
         """
         Close the Weaviate client connection.
         """
         self.client.close()
 
+    def ping(self) -> bool:
+        """
+        Check the Weaviate server is ready.
+        """
+        try:
+            return bool(self.client.is_ready())
+        except Exception:  # pylint: disable=broad-except
+            return False
+
     def get_embeddings_index(
         self,
         model_name: str,
@@ -1,8 +1,12 @@
 # built-in dependencies
-from typing import Any, Dict, IO, List, Union, Optional, cast
+from typing import Any, Dict, Generator, IO, List, Tuple, Union, Optional, cast
+from contextlib import contextmanager
+import os
 import uuid
 import time
 import math
+import threading
+import weakref
 
 # 3rd party dependencies
 import pandas as pd
@@ -14,12 +18,14 @@ from deepface.modules.database.types import Database
 from deepface.modules.database.postgres import PostgresClient
 from deepface.modules.database.mongo import MongoDbClient as MongoClient
 from deepface.modules.database.weaviate import WeaviateClient
+from deepface.modules.database.local import LocalClient
+from deepface.modules.database.pool import pooled_client, pool_key
+from deepface.modules.database import index_cache, compression
 
 from deepface.modules.representation import represent
 from deepface.modules.verification import (
     find_angular_distance,
     find_cosine_distance,
-    find_euclidean_distance,
     l2_normalize as find_l2_normalize,
     find_threshold,
 )
@@ -28,6 +34,16 @@ from deepface.commons.logger import Logger
 
 logger = Logger()
 
+# ids below the greatest indexed id that build_index scans again, since rows of concurrent
+# registrations may commit after rows with greater ids. It should exceed the number of
+# embeddings registered while another registration is in progress.
+INDEX_RESCAN_WINDOW = int(os.getenv("DEEPFACE_INDEX_RESCAN_WINDOW", "100000"))
+
+# identities of connections passed by callers in the index cache. Entries are dropped once a
+# connection is freed, so a new connection never inherits an index cached for a freed one.
+_connection_tokens: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+_connection_tokens_lock = threading.Lock()
+
 
 # pylint: disable=too-many-positional-arguments, no-else-return
 def register(
@@ -44,6 +60,7 @@ def register(
     database_type: str = "postgres",
     connection_details: Optional[Union[Dict[str, Any], str]] = None,
     connection: Any = None,
+    embedding_compression: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Register identities to database for face recognition
@@ -69,19 +86,27 @@ def register(
             Options: base, raw, Facenet, Facenet2018, VGGFace, VGGFace2, ArcFace (default is base).
         anti_spoofing (boolean): Flag to enable anti spoofing (default is False).
         database_type (str): Type of database to register identities. Options: 'postgres', 'mongo',
-            'weaviate' (default is 'postgres').
+            'weaviate', 'local' (default is 'postgres').
         connection_details (dict or str): Connection details for the database.
         connection (Any): Existing database connection object. If provided, this connection
             will be used instead of creating a new one.
+        embedding_compression (str): Also store a compressed code of each embedding for
+            faster exact search. Options: 'float16', 'int8', 'pq' (default is None).
+            The full embedding is still stored to re-rank candidates, so each row grows by
+            its code; only the data scanned by search shrinks. Codebook of 'pq' is trained
+            once 256 embeddings of a model are registered, embeddings registered before
+            that are stored uncompressed.
     Returns:
         result (dict): A dictionary containing registration results with following keys.
             - inserted (int): Number of embeddings successfully registered to the database.
     """
-    db_client = __connect_database(
-        database_type=database_type,
-        connection_details=connection_details,
-        connection=connection,
-    )
+    if embedding_compression is not None:
+        compression.validate_compression(embedding_compression)
+        if database_type == "weaviate":
+            raise ValueError(
+                "Weaviate manages its own vector storage, "
+                "so embedding_compression is not supported."
+            )
 
     results = __get_embeddings(
         img=img,
@@ -116,13 +141,24 @@ def register(
         }
         embedding_records.append(embedding_record)
 
-    inserted = db_client.insert_embeddings(embedding_records, batch_size=100)
+    with __database_client(
+        database_type=database_type,
+        connection_details=connection_details,
+        connection=connection,
+    ) as db_client:
+        if embedding_compression is not None and embedding_records:
+            __add_embedding_codes(
+                db_client=db_client,
+                embedding_records=embedding_records,
+                embedding_compression=embedding_compression,
+                model_name=model_name,
+                detector_backend=detector_backend,
+                align=align,
+                l2_normalize=l2_normalize,
+            )
+        inserted = db_client.insert_embeddings(embedding_records)
     logger.debug(f"Successfully registered {inserted} embeddings to the database.")
 
-    # Close the database connection if it was created internally
-    if connection is None:
-        db_client.close()
-
     return {"inserted": inserted}
 
 
@@ -143,7 +179,9 @@ def search(
     connection_details: Optional[Union[Dict[str, Any], str]] = None,
     connection: Any = None,
     search_method: str = "exact",
-) -> List[pd.DataFrame]:
+    columnar: bool = False,
+    embedding_compression: Optional[str] = None,
+) -> Union[List[pd.DataFrame], Dict[str, NDArray[Any]]]:
     """
     Search for identities in database for face recognition. This is a stateless facial
         recognition function. Use find function to do it in a stateful way.
@@ -174,14 +212,19 @@ def search(
         k (int): Number of top similar faces to retrieve from the database for each detected face.
             If not specified, all faces within the threshold will be returned (default is None).
         database_type (str): Type of database to search identities. Options: 'postgres', 'mongo',
-            'weaviate' (default is 'postgres').
+            'weaviate', 'local' (default is 'postgres').
         connection_details (dict or str): Connection details for the database.
         connection (Any): Existing database connection object. If provided, this connection
             will be used instead of creating a new one.
         search_method (str): Method to use for searching identities. Options: 'exact', 'ann'.
             To use ann search, you must run build_index function first to create the index.
+        columnar (bool): If True, matches of all faces are returned together as numpy arrays
+            instead of a dataframe per face (default is False).
+        embedding_compression (str): If set, exact search scans compressed codes of embeddings
+            registered with the same compression, and re-ranks the nearest candidates with
+            full embeddings. Options: 'float16', 'int8', 'pq' (default is None).
     Returns:
-        results (List[pd.DataFrame]):
+        results (List[pd.DataFrame] or dict):
             A list of pandas dataframes or a list of dicts. Each dataframe or dict corresponds
                 to the identity information for an individual detected in the source image.
 
@@ -197,6 +240,9 @@ def search(
                 is True, euclidean if l2_normalize is False.
             - distance: Similarity score between the faces based on the specified model
                 and distance metric
+
+            If columnar is True, a dict of arrays with query (index of the detected face),
+                id, distance and img_name (if available) keys is returned instead.
     """
     dfs: List[pd.DataFrame] = []
 
@@ -219,12 +265,6 @@ def search(
 
     threshold = find_threshold(model_name=model_name, distance_metric=distance_metric)
 
-    db_client = __connect_database(
-        database_type=database_type,
-        connection_details=connection_details,
-        connection=connection,
-    )
-
     results = __get_embeddings(
         img=img,
         model_name=model_name,
@@ -238,158 +278,550 @@ def search(
         return_face=False,
     )
 
-    if search_method == "ann" and database_type in ["mongo", "postgres"]:  # use faiss
-        try:
-            import faiss
-        except ImportError as e:
-            raise ValueError(
-                "faiss is not installed. Please install faiss to use approximate nearest neighbour."
-            ) from e
-
-        embeddings_index_bytes = db_client.get_embeddings_index(
-            model_name=model_name,
-            detector_backend=detector_backend,
-            aligned=align,
-            l2_normalized=l2_normalize,
-        )
-        embeddings_index_buffer = np.frombuffer(embeddings_index_bytes, dtype=np.uint8)
-        embeddings_index = faiss.deserialize_index(embeddings_index_buffer)
-        logger.info("Loaded embeddings index from database.")
-
-        for result in results:
-            query_vector = np.array(result["embedding"], dtype="float32").reshape(1, -1)
-            distances, indices = embeddings_index.search(query_vector, k or 20)
-            instances = []
-            for i, index in enumerate(indices[0]):
-                instance = {
-                    "id": index,
-                    # "img_name": "N/A",  # need to fetch from DB if required
-                    "model_name": model_name,
-                    "detector_backend": detector_backend,
-                    "aligned": align,
-                    "l2_normalized": l2_normalize,
-                    "search_method": search_method,
-                    "distance_metric": distance_metric,
-                    "distance": (
-                        math.sqrt(distances[0][i])
-                        if distance_metric == "euclidean"
-                        else distances[0][i] / 2
-                    ),
-                }
-                if similarity_search is False and instance["distance"] <= threshold:
-                    instances.append(instance)
-
-            if len(instances) > 0:
-                df = pd.DataFrame(instances)
-                df = df.sort_values(by="distance", ascending=True).reset_index(drop=True)
-                if k is not None and k > 0:
-                    df = df.nsmallest(k, "distance")
-                dfs.append(df)
-        return dfs
-
-    elif search_method == "ann" and database_type in ["weaviate"]:  # use vector db
-        for result in results:
-            target_vector: List[float] = result["embedding"]
-            neighbours = db_client.search_by_vector(
-                vector=target_vector,
+    with __database_client(
+        database_type=database_type,
+        connection_details=connection_details,
+        connection=connection,
+    ) as db_client:
+        if (
+            search_method == "ann"
+            and database_type in ["mongo", "postgres", "local"]
+            and not db_client.has_vector_search()
+        ):  # use faiss
+            try:
+                import faiss  # pylint: disable=unused-import
+            except ImportError as e:
+                raise ValueError(
+                    "faiss is not installed. "
+                    "Please install faiss to use approximate nearest neighbour."
+                ) from e
+
+            # deserialized indexes are cached in process and reloaded only on a new version
+            embeddings_index = index_cache.get_index(
+                key=__index_cache_key(
+                    database_type=database_type,
+                    connection_details=connection_details,
+                    connection=connection,
+                    model_name=model_name,
+                    detector_backend=detector_backend,
+                    align=align,
+                    l2_normalize=l2_normalize,
+                ),
+                db_client=db_client,
                 model_name=model_name,
                 detector_backend=detector_backend,
                 aligned=align,
                 l2_normalized=l2_normalize,
-                limit=k or 20,
+                background_client=(
+                    None
+                    if connection is not None
+                    else lambda: __database_client(
+                        database_type=database_type, connection_details=connection_details
+                    )
+                ),
+            )
+
+            if len(results) == 0:
+                return __to_columnar([], []) if columnar else dfs
+
+            # all faces of all images are resolved in a single index probe
+            query_vectors = np.array(
+                [result["embedding"] for result in results], dtype="float32"
+            ).reshape(len(results), -1)
+            distances, indices = embeddings_index.search(query_vectors, k or 20)
+
+            distances = (
+                np.sqrt(np.maximum(distances, 0))
+                if distance_metric == "euclidean"
+                else distances / 2
             )
-            instances = []
-            for neighbour in neighbours:
-                instance = {
-                    "id": neighbour["id"],
-                    "img_name": neighbour["img_name"],
-                    "model_name": model_name,
-                    "detector_backend": detector_backend,
-                    "aligned": align,
-                    "l2_normalized": l2_normalize,
-                    "search_method": search_method,
-                    "distance_metric": distance_metric,
-                    "distance": (
-                        neighbour["distance"] if l2_normalize else math.sqrt(neighbour["distance"])
+            # faiss returns -1 for missing neighbours if index has less than k vectors
+            mask = indices >= 0
+            if similarity_search is False:
+                mask &= distances <= threshold
+
+            # neighbours are already sorted by distance for each query
+            queries = np.nonzero(mask)[0]
+            columns = {"query": queries, "id": indices[mask], "distance": distances[mask]}
+
+            if columnar:
+                return columns
+
+            for query_idx in np.unique(queries):
+                rows = queries == query_idx
+                df = pd.DataFrame(
+                    {
+                        "id": columns["id"][rows],
+                        "model_name": model_name,
+                        "detector_backend": detector_backend,
+                        "aligned": align,
+                        "l2_normalized": l2_normalize,
+                        "search_method": search_method,
+                        "distance_metric": distance_metric,
+                        "distance": columns["distance"][rows],
+                    }
+                )
+                dfs.append(df)
+            return dfs
+
+        elif search_method == "ann" and db_client.has_vector_search():  # use vector db
+            query_indexes: List[int] = []
+            for query_idx, result in enumerate(results):
+                target_vector: List[float] = result["embedding"]
+                neighbours = db_client.search_by_vector(
+                    vector=target_vector,
+                    model_name=model_name,
+                    detector_backend=detector_backend,
+                    aligned=align,
+                    l2_normalized=l2_normalize,
+                    limit=k or 20,
+                    # vector databases filter by cosine or squared euclidean distance
+                    threshold=(
+                        None
+                        if similarity_search
+                        else (threshold if l2_normalize else threshold**2)
                     ),
-                }
+                )
+                instances = []
+                for neighbour in neighbours:
+                    instance = {
+                        "id": neighbour["id"],
+                        "img_name": neighbour["img_name"],
+                        "model_name": model_name,
+                        "detector_backend": detector_backend,
+                        "aligned": align,
+                        "l2_normalized": l2_normalize,
+                        "search_method": search_method,
+                        "distance_metric": distance_metric,
+                        "distance": (
+                            neighbour["distance"]
+                            if l2_normalize
+                            else math.sqrt(neighbour["distance"])
+                        ),
+                    }
+
+                    # similarity search returns the nearest neighbours whatever their distance
+                    if similarity_search or instance["distance"] <= threshold:
+                        instances.append(instance)
+
+                if len(instances) > 0:
+                    df = pd.DataFrame(instances)
+                    df = df.sort_values(by="distance", ascending=True).reset_index(drop=True)
+                    if k is not None and k > 0:
+                        df = df.nsmallest(k, "distance")
+                    dfs.append(df)
+                    query_indexes.append(query_idx)
+
+            return __to_columnar(dfs, query_indexes) if columnar else dfs
+
+        elif search_method == "exact":
+            if distance_metric not in ["cosine", "euclidean", "euclidean_l2", "angular"]:
+                raise ValueError(f"Unsupported distance metric: {distance_metric}")
 
-                if similarity_search is False and instance["distance"] <= threshold:
-                    instances.append(instance)
+            if len(results) == 0:
+                return __to_columnar([], []) if columnar else dfs
+
+            query_vectors = np.array(
+                [result["embedding"] for result in results], dtype="float32"
+            ).reshape(len(results), -1)
+
+            if embedding_compression is None:
+                candidates, num_scanned = __scan_embeddings(
+                    db_client=db_client,
+                    query_vectors=query_vectors,
+                    model_name=model_name,
+                    detector_backend=detector_backend,
+                    align=align,
+                    l2_normalize=l2_normalize,
+                    distance_metric=distance_metric,
+                    threshold=None if similarity_search else threshold,
+                    k=k,
+                )
+            else:
+                compression.validate_compression(embedding_compression)
+                candidates, num_scanned = __scan_embedding_codes(
+                    db_client=db_client,
+                    query_vectors=query_vectors,
+                    model_name=model_name,
+                    detector_backend=detector_backend,
+                    align=align,
+                    l2_normalize=l2_normalize,
+                    distance_metric=distance_metric,
+                    threshold=None if similarity_search else threshold,
+                    k=k,
+                    embedding_compression=embedding_compression,
+                )
 
-            if len(instances) > 0:
-                df = pd.DataFrame(instances)
-                df = df.sort_values(by="distance", ascending=True).reset_index(drop=True)
-                if k is not None and k > 0:
-                    df = df.nsmallest(k, "distance")
+            if num_scanned == 0:
+                raise ValueError(
+                    "No embeddings found in the database for the criteria "
+                    f"{model_name=}, {detector_backend=}, {align=}, {l2_normalize=}."
+                    "You must call register some embeddings to the database before using search."
+                )
+
+            for candidate in candidates:
+                order = np.argsort(candidate["distance"], kind="stable")
+                df = pd.DataFrame(
+                    {
+                        "id": candidate["id"][order],
+                        "img_name": candidate["img_name"][order],
+                        "model_name": model_name,
+                        "detector_backend": detector_backend,
+                        "aligned": align,
+                        "l2_normalized": l2_normalize,
+                        "search_method": search_method,
+                        "distance_metric": distance_metric,
+                        "distance": candidate["distance"][order],
+                    }
+                )
                 dfs.append(df)
 
-        return dfs
+            return __to_columnar(dfs, list(range(len(dfs)))) if columnar else dfs
+
+        else:
+            raise ValueError(f"Unsupported search method: {search_method}")
 
-    elif search_method == "exact":
-        source_embeddings = db_client.fetch_all_embeddings(
+
+def __scan_embeddings(
+    db_client: Database,
+    query_vectors: NDArray[Any],
+    model_name: str,
+    detector_backend: str,
+    align: bool,
+    l2_normalize: bool,
+    distance_metric: str,
+    threshold: Optional[float],
+    k: Optional[int],
+    excluded_compression: Optional[str] = None,
+) -> Tuple[List[Dict[str, NDArray[Any]]], int]:
+    """
+    Find the nearest embeddings of each query face with a streaming exact scan
+    Args:
+        excluded_compression (str): if given, only embeddings not registered with this
+            compression are scanned
+    Returns:
+        candidates (list): id, img_name and distance arrays of the matches of each face
+        num_scanned (int): number of embeddings scanned
+    """
+    if excluded_compression is None:
+        blocks = db_client.iter_embedding_blocks(
             model_name=model_name,
             detector_backend=detector_backend,
             aligned=align,
             l2_normalized=l2_normalize,
         )
-        if not source_embeddings:
-            raise ValueError(
-                "No embeddings found in the database for the criteria "
-                f"{model_name=}, {detector_backend=}, {align=}, {l2_normalize=}."
-                "You must call register some embeddings to the database before using search."
+    else:
+        blocks = db_client.iter_uncompressed_embedding_blocks(
+            model_name=model_name,
+            detector_backend=detector_backend,
+            aligned=align,
+            l2_normalized=l2_normalize,
+            compression=excluded_compression,
+        )
+
+    # blocks are scored against all faces and merged into a running top k of each
+    # face, so a single block of the database is held in memory at a time
+    candidates = [__empty_candidates() for _ in query_vectors]
+    num_scanned = 0
+    for ids, img_names, vectors in blocks:
+        num_scanned += len(ids)
+        block_distances = __find_block_distances(query_vectors, vectors, distance_metric)
+        for query_idx, distances in enumerate(block_distances):
+            mask = ~np.isnan(distances)
+            if threshold is not None:
+                mask &= distances <= threshold
+            candidates[query_idx] = __merge_top_k(
+                candidates[query_idx],
+                ids=ids[mask],
+                img_names=np.asarray(img_names, dtype=object)[mask],
+                distances=distances[mask],
+                k=k,
             )
+    return candidates, num_scanned
 
-        for result in results:
-            target_embedding = cast(List[float], result["embedding"])
 
-            df = pd.DataFrame(source_embeddings)
-            df["target_embedding"] = [target_embedding for _ in range(len(df))]
-            df["search_method"] = search_method
-            df["distance_metric"] = distance_metric
+def __scan_embedding_codes(
+    db_client: Database,
+    query_vectors: NDArray[Any],
+    model_name: str,
+    detector_backend: str,
+    align: bool,
+    l2_normalize: bool,
+    distance_metric: str,
+    threshold: Optional[float],
+    k: Optional[int],
+    embedding_compression: str,
+) -> Tuple[List[Dict[str, NDArray[Any]]], int]:
+    """
+    Find the nearest embeddings of each query face by scanning compressed codes with
+        approximate distances, then re-ranking the nearest candidates with exact distances.
+        Embeddings stored without codes of the compression, e.g. registered before a
+        codebook was trained, are scanned exactly.
+    Returns:
+        candidates (list): id, img_name and distance arrays of the matches of each face
+        num_scanned (int): number of embeddings scanned
+    """
+    if k is None and threshold is None:
+        # every embedding is a match, so approximate distances cannot skip any of them
+        return __scan_embeddings(
+            db_client=db_client,
+            query_vectors=query_vectors,
+            model_name=model_name,
+            detector_backend=detector_backend,
+            align=align,
+            l2_normalize=l2_normalize,
+            distance_metric=distance_metric,
+            threshold=threshold,
+            k=k,
+        )
 
-            if distance_metric == "cosine":
-                df["distance"] = df.apply(
-                    lambda row: find_cosine_distance(row["embedding"], row["target_embedding"]),
-                    axis=1,
-                )
-            elif distance_metric == "euclidean":
-                df["distance"] = df.apply(
-                    lambda row: find_euclidean_distance(row["embedding"], row["target_embedding"]),
-                    axis=1,
-                )
-            elif distance_metric == "angular":
-                df["distance"] = df.apply(
-                    lambda row: find_angular_distance(row["embedding"], row["target_embedding"]),
-                    axis=1,
-                )
-            elif distance_metric == "euclidean_l2":
-                df["distance"] = df.apply(
-                    lambda row: find_euclidean_distance(
-                        find_l2_normalize(row["embedding"]),
-                        find_l2_normalize(row["target_embedding"]),
-                    ),
-                    axis=1,
-                )
-            else:
-                raise ValueError(f"Unsupported distance metric: {distance_metric}")
+    exact_candidates, num_scanned = __scan_embeddings(
+        db_client=db_client,
+        query_vectors=query_vectors,
+        model_name=model_name,
+        detector_backend=detector_backend,
+        align=align,
+        l2_normalize=l2_normalize,
+        distance_metric=distance_metric,
+        threshold=threshold,
+        k=k,
+        excluded_compression=embedding_compression,
+    )
+
+    codebook = None
+    if embedding_compression == "pq":
+        codebook = __get_codebook(db_client, model_name, detector_backend, align, l2_normalize)
+        if codebook is None:
+            # no embedding is encoded before a codebook is trained
+            return exact_candidates, num_scanned
+
+    # approximate distances only select candidates, threshold is applied after re-ranking.
+    # Without k, all candidates approximately within the threshold are re-ranked as well.
+    num_candidates = max(compression.RERANK_CANDIDATES, k or 0)
+    candidates = [__empty_candidates() for _ in query_vectors]
+    num_encoded = 0
+    for ids, img_names, codes in db_client.iter_embedding_codes(
+        model_name=model_name,
+        detector_backend=detector_backend,
+        aligned=align,
+        l2_normalized=l2_normalize,
+        compression=embedding_compression,
+    ):
+        num_encoded += len(ids)
+        block_distances = compression.find_approximate_distances(
+            query_vectors, codes, embedding_compression, distance_metric, codebook
+        )
+        for query_idx, distances in enumerate(block_distances):
+            candidates[query_idx] = __merge_top_k(
+                candidates[query_idx],
+                ids=ids,
+                img_names=np.asarray(img_names, dtype=object),
+                distances=distances,
+                k=num_candidates,
+                within=threshold if k is None else None,
+            )
 
-            df = df.drop(columns=["embedding", "target_embedding"])
+    if num_encoded == 0:
+        return exact_candidates, num_scanned
 
-            if similarity_search is False:
-                df = df[df["distance"] <= threshold]
+    embeddings = db_client.fetch_embeddings_by_id(
+        list({i for candidate in candidates for i in candidate["id"].tolist()})
+    )
+    for query_idx, candidate in enumerate(candidates):
+        # embeddings deleted after the scan are dropped
+        found = np.array([i in embeddings for i in candidate["id"].tolist()], dtype=bool)
+        ids, img_names = candidate["id"][found], candidate["img_name"][found]
+        vectors = np.array(
+            [embeddings[i] for i in ids.tolist()], dtype=np.float32
+        ).reshape(len(ids), query_vectors.shape[1])
+
+        distances = __find_block_distances(
+            query_vectors[query_idx : query_idx + 1], vectors, distance_metric
+        )[0]
+        mask = ~np.isnan(distances)
+        if threshold is not None:
+            mask &= distances <= threshold
+        candidates[query_idx] = __merge_top_k(
+            exact_candidates[query_idx],
+            ids=ids[mask],
+            img_names=img_names[mask],
+            distances=distances[mask],
+            k=k,
+        )
+    return candidates, num_scanned + num_encoded
 
-            if k is not None and k > 0:
-                df = df.nsmallest(k, "distance")
 
-            df = df.sort_values(by="distance", ascending=True).reset_index(drop=True)
+def __add_embedding_codes(
+    db_client: Database,
+    embedding_records: List[Dict[str, Any]],
+    embedding_compression: str,
+    model_name: str,
+    detector_backend: str,
+    align: bool,
+    l2_normalize: bool,
+) -> None:
+    """
+    Add compressed codes of embeddings to their records before they are inserted. With pq,
+        records are left uncompressed until enough embeddings exist to train a codebook.
+    """
+    vectors = np.array([record["embedding"] for record in embedding_records], dtype=np.float32)
 
-            dfs.append(df)
+    codebook = None
+    if embedding_compression == "pq":
+        codebook = __get_codebook(
+            db_client, model_name, detector_backend, align, l2_normalize, training_vectors=vectors
+        )
+        if codebook is None:
+            logger.info(
+                f"Embeddings are stored uncompressed until {compression.PQ_NUM_CENTROIDS} "
+                "of them are registered to train a product quantization codebook."
+            )
+            return
 
-        return dfs
+    codes = compression.encode(vectors, embedding_compression, codebook)
+    for record, code in zip(embedding_records, codes):
+        record["embedding_code"] = code.tobytes()
+        record["embedding_compression"] = embedding_compression
 
-    else:
-        raise ValueError(f"Unsupported search method: {search_method}")
+
+def __get_codebook(
+    db_client: Database,
+    model_name: str,
+    detector_backend: str,
+    align: bool,
+    l2_normalize: bool,
+    training_vectors: Optional[NDArray[Any]] = None,
+) -> Optional[NDArray[Any]]:
+    """
+    Retrieve the product quantization codebook of a model configuration. If there is none
+        yet and training vectors are provided, a codebook is trained on them and on stored
+        embeddings, and stored. It is not trained until there is a sample for each centroid,
+        because a codebook is kept forever once stored.
+    """
+    codebook_bytes = db_client.ensure_codebook(
+        model_name=model_name,
+        detector_backend=detector_backend,
+        aligned=align,
+        l2_normalized=l2_normalize,
+    )
+    if codebook_bytes is None and training_vectors is not None:
+        # embeddings registered so far are stored uncompressed, so they are training samples
+        blocks = [training_vectors]
+        num_samples = len(training_vectors)
+        for _, _, vectors in db_client.iter_embedding_blocks(
+            model_name=model_name,
+            detector_backend=detector_backend,
+            aligned=align,
+            l2_normalized=l2_normalize,
+        ):
+            if num_samples >= compression.PQ_TRAINING_SAMPLES:
+                break
+            blocks.append(vectors)
+            num_samples += len(vectors)
+        if num_samples < compression.PQ_NUM_CENTROIDS:
+            return None
+        training_vectors = np.concatenate(blocks, axis=0)
+
+        tic = time.time()
+        trained = compression.train_codebook(training_vectors)
+        logger.info(
+            f"Trained product quantization codebook on {len(training_vectors)} embeddings "
+            f"in {time.time() - tic:.2f} seconds."
+        )
+        codebook_bytes = db_client.ensure_codebook(
+            model_name=model_name,
+            detector_backend=detector_backend,
+            aligned=align,
+            l2_normalized=l2_normalize,
+            codebook=compression.serialize_codebook(trained),
+        )
+    return None if codebook_bytes is None else compression.deserialize_codebook(codebook_bytes)
+
+
+def __empty_candidates() -> Dict[str, NDArray[Any]]:
+    """
+    Candidates of a face before any block is scanned
+    """
+    return {
+        "id": np.empty((0,), dtype=np.int64),
+        "img_name": np.empty((0,), dtype=object),
+        "distance": np.empty((0,), dtype=np.float64),
+    }
+
+
+def __find_block_distances(
+    query_vectors: NDArray[Any], vectors: NDArray[Any], distance_metric: str
+) -> NDArray[Any]:
+    """
+    Find distances between each query face and each vector of a block
+    Args:
+        query_vectors (np.ndarray): (m, dimension) shaped embeddings of the query faces
+        vectors (np.ndarray): (n, dimension) shaped embeddings in the database
+        distance_metric (str): cosine, euclidean, euclidean_l2 or angular
+    Returns:
+        distances (np.ndarray): (m, n) shaped distances
+    """
+    if distance_metric == "cosine":
+        return cast(NDArray[Any], find_cosine_distance(vectors, query_vectors))
+    if distance_metric == "angular":
+        return cast(NDArray[Any], find_angular_distance(vectors, query_vectors))
+    if distance_metric == "euclidean_l2":
+        vectors = find_l2_normalize(vectors, axis=1)
+        query_vectors = find_l2_normalize(query_vectors, axis=1)
+    # differences are taken per query face to avoid an (m, n, dimension) shaped temporary
+    return np.stack(
+        [np.linalg.norm(vectors - query_vector, axis=1) for query_vector in query_vectors]
+    ).reshape(len(query_vectors), len(vectors))
+
+
+def __merge_top_k(
+    candidate: Dict[str, NDArray[Any]],
+    ids: NDArray[Any],
+    img_names: NDArray[Any],
+    distances: NDArray[Any],
+    k: Optional[int],
+    within: Optional[float] = None,
+) -> Dict[str, NDArray[Any]]:
+    """
+    Merge matches of a block into the running candidates of a face, keeping the nearest k
+        if k is set, and also the ones not farther than within if it is set
+    """
+    merged = {
+        "id": np.concatenate([candidate["id"], ids]) if len(candidate["id"]) else ids,
+        "img_name": np.concatenate([candidate["img_name"], img_names]),
+        "distance": np.concatenate([candidate["distance"], distances.astype(np.float64)]),
+    }
+    if k is not None and 0 < k < len(merged["distance"]):
+        kept = np.zeros(len(merged["distance"]), dtype=bool)
+        kept[np.argpartition(merged["distance"], k - 1)[:k]] = True
+        if within is not None:
+            kept |= merged["distance"] <= within
+        merged = {key: value[kept] for key, value in merged.items()}
+    return merged
+
+
+def __to_columnar(dfs: List[pd.DataFrame], query_indexes: List[int]) -> Dict[str, NDArray[Any]]:
+    """
+    Concatenate search results of each face into columns
+    Args:
+        dfs (List[pd.DataFrame]): matches of each face
+        query_indexes (List[int]): index of the face each dataframe belongs to
+    Returns:
+        columns (dict): query (index of the face), id and distance arrays, and img_name
+            if the database returns it
+    """
+    columns: Dict[str, NDArray[Any]] = {
+        "query": np.concatenate(
+            [np.full(len(df), query_idx) for df, query_idx in zip(dfs, query_indexes)]
+            + [np.empty((0,), dtype=np.int64)]
+        ).astype(np.int64)
+    }
+    for column in ["id", "img_name", "distance"]:
+        if dfs and all(column in df.columns for df in dfs):
+            columns[column] = np.concatenate([df[column].to_numpy() for df in dfs])
+        elif column != "img_name":
+            columns[column] = np.empty((0,))
+    return columns
 
 
 def __get_embeddings(
@@ -465,7 +897,7 @@ def __connect_database(
     Connect to the specified database type
     Args:
         database_type (str): Type of database to connect. Options: 'postgres', 'mongo',
-            'weaviate' (default is 'postgres').
+            'weaviate', 'local' (default is 'postgres').
         connection_details (dict or str): Connection details for the database.
         connection (Any): Existing database connection object. If provided, this connection
             will be used instead of creating a new one.
@@ -486,9 +918,48 @@ def __connect_database(
             connection_details=connection_details, connection=connection
         )
         return weaviate_client
+
+    if database_type == "local":
+        local_client = LocalClient(connection_details=connection_details, connection=connection)
+        return local_client
     raise ValueError(f"Unsupported database type: {database_type}")
 
 
+@contextmanager
+def __database_client(
+    database_type: str = "postgres",
+    connection_details: Optional[Union[Dict[str, Any], str]] = None,
+    connection: Any = None,
+) -> Generator[Database, None, None]:
+    """
+    Borrow a database client for the duration of a request. Clients are reused across
+        requests through a pool keyed by database type and connection details.
+    Args:
+        database_type (str): Type of database to connect. Options: 'postgres', 'mongo',
+            'weaviate', 'local' (default is 'postgres').
+        connection_details (dict or str): Connection details for the database.
+        connection (Any): Existing database connection object. If provided, this connection
+            will be used as is, bypassing the pool, and will not be closed.
+    Yields:
+        db_client (Database): An instance of the connected database client.
+    """
+    if connection is not None:
+        yield __connect_database(database_type=database_type, connection=connection)
+        return
+
+    if database_type not in ["postgres", "mongo", "weaviate", "local"]:
+        raise ValueError(f"Unsupported database type: {database_type}")
+
+    with pooled_client(
+        database_type=database_type,
+        connection_details=connection_details,
+        factory=lambda: __connect_database(
+            database_type=database_type, connection_details=connection_details
+        ),
+    ) as db_client:
+        yield db_client
+
+
 def __get_index(
     db_client: Database,
     model_name: str,
@@ -507,22 +978,67 @@ def __get_index(
     Returns:
         embeddings_index (Any): The deserialized embeddings index object, or None if not found.
     """
-    import faiss
-
     try:
-        embeddings_index_bytes = db_client.get_embeddings_index(
+        return index_cache.load_index(
+            db_client=db_client,
             model_name=model_name,
             detector_backend=detector_backend,
             aligned=align,
             l2_normalized=l2_normalize,
         )
-        embeddings_index_buffer = np.frombuffer(embeddings_index_bytes, dtype=np.uint8)
-        embeddings_index = faiss.deserialize_index(embeddings_index_buffer)
-        return embeddings_index
     except ValueError:
         return None
 
 
+def __index_cache_key(
+    database_type: str,
+    connection_details: Optional[Union[Dict[str, Any], str]],
+    connection: Any,
+    model_name: str,
+    detector_backend: str,
+    align: bool,
+    l2_normalize: bool,
+) -> Tuple[Any, ...]:
+    """
+    Identify an embeddings index in the process level index cache
+    Args:
+        database_type (str): Type of database.
+        connection_details (dict or str): Connection details for the database.
+        connection (Any): Existing database connection object.
+        model_name (str): Model for face recognition.
+        detector_backend (string): face detector backend.
+        align (bool): Flag to enable face alignment.
+        l2_normalize (bool): Flag to enable L2 normalization (unit vector normalization)
+    Returns:
+        key (tuple): database identity and model configuration
+    """
+    database = (
+        pool_key(database_type, connection_details)
+        if connection is None
+        else (database_type, f"connection:{__connection_token(connection)}")
+    )
+    return (*database, model_name, detector_backend, align, l2_normalize)
+
+
+def __connection_token(connection: Any) -> str:
+    """
+    Find a unique token of a connection that lives as long as the connection does
+    Args:
+        connection (Any): Existing database connection object.
+    Returns:
+        token (str): same token for the same connection, and a new one for any other
+    """
+    with _connection_tokens_lock:
+        try:
+            token = _connection_tokens.get(connection)
+            if token is None:
+                token = _connection_tokens[connection] = uuid.uuid4().hex
+            return token
+        except TypeError:
+            # connection cannot be weakly referenced, so its index is not served from cache
+            return uuid.uuid4().hex
+
+
 def build_index(
     model_name: str = "VGG-Face",
     detector_backend: str = "opencv",
@@ -536,7 +1052,8 @@ def build_index(
 ) -> None:
     """
     Build index for faster search in the database. You should set search_method to 'ann'
-        in the search function to use the built index.
+        in the search function to use the built index. For postgres with pgvector mode
+        enabled (DEEPFACE_POSTGRES_PGVECTOR=true), a pgvector index is created instead.
     Args:
         model_name (str): Model for face recognition. Options: VGG-Face, Facenet, Facenet512,
             OpenFace, DeepFace, DeepID, Dlib, ArcFace, SFace and GhostFaceNet (default is VGG-Face).
@@ -547,10 +1064,12 @@ def build_index(
         align (bool): Flag to enable face alignment (default is True).
         l2_normalize (bool): Flag to enable L2 normalization (unit vector normalization)
         database_type (str): Type of database to build index. Options: 'postgres', 'mongo',
-            'weaviate' (default is 'postgres').
+            'weaviate', 'local' (default is 'postgres').
         connection (Any): Existing database connection object. If provided, this connection
             will be used instead of creating a new one.
         connection_details (dict or str): Connection details for the database.
+        batch_size (int): Number of embeddings fetched and added to the index per batch
+            (default is 1000).
         max_neighbors_per_node (int): Maximum number of neighbors per node in the index
             (default is 32).
     """
@@ -561,95 +1080,130 @@ def build_index(
         )
         return
 
-    try:
-        import faiss
-    except ImportError as e:
-        raise ValueError("faiss is not installed. Please install faiss to use build_index.") from e
-
-    db_client = __connect_database(
+    with __database_client(
         database_type=database_type,
         connection_details=connection_details,
         connection=connection,
-    )
-
-    index = __get_index(
-        db_client=db_client,
-        model_name=model_name,
-        detector_backend=detector_backend,
-        align=align,
-        l2_normalize=l2_normalize,
-    )
-    if index is not None:
-        indexed_indices = faiss.vector_to_array(index.id_map)
-        indexed_embeddings = set(indexed_indices)
-        logger.info(f"Found {len(indexed_embeddings)} embeddings already indexed in the database.")
-    else:
-        logger.info("No existing index found in the database. A new index will be created.")
-        indexed_embeddings = set()
+    ) as db_client:
+        if isinstance(db_client, PostgresClient) and db_client.has_vector_search():
+            db_client.create_vector_index(
+                model_name=model_name,
+                detector_backend=detector_backend,
+                aligned=align,
+                l2_normalized=l2_normalize,
+                max_neighbors_per_node=max_neighbors_per_node,
+            )
+            return
 
-    tic = time.time()
-    source_embeddings = db_client.fetch_all_embeddings(
-        model_name=model_name,
-        detector_backend=detector_backend,
-        aligned=align,
-        l2_normalized=l2_normalize,
-    )
-    toc = time.time()
+        try:
+            import faiss
+        except ImportError as e:
+            raise ValueError(
+                "faiss is not installed. Please install faiss to use build_index."
+            ) from e
 
-    if not source_embeddings:
-        raise ValueError(
-            "No embeddings found in the database for the criteria "
-            f"{model_name=}, {detector_backend=}, {align=}, {l2_normalize=}."
-            "You must call register some embeddings to the database before using build_index."
+        index = __get_index(
+            db_client=db_client,
+            model_name=model_name,
+            detector_backend=detector_backend,
+            align=align,
+            l2_normalize=l2_normalize,
         )
-    logger.info(
-        f"Fetched {len(source_embeddings)} embeddings from database in {toc - tic:.2f} seconds."
-    )
-
-    unindexed_source_embeddings = [
-        item for item in source_embeddings if item["id"] not in indexed_embeddings
-    ]
 
-    if not unindexed_source_embeddings:
-        logger.info("All embeddings are already indexed. No new embeddings to index.")
-        return
-
-    ids = [item["id"] for item in unindexed_source_embeddings]
-    vectors = np.array([item["embedding"] for item in unindexed_source_embeddings], dtype="float32")
-
-    embedding_dim_size = len(source_embeddings[0]["embedding"])
-
-    if index is None:
-        base_index = faiss.IndexHNSWFlat(embedding_dim_size, max_neighbors_per_node)
-        index = faiss.IndexIDMap(base_index)
-
-    tic = time.time()
-    for i in range(0, len(vectors), batch_size):
-        batch_ids = np.array(ids[i : i + batch_size], dtype="int64")
-        batch_vectors = vectors[i : i + batch_size]
-        index.add_with_ids(batch_vectors, batch_ids)
-
-    toc = time.time()
-    logger.info(f"Added {len(vectors)} embeddings to index in {toc - tic:.2f} seconds.")
+        # ids are increasing, so the greatest indexed id is the watermark of the index.
+        # A window below it is scanned again for rows committed after the index was built,
+        # and rows of the window that are already indexed are skipped.
+        scan_after_id: Optional[int] = None
+        indexed_ids: Optional[NDArray[Any]] = None
+        if index is not None and index.ntotal > 0:
+            indexed_ids = faiss.vector_to_array(index.id_map)
+            last_indexed_id = int(indexed_ids.max())
+            if last_indexed_id > INDEX_RESCAN_WINDOW:
+                scan_after_id = last_indexed_id - INDEX_RESCAN_WINDOW
+                indexed_ids = indexed_ids[indexed_ids > scan_after_id]
+            logger.info(
+                f"Found {index.ntotal} embeddings already indexed in the database "
+                f"up to id {last_indexed_id}."
+            )
+        else:
+            logger.info("No existing index found in the database. A new index will be created.")
 
-    index_path = f"/tmp/{model_name}_{detector_backend}_{align}_{l2_normalize}.faiss"
+        # embeddings are streamed in batches, so the whole table is never held in memory
+        tic = time.time()
+        num_added = 0
+        for batch in db_client.iter_embeddings(
+            model_name=model_name,
+            detector_backend=detector_backend,
+            aligned=align,
+            l2_normalized=l2_normalize,
+            batch_size=batch_size,
+            after_id=scan_after_id,
+        ):
+            ids = np.fromiter((item["id"] for item in batch), dtype="int64", count=len(batch))
+            if indexed_ids is not None:
+                unindexed = ~np.isin(ids, indexed_ids)
+                batch = [item for item, keep in zip(batch, unindexed) if keep]
+                ids = ids[unindexed]
+                if len(ids) == 0:
+                    continue
+            vectors = np.asarray([item["embedding"] for item in batch], dtype="float32")
+
+            if index is None:
+                base_index = faiss.IndexHNSWFlat(vectors.shape[1], max_neighbors_per_node)
+                index = faiss.IndexIDMap(base_index)
+
+            index.add_with_ids(vectors, ids)
+            num_added += len(ids)
+        toc = time.time()
+
+        if num_added == 0:
+            if index is not None:
+                logger.info("All embeddings are already indexed. No new embeddings to index.")
+                return
+            raise ValueError(
+                "No embeddings found in the database for the criteria "
+                f"{model_name=}, {detector_backend=}, {align=}, {l2_normalize=}."
+                "You must call register some embeddings to the database before using build_index."
+            )
+        logger.info(
+            f"Fetched and added {num_added} unindexed embeddings to index "
+            f"in {toc - tic:.2f} seconds."
+        )
 
-    # now create index from scratch, then think how to load an index and add new vectors to it
-    tic = time.time()
-    faiss.write_index(index, index_path)
-    toc = time.time()
-    logger.info(f"Saved index to disk in {toc - tic:.2f} seconds")
+        tic = time.time()
+        index_data = faiss.serialize_index(index).tobytes()
+        toc = time.time()
+        logger.info(f"Serialized index in {toc - tic:.2f} seconds")
 
-    with open(index_path, "rb") as f:
-        index_data = f.read()
+        tic = time.time()
+        db_client.upsert_embeddings_index(
+            model_name=model_name,
+            detector_backend=detector_backend,
+            aligned=align,
+            l2_normalized=l2_normalize,
+            index_data=index_data,
+        )
+        toc = time.time()
+        logger.info(f"Upserted index to database in {toc - tic:.2f} seconds.")
 
-    tic = time.time()
-    db_client.upsert_embeddings_index(
-        model_name=model_name,
-        detector_backend=detector_backend,
-        aligned=align,
-        l2_normalized=l2_normalize,
-        index_data=index_data,
-    )
-    toc = time.time()
-    logger.info(f"Upserted index to database in {toc - tic:.2f} seconds.")
+        # searches in this process use the new index without loading it from database
+        version = db_client.get_embeddings_index_version(
+            model_name=model_name,
+            detector_backend=detector_backend,
+            aligned=align,
+            l2_normalized=l2_normalize,
+        )
+        if version is not None:
+            index_cache.put_index(
+                key=__index_cache_key(
+                    database_type=database_type,
+                    connection_details=connection_details,
+                    connection=connection,
+                    model_name=model_name,
+                    detector_backend=detector_backend,
+                    align=align,
+                    l2_normalize=l2_normalize,
+                ),
+                index=index,
+                version=version,
+            )
@@ -8,7 +8,7 @@ from tqdm import tqdm
 
 # project dependencies
 from deepface.modules import modeling, detection, preprocessing
-from deepface.models.demography import Gender, Race, Emotion
+from deepface.models.demography import Gender, Race, Emotion, Distilled
 from deepface.modules.exceptions import UnimplementedError, SpoofDetected
 
 
@@ -22,6 +22,7 @@ def analyze(
     expand_percentage: int = 0,
     silent: bool = False,
     anti_spoofing: bool = False,
+    distilled: bool = False,
 ) -> Union[List[Dict[str, Any]], List[List[Dict[str, Any]]]]:
     """
     Analyze facial attributes such as age, gender, emotion, and race in the provided image.
@@ -54,6 +55,9 @@ def analyze(
 
         anti_spoofing (boolean): Flag to enable anti spoofing (default is False).
 
+        distilled (boolean): Use the distilled demography model sharing a single trunk for
+            age, gender and race instead of running three separate models (default is False).
+
     Returns:
         results (List[Dict[str, Any]]): A list of dictionaries, where each dictionary represents
            the analysis results for a detected face.
@@ -105,28 +109,9 @@ def analyze(
     """
 
     # batch input
-    if (isinstance(img_path, np.ndarray) and img_path.ndim == 4 and img_path.shape[0] > 1) or (
-        isinstance(img_path, list)
-    ):
-        batch_resp_obj: List[List[Dict[str, Any]]] = []
-        # Execute analysis for each image in the batch.
-        for single_img in img_path:
-            # Call the analyze function for each image in the batch.
-            resp_obj = analyze(
-                img_path=single_img,
-                actions=actions,
-                enforce_detection=enforce_detection,
-                detector_backend=detector_backend,
-                align=align,
-                expand_percentage=expand_percentage,
-                silent=silent,
-                anti_spoofing=anti_spoofing,
-            )
-            resp_obj = cast(List[Dict[str, Any]], resp_obj)
-
-            # Append the response object to the batch response list.
-            batch_resp_obj.append(resp_obj)
-        return batch_resp_obj
+    is_batch = (
+        isinstance(img_path, np.ndarray) and img_path.ndim == 4 and img_path.shape[0] > 1
+    ) or isinstance(img_path, list)
 
     # if actions is passed as tuple with single item, interestingly it becomes str here
     if isinstance(actions, str):
@@ -146,38 +131,71 @@ def analyze(
                 "Valid actions are `emotion`, `age`, `gender`, `race`."
             )
     # ---------------------------------
-    resp_objects = []
-
-    img_objs: List[Dict[str, Any]] = cast(
-        List[Dict[str, Any]],
-        detection.extract_faces(
-            img_path=img_path,
-            detector_backend=detector_backend,
-            enforce_detection=enforce_detection,
-            grayscale=False,
-            align=align,
-            expand_percentage=expand_percentage,
-            anti_spoofing=anti_spoofing,
-        ),
-    )
-
-    for img_obj in img_objs:
-        if anti_spoofing is True and img_obj.get("is_real", True) is False:
-            raise SpoofDetected("Spoof detected in the given image.")
-
-        img_content = img_obj["face"]
-        img_region = img_obj["facial_area"]
-        img_confidence = img_obj["confidence"]
-        if img_content.shape[0] == 0 or img_content.shape[1] == 0:
-            continue
-
-        # rgb to bgr
-        img_content = img_content[:, :, ::-1]
-
-        # resize input image
-        img_content = preprocessing.resize_image(img=img_content, target_size=(224, 224))
-
-        obj: Dict[str, Any] = {}
+    images = list(img_path) if is_batch else [img_path]  # type: ignore[arg-type]
+
+    # faces of all images are collected to feed each attribute model once
+    batch_faces: List[NDArray[Any]] = []
+    batch_objs: List[Dict[str, Any]] = []
+    batch_indexes: List[int] = []
+
+    for idx, single_img in enumerate(images):
+        img_objs: List[Dict[str, Any]] = cast(
+            List[Dict[str, Any]],
+            detection.extract_faces(
+                img_path=single_img,
+                detector_backend=detector_backend,
+                enforce_detection=enforce_detection,
+                grayscale=False,
+                align=align,
+                expand_percentage=expand_percentage,
+                anti_spoofing=anti_spoofing,
+            ),
+        )
+
+        for img_obj in img_objs:
+            if anti_spoofing is True and img_obj.get("is_real", True) is False:
+                raise SpoofDetected("Spoof detected in the given image.")
+
+            img_content = img_obj["face"]
+            if img_content.shape[0] == 0 or img_content.shape[1] == 0:
+                continue
+
+            # rgb to bgr
+            img_content = img_content[:, :, ::-1]
+
+            # resize input image
+            img_content = preprocessing.resize_image(img=img_content, target_size=(224, 224))
+
+            batch_faces.append(img_content)
+            batch_objs.append(
+                {
+                    # mention facial areas
+                    "region": img_obj["facial_area"],
+                    # include image confidence
+                    "face_confidence": img_obj["confidence"],
+                }
+            )
+            batch_indexes.append(idx)
+
+    if len(batch_faces) > 0:
+        # (n, 224, 224, 3) shaped batch of all faces
+        faces = np.concatenate(batch_faces, axis=0)
+        num_faces = faces.shape[0]
+
+        # age, gender and race heads of the distilled model are found in a single forward pass
+        distilled_predictions: Dict[str, NDArray[Any]] = {}
+        if distilled and any(action in ("age", "gender", "race") for action in actions):
+            age_predictions, gender_predictions, race_predictions = Distilled.split_predictions(
+                modeling.build_model(task="facial_attribute", model_name="Distilled").predict(
+                    faces
+                )
+            )
+            distilled_predictions = {
+                "age": age_predictions @ np.arange(0, Distilled.AGE_CLASSES),
+                "gender": gender_predictions,
+                "race": race_predictions,
+            }
+
         # facial attribute analysis
         pbar = tqdm(
             range(0, len(actions)),
@@ -189,55 +207,77 @@ def analyze(
             pbar.set_description(f"Action: {action}")
 
             if action == "emotion":
-                emotion_predictions = modeling.build_model(
-                    task="facial_attribute", model_name="Emotion"
-                ).predict(img_content)
-                sum_of_predictions = emotion_predictions.sum()
-
-                obj["emotion"] = {}
-                for i, emotion_label in enumerate(Emotion.labels):
-                    emotion_prediction = 100 * emotion_predictions[i] / sum_of_predictions
-                    obj["emotion"][emotion_label] = emotion_prediction
-
-                obj["dominant_emotion"] = Emotion.labels[np.argmax(emotion_predictions)]
+                emotion_predictions = np.reshape(
+                    modeling.build_model(task="facial_attribute", model_name="Emotion").predict(
+                        faces
+                    ),
+                    (num_faces, -1),
+                )
+                for obj, predictions in zip(batch_objs, emotion_predictions):
+                    sum_of_predictions = predictions.sum()
+                    obj["emotion"] = {}
+                    for i, emotion_label in enumerate(Emotion.labels):
+                        emotion_prediction = 100 * predictions[i] / sum_of_predictions
+                        obj["emotion"][emotion_label] = emotion_prediction
+
+                    obj["dominant_emotion"] = Emotion.labels[np.argmax(predictions)]
 
             elif action == "age":
-                apparent_age = modeling.build_model(
-                    task="facial_attribute", model_name="Age"
-                ).predict(img_content)
-                # int cast is for exception - object of type 'float32' is not JSON serializable
-                obj["age"] = int(apparent_age)
+                apparent_ages = distilled_predictions.get("age")
+                if apparent_ages is None:
+                    apparent_ages = np.atleast_1d(
+                        modeling.build_model(task="facial_attribute", model_name="Age").predict(
+                            faces
+                        )
+                    )
+                for obj, apparent_age in zip(batch_objs, apparent_ages):
+                    # int cast is for exception - object of type 'float32' is not JSON serializable
+                    obj["age"] = int(apparent_age)
 
             elif action == "gender":
-                gender_predictions = modeling.build_model(
-                    task="facial_attribute", model_name="Gender"
-                ).predict(img_content)
-                obj["gender"] = {}
-                for i, gender_label in enumerate(Gender.labels):
-                    gender_prediction = 100 * gender_predictions[i]
-                    obj["gender"][gender_label] = gender_prediction
-
-                obj["dominant_gender"] = Gender.labels[np.argmax(gender_predictions)]
+                gender_predictions = distilled_predictions.get("gender")
+                if gender_predictions is None:
+                    gender_predictions = np.reshape(
+                        modeling.build_model(task="facial_attribute", model_name="Gender").predict(
+                            faces
+                        ),
+                        (num_faces, -1),
+                    )
+                for obj, predictions in zip(batch_objs, gender_predictions):
+                    obj["gender"] = {}
+                    for i, gender_label in enumerate(Gender.labels):
+                        gender_prediction = 100 * predictions[i]
+                        obj["gender"][gender_label] = gender_prediction
+
+                    obj["dominant_gender"] = Gender.labels[np.argmax(predictions)]
 
             elif action == "race":
-                race_predictions = modeling.build_model(
-                    task="facial_attribute", model_name="Race"
-                ).predict(img_content)
-                sum_of_predictions = race_predictions.sum()
-
-                obj["race"] = {}
-                for i, race_label in enumerate(Race.labels):
-                    race_prediction = 100 * race_predictions[i] / sum_of_predictions
-                    obj["race"][race_label] = race_prediction
-
-                obj["dominant_race"] = Race.labels[np.argmax(race_predictions)]
-
-            # -----------------------------
-            # mention facial areas
-            obj["region"] = img_region
-            # include image confidence
-            obj["face_confidence"] = img_confidence
-
-        resp_objects.append(obj)
-
-    return resp_objects
+                race_predictions = distilled_predictions.get("race")
+                if race_predictions is None:
+                    race_predictions = np.reshape(
+                        modeling.build_model(task="facial_attribute", model_name="Race").predict(
+                            faces
+                        ),
+                        (num_faces, -1),
+                    )
+                for obj, predictions in zip(batch_objs, race_predictions):
+                    sum_of_predictions = predictions.sum()
+                    obj["race"] = {}
+                    for i, race_label in enumerate(Race.labels):
+                        race_prediction = 100 * predictions[i] / sum_of_predictions
+                        obj["race"][race_label] = race_prediction
+
+                    obj["dominant_race"] = Race.labels[np.argmax(predictions)]
+
+    # scatter results back to the images they belong to
+    resp_objects: List[List[Dict[str, Any]]] = [[] for _ in images]
+    for idx, obj in zip(batch_indexes, batch_objs):
+        # keep region and face confidence as the last items as before
+        obj["region"] = obj.pop("region")
+        obj["face_confidence"] = obj.pop("face_confidence")
+        resp_objects[idx].append(obj)
+
+    if is_batch:
+        return resp_objects
+
+    return resp_objects[0]
@@ -244,14 +244,27 @@ def extract_faces(
             "confidence": round(float(current_region.confidence or 0), 2),
         }
 
-        if anti_spoofing is True:
-            antispoof_model = modeling.build_model(task="spoofing", model_name="Fasnet")
-            is_real, antispoof_score = antispoof_model.analyze(img=img, facial_area=(x, y, w, h))
+        resp_objs.append(resp_obj)
+
+    if anti_spoofing is True and len(resp_objs) > 0:
+        # all faces in the image are analyzed in a single batch
+        antispoof_model = modeling.build_model(task="spoofing", model_name="Fasnet")
+        antispoof_results = antispoof_model.analyze_batch(
+            img=img,
+            facial_areas=[
+                (
+                    resp_obj["facial_area"]["x"],
+                    resp_obj["facial_area"]["y"],
+                    resp_obj["facial_area"]["w"],
+                    resp_obj["facial_area"]["h"],
+                )
+                for resp_obj in resp_objs
+            ],
+        )
+        for resp_obj, (is_real, antispoof_score) in zip(resp_objs, antispoof_results):
             resp_obj["is_real"] = is_real
             resp_obj["antispoof_score"] = antispoof_score
 
-        resp_objs.append(resp_obj)
-
     if len(resp_objs) == 0 and enforce_detection == True:
         raise ImgNotFound(
             f"Exception while extracting faces from {img_name}."
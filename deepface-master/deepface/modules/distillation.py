@@ -0,0 +1,182 @@
+# built-in dependencies
+import time
+from typing import Any, Dict
+
+# 3rd party dependencies
+import numpy as np
+from numpy.typing import NDArray
+
+# project dependencies
+from deepface.commons import package_utils, folder_utils
+from deepface.modules import modeling
+from deepface.modules.quantization import load_calibration_faces
+from deepface.models.demography import Distilled
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+tf_version = package_utils.get_tf_major_version()
+if tf_version == 1:
+    from keras.losses import categorical_crossentropy
+    from keras.optimizers import Adam
+else:
+    from tensorflow.keras.losses import categorical_crossentropy
+    from tensorflow.keras.optimizers import Adam
+
+TEACHERS = ["Age", "Gender", "Race"]
+
+
+# pylint: disable=too-many-positional-arguments
+def distill(
+    img_path: str,
+    detector_backend: str = "opencv",
+    align: bool = True,
+    epochs: int = 10,
+    batch_size: int = 16,
+    learning_rate: float = 1e-5,
+    max_samples: int = 5000,
+) -> str:
+    """
+    Train the shared trunk demography model offline to reproduce the outputs of the
+        original age, gender and race models. The trunk and heads are initialized from
+        the original models, then fine-tuned on soft labels of the originals. The weights
+        are stored in the weights folder and picked up by the Distilled facial attribute model.
+
+    Args:
+        img_path (str): folder of facial images. Use faces representative of the production data.
+        detector_backend (string): face detector backend (default is opencv).
+        align (bool): Flag to enable face alignment (default is True).
+        epochs (int): number of training epochs (default is 10).
+        batch_size (int): training batch size (default is 16).
+        learning_rate (float): learning rate of Adam optimizer (default is 1e-5).
+        max_samples (int): maximum number of faces used for training (default is 5000).
+    Returns:
+        target_file (str): exact path of distilled weights
+    """
+    faces = __load_faces(
+        img_path=img_path, detector_backend=detector_backend, align=align, max_samples=max_samples
+    )
+    logger.info(f"{faces.shape[0]} faces will be used to distill {TEACHERS} models")
+
+    teachers = [
+        modeling.build_model(task="facial_attribute", model_name=teacher) for teacher in TEACHERS
+    ]
+
+    # soft labels of the original models in the same order with distilled model's heads
+    soft_labels = np.concatenate(
+        [teacher.model.predict(faces, batch_size=batch_size, verbose=0) for teacher in teachers],
+        axis=1,
+    )
+
+    student = Distilled.build_model()
+
+    # teachers are VGG-Face trunk and a conv, flatten, softmax head on top of it.
+    # so, student's trunk and heads are initialized from the originals.
+    trunk_layers = len(teachers[0].model.layers) - 3
+    for teacher_layer, student_layer in zip(
+        teachers[0].model.layers[:trunk_layers], student.layers[:trunk_layers]
+    ):
+        student_layer.set_weights(teacher_layer.get_weights())
+
+    for head, teacher in zip(Distilled.HEADS.keys(), teachers):
+        student.get_layer(f"{head}_predictions").set_weights(
+            teacher.model.layers[-3].get_weights()
+        )
+
+    def distillation_loss(y_true: Any, y_pred: Any) -> Any:
+        loss = 0
+        start = 0
+        for classes in Distilled.HEADS.values():
+            loss += categorical_crossentropy(
+                y_true[:, start : start + classes], y_pred[:, start : start + classes]
+            )
+            start += classes
+        return loss
+
+    student.compile(optimizer=Adam(learning_rate=learning_rate), loss=distillation_loss)
+    student.fit(faces, soft_labels, epochs=epochs, batch_size=batch_size, shuffle=True)
+
+    folder_utils.initialize_folder()
+    target_file = Distilled.get_weights_path()
+    student.save_weights(target_file)
+    logger.info(f"Distilled demography weights stored at {target_file}")
+
+    return target_file
+
+
+def agreement_report(
+    img_path: str,
+    detector_backend: str = "opencv",
+    align: bool = True,
+    batch_size: int = 16,
+    max_samples: int = 1000,
+) -> Dict[str, Any]:
+    """
+    Compare the distilled demography model against the original age, gender and race models
+    Args:
+        img_path (str): folder of facial images not used in distillation
+        detector_backend (string): face detector backend (default is opencv).
+        align (bool): Flag to enable face alignment (default is True).
+        batch_size (int): inference batch size (default is 16).
+        max_samples (int): maximum number of faces to compare (default is 1000).
+    Returns:
+        report (dict): number of faces, age mean and max absolute differences,
+            gender and race agreement ratios and inference durations of both.
+    """
+    faces = __load_faces(
+        img_path=img_path, detector_backend=detector_backend, align=align, max_samples=max_samples
+    )
+
+    tic = time.time()
+    original = [
+        modeling.build_model(task="facial_attribute", model_name=teacher).model.predict(
+            faces, batch_size=batch_size, verbose=0
+        )
+        for teacher in TEACHERS
+    ]
+    original_duration = time.time() - tic
+
+    tic = time.time()
+    distilled = Distilled.split_predictions(
+        modeling.build_model(task="facial_attribute", model_name="Distilled").model.predict(
+            faces, batch_size=batch_size, verbose=0
+        )
+    )
+    distilled_duration = time.time() - tic
+
+    output_indexes = np.arange(0, Distilled.AGE_CLASSES)
+    age_differences = np.abs(original[0] @ output_indexes - distilled[0] @ output_indexes)
+
+    report = {
+        "faces": int(faces.shape[0]),
+        "age_mean_absolute_difference": float(np.mean(age_differences)),
+        "age_max_absolute_difference": float(np.max(age_differences)),
+        "gender_agreement": float(
+            np.mean(np.argmax(original[1], axis=1) == np.argmax(distilled[1], axis=1))
+        ),
+        "race_agreement": float(
+            np.mean(np.argmax(original[2], axis=1) == np.argmax(distilled[2], axis=1))
+        ),
+        "original_duration": original_duration,
+        "distilled_duration": distilled_duration,
+    }
+
+    return report
+
+
+def __load_faces(
+    img_path: str, detector_backend: str, align: bool, max_samples: int
+) -> NDArray[Any]:
+    """
+    Extract faces from a folder and pre-process them same as analyze does
+    """
+    return np.concatenate(
+        load_calibration_faces(
+            calibration_path=img_path,
+            target_size=(224, 224),
+            detector_backend=detector_backend,
+            align=align,
+            max_samples=max_samples,
+        ),
+        axis=0,
+    )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 # built-in dependencies
+import threading
 from typing import TYPE_CHECKING, Any, Final, TypedDict, Dict
 
 # project dependencies
@@ -15,6 +16,7 @@ from deepface.models.facial_recognition import (
     Facenet,
     GhostFaceNet,
     Buffalo_L,
+    Quantized,
 )
 from deepface.models.face_detection import (
     FastMtCnn,
@@ -28,7 +30,7 @@ from deepface.models.face_detection import (
     YuNet,
     CenterFace,
 )
-from deepface.models.demography import Age, Gender, Race, Emotion
+from deepface.models.demography import Age, Gender, Race, Emotion, Distilled
 from deepface.models.spoofing import FasNet
 from deepface.modules.exceptions import UnimplementedError
 
@@ -60,6 +62,16 @@ AVAILABLE_MODELS: Final[AvailableModels] = {
         "SFace": SFace.SFaceClient,
         "GhostFaceNet": GhostFaceNet.GhostFaceNetClient,
         "Buffalo_L": Buffalo_L.Buffalo_L,
+        "VGG-Face-float16": Quantized.VggFaceFloat16Client,
+        "VGG-Face-int8": Quantized.VggFaceInt8Client,
+        "Facenet-float16": Quantized.FaceNet128dFloat16Client,
+        "Facenet-int8": Quantized.FaceNet128dInt8Client,
+        "Facenet512-float16": Quantized.FaceNet512dFloat16Client,
+        "Facenet512-int8": Quantized.FaceNet512dInt8Client,
+        "ArcFace-float16": Quantized.ArcFaceFloat16Client,
+        "ArcFace-int8": Quantized.ArcFaceInt8Client,
+        "GhostFaceNet-float16": Quantized.GhostFaceNetFloat16Client,
+        "GhostFaceNet-int8": Quantized.GhostFaceNetInt8Client,
     },
     "spoofing": {
         "Fasnet": FasNet.Fasnet,
@@ -69,6 +81,7 @@ AVAILABLE_MODELS: Final[AvailableModels] = {
         "Age": Age.ApparentAgeClient,
         "Gender": Gender.GenderClient,
         "Race": Race.RaceClient,
+        "Distilled": Distilled.DistilledDemographyClient,
     },
     "face_detector": {
         "opencv": OpenCv.OpenCvClient,
@@ -94,6 +107,10 @@ AVAILABLE_MODELS: Final[AvailableModels] = {
     },
 }
 
+_build_lock = threading.Lock()
+# models are built under their own locks, so that different models can be loaded in parallel
+_model_locks: Dict[str, threading.RLock] = {}
+
 
 def build_model(task: str, model_name: str) -> Any:
     """
@@ -103,7 +120,9 @@ def build_model(task: str, model_name: str) -> Any:
         model_name (str): model identifier
             - VGG-Face, Facenet, Facenet512, OpenFace, DeepFace, DeepID, Dlib,
                 ArcFace, SFace and GhostFaceNet for face recognition
-            - Age, Gender, Emotion, Race for facial attributes
+            - quantized variants such as VGG-Face-int8 or Facenet512-float16
+                for face recognition
+            - Age, Gender, Emotion, Race, Distilled for facial attributes
             - opencv, mtcnn, ssd, dlib, retinaface, mediapipe, yolov8, 'yolov11n',
                 'yolov11s', 'yolov11m', yunet, fastmtcnn or centerface for face detectors
             - Fasnet for spoofing
@@ -117,14 +136,20 @@ def build_model(task: str, model_name: str) -> Any:
     if task not in AVAILABLE_MODELS.keys():
         raise UnimplementedError(f"unimplemented task - {task}")
 
-    if "cached_models" not in globals():
-        cached_models = {current_task: {} for current_task in AVAILABLE_MODELS.keys()}
+    model = AVAILABLE_MODELS[task].get(model_name)  # type: ignore[literal-required]
+    if not model:
+        raise UnimplementedError(f"Invalid model_name passed - {task}/{model_name}")
+
+    with _build_lock:
+        if "cached_models" not in globals():
+            cached_models = {current_task: {} for current_task in AVAILABLE_MODELS.keys()}
+        # locks are created for valid model names only, so they are bounded
+        model_lock = _model_locks.setdefault(f"{task}/{model_name}", threading.RLock())
 
     if cached_models[task].get(model_name) is None:
-        model = AVAILABLE_MODELS[task].get(model_name)  # type: ignore[literal-required]
-        if model:
-            cached_models[task][model_name] = model()
-        else:
-            raise UnimplementedError(f"Invalid model_name passed - {task}/{model_name}")
+        # threads serving concurrent requests must share a single copy of each model
+        with model_lock:
+            if cached_models[task].get(model_name) is None:
+                cached_models[task][model_name] = model()
 
     return cached_models[task][model_name]
@@ -0,0 +1,557 @@
+from __future__ import annotations
+
+# built-in dependencies
+import os
+import json
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
+
+# 3rd party dependencies
+from numpy.typing import NDArray
+import cv2
+
+# project dependencies
+from deepface import DeepFace
+from deepface.modules import streaming, tracking
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+# frames gathered from all streams into a single detection and recognition call
+BATCH_SIZE = int(os.getenv("DEEPFACE_STREAMS_BATCH_SIZE", "8"))
+# faces narrower than this many pixels are ignored
+MIN_FACE_SIZE = int(os.getenv("DEEPFACE_STREAMS_MIN_FACE_SIZE", "0"))
+
+EventSink = Callable[[Dict[str, Any]], None]
+
+
+class JsonLinesSink:
+    """
+    Thread safe event sink appending each event to a file as a json line
+    """
+
+    def __init__(self, path: str) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            self._file.write(json.dumps(event) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        with self._lock:
+            self._file.close()
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class VideoStream:
+    """
+    State of a source processed by analyze_streams
+    """
+
+    stream_id: str
+    source: Any
+    cap: Any
+    frame_buffer: streaming.FrameBuffer
+    face_tracker: tracking.FaceTracker
+    stats: streaming.StageStats
+    capture_stats: streaming.StageStats
+    output_path: Optional[str] = None
+    video_writer: Optional[Any] = None
+    capture_thread: Optional[threading.Thread] = None
+    # track id to timestamps of the first and last frames the track is visible in
+    first_seen: Dict[int, float] = field(default_factory=dict)
+    last_seen: Dict[int, float] = field(default_factory=dict)
+    num_tracks: int = 0
+
+
+# pylint: disable=too-many-arguments, too-many-locals, too-many-positional-arguments
+def analyze_streams(
+    sources: Union[List[Any], Dict[str, Any]],
+    db_path: Optional[str] = None,
+    model_name: str = "VGG-Face",
+    detector_backend: str = "opencv",
+    distance_metric: str = "cosine",
+    enable_face_analysis: bool = True,
+    anti_spoofing: bool = False,
+    tracker: str = "iou",
+    detection_interval: Optional[int] = None,
+    event_sink: Optional[Union[str, EventSink]] = None,
+    output_dir: Optional[str] = None,
+    batch_size: int = BATCH_SIZE,
+    min_face_size: int = MIN_FACE_SIZE,
+    stop_event: Optional[threading.Event] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run face recognition and facial attribute analysis on several video sources without
+        any window. Each source is read by its own capture thread, while frames of all
+        sources are detected, recognized and analyzed in shared batches. Faces are tracked
+        between detections, and each track is analyzed once when it appears.
+
+    Events are emitted as json serializable dicts:
+        - track_started: stream_id, track_id, timestamp, position_ms, frame_index,
+            facial_area, identity, confidence and demography (age, gender, emotion)
+        - track_ended: stream_id, track_id, first_seen, last_seen, identity
+
+    Args:
+        sources (list or dict): video files, camera indexes or rtsp / http urls. Stream ids
+            are the keys if a dict is given, or stream_{i} for a list.
+        db_path (string): Path to the folder containing image files to identify faces.
+            Faces are not identified if not given.
+        model_name (str): Model for face recognition (default is VGG-Face).
+        detector_backend (string): face detector backend (default is opencv).
+        distance_metric (string): Metric for measuring similarity (default is cosine).
+        enable_face_analysis (bool): Flag to enable age, gender and emotion analysis.
+        anti_spoofing (boolean): Flag to enable anti spoofing (default is False).
+        tracker (str): tracker following faces between detections. Options: 'iou', 'mil',
+            'kcf' or 'csrt' (default is iou).
+        detection_interval (int): run the face detector every n-th frame of each stream,
+            and earlier if the tracker loses a face.
+        event_sink (str or callable): path of a json lines file to append events to,
+            or a callable receiving each event. Events are only logged if not given.
+        output_dir (str): directory to write annotated videos as {stream_id}.mp4, if given.
+        batch_size (int): maximum number of frames analyzed in a single batch.
+        min_face_size (int): faces narrower than this many pixels are ignored.
+        stop_event (threading.Event): set it to stop processing, e.g. for live sources.
+    Returns:
+        stats (dict): frames, tracks, fps and latency per stream id
+    """
+    stop_event = stop_event or threading.Event()
+    named_sources = (
+        dict(sources)
+        if isinstance(sources, dict)
+        else {f"stream_{i}": source for i, source in enumerate(sources)}
+    )
+
+    sink: EventSink
+    if event_sink is None:
+        sink = log_event
+    elif isinstance(event_sink, str):
+        sink = JsonLinesSink(event_sink)
+    else:
+        sink = event_sink
+
+    identity_index = None
+    if db_path is not None:
+        identity_index = streaming.IdentityIndex(
+            db_path=db_path,
+            model_name=model_name,
+            detector_backend=detector_backend,
+            distance_metric=distance_metric,
+        )
+    streaming.build_demography_models(enable_face_analysis=enable_face_analysis)
+
+    streams: List[VideoStream] = []
+    try:
+        for stream_id, source in named_sources.items():
+            streams.append(
+                open_stream(
+                    stream_id=stream_id,
+                    source=source,
+                    tracker=tracker,
+                    detection_interval=detection_interval,
+                    output_dir=output_dir,
+                    batch_size=batch_size,
+                )
+            )
+
+        for stream in streams:
+            stream.capture_thread = threading.Thread(
+                target=streaming.capture_frames,
+                kwargs={
+                    "cap": stream.cap,
+                    "frame_buffer": stream.frame_buffer,
+                    "render_queue": None,
+                    "stop_event": stop_event,
+                    "stats": stream.capture_stats,
+                },
+                daemon=True,
+            )
+            stream.capture_thread.start()
+
+        next_stream = 0
+        while not stop_event.is_set():
+            # frames are gathered round robin, so that a busy stream cannot starve others.
+            # Video files contribute several buffered frames, live sources their latest one.
+            batch: List[Tuple[VideoStream, streaming.Frame]] = []
+            gathered = True
+            while gathered and len(batch) < batch_size:
+                gathered = False
+                for offset in range(len(streams)):
+                    if len(batch) >= batch_size:
+                        break
+                    stream = streams[(next_stream + offset) % len(streams)]
+                    if stream.frame_buffer.latest_wins and any(
+                        batched is stream for batched, _ in batch
+                    ):
+                        continue
+                    frame = stream.frame_buffer.get(timeout=0)
+                    if frame is not None:
+                        batch.append((stream, frame))
+                        gathered = True
+            next_stream = (next_stream + 1) % max(len(streams), 1)
+
+            if len(batch) == 0:
+                if all(stream.frame_buffer.closed for stream in streams):
+                    break
+                time.sleep(0.01)
+                continue
+
+            process_batch(
+                batch=batch,
+                sink=sink,
+                identity_index=identity_index,
+                detector_backend=detector_backend,
+                enable_face_analysis=enable_face_analysis,
+                anti_spoofing=anti_spoofing,
+                min_face_size=min_face_size,
+            )
+
+        for stream in streams:
+            for track in stream.face_tracker.tracks:
+                sink(track_ended_event(stream, track))
+    finally:
+        stop_event.set()
+        for stream in streams:
+            stream.frame_buffer.close()
+            if stream.capture_thread is not None:
+                stream.capture_thread.join()
+            stream.cap.release()
+            if stream.video_writer is not None:
+                stream.video_writer.release()
+        if isinstance(sink, JsonLinesSink):
+            sink.close()
+
+    results = {}
+    for stream in streams:
+        logger.info(
+            f"{stream.stream_id}: {stream.capture_stats.summary()}; {stream.stats.summary()}; "
+            f"{stream.frame_buffer.dropped} frames skipped"
+        )
+        results[stream.stream_id] = {
+            "frames": stream.stats.count,
+            "skipped_frames": stream.frame_buffer.dropped,
+            "tracks": stream.num_tracks,
+            "summary": stream.stats.summary(),
+        }
+    return results
+
+
+def log_event(event: Dict[str, Any]) -> None:
+    """
+    Default event sink logging each event as json
+    """
+    logger.info(json.dumps(event))
+
+
+def open_stream(
+    stream_id: str,
+    source: Any,
+    tracker: str,
+    detection_interval: Optional[int],
+    output_dir: Optional[str],
+    batch_size: int = BATCH_SIZE,
+) -> VideoStream:
+    """
+    Open a video source
+    Args:
+        stream_id (str): identifier of the stream in events and output file names
+        source (Any): video file, camera index or url
+        tracker (str): tracker following faces between detections
+        detection_interval (int): run the face detector every n-th frame
+        output_dir (str): directory to write the annotated video, if given
+        batch_size (int): frames of a video file buffered for a single batch
+    Returns:
+        stream (VideoStream): opened stream, frames are not captured yet
+    """
+    cap = cv2.VideoCapture(
+        source if isinstance(source, str) and not source.isdigit() else int(source)
+    )
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video source {source} of {stream_id}")
+
+    output_path = None
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, f"{stream_id}.mp4")
+
+    return VideoStream(
+        stream_id=stream_id,
+        source=source,
+        cap=cap,
+        # every frame of a video file is analyzed, whereas live sources skip frames
+        # captured while inference is busy
+        frame_buffer=(
+            streaming.FrameBuffer(latest_wins=True)
+            if streaming.is_live_source(source)
+            else streaming.FrameBuffer(
+                size=max(batch_size, streaming.FRAME_BUFFER_SIZE), latest_wins=False
+            )
+        ),
+        face_tracker=tracking.FaceTracker(tracker=tracker, detection_interval=detection_interval),
+        stats=streaming.StageStats(f"{stream_id} inference"),
+        capture_stats=streaming.StageStats(f"{stream_id} capture"),
+        output_path=output_path,
+    )
+
+
+def process_batch(
+    batch: List[Tuple[VideoStream, streaming.Frame]],
+    sink: EventSink,
+    identity_index: Optional[streaming.IdentityIndex],
+    detector_backend: str,
+    enable_face_analysis: bool,
+    anti_spoofing: bool,
+    min_face_size: int = MIN_FACE_SIZE,
+) -> None:
+    """
+    Track faces in frames of several streams, then identify and analyze new tracks
+        with shared batched calls and emit their events
+    Args:
+        batch (list): streams and their frames, frames of a stream in capture order
+        sink (callable): receives events
+        identity_index (IdentityIndex): in memory index of the facial database, if any
+        Rest of the arguments are the same as analyze_streams
+    Returns:
+        None
+    """
+    # trackers follow frames of their stream in order, so frames are tracked in rounds
+    # of at most one frame per stream, and detection is shared by streams of a round
+    rounds: List[List[Tuple[VideoStream, streaming.Frame]]] = []
+    frames_per_stream: Dict[str, int] = {}
+    for stream, frame in batch:
+        round_idx = frames_per_stream.get(stream.stream_id, 0)
+        frames_per_stream[stream.stream_id] = round_idx + 1
+        if round_idx == len(rounds):
+            rounds.append([])
+        rounds[round_idx].append((stream, frame))
+
+    # tracks visible in each frame with their facial areas in that frame
+    tracked_frames: List[
+        Tuple[VideoStream, streaming.Frame, List[Tuple[tracking.Track, tracking.FacialArea]]]
+    ] = []
+    ended_tracks: List[Tuple[VideoStream, tracking.Track]] = []
+    new_tracks: List[
+        Tuple[VideoStream, streaming.Frame, tracking.Track, tracking.FacialArea]
+    ] = []
+    for round_frames in rounds:
+        # frames only need detection every detection_interval frames or if a track is lost
+        due = [
+            idx
+            for idx, (stream, frame) in enumerate(round_frames)
+            if stream.face_tracker.predict(frame.img)
+        ]
+        if due:
+            detections = detect_faces_batch(
+                imgs=[round_frames[idx][1].img for idx in due],
+                detector_backend=detector_backend,
+                anti_spoofing=anti_spoofing,
+                min_face_size=min_face_size,
+            )
+            for idx, facial_areas in zip(due, detections):
+                stream, frame = round_frames[idx]
+                for track in stream.face_tracker.correct(frame.img, facial_areas):
+                    ended_tracks.append((stream, track))
+
+        for stream, frame in round_frames:
+            visible_tracks = [
+                (track, track.facial_area) for track in stream.face_tracker.visible_tracks
+            ]
+            tracked_frames.append((stream, frame, visible_tracks))
+            for track, facial_area in visible_tracks:
+                if track.track_id not in stream.first_seen:
+                    stream.first_seen[track.track_id] = frame.timestamp
+                    stream.num_tracks += 1
+                    # tracks appearing in this batch are analyzed together
+                    if track.identity is None:
+                        new_tracks.append((stream, frame, track, facial_area))
+                stream.last_seen[track.track_id] = frame.timestamp
+
+    if new_tracks:
+        detected_faces = [
+            streaming.extract_facial_areas(img=frame.img, faces_coordinates=[facial_area])[0]
+            for _, frame, _, facial_area in new_tracks
+        ]
+        identities = (
+            identity_index.search_batch(detected_faces)
+            if identity_index is not None
+            else [(None, None, 0) for _ in detected_faces]
+        )
+        demographies = (
+            streaming.analyze_demography_batch(detected_faces=detected_faces)
+            if enable_face_analysis
+            else [None for _ in detected_faces]
+        )
+        for (stream, frame, track, facial_area), identity, demography in zip(
+            new_tracks, identities, demographies
+        ):
+            track.identity = identity
+            if enable_face_analysis:
+                track.demography = demography or {}
+            sink(track_started_event(stream, frame, track, facial_area))
+
+    # tracks ending in this batch are reported after their start and with their identity
+    for stream, track in ended_tracks:
+        sink(track_ended_event(stream, track))
+
+    for stream, frame, visible_tracks in tracked_frames:
+        if stream.output_path is not None:
+            write_annotated_frame(stream, frame, visible_tracks)
+        stream.stats.record(time.monotonic() - frame.captured_at)
+
+
+def detect_faces_batch(
+    imgs: List[NDArray[Any]],
+    detector_backend: str,
+    anti_spoofing: bool = False,
+    min_face_size: int = MIN_FACE_SIZE,
+) -> List[List[tracking.FacialArea]]:
+    """
+    Detect faces of several frames with a single extract faces call
+    Args:
+        imgs (list): frames in BGR
+        detector_backend (string): face detector backend
+        anti_spoofing (boolean): Flag to enable anti spoofing
+        min_face_size (int): faces narrower than this many pixels are ignored
+    Returns:
+        facial_areas (list): x, y, w, h, is_real and antispoof_score of faces for each frame
+    """
+    faces_objs = cast(
+        List[List[Dict[str, Any]]],
+        DeepFace.extract_faces(
+            img_path=list(imgs),
+            detector_backend=detector_backend,
+            enforce_detection=False,
+            expand_percentage=0,
+            anti_spoofing=anti_spoofing,
+        ),
+    )
+
+    results = []
+    for img, face_objs in zip(imgs, faces_objs):
+        height, width = img.shape[0:2]
+        results.append(
+            [
+                (
+                    face_obj["facial_area"]["x"],
+                    face_obj["facial_area"]["y"],
+                    face_obj["facial_area"]["w"],
+                    face_obj["facial_area"]["h"],
+                    face_obj.get("is_real", True),
+                    face_obj.get("antispoof_score", 0),
+                )
+                for face_obj in face_objs
+                # whole frame is returned with zero confidence if no face is detected
+                if not (
+                    face_obj["confidence"] == 0
+                    and face_obj["facial_area"]["w"] == width
+                    and face_obj["facial_area"]["h"] == height
+                )
+                and face_obj["facial_area"]["w"] > min_face_size
+            ]
+        )
+    return results
+
+
+def track_started_event(
+    stream: VideoStream,
+    frame: streaming.Frame,
+    track: tracking.Track,
+    facial_area: Optional[tracking.FacialArea] = None,
+) -> Dict[str, Any]:
+    """
+    Event emitted once a new track is identified and analyzed, facial_area is the one of
+        the track in the frame, its current facial area if not given
+    """
+    x, y, w, h, is_real, antispoof_score = facial_area or track.facial_area
+    label, _, confidence = track.identity or (None, None, 0)
+    event: Dict[str, Any] = {
+        "event": "track_started",
+        "stream_id": stream.stream_id,
+        "track_id": track.track_id,
+        "timestamp": frame.timestamp,
+        "position_ms": frame.position_ms,
+        "frame_index": frame.index,
+        "facial_area": {"x": int(x), "y": int(y), "w": int(w), "h": int(h)},
+        "is_real": bool(is_real),
+        "antispoof_score": float(antispoof_score),
+        "identity": label,
+        "confidence": float(confidence),
+        "demography": None,
+    }
+    if track.demography:
+        event["demography"] = {
+            "age": float(track.demography["age"]),
+            "gender": str(track.demography["dominant_gender"]),
+            "emotion": str(track.demography["dominant_emotion"]),
+        }
+    return event
+
+
+def track_ended_event(stream: VideoStream, track: tracking.Track) -> Dict[str, Any]:
+    """
+    Event emitted once a track is lost or its stream ends
+    """
+    label = track.identity[0] if track.identity is not None else None
+    return {
+        "event": "track_ended",
+        "stream_id": stream.stream_id,
+        "track_id": track.track_id,
+        "first_seen": stream.first_seen.pop(track.track_id, None),
+        "last_seen": stream.last_seen.pop(track.track_id, None),
+        "identity": label,
+    }
+
+
+def write_annotated_frame(
+    stream: VideoStream,
+    frame: streaming.Frame,
+    visible_tracks: List[Tuple[tracking.Track, tracking.FacialArea]],
+) -> None:
+    """
+    Draw tracked faces with their ids, identities and demography and write the frame
+        into the output video of the stream
+    Args:
+        visible_tracks (list): tracks visible in the frame with their facial areas in it
+    """
+    img = frame.img.copy()
+    for track, facial_area in visible_tracks:
+        x, y, w, h = (int(value) for value in facial_area[0:4])
+        cv2.rectangle(img, (x, y), (x + w, y + h), (67, 67, 67), 1)
+
+        label = f"#{track.track_id}"
+        if track.identity is not None and track.identity[0] is not None:
+            label += f" {track.identity[0]}"
+        if track.demography:
+            label += (
+                f" {int(track.demography['age'])}"
+                f"{track.demography['dominant_gender'][0:1]}"
+                f" {track.demography['dominant_emotion']}"
+            )
+        cv2.putText(
+            img,
+            label,
+            (x, max(y - 5, 10)),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.5,
+            streaming.TEXT_COLOR,
+            1,
+        )
+
+    if stream.video_writer is None:
+        fps = stream.cap.get(cv2.CAP_PROP_FPS) or 25
+        stream.video_writer = cv2.VideoWriter(
+            stream.output_path,
+            cv2.VideoWriter_fourcc(*"mp4v"),  # type: ignore[attr-defined]
+            fps,
+            (img.shape[1], img.shape[0]),
+        )
+    stream.video_writer.write(img)
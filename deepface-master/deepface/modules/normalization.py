@@ -7,6 +7,7 @@ import numpy as np
 # project dependencies
 from deepface.config.minmax import get_minmax_values
 from deepface.commons.embed_utils import is_flat_embedding
+from deepface.models.facial_recognition.Quantized import parse_model_name
 
 
 def normalize_embedding_minmax(
@@ -20,7 +21,9 @@ def normalize_embedding_minmax(
     Returns:
         List[float] or List[List[float]]: Normalized embeddings.
     """
-    dim_min, dim_max = get_minmax_values(model_name)
+    # quantized variants share the output range of their base model
+    base_model_name, _ = parse_model_name(model_name)
+    dim_min, dim_max = get_minmax_values(base_model_name)
 
     if dim_max - dim_min == 0:
         return embeddings
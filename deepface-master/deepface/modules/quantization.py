@@ -0,0 +1,168 @@
+# built-in dependencies
+import os
+from typing import Any, Dict, Generator, List, Optional, cast
+
+# 3rd party dependencies
+import numpy as np
+import tensorflow as tf
+
+# project dependencies
+from deepface.commons import image_utils, folder_utils
+from deepface.modules import modeling, detection, preprocessing
+from deepface.models.FacialRecognition import FacialRecognition
+from deepface.models.facial_recognition.Quantized import (
+    QUANTIZED_PRECISIONS,
+    QUANTIZABLE_MODELS,
+    get_quantized_model_path,
+)
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+# pylint: disable=too-many-positional-arguments
+def quantize(
+    model_name: str = "VGG-Face",
+    precision: str = "int8",
+    calibration_path: Optional[str] = None,
+    detector_backend: str = "opencv",
+    align: bool = True,
+    normalization: str = "base",
+    max_samples: int = 200,
+) -> str:
+    """
+    Apply post-training quantization to a facial recognition model and store the
+        resulting tflite model in the weights folder. Once created, the quantized model
+        can be used everywhere a model name is expected with its precision suffix
+        e.g. VGG-Face-int8 or Facenet512-float16.
+
+    Args:
+        model_name (str): Model for face recognition. Options: VGG-Face, Facenet, Facenet512,
+            ArcFace and GhostFaceNet.
+
+        precision (str): Options: float16 (weights stored as half precision) or
+            int8 (weights and activations quantized, requires calibration).
+
+        calibration_path (str): Folder of facial images used to calibrate activation
+            ranges for int8 quantization. Use faces representative of the production data.
+
+        detector_backend (string): face detector backend used for calibration images.
+
+        align (bool): Flag to enable face alignment for calibration images (default is True).
+
+        normalization (string): Normalize the calibration images before feeding them to the model.
+            It should be same as the one used while representing.
+
+        max_samples (int): Maximum number of faces used for calibration (default is 200).
+
+    Returns:
+        target_file (str): exact path of the quantized tflite model
+    """
+    if model_name not in QUANTIZABLE_MODELS:
+        raise ValueError(
+            f"{model_name} cannot be quantized. Supported models are {QUANTIZABLE_MODELS}"
+        )
+
+    if precision not in QUANTIZED_PRECISIONS:
+        raise ValueError(
+            f"unsupported precision {precision}. Supported ones are {QUANTIZED_PRECISIONS}"
+        )
+
+    if precision == "int8" and (calibration_path is None or not os.path.isdir(calibration_path)):
+        raise ValueError(
+            "int8 quantization requires calibration_path to be a folder of facial images"
+        )
+
+    client: FacialRecognition = modeling.build_model(
+        task="facial_recognition", model_name=model_name
+    )
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(client.model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if precision == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    else:
+        samples = load_calibration_faces(
+            calibration_path=cast(str, calibration_path),
+            target_size=client.input_shape,
+            detector_backend=detector_backend,
+            align=align,
+            normalization=normalization,
+            max_samples=max_samples,
+        )
+        logger.info(f"{len(samples)} faces will be used to calibrate {model_name}")
+
+        def representative_dataset() -> Generator[List[Any], None, None]:
+            for sample in samples:
+                yield [sample.astype(np.float32)]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        # keep float input and output to stay compatible with the keras clients
+        converter.inference_input_type = tf.float32
+        converter.inference_output_type = tf.float32
+
+    tflite_model = converter.convert()
+
+    folder_utils.initialize_folder()
+    target_file = get_quantized_model_path(model_name, precision)
+    with open(target_file, "wb") as f:
+        f.write(tflite_model)
+
+    logger.info(f"{model_name}-{precision} stored at {target_file}")
+
+    return target_file
+
+
+def load_calibration_faces(
+    calibration_path: str,
+    target_size: Any,
+    detector_backend: str = "opencv",
+    align: bool = True,
+    normalization: str = "base",
+    max_samples: int = 200,
+) -> List[np.ndarray]:
+    """
+    Detect, align and pre-process faces in a folder the same way represent does
+    Args:
+        calibration_path (str): folder of facial images
+        target_size (tuple): input shape of the facial recognition model
+        detector_backend (string): face detector backend
+        align (bool): Flag to enable face alignment
+        normalization (string): input normalization of the facial recognition model
+        max_samples (int): maximum number of faces to return
+    Returns:
+        samples (list): pre-processed faces in (1, X, X, 3) shape
+    """
+    samples: List[np.ndarray] = []
+    for img_path in image_utils.yield_images(calibration_path):
+        try:
+            img_objs = cast(
+                List[Dict[str, Any]],
+                detection.extract_faces(
+                    img_path=img_path,
+                    detector_backend=detector_backend,
+                    grayscale=False,
+                    enforce_detection=False,
+                    align=align,
+                ),
+            )
+        except ValueError as err:
+            logger.debug(f"Skipping {img_path} in calibration because {err}")
+            continue
+
+        for img_obj in img_objs:
+            # rgb to bgr
+            img = img_obj["face"][:, :, ::-1]
+            img = preprocessing.resize_image(img=img, target_size=(target_size[1], target_size[0]))
+            img = preprocessing.normalize_input(img=img, normalization=normalization)
+            samples.append(img)
+
+            if len(samples) >= max_samples:
+                return samples
+
+    if len(samples) == 0:
+        raise ValueError(f"No face found in {calibration_path} to calibrate quantization")
+
+    return samples
@@ -138,125 +138,17 @@ def find(
     if img is None:
         raise ImgNotFound(f"Passed image path {img_path} does not exist!")
 
-    file_parts = [
-        "ds",
-        "model",
-        model_name,
-        "detector",
-        detector_backend,
-        "aligned" if align else "unaligned",
-        "normalization",
-        normalization,
-        "expand",
-        str(expand_percentage),
-    ]
-
-    file_name = "_".join(file_parts) + ".pkl"
-    file_name = file_name.replace("-", "").lower()
-
-    datastore_path = os.path.join(db_path, file_name)
-    representations = []
-
-    # required columns for representations
-    df_cols = {
-        "identity",
-        "hash",
-        "embedding",
-        "target_x",
-        "target_y",
-        "target_w",
-        "target_h",
-    }
-
-    # Ensure the proper pickle file exists
-    if not os.path.exists(datastore_path):
-        with open(datastore_path, "wb") as f:
-            pickle.dump([], f, pickle.HIGHEST_PROTOCOL)
-
-    # Load the representations from the pickle file
-    with open(datastore_path, "rb") as f:
-        representations = pickle.load(f)
-
-    # check each item of representations list has required keys
-    for i, current_representation in enumerate(representations):
-        missing_keys = df_cols - set(current_representation.keys())
-        if len(missing_keys) > 0:
-            raise ValueError(
-                f"{i}-th item does not have some required keys - {missing_keys}."
-                f"Consider to delete {datastore_path}"
-            )
-
-    # Get the list of images on storage
-    storage_images = set(image_utils.yield_images(path=db_path))
-
-    if len(storage_images) == 0 and refresh_database is True:
-        raise EmptyDatasource(f"No item found in {db_path}")
-    if len(representations) == 0 and refresh_database is False:
-        raise EmptyDatasource(f"Nothing is found in {datastore_path}")
-
-    must_save_pickle = False
-    new_images, old_images, replaced_images = set(), set(), set()
-
-    if not refresh_database:
-        logger.info(
-            f"Could be some changes in {db_path} not tracked."
-            "Set refresh_database to true to assure that any changes will be tracked."
-        )
-
-    # Enforce data consistency amongst on disk images and pickle file
-    if refresh_database:
-        # embedded images
-        pickled_images = {representation["identity"] for representation in representations}
-
-        new_images = storage_images - pickled_images  # images added to storage
-        old_images = pickled_images - storage_images  # images removed from storage
-
-        # detect replaced images
-        for current_representation in representations:
-            identity = current_representation["identity"]
-            if identity in old_images:
-                continue
-            alpha_hash = current_representation["hash"]
-            beta_hash = image_utils.find_image_hash(identity)
-            if alpha_hash != beta_hash:
-                logger.debug(f"Even though {identity} represented before, it's replaced later.")
-                replaced_images.add(identity)
-
-    if not silent and (len(new_images) > 0 or len(old_images) > 0 or len(replaced_images) > 0):
-        logger.info(
-            f"Found {len(new_images)} newly added image(s)"
-            f", {len(old_images)} removed image(s)"
-            f", {len(replaced_images)} replaced image(s)."
-        )
-
-    # append replaced images into both old and new images. these will be dropped and re-added.
-    new_images.update(replaced_images)
-    old_images.update(replaced_images)
-
-    # remove old images first
-    if len(old_images) > 0:
-        representations = [rep for rep in representations if rep["identity"] not in old_images]
-        must_save_pickle = True
-
-    # find representations for new images
-    if len(new_images) > 0:
-        representations += __find_bulk_embeddings(
-            employees=new_images,
-            model_name=model_name,
-            detector_backend=detector_backend,
-            enforce_detection=enforce_detection,
-            align=align,
-            expand_percentage=expand_percentage,
-            normalization=normalization,
-            silent=silent,
-        )  # add new images
-        must_save_pickle = True
-
-    if must_save_pickle:
-        with open(datastore_path, "wb") as f:
-            pickle.dump(representations, f, pickle.HIGHEST_PROTOCOL)
-        if not silent:
-            logger.info(f"There are now {len(representations)} representations in {file_name}")
+    representations = load_representations(
+        db_path=db_path,
+        model_name=model_name,
+        enforce_detection=enforce_detection,
+        detector_backend=detector_backend,
+        align=align,
+        expand_percentage=expand_percentage,
+        normalization=normalization,
+        silent=silent,
+        refresh_database=refresh_database,
+    )
 
     # Should we have no representations bailout
     if len(representations) == 0:
@@ -396,6 +288,157 @@ def find(
     return resp_obj
 
 
+def load_representations(
+    db_path: str,
+    model_name: str = "VGG-Face",
+    enforce_detection: bool = True,
+    detector_backend: str = "opencv",
+    align: bool = True,
+    expand_percentage: int = 0,
+    normalization: str = "base",
+    silent: bool = False,
+    refresh_database: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Load representations of the images in db_path from its pickle file, after synchronizing
+        the pickle file with added, removed and replaced images on disk.
+
+    Args:
+        db_path (string): Path to the folder containing image files.
+        refresh_database (boolean): Synchronizes the pickle file with the db_path directory,
+            if set to false, it will ignore any file changes inside the db_path directory.
+        Rest of the arguments are the same as find
+
+    Returns:
+        representations (list): dicts with identity, hash, embedding and target_x, target_y,
+            target_w, target_h keys for each face found in the database.
+    """
+    if not os.path.isdir(db_path):
+        raise PathNotFound(f"Passed path {db_path} does not exist!")
+
+    file_parts = [
+        "ds",
+        "model",
+        model_name,
+        "detector",
+        detector_backend,
+        "aligned" if align else "unaligned",
+        "normalization",
+        normalization,
+        "expand",
+        str(expand_percentage),
+    ]
+
+    file_name = "_".join(file_parts) + ".pkl"
+    file_name = file_name.replace("-", "").lower()
+
+    datastore_path = os.path.join(db_path, file_name)
+    representations = []
+
+    # required columns for representations
+    df_cols = {
+        "identity",
+        "hash",
+        "embedding",
+        "target_x",
+        "target_y",
+        "target_w",
+        "target_h",
+    }
+
+    # Ensure the proper pickle file exists
+    if not os.path.exists(datastore_path):
+        with open(datastore_path, "wb") as f:
+            pickle.dump([], f, pickle.HIGHEST_PROTOCOL)
+
+    # Load the representations from the pickle file
+    with open(datastore_path, "rb") as f:
+        representations = pickle.load(f)
+
+    # check each item of representations list has required keys
+    for i, current_representation in enumerate(representations):
+        missing_keys = df_cols - set(current_representation.keys())
+        if len(missing_keys) > 0:
+            raise ValueError(
+                f"{i}-th item does not have some required keys - {missing_keys}."
+                f"Consider to delete {datastore_path}"
+            )
+
+    # Get the list of images on storage
+    storage_images = set(image_utils.yield_images(path=db_path))
+
+    if len(storage_images) == 0 and refresh_database is True:
+        raise EmptyDatasource(f"No item found in {db_path}")
+    if len(representations) == 0 and refresh_database is False:
+        raise EmptyDatasource(f"Nothing is found in {datastore_path}")
+
+    must_save_pickle = False
+    new_images, old_images, replaced_images = set(), set(), set()
+
+    if not refresh_database:
+        logger.info(
+            f"Could be some changes in {db_path} not tracked."
+            "Set refresh_database to true to assure that any changes will be tracked."
+        )
+
+    # Enforce data consistency amongst on disk images and pickle file
+    if refresh_database:
+        # embedded images
+        pickled_images = {representation["identity"] for representation in representations}
+
+        new_images = storage_images - pickled_images  # images added to storage
+        old_images = pickled_images - storage_images  # images removed from storage
+
+        # detect replaced images
+        for current_representation in representations:
+            identity = current_representation["identity"]
+            if identity in old_images:
+                continue
+            alpha_hash = current_representation["hash"]
+            beta_hash = image_utils.find_image_hash(identity)
+            if alpha_hash != beta_hash:
+                logger.debug(f"Even though {identity} represented before, it's replaced later.")
+                replaced_images.add(identity)
+
+    if not silent and (len(new_images) > 0 or len(old_images) > 0 or len(replaced_images) > 0):
+        logger.info(
+            f"Found {len(new_images)} newly added image(s)"
+            f", {len(old_images)} removed image(s)"
+            f", {len(replaced_images)} replaced image(s)."
+        )
+
+    # append replaced images into both old and new images. these will be dropped and re-added.
+    new_images.update(replaced_images)
+    old_images.update(replaced_images)
+
+    # remove old images first
+    if len(old_images) > 0:
+        representations = [rep for rep in representations if rep["identity"] not in old_images]
+        must_save_pickle = True
+
+    # find representations for new images
+    if len(new_images) > 0:
+        representations += __find_bulk_embeddings(
+            employees=new_images,
+            model_name=model_name,
+            detector_backend=detector_backend,
+            enforce_detection=enforce_detection,
+            align=align,
+            expand_percentage=expand_percentage,
+            normalization=normalization,
+            silent=silent,
+        )  # add new images
+        must_save_pickle = True
+
+    if must_save_pickle:
+        with open(datastore_path, "wb") as f:
+            pickle.dump(representations, f, pickle.HIGHEST_PROTOCOL)
+        if not silent:
+            logger.info(f"There are now {len(representations)} representations in {file_name}")
+
+    return cast(List[Dict[str, Any]], representations)
+
+
 def __find_bulk_embeddings(
     employees: Set[str],
     model_name: str = "VGG-Face",
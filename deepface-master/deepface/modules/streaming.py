@@ -1,7 +1,11 @@
 # built-in dependencies
 import os
 import time
-from typing import List, Tuple, Optional, cast, Dict, Any
+import queue
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import List, Tuple, Optional, cast, Dict, Any, Deque
 import traceback
 
 # 3rd party dependencies
@@ -12,6 +16,7 @@ import cv2
 
 # project dependencies
 from deepface import DeepFace
+from deepface.modules import tracking, recognition, verification
 from deepface.commons.logger import Logger
 
 logger = Logger()
@@ -23,6 +28,336 @@ os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
 IDENTIFIED_IMG_SIZE = 112
 TEXT_COLOR = (255, 255, 255)
 
+# frames kept for the inference stage, it always takes the latest one and drops the rest
+FRAME_BUFFER_SIZE = int(os.getenv("DEEPFACE_STREAM_FRAME_BUFFER_SIZE", "2"))
+# frames captured but not rendered yet, camera frames are dropped once it is full
+RENDER_QUEUE_SIZE = int(os.getenv("DEEPFACE_STREAM_RENDER_QUEUE_SIZE", "8"))
+# inference results waiting to be drawn onto rendered frames
+RESULT_QUEUE_SIZE = 8
+# interval in seconds to report per stage fps and latency in debug logs
+STATS_INTERVAL = float(os.getenv("DEEPFACE_STREAM_STATS_INTERVAL", "5"))
+# sources read in real time, their frames are dropped if processing falls behind
+LIVE_SOURCE_PREFIXES = ("rtsp://", "rtmp://", "http://", "https://", "udp://", "tcp://")
+
+# how long blocked stages wait before checking whether the pipeline is stopped
+_POLL_INTERVAL = 0.1
+
+
+@dataclass
+class Frame:
+    """
+    Frame read from the video source
+        captured_at is monotonic to measure latencies, timestamp is the wall clock time
+        and position_ms is the position of the frame in a video file.
+    """
+
+    index: int
+    captured_at: float
+    img: NDArray[Any]
+    timestamp: float = 0.0
+    position_ms: float = 0.0
+
+
+@dataclass
+class InferenceResult:
+    """
+    Outcome of the inference stage for a frame
+        faces_coordinates and num_frames_with_faces are drawn onto the frames being rendered,
+        freezed_img is set when the analysis is completed and should be shown until release.
+    """
+
+    frame_index: int
+    faces_coordinates: List[Tuple[int, int, int, int, bool, float]] = field(default_factory=list)
+    track_ids: List[int] = field(default_factory=list)
+    num_frames_with_faces: int = 0
+    freezed_img: Optional[NDArray[Any]] = None
+
+
+class FrameBuffer:
+    """
+    Thread safe ring buffer where the latest frame wins. Producers never block, the oldest
+        frame is overwritten once the buffer is full, and consumers take the latest frame
+        while older ones are dropped. If latest_wins is False, it is a bounded fifo queue
+        instead where producers wait for free space, e.g. to process every frame of a file.
+    """
+
+    def __init__(self, size: int = FRAME_BUFFER_SIZE, latest_wins: bool = True) -> None:
+        if size < 1:
+            raise ValueError(f"Frame buffer size must be positive but it is {size}.")
+        self._frames: Deque[Any] = deque(maxlen=size)
+        self._condition = threading.Condition()
+        self._closed = False
+        self.latest_wins = latest_wins
+        self.dropped = 0
+
+    def put(self, item: Any) -> None:
+        """Store an item, overwriting the oldest one or waiting if the buffer is full."""
+        with self._condition:
+            if not self.latest_wins:
+                while len(self._frames) == self._frames.maxlen and not self._closed:
+                    self._condition.wait()
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1
+            self._frames.append(item)
+            self._condition.notify_all()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Take the latest item and drop the older ones, or the oldest one if not latest_wins
+        Args:
+            timeout (float): seconds to wait for an item, None waits until one arrives
+        Returns:
+            item (Any): latest item, or None if the timeout expired or the buffer is closed
+        """
+        with self._condition:
+            if not self._frames and not self._closed:
+                self._condition.wait(timeout)
+            if not self._frames:
+                return None
+            if not self.latest_wins:
+                item = self._frames.popleft()
+            else:
+                item = self._frames.pop()
+                self.dropped += len(self._frames)
+                self._frames.clear()
+            self._condition.notify_all()
+            return item
+
+    def close(self) -> None:
+        """Wake up waiting consumers, items already stored can still be taken."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the producer is done."""
+        return self._closed
+
+
+class StageStats:
+    """
+    Thread safe throughput and latency counters of a pipeline stage
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self._count = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    def record(self, latency: float) -> None:
+        """
+        Record a processed item
+        Args:
+            latency (float): seconds it took for the item to be processed by the stage
+        """
+        with self._lock:
+            self._count += 1
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+
+    @property
+    def count(self) -> int:
+        """Number of processed items."""
+        return self._count
+
+    def summary(self) -> str:
+        """Human readable fps, average and max latency of the stage."""
+        with self._lock:
+            elapsed = max(time.monotonic() - self._started_at, 1e-9)
+            average = self._total_latency / self._count if self._count else 0.0
+            return (
+                f"{self.name}: {self._count / elapsed:.1f} fps, "
+                f"latency avg {1000 * average:.1f}ms max {1000 * self._max_latency:.1f}ms"
+            )
+
+
+class IdentityIndex:
+    """
+    In memory index of a facial database for stream mode. Embeddings are stacked into a
+        matrix and thumbnails of identities are cropped and resized once when the index is
+        built, so each search costs an embedding of the face and a matrix product.
+        The index is a snapshot, images added to db_path later are not searched.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        model_name: str,
+        detector_backend: str,
+        distance_metric: str,
+        threshold: Optional[float] = None,
+    ) -> None:
+        self.db_path = db_path
+        self.model_name = model_name
+        self.detector_backend = detector_backend
+        self.distance_metric = distance_metric
+        self.threshold = threshold or verification.find_threshold(model_name, distance_metric)
+
+        try:
+            representations = recognition.load_representations(
+                db_path=db_path,
+                model_name=model_name,
+                detector_backend=detector_backend,
+                enforce_detection=False,
+                silent=True,
+            )
+        except ValueError as err:
+            if f"No item found in {db_path}" not in str(err):
+                raise err
+            logger.warn(
+                f"No item is found in {db_path}."
+                "So, no facial recognition analysis will be performed."
+            )
+            representations = []
+
+        representations = [rep for rep in representations if rep["embedding"] is not None]
+        self.identities: List[str] = [rep["identity"] for rep in representations]
+        self.embeddings: NDArray[Any] = np.asarray(
+            [rep["embedding"] for rep in representations], dtype=np.float32
+        ).reshape(len(representations), -1)
+
+        if distance_metric == "euclidean":
+            self._matrix = self.embeddings
+        else:
+            self._matrix = verification.l2_normalize(self.embeddings, axis=1)
+        self._square_norms = np.einsum("nd,nd->n", self._matrix, self._matrix)
+
+        self.thumbnails = build_thumbnails(representations)
+        logger.info(f"{len(self.identities)} faces of {db_path} are indexed")
+
+    def __len__(self) -> int:
+        return len(self.identities)
+
+    def search(
+        self, detected_face: NDArray[Any]
+    ) -> Tuple[Optional[str], Optional[NDArray[Any]], float]:
+        """
+        Search the most similar identity of an extracted face
+        Args:
+            detected_face (np.ndarray): extracted individual facial image
+        Returns:
+            result (tuple): file name of the identity, its thumbnail and confidence,
+                or None, None and 0 if no identity is within the threshold
+        """
+        return self.search_batch([detected_face])[0]
+
+    def search_batch(
+        self, detected_faces: List[NDArray[Any]]
+    ) -> List[Tuple[Optional[str], Optional[NDArray[Any]], float]]:
+        """
+        Search the most similar identities of extracted faces with a single batched
+            embedding call and a single matrix product
+        Args:
+            detected_faces (list): extracted individual facial images
+        Returns:
+            results (list): file name of the identity, its thumbnail and confidence for each
+                face, or None, None and 0 if no identity is within the threshold
+        """
+        results: List[Tuple[Optional[str], Optional[NDArray[Any]], float]] = [
+            (None, None, 0) for _ in detected_faces
+        ]
+        if len(self) == 0 or len(detected_faces) == 0:
+            return results
+
+        embedding_objs = DeepFace.represent(
+            img_path=list(detected_faces),
+            model_name=self.model_name,
+            detector_backend=self.detector_backend,
+            enforce_detection=False,
+        )
+        # represent does not nest results of a single image
+        faces_objs = cast(
+            List[List[Dict[str, Any]]],
+            [embedding_objs] if len(detected_faces) == 1 else embedding_objs,
+        )
+
+        found = [idx for idx, face_objs in enumerate(faces_objs) if len(face_objs) > 0]
+        if len(found) == 0:
+            return results
+
+        distances = self.find_distances(
+            np.asarray([faces_objs[idx][0]["embedding"] for idx in found])
+        )
+        for idx, face_distances in zip(found, distances):
+            best = int(np.argmin(face_distances))
+            distance = float(face_distances[best])
+            if distance > self.threshold:
+                continue
+
+            target_path = self.identities[best]
+            confidence = verification.find_confidence(
+                distance=distance,
+                model_name=self.model_name,
+                distance_metric=self.distance_metric,
+                verified=True,
+            )
+            logger.info(f"Hello, {target_path} (confidence: {confidence}%)")
+            results[idx] = (
+                target_path.split("/")[-1],
+                self.thumbnails.get(target_path),
+                confidence,
+            )
+        return results
+
+    def find_distances(self, embeddings: NDArray[Any]) -> NDArray[Any]:
+        """
+        Find distances of embeddings to every indexed embedding with a single matrix product
+        Args:
+            embeddings (np.ndarray): (dimension,) or (m, dimension) shaped embeddings
+        Returns:
+            distances (np.ndarray): (n,) or (m, n) shaped distances
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if self.distance_metric == "euclidean":
+            products = embeddings @ self._matrix.T
+            square_norms = np.sum(embeddings**2, axis=-1, keepdims=embeddings.ndim == 2)
+            return np.sqrt(np.maximum(self._square_norms + square_norms - 2 * products, 0))
+
+        normalized = verification.l2_normalize(embeddings, axis=-1)
+        similarities = normalized @ self._matrix.T
+        if self.distance_metric == "cosine":
+            return 1 - similarities
+        if self.distance_metric == "angular":
+            return np.arccos(np.clip(similarities, -1, 1)) / np.pi
+        if self.distance_metric == "euclidean_l2":
+            return np.sqrt(np.maximum(2 - 2 * similarities, 0))
+        raise ValueError(f"Invalid distance_metric passed - {self.distance_metric}")
+
+
+def build_thumbnails(representations: List[Dict[str, Any]]) -> Dict[str, NDArray[Any]]:
+    """
+    Crop and resize the face of each identity once to overlay it when the identity is found
+    Args:
+        representations (list): representations of the facial database
+    Returns:
+        thumbnails (dict): identity path to IDENTIFIED_IMG_SIZE squared BGR thumbnail
+    """
+    faces_per_identity: Dict[str, List[Dict[str, Any]]] = {}
+    for rep in representations:
+        faces_per_identity.setdefault(rep["identity"], []).append(rep)
+
+    thumbnails = {}
+    for identity, faces in faces_per_identity.items():
+        img = cv2.imread(identity)
+        if img is None:
+            continue
+
+        # crop facial area of the identified image if and only if it has one face
+        # otherwise, show image as is
+        if len(faces) == 1:
+            x, y, w, h = (
+                int(faces[0][key]) for key in ["target_x", "target_y", "target_w", "target_h"]
+            )
+            if w > 0 and h > 0:
+                img = img[max(y, 0) : y + h, max(x, 0) : x + w]
+
+        thumbnails[identity] = cv2.resize(img, (IDENTIFIED_IMG_SIZE, IDENTIFIED_IMG_SIZE))
+    return thumbnails
+
 
 # pylint: disable=unused-variable, too-many-positional-arguments
 def analysis(
@@ -37,10 +372,19 @@ def analysis(
     anti_spoofing: bool = False,
     output_path: Optional[str] = None,
     debug: bool = False,
+    tracker: str = "iou",
+    detection_interval: Optional[int] = None,
 ) -> None:
     """
     Run real time face recognition and facial attribute analysis
 
+    Frames flow through a staged pipeline: a capture thread reads the source, an inference
+        thread runs detection and analysis on the latest captured frame at its own pace, and
+        the render stage draws the latest results onto every captured frame, writes and shows
+        it. Per stage fps and latency are reported in debug logs and when the stream ends.
+        Faces are followed by a tracker between detections, and each tracked face is
+        recognized and analyzed once per appearance.
+
     Args:
         db_path (string): Path to the folder containing image files. All detected faces
             in the database will be considered in the decision-making process.
@@ -69,19 +413,28 @@ def analysis(
 
         output_path (str): Path to save the output video. (default is None
             If None, no video is saved).
+
+        tracker (str): tracker following faces between detections. Options: 'iou', 'mil',
+            'kcf' or 'csrt' (default is iou). kcf and csrt require opencv-contrib-python.
+
+        detection_interval (int): run the face detector every n-th frame, and earlier
+            if the tracker loses a face. Set 1 to detect on every frame (default is
+            DEEPFACE_DETECTION_INTERVAL environment variable or 5).
     Returns:
         None
     """
+    # fail fast if the tracker is not available
+    face_tracker = tracking.FaceTracker(tracker=tracker, detection_interval=detection_interval)
+
     # initialize models
     build_demography_models(enable_face_analysis=enable_face_analysis)
     build_facial_recognition_model(model_name=model_name)
-    # call a dummy find function for db_path once to create embeddings before starting webcam
-    _ = search_identity(
-        detected_face=np.zeros([224, 224, 3]),
+    # create embeddings and thumbnails of db_path once before starting webcam
+    identity_index = IdentityIndex(
         db_path=db_path,
+        model_name=model_name,
         detector_backend=detector_backend,
         distance_metric=distance_metric,
-        model_name=model_name,
     )
 
     cap = cv2.VideoCapture(source if isinstance(source, str) else int(source))
@@ -109,118 +462,447 @@ def analysis(
         else None
     )
 
-    freezed_img = None
-    freeze = False
-    num_frames_with_faces = 0
-    tic = time.time()
-    frame = 0
+    frame_buffer = FrameBuffer()
+    render_queue: "queue.Queue[Optional[Frame]]" = queue.Queue(maxsize=RENDER_QUEUE_SIZE)
+    result_queue: "queue.Queue[InferenceResult]" = queue.Queue(maxsize=RESULT_QUEUE_SIZE)
+    stop_event = threading.Event()
+    # set by the render stage once the freezed image is shown for time_threshold seconds
+    release_event = threading.Event()
+    stats = {name: StageStats(name) for name in ["capture", "inference", "render"]}
+
+    capture_thread = threading.Thread(
+        target=capture_frames,
+        kwargs={
+            "cap": cap,
+            "frame_buffer": frame_buffer,
+            "render_queue": render_queue,
+            "stop_event": stop_event,
+            "stats": stats["capture"],
+            # frames of a live camera or stream are dropped if rendering falls behind,
+            # whereas every frame of a video file is rendered
+            "drop_frames": is_live_source(source),
+        },
+        daemon=True,
+    )
+    inference_thread = threading.Thread(
+        target=run_inference,
+        kwargs={
+            "frame_buffer": frame_buffer,
+            "result_queue": result_queue,
+            "stop_event": stop_event,
+            "release_event": release_event,
+            "stats": stats["inference"],
+            "db_path": db_path,
+            "model_name": model_name,
+            "detector_backend": detector_backend,
+            "distance_metric": distance_metric,
+            "enable_face_analysis": enable_face_analysis,
+            "frame_threshold": frame_threshold,
+            "anti_spoofing": anti_spoofing,
+            "debug": debug,
+            "face_tracker": face_tracker,
+            "identity_index": identity_index,
+        },
+        daemon=True,
+    )
+    capture_thread.start()
+    inference_thread.start()
 
-    while True:
-        has_frame, img = cap.read()
-        if not has_frame:
-            break
+    try:
+        render_frames(
+            render_queue=render_queue,
+            result_queue=result_queue,
+            stop_event=stop_event,
+            release_event=release_event,
+            stats=stats,
+            time_threshold=time_threshold,
+            frame_threshold=frame_threshold,
+            video_writer=video_writer,
+        )
+    finally:
+        stop_event.set()
+        release_event.set()
+        frame_buffer.close()
+        capture_thread.join()
+        inference_thread.join()
+
+        # Release resources
+        cap.release()
+        if video_writer:
+            video_writer.release()
+        cv2.destroyAllWindows()
 
-        raw_img = img.copy()  # type: ignore[union-attr]
+    logger.info(
+        "Stream statistics: "
+        + "; ".join(stage_stats.summary() for stage_stats in stats.values())
+        + f"; {frame_buffer.dropped} frames skipped by inference"
+    )
 
-        faces_coordinates = []
 
-        if not freeze:
-            faces_coordinates = grab_facial_areas(
-                img=img, detector_backend=detector_backend, anti_spoofing=anti_spoofing
+def is_live_source(source: Any) -> bool:
+    """
+    Check the source is a camera or a network stream rather than a video file
+    """
+    if not isinstance(source, str):
+        return True
+    return source.lower().startswith(LIVE_SOURCE_PREFIXES) or source.isdigit()
+
+
+def capture_frames(
+    cap: Any,
+    frame_buffer: FrameBuffer,
+    render_queue: Optional["queue.Queue[Optional[Frame]]"],
+    stop_event: threading.Event,
+    stats: StageStats,
+    drop_frames: bool = True,
+) -> None:
+    """
+    Capture stage: read frames from the source and feed them to inference and render stages
+    Args:
+        cap (cv2.VideoCapture): opened video source
+        frame_buffer (FrameBuffer): latest frame wins buffer consumed by the inference stage
+        render_queue (queue.Queue): bounded queue consumed by the render stage, None is
+            put once the source is exhausted. Frames are not rendered if not given.
+        stop_event (threading.Event): set when the pipeline is stopped
+        stats (StageStats): capture stage counters, latency is the time to read a frame
+        drop_frames (bool): drop the oldest frame waiting to be rendered instead of
+            blocking when the render queue is full
+    Returns:
+        None
+    """
+    index = 0
+    try:
+        while not stop_event.is_set():
+            tic = time.monotonic()
+            has_frame, img = cap.read()
+            if not has_frame:
+                break
+            frame = Frame(
+                index=index,
+                captured_at=time.monotonic(),
+                img=img,
+                timestamp=time.time(),
+                position_ms=float(cap.get(cv2.CAP_PROP_POS_MSEC)),
             )
+            stats.record(frame.captured_at - tic)
+            index += 1
+
+            frame_buffer.put(frame)
+
+            if render_queue is None:
+                continue
+            if drop_frames:
+                while True:
+                    try:
+                        render_queue.put_nowait(frame)
+                        break
+                    except queue.Full:
+                        try:
+                            render_queue.get_nowait()
+                        except queue.Empty:
+                            pass
+            else:
+                __put_until_stopped(render_queue, frame, stop_event)
+    finally:
+        frame_buffer.close()
+        if render_queue is not None:
+            __put_until_stopped(render_queue, None, stop_event)
+
+
+# pylint: disable=too-many-arguments, too-many-locals
+def run_inference(
+    frame_buffer: FrameBuffer,
+    result_queue: "queue.Queue[InferenceResult]",
+    stop_event: threading.Event,
+    release_event: threading.Event,
+    stats: StageStats,
+    db_path: str,
+    model_name: str,
+    detector_backend: str,
+    distance_metric: str,
+    enable_face_analysis: bool,
+    frame_threshold: int,
+    anti_spoofing: bool,
+    debug: bool = False,
+    face_tracker: Optional[tracking.FaceTracker] = None,
+    identity_index: Optional["IdentityIndex"] = None,
+) -> None:
+    """
+    Inference stage: track faces on the latest captured frame, and run demography analysis
+        and facial recognition once faces are seen in frame_threshold sequential frames.
+        The stage then waits for the render stage to release the freezed image.
+    Args:
+        frame_buffer (FrameBuffer): latest frame wins buffer fed by the capture stage
+        result_queue (queue.Queue): bounded queue consumed by the render stage
+        stop_event (threading.Event): set when the pipeline is stopped
+        release_event (threading.Event): set by the render stage when freezing is released
+        stats (StageStats): inference stage counters, latency is the age of the frame
+            when its result is published
+        face_tracker (FaceTracker): tracker following faces between detections,
+            faces are detected on every frame if not given
+        identity_index (IdentityIndex): in memory index of db_path, find is called if not given
+        Rest of the arguments are the same as analysis
+    Returns:
+        None
+    """
+    num_frames_with_faces = 0
+    freeze_count = 0
+    face_tracker = face_tracker or tracking.FaceTracker(detection_interval=1)
 
-            # use raw_img otherwise countdown number will appear in the middle of the face
-            detected_faces = extract_facial_areas(img=raw_img, faces_coordinates=faces_coordinates)
+    def detect(img: NDArray[Any]) -> List[Tuple[int, int, int, int, bool, float]]:
+        return grab_facial_areas(
+            img=img, detector_backend=detector_backend, anti_spoofing=anti_spoofing
+        )
 
-            img = highlight_facial_areas(img=img, faces_coordinates=faces_coordinates)
+    while not stop_event.is_set():
+        frame: Optional[Frame] = frame_buffer.get(timeout=_POLL_INTERVAL)
+        if frame is None:
+            if frame_buffer.closed:
+                break
+            continue
 
-            # highlight how many seconds required to freeze in the middle of detected face
-            img = countdown_to_freeze(
-                img=img,
-                faces_coordinates=faces_coordinates,
-                frame_threshold=frame_threshold,
-                num_frames_with_faces=num_frames_with_faces,
-            )
+        tracks = face_tracker.update(frame.img, detect=detect)
+        faces_coordinates = [track.facial_area for track in tracks]
+        result = InferenceResult(
+            frame_index=frame.index,
+            faces_coordinates=faces_coordinates,
+            track_ids=[track.track_id for track in tracks],
+            num_frames_with_faces=num_frames_with_faces,
+        )
 
-            num_frames_with_faces = num_frames_with_faces + 1 if len(faces_coordinates) else 0
+        num_frames_with_faces = num_frames_with_faces + 1 if len(faces_coordinates) else 0
+        freeze = num_frames_with_faces > 0 and num_frames_with_faces % frame_threshold == 0
 
-            freeze = num_frames_with_faces > 0 and num_frames_with_faces % frame_threshold == 0
+        if freeze:
+            freeze_count += 1
+            release_event.clear()
+            try:
+                result.freezed_img = analyze_frame(
+                    img=frame.img,
+                    tracks=tracks,
+                    db_path=db_path,
+                    model_name=model_name,
+                    detector_backend=detector_backend,
+                    distance_metric=distance_metric,
+                    enable_face_analysis=enable_face_analysis,
+                    anti_spoofing=anti_spoofing,
+                    debug_prefix=f"freezed_{freeze_count}" if debug else None,
+                    identity_index=identity_index,
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                # keep the stream alive if analysis of a single frame fails
+                logger.error(f"Exception while analyzing frame {frame.index}: {err}")
+                logger.debug(traceback.format_exc())
+                result.freezed_img = None
+                freeze = False
 
-            if freeze:
-                frame += 1
+        stats.record(time.monotonic() - frame.captured_at)
+        __put_until_stopped(result_queue, result, stop_event)
 
-                # restore raw image to get rid of countdown informtion
-                img = raw_img.copy()
+        if freeze:
+            logger.info("freezed")
+            # frames captured while freezed are not analyzed
+            while not release_event.wait(_POLL_INTERVAL) and not stop_event.is_set():
+                pass
 
-                # add analyze results into img
-                img = highlight_facial_areas(
-                    img=img, faces_coordinates=faces_coordinates, anti_spoofing=anti_spoofing
-                )
 
-                if debug is True:
-                    cv2.imwrite(f"freezed_{frame}_0.jpg", detected_faces[0])
-                    cv2.imwrite(f"freezed_{frame}_1.jpg", img)
+def analyze_frame(
+    img: NDArray[Any],
+    tracks: List[tracking.Track],
+    db_path: str,
+    model_name: str,
+    detector_backend: str,
+    distance_metric: str,
+    enable_face_analysis: bool,
+    anti_spoofing: bool,
+    debug_prefix: Optional[str] = None,
+    identity_index: Optional["IdentityIndex"] = None,
+) -> NDArray[Any]:
+    """
+    Run demography analysis and facial recognition on tracked faces of a frame.
+        Results are cached on tracks, so faces analyzed in earlier freezes are not analyzed again.
+    Args:
+        img (np.ndarray): raw frame without any overlay
+        tracks (list): tracked faces visible in the frame
+        debug_prefix (str): prefix of intermediate images stored for debugging, if set
+        identity_index (IdentityIndex): in memory index of db_path, find is called if not given
+        Rest of the arguments are the same as analysis
+    Returns:
+        img (np.ndarray): frame with highlighted faces, demography and identities
+    """
+    faces_coordinates = [track.facial_area for track in tracks]
+    # use raw img otherwise countdown number will appear in the middle of the face
+    detected_faces = extract_facial_areas(img=img, faces_coordinates=faces_coordinates)
 
-                # note: faces already detected from img (original one) in grab_facial_areas()
-                # perform_demography_analysis and perform_facial_recognition are using
-                # pre-detected faces, not using anything from img
+    img = highlight_facial_areas(
+        img=img.copy(), faces_coordinates=faces_coordinates, anti_spoofing=anti_spoofing
+    )
 
-                # age, gender and emotion analysis
-                img = perform_demography_analysis(
-                    enable_face_analysis=enable_face_analysis,
-                    img=img,
-                    faces_coordinates=faces_coordinates,
-                    detected_faces=detected_faces,
-                )
+    if debug_prefix is not None:
+        cv2.imwrite(f"{debug_prefix}_0.jpg", detected_faces[0])
+        cv2.imwrite(f"{debug_prefix}_1.jpg", img)
 
-                if debug is True:
-                    cv2.imwrite(f"freezed_{frame}_2.jpg", img)
+    # age, gender and emotion analysis of all new faces in a single batch
+    if enable_face_analysis is True:
+        pending = [idx for idx, track in enumerate(tracks) if track.demography is None]
+        demographies = analyze_demography_batch(
+            detected_faces=[detected_faces[idx] for idx in pending]
+        )
+        for idx, demography in zip(pending, demographies):
+            tracks[idx].demography = demography or {}
 
-                # facial recogntion analysis
-                img = perform_facial_recognition(
-                    img=img,
-                    faces_coordinates=faces_coordinates,
-                    detected_faces=detected_faces,
-                    db_path=db_path,
-                    detector_backend=detector_backend,
-                    distance_metric=distance_metric,
-                    model_name=model_name,
+        for track in tracks:
+            if track.demography:
+                img = overlay_demography(
+                    img=img, demography=track.demography, facial_area=track.facial_area
                 )
 
-                if debug is True:
-                    cv2.imwrite(f"freezed_{frame}_3.jpg", img)
+    if debug_prefix is not None:
+        cv2.imwrite(f"{debug_prefix}_2.jpg", img)
+
+    # facial recogntion analysis of all new faces in a single batch
+    pending = [idx for idx, track in enumerate(tracks) if track.identity is None]
+    identities = search_identities(
+        detected_faces=[detected_faces[idx] for idx in pending],
+        db_path=db_path,
+        detector_backend=detector_backend,
+        distance_metric=distance_metric,
+        model_name=model_name,
+        identity_index=identity_index,
+    )
+    for idx, identity in zip(pending, identities):
+        tracks[idx].identity = identity
+
+    for track in tracks:
+        if track.identity is None:
+            continue
+        target_label, target_img, confidence = track.identity
+        if target_label is None or target_img is None:
+            continue
+        x, y, w, h = track.facial_area[0:4]
+        img = overlay_identified_face(
+            img=img,
+            target_img=target_img,
+            label=target_label,
+            x=x,
+            y=y,
+            w=w,
+            h=h,
+            confidence=confidence,
+        )
+
+    if debug_prefix is not None:
+        cv2.imwrite(f"{debug_prefix}_3.jpg", img)
+
+    return img
 
-                # freeze the img after analysis
-                freezed_img = img.copy()
 
+def render_frames(
+    render_queue: "queue.Queue[Optional[Frame]]",
+    result_queue: "queue.Queue[InferenceResult]",
+    stop_event: threading.Event,
+    release_event: threading.Event,
+    stats: Dict[str, StageStats],
+    time_threshold: int,
+    frame_threshold: int,
+    video_writer: Optional[Any] = None,
+    show: bool = True,
+) -> None:
+    """
+    Render stage: draw the latest inference result onto each captured frame, write and show it.
+        Runs in the calling thread because windows of opencv must be handled there.
+    Args:
+        render_queue (queue.Queue): frames fed by the capture stage, None ends rendering
+        result_queue (queue.Queue): results fed by the inference stage
+        stop_event (threading.Event): set when the pipeline is stopped
+        release_event (threading.Event): set once the freezed image is shown long enough
+        stats (dict): stage counters, render latency is the age of the frame when it is shown
+        time_threshold (int): seconds to show the freezed image
+        frame_threshold (int): how many sequential frames with faces are required to freeze
+        video_writer (cv2.VideoWriter): writer of the output video, if any
+        show (bool): show frames in a window, pressing q stops the pipeline
+    Returns:
+        None
+    """
+    latest = InferenceResult(frame_index=-1)
+    freezed_img: Optional[NDArray[Any]] = None
+    tic = time.time()
+    last_report = time.monotonic()
+
+    while not stop_event.is_set():
+        try:
+            frame = render_queue.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+        if frame is None:
+            break
+
+        while True:
+            try:
+                latest = result_queue.get_nowait()
+            except queue.Empty:
+                break
+            if latest.freezed_img is not None:
+                freezed_img = latest.freezed_img
                 # start counter for freezing
                 tic = time.time()
-                logger.info("freezed")
 
-        elif freeze and time.time() - tic > time_threshold:
-            freeze = False
+        if freezed_img is not None and time.time() - tic > time_threshold:
             freezed_img = None
+            latest = InferenceResult(frame_index=latest.frame_index)
             # reset counter for freezing
             tic = time.time()
+            release_event.set()
             logger.info("Freeze released")
 
-        # count how many seconds required to relased freezed image in the left up area
-        freezed_img = countdown_to_release(img=freezed_img, tic=tic, time_threshold=time_threshold)
-        display_img = img if freezed_img is None else freezed_img
+        if freezed_img is None:
+            # frame is shared with the inference stage, so overlays are drawn on a copy
+            img = highlight_facial_areas(
+                img=frame.img.copy(), faces_coordinates=latest.faces_coordinates
+            )
+            # highlight how many frames required to freeze in the middle of detected face
+            img = countdown_to_freeze(
+                img=img,
+                faces_coordinates=latest.faces_coordinates,
+                frame_threshold=frame_threshold,
+                num_frames_with_faces=latest.num_frames_with_faces,
+            )
+            display_img = img
+        else:
+            # count how many seconds required to relased freezed image in the left up area
+            display_img = cast(
+                NDArray[Any],
+                countdown_to_release(img=freezed_img, tic=tic, time_threshold=time_threshold),
+            )
 
         # Save the frame to output video if writer is initialized
         if video_writer:
             video_writer.write(display_img)
 
-        cv2.imshow("img", display_img)
-        if cv2.waitKey(1) & 0xFF == ord("q"):
-            break
+        if show:
+            cv2.imshow("img", display_img)
+            if cv2.waitKey(1) & 0xFF == ord("q"):
+                break
 
-    # Release resources
-    cap.release()
-    if video_writer:
-        video_writer.release()
-    cv2.destroyAllWindows()
+        stats["render"].record(time.monotonic() - frame.captured_at)
+
+        if time.monotonic() - last_report > STATS_INTERVAL:
+            last_report = time.monotonic()
+            logger.debug("; ".join(stage_stats.summary() for stage_stats in stats.values()))
+
+
+def __put_until_stopped(
+    target_queue: "queue.Queue[Any]", item: Any, stop_event: threading.Event
+) -> None:
+    """
+    Put an item into a bounded queue, waiting while it is full unless the pipeline is stopped
+    """
+    while not stop_event.is_set():
+        try:
+            target_queue.put(item, timeout=_POLL_INTERVAL)
+            return
+        except queue.Full:
+            continue
 
 
 def build_facial_recognition_model(model_name: str) -> None:
@@ -242,6 +924,7 @@ def search_identity(
     model_name: str,
     detector_backend: str,
     distance_metric: str,
+    identity_index: Optional["IdentityIndex"] = None,
 ) -> Tuple[Optional[str], Optional[NDArray[Any]], float]:
     """
     Search an identity in facial database.
@@ -256,11 +939,17 @@ def search_identity(
             'centerface' or 'skip' (default is opencv).
         distance_metric (string): Metric for measuring similarity. Options: 'cosine',
             'euclidean', 'euclidean_l2', 'angular', (default is cosine).
+        identity_index (IdentityIndex): in memory index of db_path built for the same model,
+            detector and metric. If given, db_path is not scanned and the thumbnail of the
+            identity is not extracted from disk again.
     Returns:
         result (tuple): result consisting of following objects
             identified image path (str)
             identified image itself (np.ndarray)
     """
+    if identity_index is not None:
+        return identity_index.search(detected_face)
+
     target_path = None
     target_img = None
     confidence = 0
@@ -509,6 +1198,7 @@ def perform_facial_recognition(
     detector_backend: str,
     distance_metric: str,
     model_name: str,
+    identity_index: Optional[IdentityIndex] = None,
 ) -> NDArray[Any]:
     """
     Perform facial recognition
@@ -526,18 +1216,22 @@ def perform_facial_recognition(
             'euclidean', 'euclidean_l2', 'angular' (default is cosine).
         model_name (str): Model for face recognition. Options: VGG-Face, Facenet, Facenet512,
             OpenFace, DeepFace, DeepID, Dlib, ArcFace, SFace and GhostFaceNet (default is VGG-Face).
+        identity_index (IdentityIndex): in memory index of db_path. If given, all faces are
+            searched with a single batched embedding call and matrix product.
     Returns:
         img (np.ndarray): image with identified face informations
     """
-    for idx, (x, y, w, h, is_real, antispoof_score) in enumerate(faces_coordinates):
-        detected_face = detected_faces[idx]
-        target_label, target_img, confidence = search_identity(
-            detected_face=detected_face,
-            db_path=db_path,
-            detector_backend=detector_backend,
-            distance_metric=distance_metric,
-            model_name=model_name,
-        )
+    identities = search_identities(
+        detected_faces=detected_faces[0 : len(faces_coordinates)],
+        db_path=db_path,
+        detector_backend=detector_backend,
+        distance_metric=distance_metric,
+        model_name=model_name,
+        identity_index=identity_index,
+    )
+    for (x, y, w, h, is_real, antispoof_score), (target_label, target_img, confidence) in zip(
+        faces_coordinates, identities
+    ):
         if target_label is None:
             continue
 
@@ -577,35 +1271,117 @@ def perform_demography_analysis(
     """
     if enable_face_analysis is False:
         return img
-    for idx, (x, y, w, h, is_real, antispoof_score) in enumerate(faces_coordinates):
-        detected_face = detected_faces[idx]
-        demographies: List[Dict[str, Any]] = cast(
-            List[Dict[str, Any]],
-            DeepFace.analyze(
-                img_path=detected_face,
-                actions=("age", "gender", "emotion"),
-                detector_backend="skip",
-                enforce_detection=False,
-                silent=True,
-            ),
-        )
-
-        if len(demographies) == 0:
+    demographies = analyze_demography_batch(
+        detected_faces=detected_faces[0 : len(faces_coordinates)]
+    )
+    for facial_area, demography in zip(faces_coordinates, demographies):
+        if demography is None:
             continue
+        img = overlay_demography(img=img, demography=demography, facial_area=facial_area)
+    return img
 
-        # safe to access 1st index because detector backend is skip
-        demography: Dict[str, Any] = demographies[0]
 
-        img = overlay_emotion(img=img, emotion_probas=demography["emotion"], x=x, y=y, w=w, h=h)
-        img = overlay_age_gender(
-            img=img,
-            apparent_age=demography["age"],
-            gender=demography["dominant_gender"][0:1],  # M or W
-            x=x,
-            y=y,
-            w=w,
-            h=h,
+def analyze_demography(detected_face: NDArray[Any]) -> Optional[Dict[str, Any]]:
+    """
+    Analyze age, gender and emotion of an extracted face
+    Args:
+        detected_face (np.ndarray): extracted individual facial image
+    Returns:
+        demography (dict): analysis result, None if nothing is found
+    """
+    return analyze_demography_batch(detected_faces=[detected_face])[0]
+
+
+def analyze_demography_batch(
+    detected_faces: List[NDArray[Any]],
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Analyze age, gender and emotion of extracted faces, running each attribute model
+        once for the whole batch
+    Args:
+        detected_faces (list): extracted individual facial images
+    Returns:
+        demographies (list): analysis result of each face, None if nothing is found
+    """
+    if len(detected_faces) == 0:
+        return []
+
+    demographies: List[List[Dict[str, Any]]] = cast(
+        List[List[Dict[str, Any]]],
+        DeepFace.analyze(
+            img_path=list(detected_faces),
+            actions=("age", "gender", "emotion"),
+            detector_backend="skip",
+            enforce_detection=False,
+            silent=True,
+        ),
+    )
+
+    # safe to access 1st index because detector backend is skip
+    return [
+        face_demographies[0] if len(face_demographies) > 0 else None
+        for face_demographies in demographies
+    ]
+
+
+def search_identities(
+    detected_faces: List[NDArray[Any]],
+    db_path: str,
+    model_name: str,
+    detector_backend: str,
+    distance_metric: str,
+    identity_index: Optional[IdentityIndex] = None,
+) -> List[Tuple[Optional[str], Optional[NDArray[Any]], float]]:
+    """
+    Search identities of extracted faces in facial database. With an identity index,
+        all faces are embedded in a single batch and searched with a single matrix product,
+        otherwise each face is searched with find.
+    Args:
+        detected_faces (list): extracted individual facial images
+        identity_index (IdentityIndex): in memory index of db_path, if any
+        Rest of the arguments are the same as search_identity
+    Returns:
+        results (list): identified image name, its thumbnail and confidence for each face
+    """
+    if identity_index is not None:
+        return identity_index.search_batch(detected_faces)
+    return [
+        search_identity(
+            detected_face=detected_face,
+            db_path=db_path,
+            model_name=model_name,
+            detector_backend=detector_backend,
+            distance_metric=distance_metric,
         )
+        for detected_face in detected_faces
+    ]
+
+
+def overlay_demography(
+    img: NDArray[Any],
+    demography: Dict[str, Any],
+    facial_area: Tuple[int, int, int, int, bool, float],
+) -> NDArray[Any]:
+    """
+    Overlay emotion, age and gender of a face onto image itself
+    Args:
+        img (np.ndarray): image itself
+        demography (dict): analysis result of the face
+        facial_area (tuple): x, y, w and h values also is_real and antispoof_score keys
+    Returns:
+        img (np.ndarray): image with analyzed demography information
+    """
+    x, y, w, h = facial_area[0:4]
+    img = overlay_emotion(img=img, emotion_probas=demography["emotion"], x=x, y=y, w=w, h=h)
+    img = overlay_age_gender(
+        img=img,
+        apparent_age=demography["age"],
+        gender=demography["dominant_gender"][0:1],  # M or W
+        x=x,
+        y=y,
+        w=w,
+        h=h,
+    )
     return img
 
 
@@ -0,0 +1,266 @@
+# built-in dependencies
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 3rd party dependencies
+from numpy.typing import NDArray
+import cv2
+
+# project dependencies
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+# x, y, w, h, is_real and antispoof_score of a facial area
+FacialArea = Tuple[int, int, int, int, bool, float]
+
+# iou predicts boxes with the velocity observed between detections, the rest are opencv
+# trackers following each face's appearance (kcf and csrt require opencv-contrib-python)
+TRACKERS = {
+    "iou": None,
+    "mil": "TrackerMIL_create",
+    "kcf": "TrackerKCF_create",
+    "csrt": "TrackerCSRT_create",
+}
+
+# detector runs on every n-th frame, tracks are followed by the tracker in between
+DETECTION_INTERVAL = int(os.getenv("DEEPFACE_DETECTION_INTERVAL", "5"))
+# minimum overlap of a detection and a track to be considered the same face
+IOU_THRESHOLD = float(os.getenv("DEEPFACE_TRACKING_IOU_THRESHOLD", "0.3"))
+# a track is dropped after it is not matched by this many sequential detections
+MAX_MISSES = int(os.getenv("DEEPFACE_TRACKING_MAX_MISSES", "1"))
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class Track:
+    """
+    A face followed across frames with a stable id. Recognition and demography results
+        are cached on the track, so that a person is analyzed once per appearance.
+    """
+
+    track_id: int
+    facial_area: FacialArea
+    # facial area found by the last matching detection
+    detected_area: FacialArea
+    # pixels moved per frame, observed between the last two detections
+    velocity: Tuple[float, float] = (0.0, 0.0)
+    # frames since the track was last matched by a detection
+    frames_since_detection: int = 0
+    misses: int = 0
+    # (label, identified image, confidence) once searched, label is None if not found
+    identity: Optional[Tuple[Optional[str], Optional[NDArray[Any]], float]] = None
+    demography: Optional[Dict[str, Any]] = None
+    cv_tracker: Optional[Any] = field(default=None, repr=False)
+
+
+class FaceTracker:
+    """
+    Follow detected faces between detections. The detector runs every detection_interval
+        frames, or earlier if the tracker loses a face, and detections are associated to
+        existing tracks by greedy intersection over union matching.
+    """
+
+    def __init__(
+        self,
+        tracker: str = "iou",
+        detection_interval: Optional[int] = None,
+        iou_threshold: float = IOU_THRESHOLD,
+        max_misses: int = MAX_MISSES,
+    ) -> None:
+        if tracker not in TRACKERS:
+            raise ValueError(f"Unsupported tracker: {tracker}. Options: {list(TRACKERS)}")
+        self.tracker = tracker
+        self.detection_interval = max(detection_interval or DETECTION_INTERVAL, 1)
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.tracks: List[Track] = []
+        self._next_id = 0
+        self._frames_until_detection = 0
+        self._create_cv_tracker = build_cv_tracker_factory(tracker)
+
+    def update(
+        self, img: NDArray[Any], detect: Callable[[NDArray[Any]], List[FacialArea]]
+    ) -> List[Track]:
+        """
+        Move tracks onto the given frame, running the detector if it is due
+        Args:
+            img (np.ndarray): frame in BGR
+            detect (callable): detector returning facial areas of a frame
+        Returns:
+            tracks (list): tracks visible in the frame
+        """
+        if self.predict(img):
+            self.correct(img, detect(img))
+        return self.visible_tracks
+
+    def predict(self, img: NDArray[Any]) -> bool:
+        """
+        Move tracks onto the given frame without running the detector. Callers detecting
+            faces of several frames in a batch call predict and then correct if it is due.
+        Args:
+            img (np.ndarray): frame in BGR
+        Returns:
+            detection_due (bool): True if faces of the frame should be detected
+        """
+        for track in self.tracks:
+            track.frames_since_detection += 1
+
+        lost = False
+        if self._frames_until_detection > 0 and self.tracks:
+            lost = not self._follow(img)
+
+        self._frames_until_detection -= 1
+        return self._frames_until_detection < 0 or lost or not self.tracks
+
+    def correct(self, img: NDArray[Any], detections: List[FacialArea]) -> List[Track]:
+        """
+        Associate detections of the frame given to predict with tracks
+        Args:
+            img (np.ndarray): frame in BGR
+            detections (list): facial areas detected in the frame
+        Returns:
+            ended_tracks (list): tracks dropped since they are missed too many times
+        """
+        self._frames_until_detection = self.detection_interval - 1
+        return self._associate(img, detections)
+
+    @property
+    def visible_tracks(self) -> List[Track]:
+        """Tracks matched by the last detection or followed since then."""
+        return [track for track in self.tracks if track.misses == 0]
+
+    def reset(self) -> None:
+        """Drop all tracks and their cached results."""
+        self.tracks = []
+        self._frames_until_detection = 0
+
+    def _follow(self, img: NDArray[Any]) -> bool:
+        """
+        Move every track onto the frame without running the detector
+        Returns:
+            followed (bool): False if the tracker lost a face
+        """
+        followed = True
+        for track in self.tracks:
+            x, y, w, h, is_real, antispoof_score = track.facial_area
+
+            if track.cv_tracker is None:
+                dx, dy = track.velocity
+                # keep predicted boxes inside the frame
+                x = min(max(int(round(x + dx)), 0), max(img.shape[1] - w, 0))
+                y = min(max(int(round(y + dy)), 0), max(img.shape[0] - h, 0))
+            else:
+                found, box = track.cv_tracker.update(img)
+                if not found:
+                    followed = False
+                    continue
+                x, y, w, h = (int(value) for value in box)
+
+            track.facial_area = (x, y, w, h, is_real, antispoof_score)
+        return followed
+
+    def _associate(self, img: NDArray[Any], detections: List[FacialArea]) -> List[Track]:
+        """
+        Match detections with existing tracks, start tracks for new faces
+            and drop the ones missed too many times
+        Returns:
+            ended_tracks (list): dropped tracks
+        """
+        pairs = sorted(
+            (
+                (find_iou(track.facial_area, detection), track_idx, detection_idx)
+                for track_idx, track in enumerate(self.tracks)
+                for detection_idx, detection in enumerate(detections)
+            ),
+            reverse=True,
+        )
+
+        matched_tracks, matched_detections = set(), set()
+        for iou, track_idx, detection_idx in pairs:
+            if iou < self.iou_threshold:
+                break
+            if track_idx in matched_tracks or detection_idx in matched_detections:
+                continue
+            matched_tracks.add(track_idx)
+            matched_detections.add(detection_idx)
+
+            track = self.tracks[track_idx]
+            detection = detections[detection_idx]
+            if track.frames_since_detection > 0:
+                track.velocity = (
+                    (detection[0] - track.detected_area[0]) / track.frames_since_detection,
+                    (detection[1] - track.detected_area[1]) / track.frames_since_detection,
+                )
+            track.facial_area = detection
+            track.detected_area = detection
+            track.frames_since_detection = 0
+            track.misses = 0
+            track.cv_tracker = self._start_cv_tracker(img, detection)
+
+        for track_idx, track in enumerate(self.tracks):
+            if track_idx not in matched_tracks:
+                track.misses += 1
+        ended_tracks = [track for track in self.tracks if track.misses > self.max_misses]
+        self.tracks = [track for track in self.tracks if track.misses <= self.max_misses]
+
+        for detection_idx, detection in enumerate(detections):
+            if detection_idx in matched_detections:
+                continue
+            self.tracks.append(
+                Track(
+                    track_id=self._next_id,
+                    facial_area=detection,
+                    detected_area=detection,
+                    cv_tracker=self._start_cv_tracker(img, detection),
+                )
+            )
+            logger.debug(f"Started track {self._next_id}")
+            self._next_id += 1
+
+        return ended_tracks
+
+    def _start_cv_tracker(self, img: NDArray[Any], facial_area: FacialArea) -> Optional[Any]:
+        """Start an opencv tracker on the facial area, None for iou tracker."""
+        if self._create_cv_tracker is None:
+            return None
+        cv_tracker = self._create_cv_tracker()
+        cv_tracker.init(img, tuple(int(value) for value in facial_area[0:4]))
+        return cv_tracker
+
+
+def build_cv_tracker_factory(tracker: str) -> Optional[Callable[[], Any]]:
+    """
+    Find the opencv tracker constructor of the given tracker
+    Args:
+        tracker (str): iou, mil, kcf or csrt
+    Returns:
+        factory (callable): constructor of the opencv tracker, None for iou
+    """
+    constructor_name = TRACKERS[tracker]
+    if constructor_name is None:
+        return None
+    constructor = getattr(cv2, constructor_name, None) or getattr(
+        getattr(cv2, "legacy", None), constructor_name, None
+    )
+    if constructor is None:
+        raise ImportError(
+            f"{tracker} tracker is not available in your opencv build. "
+            "Please install it with `pip install opencv-contrib-python` "
+            "or use iou tracker instead."
+        )
+    return constructor
+
+
+def find_iou(first: FacialArea, second: FacialArea) -> float:
+    """
+    Find intersection over union of two facial areas
+    """
+    x1, y1, w1, h1 = first[0:4]
+    x2, y2, w2, h2 = second[0:4]
+    inter_w = max(0, min(x1 + w1, x2 + w2) - max(x1, x2))
+    inter_h = max(0, min(y1 + h1, y2 + h2) - max(y1, y2))
+    intersection = inter_w * inter_h
+    union = w1 * h1 + w2 * h2 - intersection
+    return intersection / union if union > 0 else 0.0
@@ -1,6 +1,6 @@
 # built-in dependencies
 import time
-from typing import Any, Dict, Optional, Union, List, Tuple, IO, cast
+from typing import Any, Dict, Optional, Union, List, Tuple, IO, Sequence, cast
 import math
 
 # 3rd party dependencies
@@ -12,7 +12,8 @@ from deepface.modules import representation, detection, modeling
 from deepface.models.FacialRecognition import FacialRecognition
 from deepface.commons.logger import Logger
 from deepface.config.confidence import confidences
-from deepface.config.threshold import thresholds
+from deepface.config.threshold import thresholds, quantized_thresholds
+from deepface.models.facial_recognition.Quantized import parse_model_name
 from deepface.modules.exceptions import (
     SpoofDetected,
     DimensionMismatchError,
@@ -158,26 +159,14 @@ def verify(
         """
         if isinstance(img_path, list):
             # given image is already pre-calculated embedding
-            if not all(isinstance(dim, (float, int)) for dim in img_path):
-
-                raise DataTypeError(
-                    f"When passing img{index}_path as a list,"
-                    " ensure that all its items are of type float."
-                )
-
-            if silent is False:
-                logger.warn(
-                    f"You passed {index}-th image as pre-calculated embeddings."
-                    "Please ensure that embeddings have been calculated"
-                    f" for the {model_name} model."
-                )
-
-            if len(img_path) != dims:
-                raise DimensionMismatchError(
-                    f"embeddings of {model_name} should have {dims} dimensions,"
-                    f" but {index}-th image has {len(img_path)} dimensions input"
-                )
-
+            __validate_embedding(
+                embedding=img_path,
+                name=f"img{index}_path",
+                description=f"{index}-th image",
+                model_name=model_name,
+                dims=dims,
+                silent=silent,
+            )
             img_embeddings = [img_path]
             img_facial_areas = [no_facial_area]
         else:
@@ -240,6 +229,273 @@ def verify(
     return resp_obj
 
 
+def verify_many(
+    probe: Union[str, NDArray[Any], List[float], IO[bytes]],
+    candidates: Sequence[Union[str, NDArray[Any], List[float], IO[bytes]]],
+    model_name: str = "VGG-Face",
+    detector_backend: str = "opencv",
+    distance_metric: str = "cosine",
+    enforce_detection: bool = True,
+    align: bool = True,
+    expand_percentage: int = 0,
+    normalization: str = "base",
+    silent: bool = False,
+    threshold: Optional[Union[float, Sequence[float]]] = None,
+    anti_spoofing: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Verify a probe image against many candidate images. The probe is represented once,
+        faces of the probe and all candidates are represented in a single forward pass,
+        and distances of all face pairs are found with a single distance matrix.
+
+    Args:
+        probe (str or np.ndarray or List[float] or IO[bytes]): image to verify, or its
+            pre-calculated embedding.
+
+        candidates (list): images to verify the probe against, each can be an exact image
+            path, numpy array (BGR), base64 encoded image, file object or pre-calculated
+            embedding.
+
+        threshold (float or list): threshold of all pairs, or threshold of each candidate.
+            Pre-tuned threshold of the model and distance metric is used if not set.
+
+        Other arguments are the same as in verify.
+
+    Returns:
+        results (list): verification result of the probe and each candidate with the same
+            keys of verify, img1 of facial areas is the probe's face.
+    """
+    tic = time.time()
+
+    if len(candidates) == 0:
+        return []
+
+    model: FacialRecognition = modeling.build_model(
+        task="facial_recognition", model_name=model_name
+    )
+    dims = model.output_shape
+
+    pretuned_threshold = find_threshold(model_name, distance_metric)
+    if threshold is None or isinstance(threshold, (int, float)):
+        thresholds_of_pairs = [threshold or pretuned_threshold] * len(candidates)
+    else:
+        if len(threshold) != len(candidates):
+            raise ValueError(
+                f"{len(threshold)} thresholds are given for {len(candidates)} candidates"
+            )
+        thresholds_of_pairs = [value or pretuned_threshold for value in threshold]
+
+    no_facial_area = {
+        "x": None,
+        "y": None,
+        "w": None,
+        "h": None,
+        "left_eye": None,
+        "right_eye": None,
+    }
+
+    # faces of each image, an embedding is given as is and the rest are represented together
+    images_faces: List[List[Dict[str, Any]]] = []
+    for idx, img_path in enumerate([probe, *candidates]):
+        name = "probe" if idx == 0 else f"candidates[{idx - 1}]"
+        description = "probe" if idx == 0 else f"{idx - 1}-th candidate"
+        if isinstance(img_path, list):
+            __validate_embedding(
+                embedding=img_path,
+                name=name,
+                description=description,
+                model_name=model_name,
+                dims=dims,
+                silent=silent,
+            )
+            # warn about the model of pre-calculated embeddings once
+            silent = True
+            images_faces.append([{"embedding": img_path, "facial_area": no_facial_area}])
+            continue
+        try:
+            images_faces.append(
+                __detect_faces(
+                    img_path=img_path,
+                    detector_backend=detector_backend,
+                    enforce_detection=enforce_detection,
+                    align=align,
+                    expand_percentage=expand_percentage,
+                    anti_spoofing=anti_spoofing,
+                )
+            )
+        except ValueError as err:
+            raise ValueError(f"Exception while processing {name}") from err
+
+    detected_faces = [face for faces in images_faces for face in faces if "face" in face]
+    if detected_faces:
+        embedding_objs = representation.represent(
+            # make compatible with direct representation call
+            img_path=[face["face"][:, :, ::-1] for face in detected_faces],
+            model_name=model_name,
+            enforce_detection=enforce_detection,
+            detector_backend="skip",
+            align=align,
+            normalization=normalization,
+        )
+        # a single face is not responded as a batch
+        if len(detected_faces) == 1:
+            embedding_objs = [embedding_objs]
+        for face, face_embedding_objs in zip(detected_faces, embedding_objs):
+            face["embedding"] = cast(List[Dict[str, Any]], face_embedding_objs)[0]["embedding"]
+
+    return verify_faces(
+        probe_faces=images_faces[0],
+        candidates_faces=images_faces[1:],
+        model_name=model_name,
+        detector_backend=detector_backend,
+        distance_metric=distance_metric,
+        candidate_thresholds=thresholds_of_pairs,
+        tic=tic,
+    )
+
+
+def verify_faces(
+    probe_faces: List[Dict[str, Any]],
+    candidates_faces: List[List[Dict[str, Any]]],
+    model_name: str,
+    detector_backend: str,
+    distance_metric: str,
+    candidate_thresholds: Optional[Sequence[float]] = None,
+    tic: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Verify already represented faces of a probe against faces of many candidates. The closest
+        face pair of the probe and a candidate decides its verification as in verify.
+    Args:
+        probe_faces (list): embedding and facial_area of each face of the probe
+        candidates_faces (list): embedding and facial_area of each face of each candidate
+        model_name (str): model that embeddings are calculated with
+        detector_backend (str): detector that faces are detected with
+        distance_metric (str): cosine, euclidean, euclidean_l2 or angular
+        candidate_thresholds (list): threshold of each candidate, pre-tuned one if not set
+        tic (float): start time of the verification, now if not set
+    Returns:
+        results (list): verification result of the probe and each candidate
+    """
+    tic = time.time() if tic is None else tic
+    pretuned_threshold = find_threshold(model_name, distance_metric)
+    if candidate_thresholds is None:
+        candidate_thresholds = [pretuned_threshold] * len(candidates_faces)
+
+    # (number of candidate faces, number of probe faces) shaped distances of all face pairs
+    distances = find_distance(
+        np.array([face["embedding"] for face in probe_faces]),
+        np.array([face["embedding"] for faces in candidates_faces for face in faces]),
+        distance_metric,
+    )
+
+    toc = time.time()
+
+    results = []
+    offset = 0
+    for candidate_faces, pair_threshold in zip(candidates_faces, candidate_thresholds):
+        candidate_distances = distances[offset : offset + len(candidate_faces)]
+        offset += len(candidate_faces)
+
+        # the closest face pair of two images decides the verification as in verify
+        candidate_idx, probe_idx = np.unravel_index(
+            np.argmin(candidate_distances), candidate_distances.shape
+        )
+        distance = float(candidate_distances[candidate_idx, probe_idx])
+        results.append(
+            {
+                "verified": distance <= pair_threshold,
+                "distance": distance,
+                "threshold": pair_threshold,
+                "confidence": find_confidence(
+                    distance=distance,
+                    model_name=model_name,
+                    distance_metric=distance_metric,
+                    verified=distance <= pretuned_threshold,
+                ),
+                "model": model_name,
+                "detector_backend": detector_backend,
+                "similarity_metric": distance_metric,
+                "facial_areas": {
+                    "img1": probe_faces[probe_idx]["facial_area"],
+                    "img2": candidate_faces[candidate_idx]["facial_area"],
+                },
+                "time": round(toc - tic, 2),
+            }
+        )
+
+    return results
+
+
+def __validate_embedding(
+    embedding: List[Any],
+    name: str,
+    description: str,
+    model_name: str,
+    dims: int,
+    silent: bool,
+) -> None:
+    """
+    Ensure a pre-calculated embedding given instead of an image fits the model
+    Args:
+        embedding (list): pre-calculated embedding
+        name (str): argument name of the embedding, e.g. img1_path
+        description (str): description of the embedding in messages, e.g. 1-th image
+        model_name (str): model that the embedding is expected to be calculated with
+        dims (int): dimensions of the model's embeddings
+        silent (bool): suppress the warning about the model of the embedding
+    """
+    if not all(isinstance(dim, (float, int)) for dim in embedding):
+        raise DataTypeError(
+            f"When passing {name} as a list, ensure that all its items are of type float."
+        )
+
+    if silent is False:
+        logger.warn(
+            f"You passed {description} as pre-calculated embeddings."
+            "Please ensure that embeddings have been calculated"
+            f" for the {model_name} model."
+        )
+
+    if len(embedding) != dims:
+        raise DimensionMismatchError(
+            f"embeddings of {model_name} should have {dims} dimensions,"
+            f" but {description} has {len(embedding)} dimensions input"
+        )
+
+
+def __detect_faces(
+    img_path: Union[str, NDArray[Any], IO[bytes]],
+    detector_backend: str,
+    enforce_detection: bool,
+    align: bool,
+    expand_percentage: int,
+    anti_spoofing: bool,
+) -> List[Dict[str, Any]]:
+    """
+    Extract faces of given image, ensuring that none of them is spoofed
+    Returns:
+        faces (List[dict]): face and facial_area of each face
+    """
+    img_objs: List[Dict[str, Any]] = cast(
+        List[Dict[str, Any]],
+        detection.extract_faces(
+            img_path=img_path,
+            detector_backend=detector_backend,
+            grayscale=False,
+            enforce_detection=enforce_detection,
+            align=align,
+            expand_percentage=expand_percentage,
+            anti_spoofing=anti_spoofing,
+        ),
+    )
+    if anti_spoofing is True and any(img_obj.get("is_real", True) is False for img_obj in img_objs):
+        raise SpoofDetected("Spoof detected in given image.")
+    return [
+        {"face": img_obj["face"], "facial_area": img_obj["facial_area"]} for img_obj in img_objs
+    ]
+
+
 def __extract_faces_and_embeddings(
     img_path: Union[str, NDArray[Any], IO[bytes]],
     model_name: str = "VGG-Face",
@@ -486,6 +742,14 @@ def find_threshold(model_name: str, distance_metric: str) -> float:
         threshold (float): threshold value for that model name and distance metric
             pair. Distances less than this threshold will be classified same person.
     """
+    # quantized variants e.g. VGG-Face-int8 fall back to their base model if not tuned
+    base_model_name, precision = parse_model_name(model_name)
+    if precision is not None:
+        threshold = quantized_thresholds.get(model_name, {}).get(distance_metric)
+        if threshold is not None:
+            return threshold
+        model_name = base_model_name
+
     if thresholds.get(model_name) is None:
         raise ValueError(f"Model {model_name} is not supported. ")
 
@@ -524,6 +788,9 @@ def find_confidence(
             certain the model is about the classification.
     """
 
+    # quantized variants share the distance distribution of their base model
+    model_name, _ = parse_model_name(model_name)
+
     if confidences.get(model_name) is None:
         return 51 if verified else 49
 
@@ -1,3 +1,6 @@
+-- pgvector is used when DEEPFACE_POSTGRES_PGVECTOR is enabled
+CREATE EXTENSION IF NOT EXISTS vector;
+
 DROP TABLE IF EXISTS embeddings;
 
 CREATE TABLE IF NOT EXISTS embeddings (
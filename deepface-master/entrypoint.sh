@@ -2,4 +2,8 @@
 echo "Starting the application..."
 exec "$@"
 
-gunicorn --workers=1 --timeout=7200 --bind=0.0.0.0:5000 --log-level=debug --access-logformat='%(h)s - - [%(t)s] "%(r)s" %(s)s %(b)s %(L)s' --access-logfile=- "app:create_app()"
+# web server threads only wait for inference results, so there is one for each running and
+# queued request of the inference executor, and a few more to reject requests beyond the queue
+THREADS=$(( ${DEEPFACE_INFERENCE_WORKERS:-$(getconf _NPROCESSORS_ONLN)} + ${DEEPFACE_MAX_QUEUE_SIZE:-64} + 4 ))
+
+gunicorn --workers=1 --worker-class=gthread --threads=$THREADS --timeout=7200 --bind=0.0.0.0:5000 --log-level=debug --access-logformat='%(h)s - - [%(t)s] "%(r)s" %(s)s %(b)s %(L)s' --access-logfile=- "app:create_app()"
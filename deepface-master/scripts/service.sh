@@ -5,4 +5,9 @@ cd ../deepface/api/src
 # python api.py
 
 # run the service with gunicorn - for prod purposes
-gunicorn --workers=1 --timeout=3600 --bind=0.0.0.0:5005 "app:create_app()"
\ No newline at end of file
+# a single process keeps one copy of each model, its threads accept requests while
+# inference runs on DEEPFACE_INFERENCE_WORKERS threads shared by all requests.
+# there is a web server thread for each running and queued request of the inference
+# executor, and a few more to reject requests beyond the queue with 503.
+THREADS=$(( ${DEEPFACE_INFERENCE_WORKERS:-$(getconf _NPROCESSORS_ONLN)} + ${DEEPFACE_MAX_QUEUE_SIZE:-64} + 4 ))
+gunicorn --workers=1 --worker-class=gthread --threads=$THREADS --timeout=3600 --bind=0.0.0.0:5005 "app:create_app()"
\ No newline at end of file
@@ -0,0 +1,95 @@
+# built-in dependencies
+import os
+
+# 3rd party dependencies
+import pytest
+import psycopg
+import numpy as np
+import faiss
+from deepface import DeepFace
+
+# project dependencies
+from deepface.modules.database.postgres import PostgresClient
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+connection_details_dict = {
+    "host": "localhost",
+    "port": 5433,
+    "dbname": "deepface",
+    "user": "deepface_user",
+    "password": "deepface_pass",
+}
+
+
+# pylint: disable=unused-argument
+@pytest.fixture
+def flush_data():
+    conn = psycopg.connect(**connection_details_dict)
+    cur = conn.cursor()
+    cur.execute("DELETE FROM embeddings;")
+    cur.execute("DELETE FROM embeddings_index;")
+    conn.commit()
+    cur.close()
+    conn.close()
+    logger.info("🗑️ Embeddings and index data flushed.")
+
+
+def count_indexed(conn: psycopg.Connection) -> int:
+    index_bytes = PostgresClient(connection=conn).get_embeddings_index(
+        model_name="Facenet", detector_backend="mtcnn", aligned=True, l2_normalized=False
+    )
+    index = faiss.deserialize_index(np.frombuffer(index_bytes, dtype=np.uint8))
+    return int(index.ntotal)
+
+
+def test_postgres_incremental_build_index(flush_data):
+    conn = psycopg.connect(**connection_details_dict)
+
+    img_paths = sorted(
+        os.path.join("../unit/dataset", filename)
+        for filename in os.listdir("../unit/dataset")
+        if filename.lower().endswith(".jpg")
+    )[0:6]
+
+    for img_path in img_paths[0:3]:
+        DeepFace.register(
+            img=img_path, model_name="Facenet", detector_backend="mtcnn", connection=conn
+        )
+
+    DeepFace.build_index(model_name="Facenet", detector_backend="mtcnn", connection=conn)
+    first_count = count_indexed(conn)
+    assert first_count > 0
+
+    # nothing new to index
+    DeepFace.build_index(model_name="Facenet", detector_backend="mtcnn", connection=conn)
+    assert count_indexed(conn) == first_count
+
+    for img_path in img_paths[3:]:
+        DeepFace.register(
+            img=img_path, model_name="Facenet", detector_backend="mtcnn", connection=conn
+        )
+
+    DeepFace.build_index(model_name="Facenet", detector_backend="mtcnn", connection=conn)
+
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT COUNT(*) FROM embeddings WHERE model_name = 'Facenet'"
+            " AND detector_backend = 'mtcnn'"
+        )
+        total = cur.fetchone()[0]
+
+    assert count_indexed(conn) == total
+
+    dfs = DeepFace.search(
+        img=img_paths[-1],
+        model_name="Facenet",
+        detector_backend="mtcnn",
+        connection=conn,
+        search_method="ann",
+    )
+    assert len(dfs) > 0
+
+    conn.close()
+    logger.info("✅ Postgres incremental build index test passed.")
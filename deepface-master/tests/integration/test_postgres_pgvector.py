@@ -0,0 +1,115 @@
+# built-in dependencies
+import os
+
+# 3rd party dependencies
+import pytest
+import psycopg
+import pandas as pd
+from deepface import DeepFace
+
+# project dependencies
+from deepface.modules.database import postgres
+from deepface.modules.verification import find_threshold
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+connection_details_dict = {
+    "host": "localhost",
+    "port": 5433,
+    "dbname": "deepface",
+    "user": "deepface_user",
+    "password": "deepface_pass",
+}
+
+
+# pylint: disable=unused-argument, redefined-outer-name
+@pytest.fixture
+def pgvector_mode(monkeypatch):
+    monkeypatch.setattr(postgres, "PGVECTOR_ENABLED", True)
+    conn = psycopg.connect(**connection_details_dict)
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM embeddings;")
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_postgres_pgvector_search(pgvector_mode):
+    conn = pgvector_mode
+
+    img_paths = sorted(
+        os.path.join("../unit/dataset", filename)
+        for filename in os.listdir("../unit/dataset")
+        if filename.lower().endswith(".jpg")
+    )[0:10]
+
+    for img_path in img_paths:
+        DeepFace.register(
+            img=img_path, model_name="Facenet", detector_backend="mtcnn", connection=conn
+        )
+
+    # creates pgvector index instead of faiss index
+    DeepFace.build_index(model_name="Facenet", detector_backend="mtcnn", connection=conn)
+
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = 'embeddings' "
+            "AND indexname LIKE 'embeddings_vector_%'"
+        )
+        assert any("hnsw" in row[0] for row in cur.fetchall())
+    conn.commit()
+
+    ann_dfs = DeepFace.search(
+        img=img_paths[0],
+        model_name="Facenet",
+        detector_backend="mtcnn",
+        connection=conn,
+        search_method="ann",
+    )
+    exact_dfs = DeepFace.search(
+        img=img_paths[0],
+        model_name="Facenet",
+        detector_backend="mtcnn",
+        distance_metric="euclidean",
+        connection=conn,
+    )
+
+    assert len(ann_dfs) == 1
+    assert isinstance(ann_dfs[0], pd.DataFrame)
+    assert ann_dfs[0].shape[0] > 0
+    # every returned neighbour is within the threshold
+    assert (ann_dfs[0]["distance"] <= find_threshold("Facenet", "euclidean")).all()
+    assert set(ann_dfs[0]["img_name"]) <= set(exact_dfs[0]["img_name"])
+    assert ann_dfs[0]["distance"].iloc[0] == pytest.approx(
+        exact_dfs[0]["distance"].iloc[0], abs=1e-3
+    )
+
+    logger.info("✅ Postgres pgvector search test passed.")
+
+
+def test_postgres_pgvector_search_of_large_embeddings(pgvector_mode):
+    conn = pgvector_mode
+
+    img_paths = ["../unit/dataset/img1.jpg", "../unit/dataset/img2.jpg"]
+    for img_path in img_paths:
+        DeepFace.register(img=img_path, model_name="VGG-Face", connection=conn)
+
+    # 4096 dimensional embeddings are indexed as half precision vectors
+    DeepFace.build_index(model_name="VGG-Face", connection=conn)
+
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = 'embeddings' "
+            "AND indexname LIKE 'embeddings_vector_%'"
+        )
+        assert any("halfvec(4096)" in row[0] for row in cur.fetchall())
+    conn.commit()
+
+    dfs = DeepFace.search(
+        img=img_paths[0], model_name="VGG-Face", connection=conn, search_method="ann"
+    )
+    assert len(dfs) == 1
+    assert "img1.jpg" in dfs[0]["img_name"].iloc[0]
+
+    logger.info("✅ Postgres pgvector search of large embeddings test passed.")
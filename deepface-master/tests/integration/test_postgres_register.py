@@ -5,9 +5,12 @@ from unittest.mock import patch
 # 3rd party dependencies
 import pytest
 import psycopg
+import numpy as np
 from deepface import DeepFace
 
 # project dependencies
+from deepface.modules.database.postgres import PostgresClient
+from deepface.modules.database.hashing import find_legacy_face_hash
 from deepface.commons.logger import Logger
 
 logger = Logger()
@@ -114,3 +117,34 @@ def test_register_duplicate(flush_data):
         )
 
     logger.info("✅ Duplicate registration test passed.")
+
+
+def test_register_duplicate_of_legacy_face_hash(flush_data):
+    rng = np.random.default_rng(0)
+    record = {
+        "img_name": "legacy.jpg",
+        "face": rng.random((8, 8, 3)),
+        "model_name": "Facenet",
+        "detector_backend": "mtcnn",
+        "aligned": True,
+        "l2_normalized": False,
+        "embedding": rng.random(128).tolist(),
+    }
+    client = PostgresClient(connection_details=connection_details_dict)
+    assert client.insert_embeddings([record]) == 1
+
+    # faces registered by earlier versions were hashed on their json serialization
+    with client.conn.cursor() as cur:
+        cur.execute(
+            "UPDATE embeddings SET face_hash = %s", (find_legacy_face_hash(record["face"]),)
+        )
+    client.conn.commit()
+
+    with pytest.raises(ValueError, match="Duplicate detected for extracted face and embedding"):
+        client.insert_embeddings([record])
+
+    other_record = {**record, "face": rng.random((8, 8, 3))}
+    assert client.insert_embeddings([other_record]) == 1
+    client.close()
+
+    logger.info("✅ Duplicate registration of legacy face hash test passed.")
@@ -93,3 +93,32 @@ def test_postgres_search(flush_data, load_data):
 
     conn.close()
     logger.info("✅ Postgres search test passed.")
+
+
+def test_postgres_columnar_search(flush_data, load_data):
+    conn = psycopg.connect(**connection_details_dict)
+
+    target_paths = ["dataset/target.jpg", "../unit/dataset/img1.jpg"]
+
+    dfs = DeepFace.search(
+        img=target_paths,
+        model_name="Facenet",
+        detector_backend="mtcnn",
+        connection=conn,
+    )
+    columns = DeepFace.search(
+        img=target_paths,
+        model_name="Facenet",
+        detector_backend="mtcnn",
+        connection=conn,
+        columnar=True,
+    )
+
+    assert isinstance(columns, dict)
+    for query_idx, df in enumerate(dfs):
+        rows = columns["query"] == query_idx
+        assert columns["id"][rows].tolist() == df["id"].tolist()
+        assert columns["distance"][rows].tolist() == pytest.approx(df["distance"].tolist())
+
+    conn.close()
+    logger.info("✅ Postgres columnar search test passed.")
@@ -206,6 +206,24 @@ def test_analyze_for_batched_image_as_list_of_numpy():
     logger.info("✅ test analyze for batched image as list of numpy done")
 
 
+def test_batched_analysis_is_consistent_with_single_analysis():
+    img_paths = ["dataset/img1.jpg", "dataset/couple.jpg"]
+
+    demography_batch = DeepFace.analyze(img_path=img_paths, silent=True)
+
+    for img_path, batch_objs in zip(img_paths, demography_batch):
+        single_objs = DeepFace.analyze(img_path=img_path, silent=True)
+        assert len(single_objs) == len(batch_objs)
+        for single_obj, batch_obj in zip(single_objs, batch_objs):
+            assert single_obj["region"] == batch_obj["region"]
+            assert single_obj["dominant_gender"] == batch_obj["dominant_gender"]
+            assert single_obj["dominant_race"] == batch_obj["dominant_race"]
+            assert single_obj["dominant_emotion"] == batch_obj["dominant_emotion"]
+            assert abs(single_obj["age"] - batch_obj["age"]) <= 1
+
+    logger.info("✅ test batched analysis is consistent with single analysis done")
+
+
 def test_analyze_for_numpy_batched_image():
     img1_path = "dataset/img4.jpg"
     img2_path = "dataset/couple.jpg"
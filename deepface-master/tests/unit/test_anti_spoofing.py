@@ -0,0 +1,91 @@
+# built-in dependencies
+import sys
+import types
+from typing import Any, List, Tuple
+
+# 3rd party dependencies
+import cv2
+import pytest
+import numpy as np
+
+# project dependencies
+from deepface import DeepFace
+from deepface.models.spoofing import FasNet
+from deepface.modules import modeling
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+def analyze_face_by_face(
+    model: Any, img: np.ndarray, facial_area: List[int]
+) -> Tuple[bool, float]:
+    """Run both models on a single face, as analyze did before faces were batched."""
+    import torch
+    import torch.nn.functional as F
+
+    prediction = np.zeros(3)
+    for net, scale in [(model.first_model, 2.7), (model.second_model, 4)]:
+        face = FasNet.crop(img, facial_area, scale, 80, 80)
+        tensor = torch.from_numpy(face.transpose((2, 0, 1))).float().unsqueeze(0)
+        with torch.no_grad():
+            prediction += F.softmax(net.forward(tensor.to(model.device)), dim=1).cpu().numpy()[0]
+
+    label = np.argmax(prediction)
+    return bool(label == 1), prediction[label] / 2
+
+
+@pytest.mark.parametrize("img_path", ["dataset/img1.jpg", "dataset/couple.jpg"])
+def test_analyze_batch_matches_face_by_face(img_path):
+    model = modeling.build_model(task="spoofing", model_name="Fasnet")
+    img = cv2.imread(img_path)
+    facial_areas = [
+        [face_obj["facial_area"][key] for key in ["x", "y", "w", "h"]]
+        for face_obj in DeepFace.extract_faces(img_path=img_path)
+    ]
+    assert len(facial_areas) > 0
+
+    results = model.analyze_batch(img=img, facial_areas=facial_areas)
+    assert len(results) == len(facial_areas)
+    for facial_area, (is_real, score) in zip(facial_areas, results):
+        expected_is_real, expected_score = analyze_face_by_face(model, img, facial_area)
+        assert is_real == expected_is_real
+        assert score == pytest.approx(expected_score, abs=1e-5)
+        # a single face is analyzed as a batch of one
+        assert model.analyze(img=img, facial_area=facial_area) == pytest.approx(
+            (is_real, score), abs=1e-5
+        )
+
+    assert model.analyze_batch(img=img, facial_areas=[]) == []
+    logger.info(f"✅ test analyze batch matches face by face for {img_path} done")
+
+
+def test_torch_threads_from_environment(monkeypatch):
+    calls = []
+
+    def set_num_interop_threads(num_threads: int) -> None:
+        calls.append(("interop", num_threads))
+        if len(calls) > 2:
+            raise RuntimeError("cannot set number of interop threads after parallel work")
+
+    # thread pools of the process are not changed by the test
+    fake_torch = types.SimpleNamespace(
+        set_num_threads=lambda num_threads: calls.append(("intra", num_threads)),
+        set_num_interop_threads=set_num_interop_threads,
+    )
+    monkeypatch.setitem(sys.modules, "torch", fake_torch)
+
+    monkeypatch.delenv("DEEPFACE_TORCH_THREADS", raising=False)
+    monkeypatch.delenv("DEEPFACE_TORCH_INTEROP_THREADS", raising=False)
+    FasNet.configure_torch_threads()
+    assert calls == []
+
+    monkeypatch.setenv("DEEPFACE_TORCH_THREADS", "3")
+    monkeypatch.setenv("DEEPFACE_TORCH_INTEROP_THREADS", "2")
+    FasNet.configure_torch_threads()
+    assert calls == [("intra", 3), ("interop", 2)]
+
+    # inter-op threads can be set once, later attempts only log a warning
+    FasNet.configure_torch_threads()
+    assert calls[2:] == [("intra", 3), ("interop", 2)]
+    logger.info("✅ test torch threads from environment done")
@@ -1,7 +1,11 @@
 # built-in dependencies
 import base64
+import io
+import json
 import os
 import shutil
+import threading
+import time
 import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -11,13 +15,21 @@ from unittest.mock import MagicMock, patch
 import flask
 import gdown
 import numpy as np
+import pytest
 import werkzeug
 from flask import Flask
 from packaging import version
 
 # project dependencies
 from deepface.api.src.app import create_app
-from deepface.api.src.modules.core import routes
+from deepface.api.src.modules.core import routes, service
+from deepface.api.src.modules.core.routes import blueprint
+from deepface.api.src.dependencies import preload
+from deepface.api.src.dependencies.executor import (
+    InferenceExecutor,
+    ServerOverloadedError,
+    DeadlineExceededError,
+)
 from deepface.commons.logger import Logger
 from deepface.modules.detection import extract_faces, DetectedFace, FacialAreaRegion
 from deepface.modules import detection
@@ -527,3 +539,305 @@ def test_landmarks_are_raw_python_types(monkeypatch):
             assert all(isinstance(coord, int) for coord in value)
         else:
             assert isinstance(value, int)
+
+
+def test_inference_executor_admission_and_deadline():
+    executor = InferenceExecutor(max_workers=1, max_queue_size=1, timeout=5)
+    release = threading.Event()
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+        return "done"
+
+    running = threading.Thread(target=executor.run, args=(block,))
+    running.start()
+    started.wait()
+
+    # second request waits in the queue until its deadline, third one is not admitted
+    waiting = threading.Thread(
+        target=lambda: pytest.raises(DeadlineExceededError, executor.run, block, timeout=0.2)
+    )
+    waiting.start()
+    while executor.pending < 2:
+        time.sleep(0.01)
+    with pytest.raises(ServerOverloadedError):
+        executor.run(block)
+
+    waiting.join()
+    release.set()
+    running.join()
+    assert executor.run(lambda x: x + 1, 1) == 2
+    assert executor.pending == 0
+    executor.shutdown()
+    logger.info("✅ test inference executor admission and deadline done")
+
+
+def test_routes_run_on_inference_executor(monkeypatch):
+    threads = []
+
+    def fake_represent(**kwargs):
+        threads.append(threading.current_thread().name)
+        return {"results": [{"img": kwargs["img_path"]}]}, 200
+
+    monkeypatch.setattr(service, "represent", fake_represent)
+    client = create_app().test_client()
+
+    response = client.post("/represent", json={"img": "dataset/img1.jpg"})
+    assert response.status_code == 200
+    assert response.json["results"][0]["img"] == "dataset/img1.jpg"
+    assert threads[0].startswith("deepface-inference")
+
+    def slow_represent(**kwargs):
+        release.wait()
+        return {}, 200
+
+    release = threading.Event()
+    monkeypatch.setattr(service, "represent", slow_represent)
+    response = client.post(
+        "/represent", json={"img": "dataset/img1.jpg"}, headers={"X-Request-Timeout": "0.1"}
+    )
+    release.set()
+    assert response.status_code == 504
+
+    response = client.post(
+        "/represent", json={"img": "dataset/img1.jpg"}, headers={"X-Request-Timeout": "soon"}
+    )
+    assert response.status_code == 400
+    logger.info("✅ test routes run on inference executor done")
+
+
+def test_build_index_runs_on_inference_executor(monkeypatch):
+    threads = []
+
+    def fake_build_index(**kwargs):
+        threads.append(threading.current_thread().name)
+        return {"message": "Index built successfully"}, 200
+
+    monkeypatch.setattr(service, "build_index", fake_build_index)
+    client = create_app().test_client()
+    monkeypatch.setattr(blueprint.variables, "conection_details", "postgresql://localhost")
+
+    response = client.post("/build/index", json={"model_name": "Facenet"})
+    assert response.status_code == 200
+    assert threads[0].startswith("deepface-inference")
+
+    # the longest running endpoint is bound by the deadline as well
+    monkeypatch.setattr(service, "build_index", lambda **kwargs: time.sleep(0.5))
+    response = client.post(
+        "/build/index", json={"model_name": "Facenet"}, headers={"X-Request-Timeout": "0.1"}
+    )
+    assert response.status_code == 504
+    logger.info("✅ test build index runs on inference executor done")
+
+
+calls = []
+
+
+def fake_represent(img_path, **kwargs):
+    """Represent images named with a number as a one hot vector of that number."""
+    images = img_path if isinstance(img_path, list) else [img_path]
+    calls.append(len(images))
+    results = []
+    for image in images:
+        name = image if isinstance(image, str) else image.filename
+        if not name[0].isdigit():
+            raise ValueError(f"Face could not be detected in {name}")
+        embedding = [0.0] * 4
+        embedding[int(name[0])] = 1.0
+        results.append([{"embedding": embedding, "facial_area": {"x": 0}}])
+    return results[0] if len(images) == 1 else results
+
+
+def test_represent_batch_streams_results(monkeypatch):
+    calls.clear()
+    monkeypatch.setattr(service.DeepFace, "represent", fake_represent)
+    client = create_app().test_client()
+    blueprint.variables.batch_size = 2
+
+    lines = [{"img": name, "id": f"item-{i}"} for i, name in enumerate(["0", "1", "x", "3", "2"])]
+    response = client.post(
+        "/represent/batch",
+        data="\n".join(json.dumps(line) for line in lines),
+        content_type="application/x-ndjson",
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert [result["index"] for result in results] == [0, 1, 2, 3, 4]
+    assert [result["id"] for result in results] == [f"item-{i}" for i in range(5)]
+    assert results[1]["results"][0]["embedding"] == [0.0, 1.0, 0.0, 0.0]
+    # a failing image only fails its own line, others of its batch are retried separately
+    assert "Face could not be detected" in results[2]["error"]
+    assert "error" not in results[3]
+    assert calls == [2, 2, 1, 1, 1]
+
+    response = client.post("/represent/batch", json={"img": "0"})
+    assert response.status_code == 400
+    logger.info("✅ test represent batch streams results done")
+
+
+
+def test_batch_flags_are_parsed_from_query_parameters(monkeypatch):
+    options = []
+
+    def fake_represent_flags(img_path, **kwargs):
+        options.append(kwargs)
+        return fake_represent(img_path)
+
+    monkeypatch.setattr(service.DeepFace, "represent", fake_represent_flags)
+    client = create_app().test_client()
+
+    for query, expected in [
+        ("enforce_detection=false&align=0&anti_spoofing=false", False),
+        ("enforce_detection=True&align=1&anti_spoofing=true", True),
+    ]:
+        response = client.post(
+            f"/represent/batch?{query}",
+            data=json.dumps({"img": "0"}),
+            content_type="application/x-ndjson",
+        )
+        assert response.status_code == 200
+        assert "error" not in json.loads(response.get_data(as_text=True))
+        for flag in ["enforce_detection", "align", "anti_spoofing"]:
+            assert options[-1][flag] is expected
+
+    # flags that are not given keep their defaults
+    response = client.post(
+        "/represent/batch", data=json.dumps({"img": "0"}), content_type="application/x-ndjson"
+    )
+    assert response.status_code == 200 and response.get_data(as_text=True)
+    assert options[-1]["enforce_detection"] is True
+    assert options[-1]["anti_spoofing"] is False
+    logger.info("✅ test batch flags are parsed from query parameters done")
+
+def test_verify_batch_with_multipart_files(monkeypatch):
+    calls.clear()
+    monkeypatch.setattr(service.DeepFace, "represent", fake_represent)
+    client = create_app().test_client()
+
+    response = client.post(
+        "/verify/batch",
+        data={
+            "img1": [(io.BytesIO(b"."), "1.jpg"), (io.BytesIO(b"."), "2.jpg")],
+            "img2": [(io.BytesIO(b"."), "1.jpg"), (io.BytesIO(b"."), "3.jpg")],
+            "model_name": "Facenet",
+        },
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert results[0]["verified"] is True and results[0]["distance"] < 1e-6
+    assert results[1]["verified"] is False
+    assert results[1]["model"] == "Facenet"
+    # images of all pairs are represented together
+    assert calls == [4]
+    logger.info("✅ test verify batch with multipart files done")
+
+
+def test_represent_binary_response(monkeypatch):
+    embedding = np.random.default_rng(0).standard_normal(4096).tolist()
+    facial_area = {"x": 1, "y": 2, "w": 3, "h": 4, "left_eye": (5, 6), "right_eye": None}
+
+    def fake_represent(**kwargs):
+        return {"results": [{"embedding": embedding, "facial_area": facial_area}] * 2}, 200
+
+    monkeypatch.setattr(service, "represent", fake_represent)
+    client = create_app().test_client()
+
+    json_response = client.post("/represent", json={"img": "dataset/img1.jpg"})
+    assert json_response.mimetype == "application/json"
+
+    response = client.post(
+        "/represent", json={"img": "dataset/img1.jpg"}, headers={"Accept": "application/x-npy"}
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-npy"
+    records = np.load(io.BytesIO(response.data), allow_pickle=False)
+    assert records.shape == (2,)
+    assert np.allclose(records["embedding"][1], embedding, atol=1e-6)
+    assert records["w"][0] == 3
+    assert records["left_eye"][0].tolist() == [5, 6]
+    assert records["right_eye"][0].tolist() == [-1, -1]
+    assert len(json_response.data) > 4 * len(response.data)
+
+    response = client.post(
+        "/represent", json={"img": "dataset/img1.jpg"}, headers={"Accept": "text/html"}
+    )
+    assert response.status_code == 406
+    logger.info("✅ test represent binary response done")
+
+
+class FakeWeight:
+    shape = (10, 10)
+    dtype = "float32"
+
+
+class FakeKerasModel:
+    weights = [FakeWeight(), FakeWeight()]
+
+    def count_params(self):
+        return 200
+
+
+class FakeClient:
+    input_shape = (160, 160)
+
+    def __init__(self):
+        self.model = FakeKerasModel()
+        self.inputs = []
+
+    def forward(self, img):
+        self.inputs.append(img.shape)
+
+    def predict(self, img):
+        self.inputs.append(img.shape)
+
+    def detect_faces(self, img):
+        self.inputs.append(img.shape)
+        return []
+
+
+def test_preload_models_and_health(monkeypatch):
+    monkeypatch.setenv(
+        "DEEPFACE_PRELOAD_MODELS", json.dumps({"facial_attribute": ["Age", "Gender"]})
+    )
+    monkeypatch.setenv("DEEPFACE_FACE_RECOGNITION_MODELS", "Facenet")
+    monkeypatch.setenv("DEEPFACE_FACE_DETECTION_MODELS", "retinaface")
+
+    # two models can only pass the barrier together if they are loaded in parallel
+    barrier = threading.Barrier(2, timeout=5)
+    clients = {}
+
+    def fake_build_model(task, model_name):
+        if model_name in ["Age", "Gender"]:
+            barrier.wait()
+        if model_name == "retinaface":
+            raise ValueError("retinaface weights could not be downloaded")
+        clients[model_name] = FakeClient()
+        return clients[model_name]
+
+    monkeypatch.setattr(preload.modeling, "build_model", fake_build_model)
+    monkeypatch.setattr(preload.modeling, "cached_models", {}, raising=False)
+    client = create_app().test_client()
+
+    response = client.get("/health/models")
+    assert response.status_code == 503
+    statuses = {status["model_name"]: status for status in response.json["models"]}
+    # opencv is preloaded with any detector since it finds eyes when detectors do not
+    assert set(statuses) == {"Age", "Gender", "Facenet", "retinaface", "opencv"}
+    assert statuses["Age"]["loaded"] and statuses["Gender"]["loaded"]
+    assert statuses["Facenet"]["weights_bytes"] == 800
+    assert statuses["Facenet"]["warmup_time"] is not None
+    assert clients["Facenet"].inputs == [(1, 160, 160, 3)]
+    assert clients["opencv"].inputs == [(224, 224, 3)]
+    assert statuses["retinaface"]["loaded"] is False
+    assert "could not be downloaded" in statuses["retinaface"]["error"]
+    assert response.json["resident_memory_bytes"] > 0
+
+    with pytest.raises(ValueError, match="Unsupported facial_attribute models"):
+        preload.parse_preload_spec(json.dumps({"facial_attribute": ["Height"]}))
+    logger.info("✅ test preload models and health done")
@@ -0,0 +1,127 @@
+# built-in dependencies
+import time
+import threading
+from typing import Any, Dict, List
+
+# 3rd party dependencies
+import pytest
+
+# project dependencies
+from deepface.modules.database.types import Database
+from deepface.modules.database.pool import ClientPool, pool_key
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+# pylint: disable=unused-argument
+class FakeClient(Database):
+    def __init__(self) -> None:
+        self.closed = False
+        self.healthy = True
+        self.resets = 0
+
+    def ensure_embeddings_table(self) -> None:
+        pass
+
+    def upsert_embeddings_index(
+        self, model_name, detector_backend, aligned, l2_normalized, index_data
+    ) -> None:
+        pass
+
+    def get_embeddings_index(self, model_name, detector_backend, aligned, l2_normalized) -> bytes:
+        return b""
+
+    def insert_embeddings(self, embeddings: List[Dict[str, Any]], batch_size: int = 100) -> int:
+        return len(embeddings)
+
+    def fetch_all_embeddings(
+        self, model_name, detector_backend, aligned, l2_normalized, batch_size=1000, after_id=None
+    ) -> List[Dict[str, Any]]:
+        return []
+
+    def close(self) -> None:
+        self.closed = True
+
+    def search_by_vector(
+        self,
+        vector,
+        model_name="VGG-Face",
+        detector_backend="opencv",
+        aligned=True,
+        l2_normalized=False,
+        limit=10,
+    ) -> List[Dict[str, Any]]:
+        return []
+
+    def ping(self) -> bool:
+        return self.healthy
+
+    def reset(self) -> None:
+        self.resets += 1
+
+
+def test_pool_reuses_released_clients():
+    created: List[FakeClient] = []
+
+    def factory() -> FakeClient:
+        created.append(FakeClient())
+        return created[-1]
+
+    pool = ClientPool(factory=factory, max_size=2)
+
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+
+    assert second is first
+    assert len(created) == 1
+    assert first.resets == 1
+
+    pool.release(second)
+    pool.close()
+    assert first.closed is True
+    logger.info("✅ test pool reuses released clients done")
+
+
+def test_pool_blocks_when_exhausted():
+    pool = ClientPool(factory=FakeClient, max_size=1, timeout=0.1)
+    client = pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+    # a released client is handed to the waiting request
+    threading.Timer(0.05, pool.release, args=(client,)).start()
+    pool.timeout = 2
+    assert pool.acquire() is client
+    logger.info("✅ test pool blocks when exhausted done")
+
+
+def test_pool_discards_unhealthy_and_idle_clients():
+    pool = ClientPool(factory=FakeClient, max_size=2, health_check_interval=0)
+    client = pool.acquire()
+    pool.release(client)
+
+    client.healthy = False
+    replacement = pool.acquire()
+    assert replacement is not client
+    assert client.closed is True
+    pool.release(replacement)
+
+    pool.idle_timeout = 0
+    time.sleep(0.01)
+    another = pool.acquire()
+    assert another is not replacement
+    assert replacement.closed is True
+    assert pool.size == 1
+    logger.info("✅ test pool discards unhealthy and idle clients done")
+
+
+def test_pool_keys():
+    assert pool_key("postgres", "postgresql://a") == pool_key("postgres", "postgresql://a")
+    assert pool_key("postgres", "postgresql://a") != pool_key("mongo", "postgresql://a")
+    assert pool_key("postgres", {"host": "a", "port": 1}) == pool_key(
+        "postgres", {"port": 1, "host": "a"}
+    )
+    logger.info("✅ test pool keys done")
@@ -0,0 +1,38 @@
+# 3rd party dependencies
+import numpy as np
+
+# project dependencies
+from deepface.modules import modeling
+from deepface.models.demography import Distilled
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+def test_split_distilled_predictions():
+    batch = np.random.rand(3, 109)
+    age_predictions, gender_predictions, race_predictions = Distilled.split_predictions(batch)
+    assert age_predictions.shape == (3, 101)
+    assert gender_predictions.shape == (3, 2)
+    assert race_predictions.shape == (3, 6)
+    assert np.array_equal(
+        np.concatenate([age_predictions, gender_predictions, race_predictions], axis=1), batch
+    )
+
+    # single image predictions are returned as a batch of one
+    age_predictions, gender_predictions, race_predictions = Distilled.split_predictions(batch[0])
+    assert age_predictions.shape == (1, 101)
+    assert gender_predictions.shape == (1, 2)
+    assert race_predictions.shape == (1, 6)
+
+    logger.info("✅ test split distilled predictions done")
+
+
+def test_distilled_model_outputs_all_heads():
+    assert (
+        modeling.AVAILABLE_MODELS["facial_attribute"]["Distilled"]
+        == Distilled.DistilledDemographyClient
+    )
+    model = Distilled.build_model()
+    assert model.output_shape == (None, 109)
+    logger.info("✅ test distilled model outputs all heads done")
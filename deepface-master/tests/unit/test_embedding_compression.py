@@ -0,0 +1,153 @@
+# 3rd party dependencies
+import pytest
+import numpy as np
+
+# project dependencies
+from deepface.modules import datastore
+from deepface.modules.database import compression
+from deepface.modules.database.local import LocalClient
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+def make_clustered_embeddings(num_records: int, dimension: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((num_records // 10, dimension))
+    return (
+        centers[rng.integers(0, len(centers), num_records)]
+        + 0.3 * rng.standard_normal((num_records, dimension))
+    ).astype(np.float32)
+
+
+@pytest.mark.parametrize("embedding_compression", compression.COMPRESSIONS)
+def test_compressed_distances_recall(embedding_compression):
+    vectors = make_clustered_embeddings(2000, 64)
+    queries = vectors[0:20] + 0.05
+    codebook = compression.train_codebook(vectors) if embedding_compression == "pq" else None
+
+    codes = compression.encode(vectors, embedding_compression, codebook)
+    expected_size = {"float16": 2 * 64, "int8": 64 + 4, "pq": 64 // compression.PQ_SUBVECTOR_SIZE}
+    assert codes.shape == (2000, expected_size[embedding_compression])
+
+    for distance_metric in ["cosine", "euclidean", "euclidean_l2", "angular"]:
+        distances = compression.find_approximate_distances(
+            queries, codes, embedding_compression, distance_metric, codebook
+        )
+        assert distances.shape == (20, 2000)
+
+        # exact nearest neighbours are among the candidates that are re-ranked
+        exact = np.linalg.norm(vectors[None, :, :] - queries[:, None, :], axis=2)
+        if distance_metric != "euclidean":
+            exact = 1 - (queries @ vectors.T) / np.outer(
+                np.linalg.norm(queries, axis=1), np.linalg.norm(vectors, axis=1)
+            )
+        nearest = np.argsort(exact, axis=1)[:, 0:10]
+        candidates = np.argsort(distances, axis=1)[:, 0:100]
+        recall = np.mean([len(set(n) & set(c)) / 10 for n, c in zip(nearest, candidates)])
+        assert recall >= 0.95, f"{embedding_compression} {distance_metric} recall {recall}"
+
+    logger.info(f"✅ test compressed distances recall for {embedding_compression} done")
+
+
+def test_codebook_serialization():
+    codebook = compression.train_codebook(make_clustered_embeddings(300, 16))
+    subvector_size = compression.PQ_SUBVECTOR_SIZE
+    assert codebook.shape == (16 // subvector_size, 256, subvector_size)
+    restored = compression.deserialize_codebook(compression.serialize_codebook(codebook))
+    assert np.array_equal(restored, codebook)
+
+    with pytest.raises(ValueError, match="Unsupported embedding compression"):
+        compression.encode(make_clustered_embeddings(10, 16), "int4")
+    logger.info("✅ test codebook serialization done")
+
+
+def test_local_compressed_storage(tmp_path):
+    client = LocalClient(connection_details=str(tmp_path))
+    vectors = make_clustered_embeddings(20, 8)
+    codes = compression.encode(vectors, "int8")
+    records = [
+        {
+            "id": None,
+            "img_name": f"img_{i}.jpg",
+            "face": np.full((4, 4, 3), i, dtype=np.float32),
+            "model_name": "Facenet",
+            "detector_backend": "opencv",
+            "embedding": vectors[i].tolist(),
+            "aligned": True,
+            "l2_normalized": False,
+            # half of the embeddings are registered without compression
+            "embedding_code": codes[i].tobytes() if i % 2 == 0 else None,
+            "embedding_compression": "int8" if i % 2 == 0 else None,
+        }
+        for i in range(20)
+    ]
+    client.insert_embeddings(records)
+
+    blocks = list(
+        client.iter_embedding_codes(
+            model_name="Facenet",
+            detector_backend="opencv",
+            aligned=True,
+            l2_normalized=False,
+            compression="int8",
+            batch_size=4,
+        )
+    )
+    assert [len(ids) for ids, _, _ in blocks] == [4, 4, 2]
+    assert np.array_equal(np.concatenate([block for _, _, block in blocks]), codes[0::2])
+
+    ids = np.concatenate([block_ids for block_ids, _, _ in blocks])
+    embeddings = client.fetch_embeddings_by_id(ids.tolist())
+    assert np.allclose([embeddings[i] for i in ids.tolist()], vectors[0::2])
+
+    config = {
+        "model_name": "Facenet",
+        "detector_backend": "opencv",
+        "aligned": True,
+        "l2_normalized": False,
+    }
+    assert client.ensure_codebook(**config) is None
+    assert client.ensure_codebook(**config, codebook=b"first") == b"first"
+    # codes are encoded with the first stored codebook, so it is never replaced
+    assert client.ensure_codebook(**config, codebook=b"second") == b"first"
+    client.close()
+    logger.info("✅ test local compressed storage done")
+
+
+def test_pq_codebook_waits_for_enough_embeddings(monkeypatch, tmp_path):
+    vectors = make_clustered_embeddings(600, 64)
+
+    def fake_get_embeddings(img, **kwargs):
+        return [
+            {"embedding": vectors[i].tolist(), "face": np.full((4, 4, 3), i, dtype=np.float32)}
+            for i in img
+        ]
+
+    monkeypatch.setattr(datastore, "__get_embeddings", fake_get_embeddings)
+    database = {"database_type": "local", "connection_details": str(tmp_path)}
+    config = {"model_name": "Facenet", "detector_backend": "opencv"}
+
+    # a single embedding registered first does not train a codebook of a single centroid
+    datastore.register(img=[0], **config, **database, embedding_compression="pq")
+    client = LocalClient(connection_details=str(tmp_path))
+    assert client.ensure_codebook(**config, aligned=True, l2_normalized=False) is None
+
+    datastore.register(img=list(range(1, 600)), **config, **database, embedding_compression="pq")
+    codebook = client.ensure_codebook(**config, aligned=True, l2_normalized=False)
+    client.close()
+    assert compression.deserialize_codebook(codebook).shape[1] == compression.PQ_NUM_CENTROIDS
+
+    queries = list(range(0, 600, 30))
+    for k in [5, None]:
+        expected = datastore.search(img=queries, **config, **database, k=k)
+        results = datastore.search(
+            img=queries, **config, **database, k=k, embedding_compression="pq"
+        )
+        assert len(results) == len(expected)
+        for result, exact in zip(results, expected):
+            assert set(result["id"]) == set(exact["id"])
+        # the embedding registered before the codebook is still found
+        assert results[0]["img_name"].iloc[0] == expected[0]["img_name"].iloc[0]
+
+    logger.info("✅ test pq codebook waits for enough embeddings done")
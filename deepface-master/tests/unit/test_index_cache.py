@@ -0,0 +1,135 @@
+# built-in dependencies
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+# project dependencies
+from deepface.modules import datastore
+from deepface.modules.database import index_cache
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+class FakeIndexClient:
+    """Serves a versioned index and counts how many times it is downloaded"""
+
+    def __init__(self) -> None:
+        self.version = "v1"
+        self.downloads: List[str] = []
+
+    def get_embeddings_index_version(self, **kwargs: Any) -> str:
+        return self.version
+
+    def get_embeddings_index(self, **kwargs: Any) -> str:
+        self.downloads.append(self.version)
+        return self.version
+
+
+CONFIG: Dict[str, Any] = {
+    "model_name": "Facenet",
+    "detector_backend": "opencv",
+    "aligned": True,
+    "l2_normalized": False,
+}
+
+
+def fake_load_index(db_client: FakeIndexClient, **kwargs: Any) -> str:
+    return f"index-{db_client.get_embeddings_index(**kwargs)}"
+
+
+def test_index_is_cached_until_new_version(monkeypatch):
+    monkeypatch.setattr(index_cache, "load_index", fake_load_index)
+    monkeypatch.setattr(index_cache, "INDEX_CACHE_CHECK_INTERVAL", 0)
+    index_cache.clear()
+    client = FakeIndexClient()
+    key = ("fake", "db", "sync")
+
+    for _ in range(3):
+        assert index_cache.get_index(key=key, db_client=client, **CONFIG) == "index-v1"
+    assert client.downloads == ["v1"]
+
+    # without a background client, new version is loaded in the request
+    client.version = "v2"
+    assert index_cache.get_index(key=key, db_client=client, **CONFIG) == "index-v2"
+    assert client.downloads == ["v1", "v2"]
+    logger.info("✅ test index is cached until new version done")
+
+
+def test_new_version_is_loaded_in_background(monkeypatch):
+    monkeypatch.setattr(index_cache, "load_index", fake_load_index)
+    monkeypatch.setattr(index_cache, "INDEX_CACHE_CHECK_INTERVAL", 0)
+    index_cache.clear()
+    client = FakeIndexClient()
+    key = ("fake", "db", "background")
+
+    @contextmanager
+    def background_client():
+        time.sleep(0.1)
+        yield client
+
+    assert (
+        index_cache.get_index(
+            key=key, db_client=client, background_client=background_client, **CONFIG
+        )
+        == "index-v1"
+    )
+
+    client.version = "v2"
+    # stale index keeps serving while the new version is being loaded
+    assert (
+        index_cache.get_index(
+            key=key, db_client=client, background_client=background_client, **CONFIG
+        )
+        == "index-v1"
+    )
+
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        index = index_cache.get_index(
+            key=key, db_client=client, background_client=background_client, **CONFIG
+        )
+        if index == "index-v2":
+            break
+        time.sleep(0.02)
+
+    assert index == "index-v2"
+    assert client.downloads == ["v1", "v2"]
+    logger.info("✅ test new version is loaded in background done")
+
+
+def test_published_index_is_served_without_download(monkeypatch):
+    monkeypatch.setattr(index_cache, "load_index", fake_load_index)
+    index_cache.clear()
+    client = FakeIndexClient()
+    key = ("fake", "db", "published")
+
+    # build_index publishes the index it has just built
+    index_cache.put_index(key=key, index="index-v1", version="v1")
+    assert index_cache.get_index(key=key, db_client=client, **CONFIG) == "index-v1"
+    assert not client.downloads
+    logger.info("✅ test published index is served without download done")
+
+
+def test_index_cache_key_of_connections_is_not_reused():
+    index_cache_key = getattr(datastore, "__index_cache_key")
+    config = {
+        "database_type": "postgres",
+        "connection_details": None,
+        "model_name": "Facenet",
+        "detector_backend": "opencv",
+        "align": True,
+        "l2_normalize": False,
+    }
+
+    connection = FakeIndexClient()
+    key = index_cache_key(connection=connection, **config)
+    assert index_cache_key(connection=connection, **config) == key
+
+    # a connection created after the first one is freed may get the same id
+    del connection
+    keys = {index_cache_key(connection=FakeIndexClient(), **config) for _ in range(10)}
+    assert key not in keys
+    assert len(keys) == 10
+
+    logger.info("✅ test index cache key of connections is not reused done")
@@ -0,0 +1,269 @@
+# built-in dependencies
+import os
+import threading
+from typing import Any, Dict, List
+
+# 3rd party dependencies
+import pytest
+import numpy as np
+
+# project dependencies
+from deepface.modules import datastore
+from deepface.modules.database import local
+from deepface.modules.database.local import LocalClient
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+def make_records(num_records: int, dimension: int = 8, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "id": None,
+            "img_name": f"img{seed}_{i}.jpg",
+            "face": rng.random((4, 4, 3)),
+            "model_name": "Facenet",
+            "detector_backend": "opencv",
+            "embedding": rng.random(dimension).tolist(),
+            "aligned": True,
+            "l2_normalized": False,
+        }
+        for i in range(num_records)
+    ]
+
+
+def test_local_insert_fetch_and_search(tmp_path, monkeypatch):
+    # small segments to cover appending across segment files
+    monkeypatch.setattr(local, "SEGMENT_SIZE", 4)
+    client = LocalClient(connection_details=str(tmp_path))
+
+    records = make_records(10)
+    assert client.insert_embeddings(records, batch_size=3) == 10
+    assert len(os.listdir(os.path.join(str(tmp_path), "segments"))) == 3
+
+    fetched = client.fetch_all_embeddings(
+        model_name="Facenet", detector_backend="opencv", aligned=True, l2_normalized=False
+    )
+    assert [item["img_name"] for item in fetched] == [item["img_name"] for item in records]
+    for item, record in zip(fetched, records):
+        assert np.allclose(item["embedding"], record["embedding"], atol=1e-6)
+
+    newer = client.fetch_all_embeddings(
+        model_name="Facenet",
+        detector_backend="opencv",
+        aligned=True,
+        l2_normalized=False,
+        after_id=fetched[6]["id"],
+    )
+    assert [item["id"] for item in newer] == [item["id"] for item in fetched[7:]]
+
+    neighbours = client.search_by_vector(
+        vector=records[5]["embedding"], model_name="Facenet", detector_backend="opencv", limit=3
+    )
+    assert len(neighbours) == 3
+    assert neighbours[0]["img_name"] == records[5]["img_name"]
+    assert neighbours[0]["distance"] == pytest.approx(0, abs=1e-6)
+    assert neighbours[0]["distance"] <= neighbours[1]["distance"] <= neighbours[2]["distance"]
+
+    # other configurations are stored separately
+    assert (
+        client.fetch_all_embeddings(
+            model_name="Facenet", detector_backend="mtcnn", aligned=True, l2_normalized=False
+        )
+        == []
+    )
+
+    client.close()
+    logger.info("✅ test local insert fetch and search done")
+
+
+def test_local_iter_embeddings(tmp_path):
+    client = LocalClient(connection_details=str(tmp_path))
+    records = make_records(10)
+    client.insert_embeddings(records)
+
+    batches = list(
+        client.iter_embeddings(
+            model_name="Facenet",
+            detector_backend="opencv",
+            aligned=True,
+            l2_normalized=False,
+            batch_size=4,
+        )
+    )
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert [item["img_name"] for batch in batches for item in batch] == [
+        item["img_name"] for item in records
+    ]
+
+    blocks = list(
+        client.iter_embedding_blocks(
+            model_name="Facenet",
+            detector_backend="opencv",
+            aligned=True,
+            l2_normalized=False,
+            batch_size=4,
+        )
+    )
+    assert [len(ids) for ids, _, _ in blocks] == [4, 4, 2]
+    vectors = np.concatenate([block_vectors for _, _, block_vectors in blocks])
+    assert vectors.dtype == np.float32
+    assert np.allclose(vectors, [item["embedding"] for item in records], atol=1e-6)
+    client.close()
+    logger.info("✅ test local iter embeddings done")
+
+
+def test_local_duplicates_are_rolled_back(tmp_path):
+    client = LocalClient(connection_details=str(tmp_path))
+    records = make_records(3)
+    client.insert_embeddings(records)
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        client.insert_embeddings(make_records(2, seed=1) + records[0:1])
+
+    # failed batch is not visible and its rows are reused by the next writer
+    assert client.insert_embeddings(make_records(2, seed=2)) == 2
+    fetched = client.fetch_all_embeddings(
+        model_name="Facenet", detector_backend="opencv", aligned=True, l2_normalized=False
+    )
+    assert len(fetched) == 5
+    assert np.allclose(fetched[-1]["embedding"], make_records(2, seed=2)[-1]["embedding"])
+    client.close()
+    logger.info("✅ test local duplicates are rolled back done")
+
+
+def test_local_search_by_vector_across_blocks(tmp_path):
+    client = LocalClient(connection_details=str(tmp_path))
+    # more records than a block of the streamed scan
+    records = make_records(2500)
+    client.insert_embeddings(records, batch_size=1000)
+    vectors = np.array([record["embedding"] for record in records], dtype=np.float32)
+    target = vectors[1700] + 0.01
+
+    for l2_normalized, threshold in [(False, None), (False, 0.2), (True, None)]:
+        if l2_normalized:
+            distances = 1 - (vectors @ target) / (
+                np.linalg.norm(vectors, axis=1) * np.linalg.norm(target)
+            )
+        else:
+            distances = np.sum(np.square(vectors - target), axis=1)
+        expected = [
+            records[i]["img_name"]
+            for i in np.argsort(distances)[0:5]
+            if threshold is None or distances[i] <= threshold
+        ]
+
+        if l2_normalized:
+            # faces differ from the ones already stored, so they are not duplicates
+            l2_records = [
+                {**record, "face": record["face"] + 1, "l2_normalized": True}
+                for record in records
+            ]
+            client.insert_embeddings(l2_records, batch_size=1000)
+        neighbours = client.search_by_vector(
+            vector=target.tolist(),
+            model_name="Facenet",
+            detector_backend="opencv",
+            l2_normalized=l2_normalized,
+            limit=5,
+            threshold=threshold,
+        )
+        assert [neighbour["img_name"] for neighbour in neighbours] == expected
+        assert np.allclose(neighbours[0]["embedding"], vectors[1700], atol=1e-6)
+
+    client.close()
+    logger.info("✅ test local search by vector across blocks done")
+
+
+def test_local_embeddings_index(tmp_path):
+    client = LocalClient(connection_details=str(tmp_path))
+
+    with pytest.raises(ValueError, match="build_index"):
+        client.get_embeddings_index(
+            model_name="Facenet", detector_backend="opencv", aligned=True, l2_normalized=False
+        )
+
+    client.insert_embeddings(make_records(2))
+    for index_data in [b"first", b"second"]:
+        client.upsert_embeddings_index(
+            model_name="Facenet",
+            detector_backend="opencv",
+            aligned=True,
+            l2_normalized=False,
+            index_data=index_data,
+        )
+    assert (
+        client.get_embeddings_index(
+            model_name="Facenet", detector_backend="opencv", aligned=True, l2_normalized=False
+        )
+        == b"second"
+    )
+    client.close()
+    logger.info("✅ test local embeddings index done")
+
+
+def test_local_readers_during_writes(tmp_path):
+    writer = LocalClient(connection_details=str(tmp_path))
+    reader = LocalClient(connection_details=str(tmp_path))
+    errors: List[Exception] = []
+
+    def write() -> None:
+        try:
+            for seed in range(10):
+                writer.insert_embeddings(make_records(5, seed=seed + 10))
+        except Exception as err:  # pylint: disable=broad-except
+            errors.append(err)
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    while thread.is_alive():
+        fetched = reader.fetch_all_embeddings(
+            model_name="Facenet", detector_backend="opencv", aligned=True, l2_normalized=False
+        )
+        # readers only see complete batches
+        assert len(fetched) % 5 == 0
+    thread.join()
+
+    assert not errors
+    assert (
+        len(
+            reader.fetch_all_embeddings(
+                model_name="Facenet", detector_backend="opencv", aligned=True, l2_normalized=False
+            )
+        )
+        == 50
+    )
+    writer.close()
+    reader.close()
+    logger.info("✅ test local readers during writes done")
+
+
+@pytest.mark.parametrize("similarity_search, expected", [(True, 3), (False, 0)])
+def test_vector_search_of_similar_faces(tmp_path, monkeypatch, similarity_search, expected):
+    records = make_records(5)
+    # embeddings are farther than the threshold of the model from the query
+    for i, record in enumerate(records):
+        record["embedding"] = (np.array(record["embedding"]) + 100 * (i + 1)).tolist()
+    client = LocalClient(connection_details=str(tmp_path))
+    client.insert_embeddings(records)
+    client.close()
+
+    monkeypatch.setattr(LocalClient, "has_vector_search", lambda self: True)
+    monkeypatch.setattr(
+        datastore, "__get_embeddings", lambda img, **kwargs: [{"embedding": [0.0] * 8}]
+    )
+    dfs = datastore.search(
+        img="query.jpg",
+        model_name="Facenet",
+        database_type="local",
+        connection_details=str(tmp_path),
+        search_method="ann",
+        similarity_search=similarity_search,
+        k=3,
+    )
+
+    assert sum(len(df) for df in dfs) == expected
+    if similarity_search:
+        assert dfs[0]["img_name"].tolist() == ["img0_0.jpg", "img0_1.jpg", "img0_2.jpg"]
+    logger.info(f"✅ test vector search with similarity search {similarity_search} done")
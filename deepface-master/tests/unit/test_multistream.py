@@ -0,0 +1,156 @@
+# built-in dependencies
+import os
+import json
+import time
+
+# 3rd party dependencies
+import numpy as np
+import cv2
+
+# project dependencies
+from deepface.modules import multistream, streaming, tracking
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+def write_video(path: str, num_frames: int, face_x: int) -> None:
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (320, 240))
+    for i in range(num_frames):
+        img = np.zeros((240, 320, 3), dtype=np.uint8)
+        # bright square stands for the face, it disappears in the second half of the video
+        if i < num_frames // 2:
+            img[50:150, face_x + i : face_x + i + 100] = 255
+        writer.write(img)
+    writer.release()
+
+
+def fake_extract_faces(img_path, **kwargs):
+    results = []
+    for img in img_path:
+        columns = np.where(img[100, :, 0] > 127)[0]
+        if len(columns) == 0:
+            results.append(
+                [{"facial_area": {"x": 0, "y": 0, "w": 320, "h": 240}, "confidence": 0}]
+            )
+            continue
+        x = int(columns[0])
+        results.append(
+            [{"facial_area": {"x": x, "y": 50, "w": 100, "h": 100}, "confidence": 0.9}]
+        )
+    return results
+
+
+def test_analyze_streams_emits_track_events(monkeypatch, tmp_path):
+    detected_batches = []
+
+    def counting_extract_faces(img_path, **kwargs):
+        detected_batches.append(len(img_path))
+        return fake_extract_faces(img_path, **kwargs)
+
+    monkeypatch.setattr(multistream.DeepFace, "extract_faces", counting_extract_faces)
+    demography = {"age": 31, "dominant_gender": "Woman", "dominant_emotion": "happy"}
+    monkeypatch.setattr(
+        streaming,
+        "analyze_demography_batch",
+        lambda detected_faces: [demography for _ in detected_faces],
+    )
+    monkeypatch.setattr(streaming, "build_demography_models", lambda **kwargs: None)
+
+    sources = {}
+    for stream_id, face_x in [("door", 10), ("hall", 150)]:
+        sources[stream_id] = str(tmp_path / f"{stream_id}.avi")
+        write_video(sources[stream_id], num_frames=30, face_x=face_x)
+
+    events_path = str(tmp_path / "events" / "events.jsonl")
+    results = multistream.analyze_streams(
+        sources=sources,
+        detection_interval=3,
+        event_sink=events_path,
+        output_dir=str(tmp_path / "annotated"),
+    )
+
+    # every frame of video files is analyzed
+    assert {stream_id: result["frames"] for stream_id, result in results.items()} == {
+        "door": 30,
+        "hall": 30,
+    }
+    # detection runs on a subset of frames and is shared by streams
+    assert sum(detected_batches) < 60
+    assert max(detected_batches) == 2
+
+    with open(events_path, "r", encoding="utf-8") as f:
+        events = [json.loads(line) for line in f]
+
+    for stream_id in sources:
+        stream_events = [event for event in events if event["stream_id"] == stream_id]
+        assert [event["event"] for event in stream_events] == ["track_started", "track_ended"]
+        started, ended = stream_events
+        assert started["track_id"] == ended["track_id"]
+        assert started["identity"] is None
+        assert started["demography"] == {"age": 31.0, "gender": "Woman", "emotion": "happy"}
+        assert ended["first_seen"] <= ended["last_seen"]
+
+        cap = cv2.VideoCapture(str(tmp_path / "annotated" / f"{stream_id}.mp4"))
+        assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 30
+        cap.release()
+
+    assert os.path.getsize(events_path) > 0
+    logger.info("✅ test analyze streams emits track events done")
+
+
+def test_frames_of_a_stream_are_batched_in_order(monkeypatch):
+    detected_batches = []
+
+    def counting_extract_faces(img_path, **kwargs):
+        detected_batches.append(len(img_path))
+        return fake_extract_faces(img_path, **kwargs)
+
+    analyzed_batches = []
+
+    def counting_analyze_demography_batch(detected_faces):
+        analyzed_batches.append(len(detected_faces))
+        return [{} for _ in detected_faces]
+
+    monkeypatch.setattr(multistream.DeepFace, "extract_faces", counting_extract_faces)
+    monkeypatch.setattr(
+        streaming, "analyze_demography_batch", counting_analyze_demography_batch
+    )
+
+    stream = multistream.VideoStream(
+        stream_id="door",
+        source="door.avi",
+        cap=None,
+        frame_buffer=streaming.FrameBuffer(latest_wins=False),
+        face_tracker=tracking.FaceTracker(detection_interval=1),
+        stats=streaming.StageStats("door inference"),
+        capture_stats=streaming.StageStats("door capture"),
+    )
+    frames = []
+    for i in range(6):
+        img = np.zeros((240, 320, 3), dtype=np.uint8)
+        img[50:150, 10 + 5 * i : 110 + 5 * i] = 255
+        frames.append(
+            streaming.Frame(index=i, captured_at=time.monotonic(), img=img, timestamp=i)
+        )
+
+    events = []
+    multistream.process_batch(
+        batch=[(stream, frame) for frame in frames],
+        sink=events.append,
+        identity_index=None,
+        detector_backend="opencv",
+        enable_face_analysis=True,
+        anti_spoofing=False,
+        min_face_size=0,
+    )
+
+    # the tracker follows frames of the stream one by one, the new track is analyzed once
+    assert detected_batches == [1] * 6
+    assert analyzed_batches == [1]
+    assert [event["event"] for event in events] == ["track_started"]
+    assert events[0]["frame_index"] == 0 and events[0]["facial_area"]["x"] == 10
+    assert stream.first_seen[events[0]["track_id"]] == 0
+    assert stream.last_seen[events[0]["track_id"]] == 5
+    assert stream.stats.count == 6
+    logger.info("✅ test frames of a stream are batched in order done")
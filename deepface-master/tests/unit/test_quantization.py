@@ -0,0 +1,41 @@
+# 3rd party dependencies
+import pytest
+
+# project dependencies
+from deepface import DeepFace
+from deepface.modules import verification
+from deepface.models.facial_recognition.Quantized import parse_model_name
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+def test_parse_quantized_model_names():
+    assert parse_model_name("VGG-Face-int8") == ("VGG-Face", "int8")
+    assert parse_model_name("Facenet512-float16") == ("Facenet512", "float16")
+    assert parse_model_name("Facenet512") == ("Facenet512", None)
+    # models cannot be quantized are not parsed as variants
+    assert parse_model_name("SFace-int8") == ("SFace-int8", None)
+    logger.info("✅ test parse quantized model names done")
+
+
+def test_quantized_variants_fall_back_to_base_thresholds():
+    for model_name in ["VGG-Face", "Facenet", "Facenet512", "ArcFace", "GhostFaceNet"]:
+        for precision in ["float16", "int8"]:
+            for metric in ["cosine", "euclidean", "euclidean_l2", "angular"]:
+                assert verification.find_threshold(
+                    f"{model_name}-{precision}", metric
+                ) == verification.find_threshold(model_name, metric)
+    logger.info("✅ test quantized variants fall back to base thresholds done")
+
+
+def test_int8_quantization_requires_calibration():
+    with pytest.raises(ValueError, match="calibration_path"):
+        DeepFace.quantize(model_name="Facenet", precision="int8", calibration_path=None)
+    logger.info("✅ test int8 quantization requires calibration done")
+
+
+def test_unsupported_precision():
+    with pytest.raises(ValueError, match="unsupported precision"):
+        DeepFace.quantize(model_name="Facenet", precision="int4")
+    logger.info("✅ test unsupported precision done")
@@ -1,4 +1,10 @@
+# 3rd party dependencies
+import pytest
+
+# project dependencies
+from deepface.modules import modeling
 from deepface.commons.logger import Logger
+from deepface.modules.exceptions import UnimplementedError
 
 logger = Logger()
 
@@ -6,3 +12,12 @@ logger = Logger()
 def test_singleton_same_object():
     assert Logger() == Logger()
     logger.info("✅ id's of instances of \"singletoned\" class Logger are the same")
+
+
+def test_invalid_model_name_creates_no_lock():
+    num_locks = len(modeling._model_locks)
+    for idx in range(3):
+        with pytest.raises(UnimplementedError, match="Invalid model_name"):
+            modeling.build_model(task="facial_recognition", model_name=f"Unknown{idx}")
+    assert len(modeling._model_locks) == num_locks
+    logger.info("✅ test invalid model name creates no lock done")
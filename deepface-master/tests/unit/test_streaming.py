@@ -0,0 +1,285 @@
+# built-in dependencies
+import queue
+import threading
+
+# 3rd party dependencies
+import pytest
+import numpy as np
+import cv2
+
+# project dependencies
+from deepface.modules import streaming, tracking, recognition, verification
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+class FakeCapture:
+    def __init__(self, num_frames: int):
+        self.num_frames = num_frames
+        self.index = 0
+
+    def get(self, prop):
+        return 40.0 * self.index
+
+    def read(self):
+        if self.index == self.num_frames:
+            return False, None
+        self.index += 1
+        return True, np.full((240, 320, 3), self.index % 255, dtype=np.uint8)
+
+
+class FakeWriter:
+    def __init__(self):
+        self.frames = []
+
+    def write(self, img):
+        self.frames.append(img)
+
+
+def test_frame_buffer_latest_frame_wins():
+    buffer = streaming.FrameBuffer(size=2)
+    for i in range(5):
+        buffer.put(i)
+    assert buffer.get(timeout=0) == 4
+    # older frames are dropped once the latest one is taken
+    assert buffer.dropped == 4
+    assert buffer.get(timeout=0) is None
+
+    buffer.put(5)
+    buffer.close()
+    assert buffer.get() == 5
+    assert buffer.get() is None and buffer.closed
+    logger.info("✅ test frame buffer latest frame wins done")
+
+
+def test_live_sources():
+    assert streaming.is_live_source(0)
+    assert streaming.is_live_source("rtsp://camera/stream")
+    assert streaming.is_live_source("http://camera/video.mjpg")
+    assert not streaming.is_live_source("videos/door.mp4")
+    logger.info("✅ test live sources done")
+
+
+def test_pipeline_renders_every_video_frame(monkeypatch):
+    face = (10, 10, 150, 150, True, 0)
+    monkeypatch.setattr(streaming, "grab_facial_areas", lambda **kwargs: [face])
+    analyzed = []
+
+    def fake_analyze_frame(img, **kwargs):
+        analyzed.append(img)
+        return np.zeros_like(img)
+
+    monkeypatch.setattr(streaming, "analyze_frame", fake_analyze_frame)
+
+    frame_buffer = streaming.FrameBuffer()
+    render_queue = queue.Queue(maxsize=2)
+    result_queue = queue.Queue(maxsize=2)
+    stop_event, release_event = threading.Event(), threading.Event()
+    stats = {name: streaming.StageStats(name) for name in ["capture", "inference", "render"]}
+
+    capture_thread = threading.Thread(
+        target=streaming.capture_frames,
+        args=(FakeCapture(50), frame_buffer, render_queue, stop_event, stats["capture"]),
+        kwargs={"drop_frames": False},
+    )
+    inference_thread = threading.Thread(
+        target=streaming.run_inference,
+        args=(frame_buffer, result_queue, stop_event, release_event, stats["inference"]),
+        kwargs={
+            "db_path": "",
+            "model_name": "VGG-Face",
+            "detector_backend": "opencv",
+            "distance_metric": "cosine",
+            "enable_face_analysis": False,
+            "frame_threshold": 2,
+            "anti_spoofing": False,
+        },
+    )
+    capture_thread.start()
+    inference_thread.start()
+
+    writer = FakeWriter()
+    streaming.render_frames(
+        render_queue=render_queue,
+        result_queue=result_queue,
+        stop_event=stop_event,
+        release_event=release_event,
+        stats=stats,
+        time_threshold=0,
+        frame_threshold=2,
+        video_writer=writer,
+        show=False,
+    )
+    stop_event.set()
+    release_event.set()
+    capture_thread.join()
+    inference_thread.join()
+
+    # video files are not dropped by the render stage even if inference falls behind
+    assert len(writer.frames) == 50
+    assert stats["capture"].count == stats["render"].count == 50
+    assert 0 < stats["inference"].count <= 50
+    assert len(analyzed) > 0
+    logger.info("✅ test pipeline renders every video frame done")
+
+
+def test_analysis_results_are_cached_per_track(monkeypatch):
+    searched, analyzed = [], []
+
+    def fake_search_identity(detected_face, **kwargs):
+        searched.append(detected_face)
+        return None, None, 0
+
+    def fake_analyze_demography_batch(detected_faces):
+        analyzed.extend(detected_faces)
+        return [None for _ in detected_faces]
+
+    monkeypatch.setattr(streaming, "search_identity", fake_search_identity)
+    monkeypatch.setattr(streaming, "analyze_demography_batch", fake_analyze_demography_batch)
+
+    img = np.zeros((480, 640, 3), dtype=np.uint8)
+    tracker = tracking.FaceTracker(tracker="iou", detection_interval=2)
+
+    def detect(_):
+        return [(10, 10, 150, 150, True, 0), (300, 200, 150, 150, True, 0)]
+
+    for _ in range(3):
+        tracks = tracker.update(img, detect=detect)
+        streaming.analyze_frame(
+            img=img,
+            tracks=tracks,
+            db_path="",
+            model_name="VGG-Face",
+            detector_backend="opencv",
+            distance_metric="cosine",
+            enable_face_analysis=True,
+            anti_spoofing=False,
+        )
+
+    # each tracked face is analyzed once although it is in every freezed frame
+    assert len(searched) == len(analyzed) == 2
+    logger.info("✅ test analysis results are cached per track done")
+
+
+@pytest.mark.parametrize("distance_metric", ["cosine", "euclidean", "euclidean_l2", "angular"])
+def test_identity_index_search(monkeypatch, tmp_path, distance_metric):
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((5, 16))
+    representations = []
+    for i, embedding in enumerate(embeddings):
+        identity = str(tmp_path / f"img{i}.jpg")
+        cv2.imwrite(identity, np.full((200, 200, 3), 40 * i, dtype=np.uint8))
+        representations.append(
+            {
+                "identity": identity,
+                "hash": str(i),
+                "embedding": embedding.tolist(),
+                "target_x": 20,
+                "target_y": 30,
+                "target_w": 100,
+                "target_h": 120,
+            }
+        )
+    # images without a face are not indexed
+    representations.append({**representations[0], "identity": "empty.jpg", "embedding": None})
+
+    monkeypatch.setattr(recognition, "load_representations", lambda **kwargs: representations)
+    index = streaming.IdentityIndex(
+        db_path=str(tmp_path),
+        model_name="Facenet",
+        detector_backend="opencv",
+        distance_metric=distance_metric,
+    )
+    assert len(index) == 5
+    assert index.thumbnails[representations[2]["identity"]].shape == (112, 112, 3)
+
+    query = embeddings[2] + 0.01
+    expected = verification.find_distance(embeddings, query[None, :], distance_metric)[0]
+    assert np.allclose(index.find_distances(query), expected, atol=1e-4)
+
+    represented = []
+
+    def fake_represent(img_path, **kwargs):
+        represented.append(img_path)
+        return [{"embedding": query.tolist()}]
+
+    monkeypatch.setattr(streaming.DeepFace, "represent", fake_represent)
+    label, thumbnail, confidence = streaming.search_identity(
+        detected_face=np.zeros((50, 50, 3)),
+        db_path=str(tmp_path),
+        model_name="Facenet",
+        detector_backend="opencv",
+        distance_metric=distance_metric,
+        identity_index=index,
+    )
+    assert label == "img2.jpg" and confidence > 50
+    assert thumbnail is index.thumbnails[representations[2]["identity"]]
+    assert len(represented) == 1
+    logger.info(f"✅ test identity index search for {distance_metric} done")
+
+
+def test_frame_faces_are_analyzed_in_a_single_batch(monkeypatch, tmp_path):
+    calls = {"analyze": [], "represent": []}
+    demography = {
+        "age": 30,
+        "dominant_gender": "Man",
+        "emotion": {"happy": 90.0, "neutral": 10.0},
+        "dominant_emotion": "happy",
+    }
+
+    def fake_analyze(img_path, **kwargs):
+        calls["analyze"].append(len(img_path))
+        return [[demography] for _ in img_path]
+
+    def fake_represent(img_path, **kwargs):
+        calls["represent"].append(len(img_path))
+        return [[{"embedding": [1.0, float(i)]}] for i in range(len(img_path))]
+
+    monkeypatch.setattr(streaming.DeepFace, "analyze", fake_analyze)
+    monkeypatch.setattr(streaming.DeepFace, "represent", fake_represent)
+    monkeypatch.setattr(
+        recognition,
+        "load_representations",
+        lambda **kwargs: [
+            {
+                "identity": str(tmp_path / "img1.jpg"),
+                "embedding": [1.0, 0.0],
+                "target_x": 0,
+                "target_y": 0,
+                "target_w": 0,
+                "target_h": 0,
+            }
+        ],
+    )
+    index = streaming.IdentityIndex(
+        db_path=str(tmp_path),
+        model_name="Facenet",
+        detector_backend="opencv",
+        distance_metric="cosine",
+    )
+
+    img = np.zeros((720, 1280, 3), dtype=np.uint8)
+    faces = [(150 * i, 300, 140, 140, True, 0) for i in range(8)]
+    tracker = tracking.FaceTracker(tracker="iou", detection_interval=1)
+    tracks = tracker.update(img, detect=lambda _: faces)
+
+    streaming.analyze_frame(
+        img=img,
+        tracks=tracks,
+        db_path=str(tmp_path),
+        model_name="Facenet",
+        detector_backend="opencv",
+        distance_metric="cosine",
+        enable_face_analysis=True,
+        anti_spoofing=False,
+        identity_index=index,
+    )
+
+    # 8 faces cost a single analyze and a single represent call
+    assert calls == {"analyze": [8], "represent": [8]}
+    assert all(track.demography == demography for track in tracks)
+    # only the first face matches the indexed embedding within the threshold
+    assert tracks[0].identity[0] == "img1.jpg"
+    assert tracks[7].identity[0] is None
+    logger.info("✅ test frame faces are analyzed in a single batch done")
@@ -0,0 +1,77 @@
+# 3rd party dependencies
+import pytest
+import numpy as np
+
+# project dependencies
+from deepface.modules import tracking
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+class FakeDetector:
+    """Detect a face moving 4 pixels right per frame, and optionally a second static face"""
+
+    def __init__(self):
+        self.frame = 0
+        self.calls = 0
+        self.second_face = True
+
+    def __call__(self, img):
+        self.calls += 1
+        faces = [(20 + 4 * self.frame, 30, 100, 100, True, 0)]
+        if self.second_face:
+            faces.append((300, 200, 80, 80, True, 0))
+        return faces
+
+
+def test_detector_runs_every_n_frames_with_stable_ids():
+    detector = FakeDetector()
+    tracker = tracking.FaceTracker(tracker="iou", detection_interval=5)
+    img = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    for frame in range(20):
+        detector.frame = frame
+        tracks = tracker.update(img, detect=detector)
+        assert sorted(track.track_id for track in tracks) == [0, 1]
+
+    assert detector.calls == 4
+
+    # boxes between detections are predicted with the observed velocity
+    moving = next(track for track in tracks if track.track_id == 0)
+    assert moving.velocity == (4.0, 0.0)
+    assert abs(moving.facial_area[0] - (20 + 4 * 19)) <= 4
+    logger.info("✅ test detector runs every n frames with stable ids done")
+
+
+def test_missed_tracks_are_dropped_and_new_faces_get_new_ids():
+    detector = FakeDetector()
+    tracker = tracking.FaceTracker(tracker="iou", detection_interval=1, max_misses=1)
+    img = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    tracks = tracker.update(img, detect=detector)
+    tracks[1].identity = ("img1.jpg", None, 90.0)
+
+    detector.second_face = False
+    assert [track.track_id for track in tracker.update(img, detect=detector)] == [0]
+    # missed once, still kept in case the face is detected again
+    assert len(tracker.tracks) == 2
+    tracker.update(img, detect=detector)
+    assert len(tracker.tracks) == 1
+
+    detector.second_face = True
+    tracks = tracker.update(img, detect=detector)
+    assert [track.track_id for track in tracks] == [0, 2]
+    # cached results belong to the previous appearance only
+    assert tracks[1].identity is None
+    logger.info("✅ test missed tracks are dropped and new faces get new ids done")
+
+
+def test_find_iou():
+    assert tracking.find_iou((0, 0, 10, 10, True, 0), (0, 0, 10, 10, True, 0)) == 1
+    assert tracking.find_iou((0, 0, 10, 10, True, 0), (5, 0, 10, 10, True, 0)) == 50 / 150
+    assert tracking.find_iou((0, 0, 10, 10, True, 0), (20, 20, 10, 10, True, 0)) == 0
+
+    with pytest.raises(ValueError, match="Unsupported tracker"):
+        tracking.FaceTracker(tracker="medianflow")
+    logger.info("✅ test find iou done")
@@ -1,9 +1,11 @@
 # 3rd party dependencies
 import pytest
 import cv2
+import numpy as np
 
 # project dependencies
 from deepface import DeepFace
+from deepface.modules import verification
 from deepface.modules.verification import find_distance
 from deepface.commons.logger import Logger
 
@@ -257,3 +259,55 @@ def test_confidence():
             result["confidence"] <= 49
         ), f"Confidence should be <= 49 for different persons, got {result['confidence']}"
         logger.info(f"✅ test confidence for {distance_metric} metric is done")
+
+
+def test_verify_many_represents_all_faces_once(monkeypatch):
+    embeddings = {"a": [1.0, 0.0, 0.0, 0.0], "b": [0.0, 1.0, 0.0, 0.0], "c": [0.0, 0.0, 1.0, 0.0]}
+    represent_calls = []
+
+    class FakeModel:
+        output_shape = 4
+
+    def fake_extract_faces(img_path, **kwargs):
+        # each letter of a fake image is a face
+        return [
+            {"face": np.full((4, 4, 3), ord(letter)), "facial_area": {"x": idx}}
+            for idx, letter in enumerate(img_path)
+        ]
+
+    def fake_represent(img_path, **kwargs):
+        faces = img_path if isinstance(img_path, list) else [img_path]
+        represent_calls.append(len(faces))
+        results = [[{"embedding": embeddings[chr(int(face[0, 0, 0]))]}] for face in faces]
+        return results[0] if len(faces) == 1 else results
+
+    monkeypatch.setattr(verification.modeling, "build_model", lambda **kwargs: FakeModel())
+    monkeypatch.setattr(verification.detection, "extract_faces", fake_extract_faces)
+    monkeypatch.setattr(verification.representation, "represent", fake_represent)
+
+    results = DeepFace.verify_many(
+        "a",
+        ["ba", "c", [0.0, 1.0, 0.0, 0.0]],
+        model_name="Facenet",
+        threshold=[None, 0.5, 0.2],
+        silent=True,
+    )
+    # probe and faces of all candidates are represented in a single batch
+    assert represent_calls == [4]
+
+    assert [result["verified"] for result in results] == [True, False, False]
+    assert results[0]["distance"] == 0
+    assert results[0]["facial_areas"] == {"img1": {"x": 0}, "img2": {"x": 1}}
+    assert results[0]["threshold"] == verification.find_threshold("Facenet", "cosine")
+    assert [result["threshold"] for result in results[1:]] == [0.5, 0.2]
+    assert results[2]["facial_areas"]["img2"]["x"] is None
+    assert results[0]["confidence"] >= 51 and results[1]["confidence"] <= 49
+
+    # distances are the same as verifying each pair on its own
+    for candidate, result in zip(["ba", "c"], results):
+        expected = DeepFace.verify("a", candidate, model_name="Facenet")
+        assert expected["distance"] == pytest.approx(result["distance"], abs=1e-6)
+
+    with pytest.raises(ValueError, match="2 thresholds are given for 3 candidates"):
+        DeepFace.verify_many("a", ["a", "b", "c"], threshold=[0.1, 0.2])
+    logger.info("✅ test verify many represents all faces once done")
@@ -0,0 +1,130 @@
+# built-in dependencies
+from typing import Any, Dict, List, Optional
+
+# 3rd party dependencies
+import pytest
+
+# project dependencies
+from deepface.modules.database.weaviate import WeaviateClient
+from deepface.commons.logger import Logger
+
+logger = Logger()
+
+
+def make_rows(start: int, num_rows: int) -> List[Dict[str, Any]]:
+    # every third row belongs to another detector and every fifth one to another model
+    return [
+        {
+            "_additional": {"id": f"uuid-{i}"},
+            "img_name": f"img_{i}.jpg",
+            "embedding": [float(i)] * 4,
+            "model_name": "VGG-Face" if i % 5 == 4 else "Facenet",
+            "detector_backend": "mtcnn" if i % 3 == 2 else "opencv",
+            "aligned": True,
+        }
+        for i in range(start, start + num_rows)
+    ]
+
+
+class FakeQuery:
+    """Serves rows of a class page by page after a cursor, as the weaviate cursor api"""
+
+    def __init__(self, client: "FakeWeaviate", class_name: str) -> None:
+        self.client = client
+        self.class_name = class_name
+        self.limit: Optional[int] = None
+        self.after: Optional[str] = None
+
+    def with_additional(self, properties: List[str]) -> "FakeQuery":
+        return self
+
+    def with_limit(self, limit: int) -> "FakeQuery":
+        self.limit = limit
+        return self
+
+    def with_after(self, after: str) -> "FakeQuery":
+        self.after = after
+        return self
+
+    def do(self) -> Dict[str, Any]:
+        self.client.cursors.append(self.after)
+        rows = self.client.rows
+        start = 0
+        if self.after is not None:
+            start = [row["_additional"]["id"] for row in rows].index(self.after) + 1
+        assert self.limit is not None
+        return {"data": {"Get": {self.class_name: rows[start : start + self.limit]}}}
+
+
+class FakeWeaviate:
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self.rows = rows
+        self.cursors: List[Optional[str]] = []
+        self.query = self
+
+    def get(self, class_name: str, properties: List[str]) -> FakeQuery:
+        return FakeQuery(self, class_name)
+
+
+def make_client(rows: List[Dict[str, Any]]) -> WeaviateClient:
+    # weaviate-client is an optional dependency, so the client is built around a fake one
+    client = WeaviateClient.__new__(WeaviateClient)
+    client.client = FakeWeaviate(rows)
+    return client
+
+
+@pytest.mark.parametrize("num_rows, expected_cursors", [(10, 3), (12, 4)])
+def test_weaviate_iter_embeddings_pages_with_cursor(num_rows, expected_cursors):
+    rows = make_rows(0, num_rows)
+    client = make_client(rows)
+
+    batches = list(
+        client.iter_embeddings(
+            model_name="Facenet",
+            detector_backend="opencv",
+            aligned=True,
+            l2_normalized=False,
+            batch_size=4,
+        )
+    )
+
+    # each page starts after the last id of the previous one
+    assert client.client.cursors == [None] + [
+        f"uuid-{i}" for i in range(3, 4 * (expected_cursors - 1), 4)
+    ]
+    # a short page ends iteration, a full last page needs an empty one to end it
+    assert len(client.client.cursors) == expected_cursors
+
+    # rows of other models and detectors are dropped from pages
+    fetched = [item for batch in batches for item in batch]
+    expected = [
+        row["_additional"]["id"]
+        for row in rows
+        if row["model_name"] == "Facenet" and row["detector_backend"] == "opencv"
+    ]
+    assert [item["id"] for item in fetched] == expected
+    assert all(item["model_name"] == "Facenet" for item in fetched)
+    assert all(len(batch) <= 4 for batch in batches)
+    logger.info(f"✅ test weaviate iter embeddings pages of {num_rows} rows done")
+
+
+def test_weaviate_iter_embeddings_of_empty_class():
+    client = make_client([])
+    assert not list(
+        client.iter_embeddings(
+            model_name="Facenet", detector_backend="opencv", aligned=True, l2_normalized=False
+        )
+    )
+    assert client.client.cursors == [None]
+
+    with pytest.raises(ValueError, match="after_id"):
+        list(
+            client.iter_embeddings(
+                model_name="Facenet",
+                detector_backend="opencv",
+                aligned=True,
+                l2_normalized=False,
+                after_id=1,
+            )
+        )
+    logger.info("✅ test weaviate iter embeddings of empty class done")